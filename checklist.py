@@ -497,6 +497,13 @@ class APIRegressionValidator(RepoValidator):
                     imports += [
                         ".".join([prefix + node.module, x.name]) for x in node.names
                     ]
+                elif self._is_lazy_imports(node):
+                    # Names imported on first access by a module `__getattr__`
+                    # are mapped to the modules they are imported from.
+                    imports += [
+                        ".".join([module.value, name.value])
+                        for name, module in zip(node.value.keys, node.value.values)
+                    ]
         skbio_imports = []
         for import_ in imports:
             # Filter by skbio
@@ -504,6 +511,18 @@ class APIRegressionValidator(RepoValidator):
                 skbio_imports.append(import_)
         return skbio_imports
 
+    def _is_lazy_imports(self, node):
+        """Return whether `node` assigns a ``_lazy_imports`` mapping."""
+        return (
+            isinstance(node, ast.Assign)
+            and [getattr(x, "id", None) for x in node.targets] == ["_lazy_imports"]
+            and isinstance(node.value, ast.Dict)
+            and all(
+                isinstance(x, ast.Constant) and isinstance(x.value, str)
+                for x in node.value.keys + node.value.values
+            )
+        )
+
 
 if __name__ == "__main__":
     sys.exit(main())
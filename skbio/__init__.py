@@ -8,18 +8,41 @@
 
 # ruff: noqa: D104
 
-# Add skbio.io to sys.modules to prevent cycles in our imports
-import skbio.io  # noqa
+from importlib import import_module
 
-# imports included for convenience
-from skbio.sequence import Sequence, DNA, RNA, Protein, GeneticCode, SubstitutionMatrix
-from skbio.stats.distance import DistanceMatrix
-from skbio.alignment import local_pairwise_align_ssw, TabularMSA
-from skbio.tree import TreeNode, nj
+# Add skbio.io to sys.modules to prevent cycles in our imports. Importing it
+# also registers all file formats and adds `read` and `write` methods to the
+# classes they support, so it cannot be deferred.
+import skbio.io  # noqa
 from skbio.io import read, write
-from skbio.stats.ordination import OrdinationResults
-import skbio.diversity  # noqa
-import skbio.stats.evolve  # noqa
+
+# Everything else is imported on first access, see `__getattr__`. Convenience
+# imports map to the module defining them.
+_lazy_imports = {
+    "Sequence": "skbio.sequence",
+    "DNA": "skbio.sequence",
+    "RNA": "skbio.sequence",
+    "Protein": "skbio.sequence",
+    "GeneticCode": "skbio.sequence",
+    "SubstitutionMatrix": "skbio.sequence",
+    "DistanceMatrix": "skbio.stats.distance",
+    "TabularMSA": "skbio.alignment",
+    "local_pairwise_align_ssw": "skbio.alignment",
+    "TreeNode": "skbio.tree",
+    "nj": "skbio.tree",
+    "OrdinationResults": "skbio.stats.ordination",
+}
+_subpackages = {
+    "alignment",
+    "diversity",
+    "feature_table",
+    "io",
+    "metadata",
+    "sequence",
+    "stats",
+    "tree",
+    "util",
+}
 
 __all__ = [
     "Sequence",
@@ -38,6 +61,22 @@ __all__ = [
     "OrdinationResults",
 ]
 
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        value = getattr(import_module(_lazy_imports[name]), name)
+    elif name in _subpackages:
+        value = import_module("skbio." + name)
+    else:
+        raise AttributeError("module 'skbio' has no attribute %r" % name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports) | _subpackages)
+
+
 __credits__ = "https://github.com/scikit-bio/scikit-bio/graphs/contributors"
 __version__ = "0.6.0-dev"
 
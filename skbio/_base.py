@@ -18,6 +18,10 @@ class SkbioObject(metaclass=abc.ABCMeta):
 
     """
 
+    # Empty, so that subclasses can define `__slots__` to avoid a per-instance
+    # dictionary. Subclasses without `__slots__` are unaffected.
+    __slots__ = ()
+
     @abc.abstractmethod
     def __str__(self):
         raise NotImplementedError
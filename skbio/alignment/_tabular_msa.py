@@ -11,7 +11,6 @@ import copy
 
 import numpy as np
 import pandas as pd
-import scipy.stats
 
 from skbio._base import SkbioObject
 from skbio.metadata._mixin import MetadataMixin, PositionalMetadataMixin
@@ -22,6 +21,7 @@ from skbio.util._misc import resolve_key
 from skbio.alignment._indexing import TabularMSAILoc, TabularMSALoc
 
 from skbio.alignment._repr import _TabularMSAReprBuilder
+from skbio.io.registry import _LazyIOMethod
 
 
 _Shape = collections.namedtuple("Shape", ["sequence", "position"])
@@ -141,6 +141,8 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
     """
 
     default_write_format = "fasta"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
     __hash__ = None
 
     @property
@@ -1445,9 +1447,11 @@ class TabularMSA(MetadataMixin, PositionalMetadataMixin, SkbioObject):
             # the default gap character.
             base += 1
 
+        from scipy.stats import entropy
+
         def f(p):
             freqs = list(p.frequencies().values())
-            return 1.0 - scipy.stats.entropy(freqs, base=base)
+            return 1.0 - entropy(freqs, base=base)
 
         return f
 
@@ -23,6 +23,7 @@ from skbio.diversity.beta._unifrac import (
 from skbio.util._decorator import experimental, deprecated
 from skbio.stats.distance import DistanceMatrix
 from skbio.diversity._util import (
+    _count_root_children,
     _validate_counts_matrix,
     _get_phylogenetic_kwargs,
     _quantitative_to_qualitative_counts,
@@ -187,7 +188,7 @@ def alpha_diversity(metric, counts, ids=None, validate=True, **kwargs):
         )
         counts = counts_by_node
         if "rooted" not in kwargs:
-            kwargs["rooted"] = len(tree.root().children) == 2
+            kwargs["rooted"] = _count_root_children(tree) == 2
         if "weight" not in kwargs:
             kwargs["weight"] = False
         metric = functools.partial(_phydiv, branch_lengths=branch_lengths, **kwargs)
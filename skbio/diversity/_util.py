@@ -11,7 +11,7 @@ import collections.abc
 import numpy as np
 import pandas as pd
 
-from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.tree import CompactTree, DuplicateNodeError, MissingNodeError
 from skbio.diversity._phylogenetic import _nodes_by_counts
 
 
@@ -84,10 +84,11 @@ def _validate_otu_ids_and_tree(counts, otu_ids, tree, rooted=True):
             "``otu_ids`` must be the same length as ``counts`` " "vector(s)."
         )
 
-    if len(tree.root().children) == 0:
+    n_root_children = _count_root_children(tree)
+    if n_root_children == 0:
         raise ValueError("``tree`` must contain more than just a root node.")
 
-    if rooted is True and len(tree.root().children) > 2:
+    if rooted is True and n_root_children > 2:
         # this is an imperfect check for whether the tree is rooted or not.
         # can this be improved?
         raise ValueError("``tree`` must be rooted.")
@@ -95,18 +96,25 @@ def _validate_otu_ids_and_tree(counts, otu_ids, tree, rooted=True):
     # all nodes (except the root node) have corresponding branch lengths
     # all tip names in tree are unique
     # all otu_ids correspond to tip names in tree
-    branch_lengths = []
-    tip_names = []
-    for e in tree.traverse():
-        if not e.is_root():
-            branch_lengths.append(e.length)
-        if e.is_tip():
-            tip_names.append(e.name)
+    if isinstance(tree, CompactTree):
+        missing_lengths = np.isnan(tree.length[1:]).any()
+        tip_names = tree.name[tree.is_tip].tolist()
+    else:
+        branch_lengths = []
+        tip_names = []
+        for e in tree.traverse():
+            if not e.is_root():
+                branch_lengths.append(e.length)
+            if e.is_tip():
+                tip_names.append(e.name)
+        missing_lengths = np.array(
+            [branch is None for branch in branch_lengths]
+        ).any()
     set_tip_names = set(tip_names)
     if len(tip_names) != len(set_tip_names):
         raise DuplicateNodeError("All tip names must be unique.")
 
-    if np.array([branch is None for branch in branch_lengths]).any():
+    if missing_lengths:
         raise ValueError("All non-root nodes in ``tree`` must have a branch " "length.")
     missing_tip_names = set_otu_ids - set_tip_names
     if missing_tip_names != set():
@@ -118,6 +126,13 @@ def _validate_otu_ids_and_tree(counts, otu_ids, tree, rooted=True):
         )
 
 
+def _count_root_children(tree):
+    """Return the number of children of the root of a tree."""
+    if isinstance(tree, CompactTree):
+        return len(tree.children(0))
+    return len(tree.root().children)
+
+
 def _vectorize_counts_and_tree(counts, otu_ids, tree):
     """Index tree and convert counts to np.array in corresponding order."""
     tree_index = tree.to_array(nan_length_value=0.0)
@@ -10,6 +10,7 @@ import numpy as np
 
 from skbio.util._decorator import experimental
 from skbio.diversity._util import (
+    _count_root_children,
     _validate_counts_vector,
     _validate_otu_ids_and_tree,
     _vectorize_counts_and_tree,
@@ -60,7 +61,7 @@ def faith_pd(counts, otu_ids, tree, validate=True):
     otu_ids : list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``counts``.
-    tree : skbio.TreeNode
+    tree : skbio.TreeNode or skbio.tree.CompactTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     validate: bool, optional
@@ -226,7 +227,7 @@ def phydiv(counts, otu_ids, tree, rooted=None, weight=False, validate=True):
     otu_ids : list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``counts``.
-    tree : skbio.TreeNode
+    tree : skbio.TreeNode or skbio.tree.CompactTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     rooted : bool, optional
@@ -406,7 +407,7 @@ def phydiv(counts, otu_ids, tree, rooted=None, weight=False, validate=True):
     # if not specified, determine whether metric should be calculated in rooted
     # mode according to the tree
     if rooted is None:
-        rooted = len(tree.root().children) == 2
+        rooted = _count_root_children(tree) == 2
 
     # validate weight parameter
     if (
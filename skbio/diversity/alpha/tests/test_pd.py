@@ -15,7 +15,7 @@ import pandas as pd
 
 from skbio import TreeNode
 from skbio.util import get_data_path
-from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.tree import CompactTree, DuplicateNodeError, MissingNodeError
 from skbio.diversity.alpha import faith_pd, phydiv
 
 
@@ -102,6 +102,13 @@ class FaithPDTests(TestCase):
         expected = 2.0
         self.assertAlmostEqual(actual, expected)
 
+    def test_faith_pd_compact_tree(self):
+        for tree in self.t1, self.t1_w_extra_tips:
+            ct = CompactTree.from_tree_node(tree)
+            for counts in self.b1:
+                self.assertAlmostEqual(faith_pd(counts, self.oids1, ct),
+                                       faith_pd(counts, self.oids1, tree))
+
     def test_faith_pd_minimal(self):
         # two tips
         tree = TreeNode.read(StringIO('(OTU1:0.25, OTU2:0.25)root;'))
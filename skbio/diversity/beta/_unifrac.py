@@ -17,6 +17,8 @@ from skbio.diversity._util import (
     _vectorize_counts_and_tree,
 )
 from skbio.diversity._phylogenetic import _tip_distances
+from skbio.tree import CompactTree
+from skbio.tree._compact import _ancestor_sums
 
 
 # The default value indicating whether normalization should be applied
@@ -38,7 +40,7 @@ def unweighted_unifrac(u_counts, v_counts, otu_ids, tree, validate=True):
     otu_ids: list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``.
-    tree: skbio.TreeNode
+    tree: skbio.TreeNode or skbio.tree.CompactTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     validate: bool, optional
@@ -174,7 +176,7 @@ def weighted_unifrac(
     otu_ids: list, np.array
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``.
-    tree: skbio.TreeNode
+    tree: skbio.TreeNode or skbio.tree.CompactTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     normalized: boolean, optional
@@ -311,7 +313,9 @@ def weighted_unifrac(
 
     if normalized:
         tip_indices = _get_tip_indices(tree_index)
-        node_to_root_distances = _tip_distances(branch_lengths, tree, tip_indices)
+        node_to_root_distances = _get_tip_distances(
+            branch_lengths, tree, tree_index, tip_indices
+        )
         return _weighted_unifrac_normalized(
             u_node_counts,
             v_node_counts,
@@ -512,7 +516,7 @@ def _setup_multiple_unweighted_unifrac(counts, otu_ids, tree, validate):
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``. These IDs do not need to
         be in tip order with respect to the tree.
-    tree: skbio.TreeNode
+    tree: skbio.TreeNode or skbio.tree.CompactTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     validate: bool, optional
@@ -548,7 +552,7 @@ def _setup_multiple_weighted_unifrac(counts, otu_ids, tree, normalized, validate
         Vector of OTU ids corresponding to tip names in ``tree``. Must be the
         same length as ``u_counts`` and ``v_counts``. These IDs do not need to
         be in tip order with respect to the tree.
-    tree : skbio.TreeNode
+    tree : skbio.TreeNode or skbio.tree.CompactTree
         Tree relating the OTUs in otu_ids. The set of tip names in the tree can
         be a superset of ``otu_ids``, but not a subset.
     normalized : bool
@@ -571,7 +575,9 @@ def _setup_multiple_weighted_unifrac(counts, otu_ids, tree, normalized, validate
     tip_indices = _get_tip_indices(tree_index)
 
     if normalized:
-        node_to_root_distances = _tip_distances(branch_lengths, tree, tip_indices)
+        node_to_root_distances = _get_tip_distances(
+            branch_lengths, tree, tree_index, tip_indices
+        )
 
         def f(u_node_counts, v_node_counts):
             u_total_count = np.take(u_node_counts, tip_indices).sum()
@@ -603,12 +609,34 @@ def _setup_multiple_weighted_unifrac(counts, otu_ids, tree, normalized, validate
 
 
 def _get_tip_indices(tree_index):
+    if "id_index" not in tree_index:
+        # nodes without children, from the array representation of a
+        # CompactTree
+        child_index = tree_index["child_index"]
+        return np.setdiff1d(tree_index["id"], child_index[:, 0])
     tip_indices = np.array(
         [n.id for n in tree_index["id_index"].values() if n.is_tip()]
     )
     return tip_indices
 
 
+def _get_tip_distances(branch_lengths, tree, tree_index, tip_indices):
+    """Calculate the distance from the root to each tip, and 0 for other nodes.
+
+    The distances include the branch length of the root.
+
+    """
+    if not isinstance(tree, CompactTree):
+        return _tip_distances(branch_lengths, tree, tip_indices)
+    parent = tree_index["parent"]
+    root = parent < 0
+    lengths = np.where(root, 0.0, branch_lengths)
+    distances = _ancestor_sums(parent, lengths) + branch_lengths[root]
+    tip_distances = np.zeros_like(distances)
+    tip_distances[tip_indices] = distances[tip_indices]
+    return tip_distances
+
+
 def _weighted_unifrac_branch_correction(
     node_to_root_distances, u_node_proportions, v_node_proportions
 ):
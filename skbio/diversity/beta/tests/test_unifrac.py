@@ -12,7 +12,7 @@ from unittest import main, TestCase
 import numpy as np
 
 from skbio import TreeNode
-from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.tree import CompactTree, DuplicateNodeError, MissingNodeError
 from skbio.diversity.beta import unweighted_unifrac, weighted_unifrac
 from skbio.diversity.beta._unifrac import (_unweighted_unifrac,
                                            _weighted_unifrac,
@@ -169,6 +169,24 @@ class UnifracTests(TestCase):
         expected = 0.1818181818
         self.assertAlmostEqual(actual, expected)
 
+    def test_compact_tree(self):
+        # the root has a branch length, which counts toward the distances
+        # from the tips to the root in normalized weighted UniFrac
+        tree = TreeNode.read(
+            StringIO('(((((OTU1:0.5,OTU2:0.5):0.5,OTU3:1.0):1.0):0.0,(OTU4:'
+                     '0.75,(OTU5:0.25,(OTU6:0.5,OTU7:0.5):0.5):0.5):1.25):0.3'
+                     ')root:0.2;'))
+        ct = CompactTree.from_tree_node(tree)
+        for u in self.b1:
+            for v in self.b1:
+                for metric, kwargs in ((unweighted_unifrac, {}),
+                                       (weighted_unifrac, {}),
+                                       (weighted_unifrac,
+                                        {'normalized': True})):
+                    self.assertAlmostEqual(
+                        metric(u, v, self.oids1, ct, **kwargs),
+                        metric(u, v, self.oids1, tree, **kwargs))
+
     def test_unweighted_unifrac_identity(self):
         for i in range(len(self.b1)):
             actual = unweighted_unifrac(
@@ -21,7 +21,7 @@ from skbio.diversity import (alpha_diversity, beta_diversity,
                              get_beta_diversity_metrics)
 from skbio.diversity.alpha import faith_pd, phydiv, sobs
 from skbio.diversity.beta import unweighted_unifrac, weighted_unifrac
-from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.tree import CompactTree, DuplicateNodeError, MissingNodeError
 from skbio.diversity._driver import (_qualitative_beta_metrics,
                                      _valid_beta_metrics)
 
@@ -250,6 +250,14 @@ class AlphaDiversityTests(TestCase):
                                  otu_ids=self.oids2)
         assert_series_almost_equal(actual, expected)
 
+    def test_faith_pd_compact_tree(self):
+        expected = alpha_diversity('faith_pd', self.table1, tree=self.tree1,
+                                   otu_ids=self.oids1)
+        actual = alpha_diversity('faith_pd', self.table1,
+                                 tree=CompactTree.from_tree_node(self.tree1),
+                                 otu_ids=self.oids1)
+        assert_series_almost_equal(actual, expected)
+
     def test_phydiv(self):
         expected = []
         for e in self.table1:
@@ -621,6 +629,18 @@ class BetaDiversityTests(TestCase):
                 npt.assert_almost_equal(dm1[id1, id2],
                                         expected_dm[id1, id2], 6)
 
+    def test_unifrac_compact_tree(self):
+        ct = CompactTree.from_tree_node(self.tree1)
+        for metric, kwargs in (('unweighted_unifrac', {}),
+                               ('weighted_unifrac', {}),
+                               ('weighted_unifrac', {'normalized': True})):
+            expected = beta_diversity(metric, self.table1, self.sids1,
+                                      otu_ids=self.oids1, tree=self.tree1,
+                                      **kwargs)
+            actual = beta_diversity(metric, self.table1, self.sids1,
+                                    otu_ids=self.oids1, tree=ct, **kwargs)
+            npt.assert_almost_equal(actual.data, expected.data)
+
     def test_weighted_unifrac_normalized(self):
         # TODO: update npt.assert_almost_equal calls to use DistanceMatrix
         # near-equality testing when that support is available
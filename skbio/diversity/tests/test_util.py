@@ -19,7 +19,7 @@ from skbio.diversity._util import (_validate_counts_vector,
                                    _validate_otu_ids_and_tree,
                                    _vectorize_counts_and_tree,
                                    _quantitative_to_qualitative_counts)
-from skbio.tree import DuplicateNodeError, MissingNodeError
+from skbio.tree import CompactTree, DuplicateNodeError, MissingNodeError
 
 
 class ValidationTests(TestCase):
@@ -243,6 +243,24 @@ class ValidationTests(TestCase):
         self.assertRaises(ValueError, _validate_otu_ids_and_tree, counts,
                           otu_ids, t)
 
+    def test_validate_otu_ids_and_tree_compact_tree(self):
+        otu_ids = ['OTU1', 'OTU2', 'OTU3']
+        t = CompactTree.from_tree_node(TreeNode.read(
+            io.StringIO('((OTU1:0.5,OTU2:0.5):0.5,OTU3:1.0)root;')))
+        self.assertIsNone(_validate_otu_ids_and_tree([1, 1, 1], otu_ids, t))
+
+        for newick, error, message in (
+                ('((OTU1:0.5,OTU2:0.5):0.5,OTU1:1.0)root;',
+                 DuplicateNodeError, 'unique'),
+                ('((OTU1:0.5,OTU2:0.5),OTU3:1.0)root;',
+                 ValueError, 'branch length'),
+                ('(OTU1:0.5,OTU2:0.5,OTU3:1.0)root;', ValueError, 'rooted'),
+                ('root;', ValueError, 'more than just a root'),
+                ('(OTU1:0.5,OTU2:0.5)root;', MissingNodeError, 'OTU3')):
+            t = CompactTree.from_tree_node(TreeNode.read(io.StringIO(newick)))
+            with self.assertRaisesRegex(error, message):
+                _validate_otu_ids_and_tree([1, 1, 1], otu_ids, t)
+
     def test_vectorize_counts_and_tree(self):
         t = TreeNode.read(io.StringIO("((a:1, b:2)c:3)root;"))
         counts = np.array([[0, 1], [1, 5], [10, 1]])
@@ -15,14 +15,18 @@ see the associated documentation.
    :toctree: generated/
 
    binary_dm
+   binary_seq
+   binary_tree
    blast6
    blast7
    clustal
    embl
+   fai
    fasta
    fastq
    genbank
    gff3
+   gfi
    lsmat
    newick
    ordination
@@ -58,6 +62,8 @@ User exceptions and warnings
    UnrecognizedFormatError
    IOSourceError
    FileFormatError
+   BinarySeqFormatError
+   BinaryTreeFormatError
    BLAST7FormatError
    ClustalFormatError
    EMBLFormatError
@@ -200,12 +206,12 @@ not know how you want to serialize an object. OO interfaces define a default
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
-from importlib import import_module
-
 from ._warning import FormatIdentificationWarning, ArgumentOverrideWarning
 from ._exception import (
     UnrecognizedFormatError,
     FileFormatError,
+    BinarySeqFormatError,
+    BinaryTreeFormatError,
     BLAST7FormatError,
     ClustalFormatError,
     FASTAFormatError,
@@ -237,6 +243,8 @@ __all__ = [
     "UnrecognizedFormatError",
     "IOSourceError",
     "FileFormatError",
+    "BinarySeqFormatError",
+    "BinaryTreeFormatError",
     "BLAST7FormatError",
     "ClustalFormatError",
     "EMBLFormatError",
@@ -254,31 +262,33 @@ __all__ = [
 ]
 
 
-# Necessary to import each file format module to have them added to the I/O
-# registry. We use import_module instead of a typical import to avoid flake8
-# unused import errors.
-import_module("skbio.io.format.blast6")
-import_module("skbio.io.format.blast7")
-import_module("skbio.io.format.clustal")
-import_module("skbio.io.format.embl")
-import_module("skbio.io.format.fasta")
-import_module("skbio.io.format.fastq")
-import_module("skbio.io.format.lsmat")
-import_module("skbio.io.format.newick")
-import_module("skbio.io.format.ordination")
-import_module("skbio.io.format.phylip")
-import_module("skbio.io.format.qseq")
-import_module("skbio.io.format.genbank")
-import_module("skbio.io.format.gff3")
-import_module("skbio.io.format.stockholm")
-import_module("skbio.io.format.binary_dm")
-import_module("skbio.io.format.taxdump")
-import_module("skbio.io.format.sample_metadata")
-
-# This is meant to be a handy indicator to the user that they have done
-# something wrong.
-import_module("skbio.io.format.emptyfile")
-
-# Now that all of our I/O has loaded, we can add the object oriented methods
-# (read and write) to each class which has registered I/O operations.
-io_registry.monkey_patch()
+# Each file format module must be imported to have its format added to the I/O
+# registry. The modules are imported, and the `read` and `write` methods added
+# to the classes their formats support, on first use of the registry or of
+# these methods, as importing them (and the classes) is slow.
+io_registry._defer_formats(
+    {
+        "blast+6": "skbio.io.format.blast6",
+        "blast+7": "skbio.io.format.blast7",
+        "clustal": "skbio.io.format.clustal",
+        "embl": "skbio.io.format.embl",
+        "fai": "skbio.io.format.fai",
+        "fasta": "skbio.io.format.fasta",
+        "fastq": "skbio.io.format.fastq",
+        "lsmat": "skbio.io.format.lsmat",
+        "newick": "skbio.io.format.newick",
+        "ordination": "skbio.io.format.ordination",
+        "phylip": "skbio.io.format.phylip",
+        "qseq": "skbio.io.format.qseq",
+        "genbank": "skbio.io.format.genbank",
+        "gff3": "skbio.io.format.gff3",
+        "gfi": "skbio.io.format.gfi",
+        "stockholm": "skbio.io.format.stockholm",
+        "binary_dm": "skbio.io.format.binary_dm",
+        "binary_seq": "skbio.io.format.binary_seq",
+        "binary_tree": "skbio.io.format.binary_tree",
+        "taxdump": "skbio.io.format.taxdump",
+        "sample_metadata": "skbio.io.format.sample_metadata",
+        "<emptyfile>": "skbio.io.format.emptyfile",
+    }
+)
@@ -0,0 +1,391 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+"""Blocked GNU Zip Format (BGZF) file objects.
+
+BGZF files are a series of independent gzip members ("blocks"), each holding
+at most 64 KiB of uncompressed data and recording its own compressed size in a
+``BC`` extra subfield. They are valid gzip files, but because every block can
+be inflated on its own, blocks can be (de)compressed concurrently and a
+position in the file can be addressed by a *virtual offset*: the compressed
+offset of a block shifted left 16 bits, combined with an offset within the
+uncompressed block. This is the layout produced by ``bgzip`` and used by
+``samtools``, tabix and BAM files.
+
+"""
+
+import io
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from gzip import BadGzipFile
+
+
+# Uncompressed data per block, as used by htslib. This leaves room for the
+# deflate overhead of incompressible data within the 64 KiB block limit.
+_BLOCK_SIZE = 0xFF00
+_HEADER_SIZE = 18
+_MAGIC = b"\x1f\x8b\x08\x04"
+_EOF_BLOCK = (
+    b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00\x42\x43\x02\x00"
+    b"\x1b\x00\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00"
+)
+
+
+def _default_threads():
+    return os.cpu_count() or 1
+
+
+def is_bgzf(head):
+    """Check whether the leading bytes of a file look like a BGZF block."""
+    return head[:4] == _MAGIC and head[12:16] == b"BC\x02\x00"
+
+
+def _read_raw_block(fileobj):
+    """Read one complete compressed block, or None at the end of the file."""
+    header = fileobj.read(12)
+    if not header:
+        return None
+    if len(header) < 12 or header[:4] != _MAGIC:
+        raise BadGzipFile("Not a BGZF block: invalid gzip header.")
+    xlen = int.from_bytes(header[10:12], "little")
+    extra = fileobj.read(xlen)
+    bsize = _block_size(extra)
+    rest = bsize - 12 - xlen
+    data = fileobj.read(rest)
+    if len(data) != rest:
+        raise BadGzipFile("BGZF block is truncated.")
+    return header + extra + data
+
+
+def _block_size(extra):
+    i = 0
+    while i + 4 <= len(extra):
+        slen = int.from_bytes(extra[i + 2 : i + 4], "little")
+        if extra[i : i + 2] == b"BC" and slen == 2:
+            return int.from_bytes(extra[i + 4 : i + 6], "little") + 1
+        i += 4 + slen
+    raise BadGzipFile("Not a BGZF block: missing BC extra subfield.")
+
+
+def _inflate_block(block):
+    xlen = int.from_bytes(block[10:12], "little")
+    data = zlib.decompress(block[12 + xlen : -8], -15)
+    crc, isize = struct.unpack("<II", block[-8:])
+    if len(data) != isize:
+        raise BadGzipFile("BGZF block has an incorrect length.")
+    if zlib.crc32(data) != crc:
+        raise BadGzipFile("BGZF block failed its CRC check.")
+    return data
+
+
+def _deflate_block(data, compresslevel):
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    cdata = compressor.compress(data) + compressor.flush()
+    bsize = _HEADER_SIZE + len(cdata) + 8
+    return b"".join(
+        [
+            _MAGIC,
+            b"\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00",
+            struct.pack("<H", bsize - 1),
+            cdata,
+            struct.pack("<II", zlib.crc32(data), len(data)),
+        ]
+    )
+
+
+class _BgzfMixin:
+    def _init_pool(self, threads):
+        if threads is None:
+            threads = _default_threads()
+        self._threads = max(int(threads), 1)
+        self._executor = None
+
+    def _submit(self, fn, *args):
+        if self._threads == 1:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._threads)
+        return self._executor.submit(fn, *args)
+
+    def _shutdown_pool(self, pending):
+        # the pending blocks are cancelled here, as `cancel_futures` of
+        # `Executor.shutdown` requires Python 3.9
+        for future in pending:
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+class BgzfReader(_BgzfMixin, io.RawIOBase):
+    """Decompress a BGZF file, inflating blocks ahead of time in threads.
+
+    Offsets given to ``seek`` and returned by ``tell`` are positions in the
+    uncompressed stream. Blocks are located by scanning their headers, so
+    seeking does not decompress anything but the block containing the target.
+    ``virtual_to_offset`` and ``offset_to_virtual`` convert between these
+    positions and BGZF virtual offsets, such as those stored by tabix or BAM
+    indices.
+
+    """
+
+    def __init__(self, fileobj, threads=None):
+        super(BgzfReader, self).__init__()
+        self._fileobj = fileobj
+        self._init_pool(threads)
+        self._readahead = 2 * self._threads
+
+        start = fileobj.tell() if fileobj.seekable() else 0
+        # Compressed and uncompressed start of every non-empty block found so
+        # far, and the point up to which the file has been mapped.
+        self._blocks_c = []
+        self._blocks_u = []
+        self._map_c = start
+        self._map_u = 0
+        self._map_done = False
+
+        self._buffer = b""
+        self._buffer_pos = 0
+        self._block_c = start
+        self._block_u = 0
+        self._pending = deque()
+        self._next_c = start
+        self._next_u = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return self._fileobj.seekable()
+
+    def close(self):
+        if not self.closed:
+            self._shutdown_pool([future for _, _, future in self._pending])
+            self._pending.clear()
+        super(BgzfReader, self).close()
+
+    def _fetch(self):
+        """Read the next compressed block and queue it for decompression."""
+        coffset = self._next_c
+        block = _read_raw_block(self._fileobj)
+        if block is None:
+            if coffset == self._map_c:
+                self._map_done = True
+            return False
+        isize = int.from_bytes(block[-4:], "little")
+        uoffset = self._next_u
+        self._add_to_map(coffset, uoffset, len(block), isize)
+        self._next_c += len(block)
+        self._next_u += isize
+        self._pending.append((coffset, uoffset, self._submit(_inflate_block, block)))
+        return True
+
+    def _add_to_map(self, coffset, uoffset, bsize, isize):
+        if coffset == self._map_c:
+            if isize:
+                self._blocks_c.append(coffset)
+                self._blocks_u.append(uoffset)
+            self._map_c += bsize
+            self._map_u += isize
+
+    def _next_block(self):
+        while len(self._pending) < self._readahead and self._fetch():
+            pass
+        if not self._pending:
+            return False
+        self._block_c, self._block_u, future = self._pending.popleft()
+        self._buffer = future.result()
+        self._buffer_pos = 0
+        return True
+
+    def readinto(self, b):
+        while self._buffer_pos >= len(self._buffer):
+            if not self._next_block():
+                return 0
+        n = min(len(b), len(self._buffer) - self._buffer_pos)
+        b[:n] = self._buffer[self._buffer_pos : self._buffer_pos + n]
+        self._buffer_pos += n
+        return n
+
+    def tell(self):
+        return self._block_u + self._buffer_pos
+
+    def _scan_to(self, uoffset=None, coffset=None):
+        """Extend the block map until it covers the given offsets."""
+        fileobj = self._fileobj
+        position = None
+        while not self._map_done and (
+            (uoffset is not None and self._map_u <= uoffset)
+            or (coffset is not None and self._map_c <= coffset)
+        ):
+            if position is None:
+                position = fileobj.tell()
+            fileobj.seek(self._map_c)
+            header = fileobj.read(12)
+            if not header:
+                self._map_done = True
+                break
+            if len(header) < 12 or header[:4] != _MAGIC:
+                raise BadGzipFile("Not a BGZF block: invalid gzip header.")
+            bsize = _block_size(fileobj.read(int.from_bytes(header[10:12], "little")))
+            fileobj.seek(self._map_c + bsize - 4)
+            isize = fileobj.read(4)
+            if len(isize) != 4:
+                raise BadGzipFile("BGZF block is truncated.")
+            self._add_to_map(
+                self._map_c, self._map_u, bsize, int.from_bytes(isize, "little")
+            )
+        if position is not None:
+            fileobj.seek(position)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence == io.SEEK_END:
+            self._scan_to(uoffset=float("inf"))
+            offset += self._map_u
+        elif whence != io.SEEK_SET:
+            raise ValueError("Invalid whence (%r)" % whence)
+        if offset < 0:
+            raise ValueError("Negative seek position %d" % offset)
+
+        if self._block_u <= offset < self._block_u + len(self._buffer):
+            self._buffer_pos = offset - self._block_u
+            return offset
+
+        self._scan_to(uoffset=offset)
+        i = bisect_right(self._blocks_u, offset) - 1
+        if i < 0 or offset >= self._map_u:
+            # Past the end of the data: reads will return nothing.
+            self._reset(self._map_c, self._map_u)
+            self._block_u = offset
+            return offset
+        self._reset(self._blocks_c[i], self._blocks_u[i])
+        self._next_block()
+        self._buffer_pos = offset - self._block_u
+        return offset
+
+    def _reset(self, coffset, uoffset):
+        for _, _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._buffer = b""
+        self._buffer_pos = 0
+        self._block_c = self._next_c = coffset
+        self._block_u = self._next_u = uoffset
+        self._fileobj.seek(coffset)
+
+    def virtual_to_offset(self, voffset):
+        """Convert a BGZF virtual offset to an uncompressed offset."""
+        coffset, within = voffset >> 16, voffset & 0xFFFF
+        self._scan_to(coffset=coffset)
+        i = bisect_right(self._blocks_c, coffset) - 1
+        if i >= 0 and self._blocks_c[i] == coffset:
+            return self._blocks_u[i] + within
+        if coffset == self._map_c and self._map_done and within == 0:
+            return self._map_u
+        raise ValueError(
+            "Virtual offset %d does not point to the start of a block." % voffset
+        )
+
+    def offset_to_virtual(self, offset):
+        """Convert an uncompressed offset to a BGZF virtual offset."""
+        self._scan_to(uoffset=offset)
+        i = bisect_right(self._blocks_u, offset) - 1
+        if i < 0 or offset >= self._map_u:
+            if offset == self._map_u:
+                return self._map_c << 16
+            raise ValueError("Offset %d is past the end of the file." % offset)
+        return (self._blocks_c[i] << 16) | (offset - self._blocks_u[i])
+
+    def seek_virtual(self, voffset):
+        """Seek to a BGZF virtual offset."""
+        return self.seek(self.virtual_to_offset(voffset))
+
+    def tell_virtual(self):
+        """Return the current position as a BGZF virtual offset."""
+        return self.offset_to_virtual(self.tell())
+
+
+class BgzfWriter(_BgzfMixin, io.RawIOBase):
+    """Compress data into BGZF blocks, deflating blocks in threads.
+
+    Closing the writer writes any remaining data and the BGZF end-of-file
+    marker, but does not close the underlying file.
+
+    """
+
+    def __init__(self, fileobj, compresslevel=9, threads=None):
+        super(BgzfWriter, self).__init__()
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._init_pool(threads)
+        self._queue_size = 2 * self._threads
+        self._data = bytearray()
+        self._pending = deque()
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        if self.closed:
+            raise ValueError("write to closed file")
+        self._data += b
+        n = len(self._data) // _BLOCK_SIZE * _BLOCK_SIZE
+        for i in range(0, n, _BLOCK_SIZE):
+            self._queue(bytes(self._data[i : i + _BLOCK_SIZE]))
+        del self._data[:n]
+        self._size += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._size
+
+    def _queue(self, data):
+        self._pending.append(
+            self._submit(_deflate_block, data, self._compresslevel)
+        )
+        while len(self._pending) > self._queue_size:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def _drain(self):
+        while self._pending:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def flush(self):
+        if self.closed:
+            return
+        # A partial block is only written on close, so that flushing does not
+        # produce many small blocks.
+        self._drain()
+        self._fileobj.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._data:
+                self._queue(bytes(self._data))
+                self._data.clear()
+            self._drain()
+            self._fileobj.write(_EOF_BLOCK)
+            self._fileobj.flush()
+        finally:
+            self._shutdown_pool(self._pending)
+            self._pending.clear()
+            super(BgzfWriter, self).close()
@@ -43,6 +43,18 @@ class GFF3FormatError(FileFormatError):
     pass
 
 
+class BinarySeqFormatError(FileFormatError):
+    """Raised when a ``binary_seq`` formatted file cannot be parsed."""
+
+    pass
+
+
+class BinaryTreeFormatError(FileFormatError):
+    """Raised when a ``binary_tree`` formatted file cannot be parsed."""
+
+    pass
+
+
 class BLAST7FormatError(FileFormatError):
     """Raised when a ``blast7`` formatted file cannot be parsed."""
 
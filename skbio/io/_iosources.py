@@ -11,11 +11,13 @@ import gzip
 import bz2
 import tempfile
 import itertools
-
-import requests
+from urllib.parse import urlparse
 
 from skbio.io import IOSourceError
+from ._bgzf import BgzfReader, BgzfWriter, is_bgzf
 from ._fileobject import (
+    CompressedBufferedReader,
+    CompressedBufferedWriter,
     IterableStringWriterIO,
     IterableStringReaderIO,
     WrappedBufferedRandom,
@@ -44,7 +46,8 @@ def get_io_sources():
 
 
 def _compressors():
-    return (GzipCompressor, BZ2Compressor)
+    # BGZF files are also gzip files, so they must be recognized first
+    return (BgzfCompressor, GzipCompressor, BZ2Compressor)
 
 
 def get_compression_handler(name):
@@ -53,6 +56,63 @@ def get_compression_handler(name):
     return compressors.get(name, False)
 
 
+def unwrap_file(file):
+    """Return the file handle that a handle opened without compression wraps.
+
+    Parameters
+    ----------
+    file : filehandle
+        A binary file handle, such as those passed to readers and writers.
+
+    Returns
+    -------
+    filehandle
+        The handle wrapped by `file` if `file` was opened by the I/O registry
+        and does not (de)compress its contents, otherwise `file` itself.
+
+    Notes
+    -----
+    The I/O registry wraps the handles it opens into one that also closes
+    them, which is not what file-like objects meant for other libraries (such
+    as ``h5py``) expect.
+
+    """
+    if isinstance(file, (CompressedBufferedReader, CompressedBufferedWriter)):
+        if file.raw is file._before_file:
+            return file.raw
+    return file
+
+
+def get_file_path(file):
+    """Return the path of the file on disk that a file handle reads or writes.
+
+    Parameters
+    ----------
+    file : filehandle
+        A file handle, such as those passed to readers and writers.
+
+    Returns
+    -------
+    str or None
+        Path of the file, or None if `file` is not backed by a file on disk.
+
+    Notes
+    -----
+    Text decoding and (de)compression wrapped around the file by the I/O
+    registry are looked through, so the path is that of the file as stored on
+    disk (e.g., of a gzip-compressed file rather than of its contents).
+
+    """
+    if isinstance(file, io.TextIOWrapper):
+        file = file.buffer
+    if isinstance(file, (CompressedBufferedReader, CompressedBufferedWriter)):
+        file = file._before_file
+    if isinstance(getattr(file, "raw", None), io.FileIO):
+        if isinstance(file.name, str):
+            return file.name
+    return None
+
+
 class IOSource:
     closeable = True
 
@@ -97,11 +157,14 @@ class FilePathSource(IOSource):
 
 class HTTPSource(IOSource):
     def can_read(self):
-        return isinstance(self.file, str) and requests.compat.urlparse(
+        return isinstance(self.file, str) and urlparse(
             self.file
         ).scheme in {"http", "https"}
 
     def get_reader(self):
+        # requests is slow to import and rarely needed.
+        import requests
+
         req = requests.get(self.file)
 
         # if the response is not 200, an exception will be raised
@@ -210,7 +273,8 @@ class IterableSource(IOSource):
 
 class GzipCompressor(Compressor):
     name = "gzip"
-    streamable = True
+    # The gzip trailer is only written on close
+    streamable = False
 
     def can_read(self):
         return self.file.peek(2)[:2] == b"\x1f\x8b"
@@ -224,6 +288,21 @@ class GzipCompressor(Compressor):
         )
 
 
+class BgzfCompressor(Compressor):
+    name = "bgzf"
+    # The last block and the end-of-file marker are only written on close
+    streamable = False
+
+    def can_read(self):
+        return is_bgzf(self.file.peek(16)[:16])
+
+    def get_reader(self):
+        return BgzfReader(self.file)
+
+    def get_writer(self):
+        return BgzfWriter(self.file, compresslevel=self.options["compresslevel"])
+
+
 class BZ2Compressor(Compressor):
     name = "bz2"
     streamable = False
@@ -16,20 +16,25 @@ from skbio.util import cardinal_to_ordinal
 _whitespace_regex = re.compile(r"\s")
 _newline_regex = re.compile(r"\n")
 
+# Approximate number of sequence characters formatted per write by the
+# FASTA-like writers.
+_write_buffer_size = 1 << 22
+
+
+_decode_errors = [
+    "Must provide either `variant` or `phred_offset` in order to decode "
+    "quality scores.",
+    "Decoding Solexa quality scores is not currently supported, "
+    "as quality scores are always stored as Phred scores in "
+    "scikit-bio. Please see the following scikit-bio issue to "
+    "track progress on this:\n\t"
+    "https://github.com/scikit-bio/scikit-bio/issues/719",
+]
+
 
 def _decode_qual_to_phred(qual_str, variant=None, phred_offset=None):
     phred_offset, phred_range = _get_phred_offset_and_range(
-        variant,
-        phred_offset,
-        [
-            "Must provide either `variant` or `phred_offset` in order to decode "
-            "quality scores.",
-            "Decoding Solexa quality scores is not currently supported, "
-            "as quality scores are always stored as Phred scores in "
-            "scikit-bio. Please see the following scikit-bio issue to "
-            "track progress on this:\n\t"
-            "https://github.com/scikit-bio/scikit-bio/issues/719",
-        ],
+        variant, phred_offset, _decode_errors
     )
     qual = np.frombuffer(qual_str.encode("ascii"), dtype=np.uint8) - phred_offset
 
@@ -42,36 +47,103 @@ def _decode_qual_to_phred(qual_str, variant=None, phred_offset=None):
     return qual
 
 
+def _decode_qual_block_to_phred(qual_strs, variant=None, phred_offset=None):
+    # Decode a block of quality strings with a single subtraction and range
+    # check. Returns the decoded scores (views into one shared array) for the
+    # strings preceding the first invalid one, the error that decoding that
+    # string on its own would have raised (or None), and the number of valid
+    # strings, so that callers can hand out valid records before raising.
+    phred_offset, phred_range = _get_phred_offset_and_range(
+        variant, phred_offset, _decode_errors
+    )
+    ends = np.cumsum([len(q) for q in qual_strs], dtype=np.intp)
+    block = "".join(qual_strs)
+
+    error = None
+    try:
+        raw = block.encode("ascii")
+    except UnicodeEncodeError as e:
+        error, first_bad = e, e.start
+        raw = block[:first_bad].encode("ascii")
+    qual = np.frombuffer(raw, dtype=np.uint8) - phred_offset
+
+    out_of_range = (qual > phred_range[1]) | (qual < phred_range[0])
+    if out_of_range.any():
+        error = ValueError(
+            "Decoded Phred score is out of range [%d, %d]."
+            % (phred_range[0], phred_range[1])
+        )
+        first_bad = out_of_range.argmax()
+
+    n_valid = len(qual_strs)
+    if error is not None:
+        n_valid = int(np.searchsorted(ends, first_bad, side="right"))
+        if isinstance(error, UnicodeEncodeError):
+            # re-raise with the offending string itself as the subject, as
+            # encoding it alone would have
+            try:
+                qual_strs[n_valid].encode("ascii")
+            except UnicodeEncodeError as e:
+                error = e
+
+    ends = ends[:n_valid].tolist()
+    scores = [qual[s:e] for s, e in zip([0] + ends[:-1], ends)]
+    return scores, error, n_valid
+
+
+_encode_errors = [
+    "Must provide either `variant` or `phred_offset` in order to encode "
+    "Phred scores.",
+    "Encoding Solexa quality scores is not currently supported. "
+    "Please see the following scikit-bio issue to track progress "
+    "on this:\n\t"
+    "https://github.com/scikit-bio/scikit-bio/issues/719",
+]
+
+
 def _encode_phred_to_qual(phred, variant=None, phred_offset=None):
     phred_offset, phred_range = _get_phred_offset_and_range(
-        variant,
-        phred_offset,
-        [
-            "Must provide either `variant` or `phred_offset` in order to encode "
-            "Phred scores.",
-            "Encoding Solexa quality scores is not currently supported. "
-            "Please see the following scikit-bio issue to track progress "
-            "on this:\n\t"
-            "https://github.com/scikit-bio/scikit-bio/issues/719",
-        ],
+        variant, phred_offset, _encode_errors
     )
+    return _encode_phred_array(np.asarray(phred), phred_offset, phred_range)
 
-    qual_chars = []
-    for score in phred:
-        if score < phred_range[0]:
-            raise ValueError(
-                "Phred score %d is out of range [%d, %d]."
-                % (score, phred_range[0], phred_range[1])
-            )
-        if score > phred_range[1]:
+
+def _encode_phred_block_to_qual(phreds, variant=None, phred_offset=None):
+    # Encode the Phred scores of many records with a single clip and offset,
+    # returning one quality string per record.
+    phred_offset, phred_range = _get_phred_offset_and_range(
+        variant, phred_offset, _encode_errors
+    )
+    if not phreds:
+        return []
+    ends = np.cumsum([len(p) for p in phreds]).tolist()
+    qual = _encode_phred_array(np.concatenate(phreds), phred_offset, phred_range)
+    return [qual[s:e] for s, e in zip([0] + ends[:-1], ends)]
+
+
+def _encode_phred_array(phred, phred_offset, phred_range):
+    # Scores are checked in order: out-of-range high scores preceding the
+    # first score below the range are clipped with a warning, and that score
+    # raises an error.
+    too_low = phred < phred_range[0]
+    stop = int(too_low.argmax()) if too_low.any() else phred.size
+
+    too_high = phred[:stop] > phred_range[1]
+    if too_high.any():
+        for score in phred[:stop][too_high]:
             warnings.warn(
                 "Phred score %d is out of targeted range [%d, %d]. Converting "
                 "to %d." % (score, phred_range[0], phred_range[1], phred_range[1]),
                 UserWarning,
             )
-            score = phred_range[1]
-        qual_chars.append(chr(score + phred_offset))
-    return "".join(qual_chars)
+    if stop < phred.size:
+        raise ValueError(
+            "Phred score %d is out of range [%d, %d]."
+            % (phred[stop], phred_range[0], phred_range[1])
+        )
+
+    qual = np.minimum(phred, phred_range[1]).astype(np.uint8) + phred_offset
+    return qual.tobytes().decode("ascii")
 
 
 def _get_phred_offset_and_range(variant, phred_offset, errors):
@@ -196,16 +268,20 @@ def _format_fasta_like_records(
         else:
             header = id_
 
-        if require_qual and "quality" not in seq.positional_metadata:
+        # check for positional metadata first so that an empty data frame is
+        # not created for every sequence without it
+        qual = None
+        if seq.has_positional_metadata():
+            positional_metadata = seq.positional_metadata
+            if "quality" in positional_metadata.columns:
+                qual = positional_metadata["quality"].values
+
+        if require_qual and qual is None:
             raise ValueError(
                 "Cannot write %s sequence because it does not have quality "
                 "scores associated with it." % cardinal_to_ordinal(idx + 1)
             )
 
-        qual = None
-        if "quality" in seq.positional_metadata:
-            qual = seq.positional_metadata["quality"].values
-
         if lowercase is not None:
             seq_str = seq.lowercase(lowercase)
         else:
@@ -213,6 +289,62 @@ def _format_fasta_like_records(
         yield header, "%s" % seq_str, qual
 
 
+def _batch_fasta_like_records(records, buffer_size=None):
+    """Group formatted records into lists holding about `buffer_size` chars.
+
+    Writers format and write each batch at once, so that a file handle sees a
+    few large writes instead of several small ones per record. If a record
+    cannot be formatted, the records formatted before it are yielded before
+    the error is raised.
+
+    """
+    if buffer_size is None:
+        buffer_size = _write_buffer_size
+    batch = []
+    size = 0
+    try:
+        for record in records:
+            batch.append(record)
+            size += len(record[1])
+            if size >= buffer_size:
+                yield batch
+                batch = []
+                size = 0
+    except Exception:
+        # the records preceding an invalid one are still written, as they
+        # were when each record was written on its own
+        if batch:
+            yield batch
+        raise
+    if batch:
+        yield batch
+
+
+def _wrap_lines(strs, width):
+    """Split each string into lines of at most `width` characters.
+
+    Every line, including the last line of each string, is terminated by a
+    newline. The strings must be ASCII and non-empty. Newline positions for the
+    whole batch are computed at once and inserted into a single buffer.
+
+    """
+    lengths = np.fromiter(map(len, strs), dtype=np.intp, count=len(strs))
+    n_lines = -(-lengths // width)
+    starts = np.cumsum(lengths) - lengths
+
+    # position of the end of each line, relative to the start of its string
+    first_line = np.cumsum(n_lines) - n_lines
+    line_idx = np.arange(n_lines.sum()) - np.repeat(first_line, n_lines)
+    line_ends = np.minimum((line_idx + 1) * width, np.repeat(lengths, n_lines))
+
+    data = np.frombuffer("".join(strs).encode("ascii"), dtype=np.uint8)
+    wrapped = np.insert(data, np.repeat(starts, n_lines) + line_ends, ord("\n"))
+    wrapped = wrapped.tobytes().decode("ascii")
+
+    ends = np.cumsum(lengths + n_lines).tolist()
+    return [wrapped[s:e] for s, e in zip([0] + ends[:-1], ends)]
+
+
 def _line_generator(fh, skip_blanks=False, strip=True):
     for line in fh:
         if strip:
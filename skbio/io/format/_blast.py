@@ -9,6 +9,7 @@
 import functools
 import contextlib
 
+import numpy as np
 import pandas as pd
 
 _possible_columns = {
@@ -59,7 +60,97 @@ _possible_columns = {
 }
 
 
-def _parse_blast_data(fh, columns, error, error_message, comment=None, skiprows=None):
+# Compact dtypes of the columns, used with `compact=True`. Whole numbers are
+# stored as nullable integers instead of floats, and identifiers and names,
+# which repeat across rows, as categoricals. E-values keep double precision
+# because single precision cannot represent values below about 1e-38.
+_compact_columns = {
+    column: "category"
+    for column, type_ in _possible_columns.items()
+    if type_ is str and column not in ("qseq", "sseq")
+}
+_compact_columns.update(
+    (column, "Int32")
+    for column in (
+        "qlen",
+        "slen",
+        "qstart",
+        "qend",
+        "sstart",
+        "send",
+        "score",
+        "length",
+        "nident",
+        "mismatch",
+        "positive",
+        "gapopen",
+        "gaps",
+        "qframe",
+        "sframe",
+        "qcovs",
+        "qcovhsp",
+    )
+)
+_compact_columns.update((column, "Int64") for column in ("qgi", "sgi", "sallgi"))
+_compact_columns.update(
+    (column, "float32") for column in ("pident", "ppos", "bitscore")
+)
+
+# Columns identifying the query of a hit, in order of preference.
+_query_columns = ("qseqid", "qaccver", "qacc")
+
+
+def _parse_blast_data(
+    fh,
+    columns,
+    error,
+    error_message,
+    comment=None,
+    skiprows=None,
+    usecols=None,
+    compact=False,
+    chunksize=None,
+    best_hits=False,
+):
+    """Parse tabular BLAST data into a data frame or a generator of them.
+
+    Returns a generator of data frames of at most `chunksize` rows if
+    `chunksize` is provided, and a single data frame otherwise.
+
+    """
+    if usecols is not None:
+        for column in usecols:
+            if column not in columns:
+                raise ValueError(
+                    "Column %r in `usecols` is not in the file. Columns in the"
+                    " file: %r" % (column, columns)
+                )
+        # keep the order of the file, as pandas does
+        usecols = [column for column in columns if column in usecols]
+    selected = columns if usecols is None else usecols
+    dtype = {column: _possible_columns[column] for column in selected}
+    # Converting parsed columns is much faster than having pandas parse into
+    # nullable integers. Only categories are parsed directly.
+    converted = {}
+    if compact:
+        converted = {
+            column: _compact_columns[column]
+            for column in selected
+            if column in _compact_columns
+        }
+        if not best_hits:
+            # categories would differ between chunks whose best hits are merged
+            for column, type_ in converted.items():
+                if type_ == "category":
+                    dtype[column] = type_
+    if best_hits:
+        query = next((column for column in _query_columns if column in selected), None)
+        if query is None or "bitscore" not in selected:
+            raise ValueError(
+                "Selecting the best hits requires a query ID column (one of %r)"
+                " and the `bitscore` column." % (_query_columns,)
+            )
+
     read_csv = functools.partial(
         pd.read_csv,
         na_values="N/A",
@@ -81,7 +172,51 @@ def _parse_blast_data(fh, columns, error, error_message, comment=None, skiprows=
 
         fh.seek(0)
 
-        return read_csv(fh, names=columns, dtype=_possible_columns)
+        read_csv = functools.partial(
+            read_csv, names=columns, usecols=usecols, dtype=dtype
+        )
+        if best_hits:
+            chunks = read_csv(fh, chunksize=chunksize or _chunksize)
+            return _best_hits(chunks, query).astype(converted)
+        if chunksize is None:
+            return read_csv(fh).astype(converted)
+    return _iter_blast_data(fh, read_csv, converted, chunksize)
+
+
+# Number of rows parsed at a time by default when reading in chunks.
+_chunksize = 1 << 16
+
+
+def _iter_blast_data(fh, read_csv, converted, chunksize):
+    with _noop_close(fh) as fh:
+        for chunk in read_csv(fh, chunksize=chunksize):
+            yield chunk.astype(converted)
+
+
+def _best_hits(chunks, query):
+    """Select the hit with the highest bit score of each query.
+
+    Only the best hits found so far are kept while going through `chunks`.
+    Ties are resolved in favor of the hit found first. The hits keep their row
+    numbers in the file and are ordered by query in order of appearance.
+
+    """
+    best = None
+    for chunk in chunks:
+        if best is not None:
+            chunk = pd.concat([best, chunk])
+        # Sort by query, in order of appearance, then by decreasing score, and
+        # take the first row of each query. The sort is stable to keep ties
+        # in order.
+        queries, _ = pd.factorize(chunk[query], use_na_sentinel=False)
+        scores = chunk["bitscore"].to_numpy(dtype=float, na_value=-np.inf)
+        order = np.lexsort((-scores, queries))
+        queries = queries[order]
+        first = np.empty(len(order), dtype=bool)
+        first[:1] = True
+        np.not_equal(queries[1:], queries[:-1], out=first[1:])
+        best = chunk.iloc[order[first]]
+    return best
 
 
 # HACK for https://github.com/pandas-dev/pandas/issues/14418
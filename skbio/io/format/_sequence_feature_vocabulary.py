@@ -43,6 +43,24 @@ def _vocabulary_skip(format="insdc"):
     return [k for k, v in skip.items() if format in v]
 
 
+def _selected_sections(sections):
+    """Return the headers of the sections a reader should parse.
+
+    ``None`` means every section. ``LOCUS`` is always parsed, as it holds the
+    length and molecule type of a record.
+
+    """
+    if sections is None:
+        return None
+    if isinstance(sections, str):
+        sections = [sections]
+    selected = frozenset(["LOCUS", *sections])
+    if "FEATURES" in selected and "ORIGIN" not in selected:
+        # The sequence gives the upper bound of the interval metadata.
+        raise ValueError("The FEATURES section cannot be read without ORIGIN.")
+    return selected
+
+
 def _yield_section(is_another_section, **kwargs):
     """Return function that returns successive sections from file.
 
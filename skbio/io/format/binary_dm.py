@@ -59,6 +59,31 @@ Required attributes:
    distance matrix, such as when calculating within and between distances for a
    subset of samples in a large matrix.
 
+Format Parameters
+-----------------
+When reading, ``lazy=True`` returns a matrix that keeps the HDF5 file open
+and reads values from it on demand instead of loading the whole matrix into
+memory. Looking up rows or elements by ID (e.g., ``dm['a']`` or
+``dm['a', 'b']``), numpy slicing of rows, ``filter``, ``within``, ``between``,
+``condensed_form`` and ``to_series`` read only the rows they need (in the case
+of ``filter``, ``within`` and ``between``, only the rows of the requested
+IDs). Any other use of the matrix, such as accessing its ``data`` attribute,
+loads the entire matrix into memory on first access. The file stays open until
+the matrix's ``close`` method is called, which a ``with`` block does on exit::
+
+    with DistanceMatrix.read('dm.h5', format='binary_dm', lazy=True) as dm:
+        subset = dm.filter(['a', 'b'])
+
+Values that were not loaded before closing can no longer be read. The values
+are not validated when reading lazily (e.g., a ``DistanceMatrix`` is not
+checked to be symmetric and hollow), as that would require reading the whole
+matrix.
+
+When writing, the ``matrix`` dataset is stored in chunks of whole rows, so that
+reading a row touches as little of the file as possible. ``compress``, which
+defaults to ``True``, compresses each chunk with gzip. Pass ``compress=False``
+for faster reading and writing at the cost of larger files.
+
 References
 ----------
 .. [1] http://www.hdfgroup.org/
@@ -74,18 +99,27 @@ References
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
-import h5py
+import io
+
+import numpy as np
+import pandas as pd
 
 from skbio.io import create_format
-from skbio.stats.distance import DissimilarityMatrix, DistanceMatrix
+from skbio.io._iosources import unwrap_file
+from skbio.stats.distance import DissimilarityMatrix, DistanceMatrix, MissingIDError
 
 
-binary_dm = create_format("binary_dm", encoding="binary")
-_vlen_dtype = h5py.special_dtype(vlen=str)
+binary_dm = create_format("binary_dm", encoding="binary", magic=(b"\x89HDF\r\n\x1a\n",))
+# Target size in bytes of each chunk of the `matrix` dataset, and of the
+# blocks of rows read or written at once.
+_chunk_size = 1 << 20
+_block_size = 1 << 24
 
 
 @binary_dm.sniffer()
 def _binary_dm_sniffer(fh):
+    import h5py
+
     try:
         f = h5py.File(fh, "r")
     except OSError:
@@ -111,41 +145,273 @@ def _binary_dm_sniffer(fh):
 
 
 @binary_dm.reader(DissimilarityMatrix)
-def _binary_dm_to_dissimilarity(fh):
-    return _h5py_mat_to_skbio_mat(fh)
+def _binary_dm_to_dissimilarity(fh, lazy=False):
+    return _read_binary_dm(DissimilarityMatrix, fh, lazy)
 
 
 @binary_dm.reader(DistanceMatrix)
-def _binary_dm_to_distance(fh):
-    return _h5py_mat_to_skbio_mat(fh)
+def _binary_dm_to_distance(fh, lazy=False):
+    return _read_binary_dm(DistanceMatrix, fh, lazy)
 
 
 @binary_dm.writer(DissimilarityMatrix)
-def _dissimilarity_to_binary_dm(obj, fh):
-    return _skbio_mat_to_h5py_mat(fh)
+def _dissimilarity_to_binary_dm(obj, fh, compress=True):
+    _write_binary_dm(obj, fh, compress)
 
 
 @binary_dm.writer(DistanceMatrix)
-def _distance_to_binary_dm(obj, fh):
-    return _skbio_mat_to_h5py_mat(fh)
+def _distance_to_binary_dm(obj, fh, compress=True):
+    _write_binary_dm(obj, fh, compress)
+
+
+def _vlen_dtype():
+    # h5py is slow to import, so it is only imported once the format is used.
+    import h5py
+
+    return h5py.special_dtype(vlen=str)
+
+
+def _h5py_source(fh):
+    # Handles of files on disk are opened either for reading or for writing,
+    # while HDF5 reads back what it writes, and they are closed once reading
+    # returns, while a lazily read matrix keeps reading. Such files are
+    # reopened by name instead.
+    fh = unwrap_file(fh)
+    if isinstance(getattr(fh, "raw", None), io.FileIO):
+        return fh.name
+    return fh
 
 
-def _h5py_mat_to_skbio_mat(cls, fh):
-    return cls(fh["matrix"], _parse_ids(fh["order"]))
+def _read_binary_dm(cls, fh, lazy):
+    import h5py
 
+    if lazy:
+        return _h5py_mat_to_skbio_mat(cls, h5py.File(_h5py_source(fh), "r"), lazy)
+    with h5py.File(_h5py_source(fh), "r") as f:
+        return _h5py_mat_to_skbio_mat(cls, f)
 
-def _skbio_mat_to_h5py_mat(obj, fh):
+
+def _write_binary_dm(obj, fh, compress):
+    import h5py
+
+    with h5py.File(_h5py_source(fh), "w") as f:
+        _skbio_mat_to_h5py_mat(obj, f, compress=compress)
+
+
+def _h5py_mat_to_skbio_mat(cls, fh, lazy=False):
+    ids = _parse_ids(fh["order"][()])
+    if lazy:
+        if issubclass(cls, DistanceMatrix):
+            return _LazyDistanceMatrix(fh["matrix"], ids)
+        return _LazyDissimilarityMatrix(fh["matrix"], ids)
+    return cls(fh["matrix"], ids)
+
+
+def _skbio_mat_to_h5py_mat(obj, fh, compress=True):
     _set_header(fh)
 
-    ids = fh.create_dataset("order", shape=(len(obj.ids),), dtype=_vlen_dtype)
+    ids = fh.create_dataset("order", shape=(len(obj.ids),), dtype=_vlen_dtype())
     ids[:] = obj.ids
-    fh.create_dataset("matrix", data=obj.data)
+
+    n = obj.shape[0]
+    row_bytes = n * obj.dtype.itemsize
+    chunk_rows = min(n, max(1, _chunk_size // row_bytes))
+    kwargs = {}
+    if compress:
+        kwargs = {"compression": "gzip", "compression_opts": 4, "shuffle": True}
+    mat = fh.create_dataset(
+        "matrix", shape=obj.shape, dtype=obj.dtype, chunks=(chunk_rows, n), **kwargs
+    )
+
+    # Write whole chunks at a time, reading them from `obj` by slicing so that
+    # a lazily read matrix is copied without loading it entirely.
+    step = max(1, _block_size // (row_bytes * chunk_rows)) * chunk_rows
+    for start in range(0, n, step):
+        mat[start : start + step] = obj[start : start + step]
+
+
+class _LazyDissimilarityMatrix(DissimilarityMatrix):
+    """Dissimilarity matrix reading its values from an open HDF5 dataset.
+
+    Constructed from anything other than an ``h5py.Dataset`` (as done by e.g.
+    ``copy``), this behaves exactly like its in-memory base class.
+
+    """
+
+    _eager_class = DissimilarityMatrix
+
+    def __init__(self, data, ids=None, validate=True):
+        import h5py
+
+        if not isinstance(data, h5py.Dataset):
+            self._dataset = None
+            super().__init__(data, ids, validate)
+            return
+
+        if ids is None:
+            ids = (str(i) for i in range(data.shape[0]))
+        ids = tuple(ids)
+        self._validate_shape(data)
+        self._validate_ids(data, ids)
+        self._dataset = data
+        self._loaded = None
+        self._ids = ids
+        self._id_index = self._index_list(ids)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the HDF5 file the values are read from.
+
+        Values that were not loaded into memory can no longer be read once the
+        file is closed. Closing an already closed matrix has no effect.
+
+        """
+        if self._dataset is not None and self._dataset.id.valid:
+            self._dataset.file.close()
+
+    @property
+    def _data(self):
+        if self._loaded is None:
+            self._loaded = self._dataset[()]
+        return self._loaded
+
+    @_data.setter
+    def _data(self, data):
+        self._loaded = data
+
+    @property
+    def _lazy(self):
+        return self._loaded is None
+
+    @property
+    def _source(self):
+        return self._dataset if self._lazy else self._loaded
+
+    @DissimilarityMatrix.ids.setter
+    def ids(self, ids_):
+        ids_ = tuple(ids_)
+        self._validate_ids(self._source, ids_)
+        self._ids = ids_
+        self._id_index = self._index_list(self._ids)
+
+    @property
+    def dtype(self):
+        return self._source.dtype
+
+    @property
+    def shape(self):
+        return self._source.shape
+
+    @property
+    def size(self):
+        return self._source.size
+
+    def __getitem__(self, index):
+        if not self._lazy:
+            return super().__getitem__(index)
+
+        if isinstance(index, str):
+            return self._dataset[self.index(index)]
+        elif self._is_id_pair(index):
+            return self._dataset[self.index(index[0]), self.index(index[1])]
+        try:
+            return self._dataset[index]
+        except (TypeError, ValueError):
+            # A selection HDF5 cannot express, such as unsorted indices.
+            rows = np.asarray(index)
+            if rows.ndim == 1 and rows.dtype.kind in "iu":
+                rows = np.arange(self.shape[0])[rows]
+                return self._read(rows, np.arange(self.shape[1]))
+            return self._data[index]
+
+    def filter(self, ids, strict=True):
+        if not self._lazy:
+            return super().filter(ids, strict)
+
+        ids = tuple(ids)
+        if strict:
+            idxs = [self.index(id_) for id_ in ids]
+        else:
+            idxs = []
+            found_ids = []
+            for id_ in ids:
+                try:
+                    idxs.append(self.index(id_))
+                    found_ids.append(id_)
+                except MissingIDError:
+                    pass
+            ids = tuple(found_ids)
+
+        filtered_data = self._read(idxs, idxs)
+        self._validate_ids(filtered_data, ids)
+        return self._eager_class(filtered_data, ids, validate=False)
+
+    def _subset_to_dataframe(self, i_ids, j_ids):
+        if not self._lazy:
+            return super()._subset_to_dataframe(i_ids, j_ids)
+
+        i_indices = self._stable_order(i_ids)
+        j_indices = self._stable_order(j_ids)
+        values = self._read(i_indices, j_indices)
+
+        j_labels = [self.ids[j] for j in j_indices]
+        i = [self.ids[i_idx] for i_idx in i_indices for _ in j_labels]
+        i = pd.Series(i, name="i", dtype=str)
+        j = pd.Series(j_labels * len(i_indices), name="j", dtype=str)
+        values = pd.Series(values.ravel(), name="value", dtype=float)
+
+        return pd.concat([i, j, values], axis=1)
+
+    def _row_blocks(self, rows):
+        """Yield ``(positions, block)`` reading `rows` a block at a time.
+
+        `rows` must be sorted and unique, as required by HDF5 selections.
+
+        """
+        step = max(1, _block_size // (self.shape[1] * self.dtype.itemsize))
+        for start in range(0, len(rows), step):
+            selection = rows[start : start + step]
+            yield slice(start, start + len(selection)), self._dataset[selection]
+
+    def _read(self, rows, cols):
+        """Read ``data[rows][:, cols]``, touching only the requested rows."""
+        rows = np.asarray(rows, dtype=int)
+        cols = np.asarray(cols, dtype=int)
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        values = np.empty((len(unique_rows), len(cols)), dtype=self.dtype)
+        for positions, block in self._row_blocks(unique_rows):
+            values[positions] = block[:, cols]
+        return values[inverse]
+
+
+class _LazyDistanceMatrix(_LazyDissimilarityMatrix, DistanceMatrix):
+    """Distance matrix reading its values from an open HDF5 dataset."""
+
+    _eager_class = DistanceMatrix
+
+    def condensed_form(self):
+        if not self._lazy:
+            return super().condensed_form()
+
+        n = self.shape[0]
+        condensed = np.empty(n * (n - 1) // 2, dtype=self.dtype)
+        pos = 0
+        for positions, block in self._row_blocks(np.arange(n)):
+            for i, row in enumerate(block, start=positions.start):
+                condensed[pos : pos + n - i - 1] = row[i + 1 :]
+                pos += n - i - 1
+        return condensed
 
 
 def _get_header(fh):
     format_ = fh.get("format")
     version = fh.get("version")
-    if format is None or version is None:
+    if format_ is None or version is None:
         return None
     else:
         return {"format": format_[0], "version": version[0]}
@@ -0,0 +1,478 @@
+"""Simple binary sequence format (:mod:`skbio.io.format.binary_seq`)
+================================================================
+
+.. currentmodule:: skbio.io.format.binary_seq
+
+The binary sequence format (``binary_seq``) stores a collection of biological
+sequences, along with their IDs, descriptions and quality scores, as columns of
+binary arrays. Unlike the text-based formats such as FASTA and FASTQ, reading
+it requires no parsing, so it is well suited for intermediate files that are
+written once and read many times, e.g., between the steps of a pipeline.
+
+Format Support
+--------------
+**Has Sniffer: Yes**
+
++------+------+---------------------------------------------------------------+
+|Reader|Writer|                          Object Class                         |
++======+======+===============================================================+
+|Yes   |Yes   |generator of :mod:`skbio.sequence.Sequence` objects            |
++------+------+---------------------------------------------------------------+
+|Yes   |Yes   |:mod:`skbio.sequence.Sequence`                                 |
++------+------+---------------------------------------------------------------+
+|Yes   |Yes   |:mod:`skbio.sequence.DNA`                                      |
++------+------+---------------------------------------------------------------+
+|Yes   |Yes   |:mod:`skbio.sequence.RNA`                                      |
++------+------+---------------------------------------------------------------+
+|Yes   |Yes   |:mod:`skbio.sequence.Protein`                                  |
++------+------+---------------------------------------------------------------+
+|Yes   |Yes   |:mod:`skbio.alignment.TabularMSA`                              |
++------+------+---------------------------------------------------------------+
+
+Format Specification
+--------------------
+**State: Experimental as of 0.6.0.**
+
+A file is a NumPy ``.npz`` archive [1]_, i.e., a ZIP file of arrays in
+NumPy's ``.npy`` format, which is readable without scikit-bio. The sequences
+are stored in consecutive *row groups* of up to a given number of sequences.
+Each column of a row group is stored in its own arrays:
+
++---------------------------+------------+-----------------------------------+
+|Array                      |Type        |Description                        |
++===========================+============+===================================+
+|``<g>/sequence``           |uint8       |Characters of all sequences of row |
+|                           |            |group ``g``, concatenated          |
++---------------------------+------------+-----------------------------------+
+|``<g>/sequence_offsets``   |int64       |Start of each sequence in          |
+|                           |            |``<g>/sequence``, followed by its  |
+|                           |            |length                             |
++---------------------------+------------+-----------------------------------+
+|``<g>/id``,                |uint8       |UTF-8 encoded IDs, concatenated    |
+|``<g>/id_offsets``         |int64       |                                   |
++---------------------------+------------+-----------------------------------+
+|``<g>/description``,       |uint8       |UTF-8 encoded descriptions,        |
+|``<g>/description_offsets``|int64       |concatenated                       |
++---------------------------+------------+-----------------------------------+
+|``<g>/quality``            |uint8       |Phred quality scores of all        |
+|                           |            |sequences, laid out as the         |
+|                           |            |sequences                          |
++---------------------------+------------+-----------------------------------+
+|``<g>/has_quality``        |bool        |Whether each sequence has quality  |
+|                           |            |scores                             |
++---------------------------+------------+-----------------------------------+
+
+The quality arrays are only present if at least one sequence has quality
+scores. In addition, the archive contains a ``format`` array with the value
+``binary_seq``, a ``version`` array (currently ``1.0``), and a ``row_groups``
+array with the number of sequences in each row group.
+
+IDs and descriptions are taken from the ``id`` and ``description`` keys of the
+sequences' ``metadata`` (empty if absent), and quality scores from the
+``quality`` column of their ``positional_metadata``. Quality scores must be
+integers from 0 to 255. Other metadata is not stored.
+
+Format Parameters
+-----------------
+The following parameters are available to the readers:
+
+- ``constructor``: The sequence class of the sequences read by the generator
+  reader (:class:`skbio.sequence.Sequence` by default), which must be provided
+  when reading into a ``TabularMSA``.
+
+- ``columns``: The columns to read among ``id``, ``description`` and
+  ``quality``. By default, all columns in the file are read. The arrays of the
+  other columns are not read at all, and the corresponding metadata is left
+  out.
+
+- ``rows``: The indices of the sequences to read, as a slice or a sequence of
+  integers. Sequences are read in the order they are stored. Row groups that
+  contain none of the selected sequences are not read at all.
+
+- ``lightweight``: If ``True``, the generator yields plain tuples of ``(id,
+  description, sequence, quality)`` instead of sequence objects, like the
+  ``lightweight`` parameter of the :mod:`~skbio.io.format.fastq` format.
+  Columns that are not read are ``None``, as is ``quality`` for sequences
+  without quality scores.
+
+- ``seq_num``: The number of the sequence to read (1-based) when reading a
+  single sequence. Only its row group is read.
+
+The following parameters are available to the writers:
+
+- ``row_group_size``: The maximum number of sequences of a row group, 65536 by
+  default. Smaller row groups allow selected rows to be read with less
+  overhead, at the cost of more arrays in the file.
+
+- ``compress``: If ``True``, the arrays are compressed with DEFLATE. Defaults
+  to ``False``, as reading and writing uncompressed arrays is much faster.
+
+Examples
+--------
+>>> from io import BytesIO
+>>> from skbio import DNA
+>>> seqs = [DNA('ACGT', metadata={'id': 'seq1', 'description': 'first'}),
+...         DNA('GGTTA', metadata={'id': 'seq2', 'description': ''},
+...             positional_metadata={'quality': [40, 40, 38, 30, 12]})]
+
+Write the sequences in row groups of one sequence:
+
+>>> import skbio.io
+>>> fh = BytesIO()
+>>> _ = skbio.io.write((seq for seq in seqs), format='binary_seq', into=fh,
+...                    row_group_size=1)
+
+Read the second sequence, skipping the first row group, and leaving out its
+description:
+
+>>> fh.seek(0)
+0
+>>> for seq in skbio.io.read(fh, format='binary_seq', constructor=DNA,
+...                          columns=['id', 'quality'], rows=[1]):
+...     seq.metadata, seq.positional_metadata['quality'].tolist()
+({'id': 'seq2'}, [40, 40, 38, 30, 12])
+
+References
+----------
+.. [1] https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+
+"""  # noqa: D205, D415
+
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import zipfile
+
+import numpy as np
+
+from skbio.alignment import TabularMSA
+from skbio.io import create_format, BinarySeqFormatError
+from skbio.sequence import Sequence, DNA, RNA, Protein
+from skbio.util import cardinal_to_ordinal
+
+binary_seq = create_format(
+    "binary_seq", encoding="binary", extensions=(".npz",), magic=(b"PK\x03\x04",)
+)
+
+_version = "1.0"
+_columns = ("id", "description", "quality")
+# Default number of sequences of a row group.
+_row_group_size = 1 << 16
+
+
+@binary_seq.sniffer()
+def _binary_seq_sniffer(fh):
+    try:
+        with _load(fh) as data:
+            return str(data["format"]) == "binary_seq", {}
+    except (BinarySeqFormatError, ValueError, OSError, KeyError):
+        return False, {}
+
+
+@binary_seq.reader(None)
+def _binary_seq_to_generator(
+    fh, constructor=Sequence, columns=None, rows=None, lightweight=False, **kwargs
+):
+    yield from _read_binary_seq(fh, constructor, columns, rows, lightweight, kwargs)
+
+
+@binary_seq.reader(Sequence)
+def _binary_seq_to_sequence(fh, seq_num=1, columns=None, **kwargs):
+    return _binary_seq_to_single_sequence(fh, seq_num, columns, Sequence, kwargs)
+
+
+@binary_seq.reader(DNA)
+def _binary_seq_to_dna(fh, seq_num=1, columns=None, **kwargs):
+    return _binary_seq_to_single_sequence(fh, seq_num, columns, DNA, kwargs)
+
+
+@binary_seq.reader(RNA)
+def _binary_seq_to_rna(fh, seq_num=1, columns=None, **kwargs):
+    return _binary_seq_to_single_sequence(fh, seq_num, columns, RNA, kwargs)
+
+
+@binary_seq.reader(Protein)
+def _binary_seq_to_protein(fh, seq_num=1, columns=None, **kwargs):
+    return _binary_seq_to_single_sequence(fh, seq_num, columns, Protein, kwargs)
+
+
+@binary_seq.reader(TabularMSA)
+def _binary_seq_to_tabular_msa(fh, constructor=None, columns=None, rows=None, **kwargs):
+    if constructor is None:
+        raise ValueError("Must provide `constructor`.")
+
+    return TabularMSA(_read_binary_seq(fh, constructor, columns, rows, False, kwargs))
+
+
+@binary_seq.writer(None)
+def _generator_to_binary_seq(obj, fh, row_group_size=_row_group_size, compress=False):
+    _write_binary_seq(obj, fh, row_group_size, compress)
+
+
+@binary_seq.writer(Sequence)
+def _sequence_to_binary_seq(obj, fh, row_group_size=_row_group_size, compress=False):
+    _write_binary_seq([obj], fh, row_group_size, compress)
+
+
+@binary_seq.writer(DNA)
+def _dna_to_binary_seq(obj, fh, row_group_size=_row_group_size, compress=False):
+    _write_binary_seq([obj], fh, row_group_size, compress)
+
+
+@binary_seq.writer(RNA)
+def _rna_to_binary_seq(obj, fh, row_group_size=_row_group_size, compress=False):
+    _write_binary_seq([obj], fh, row_group_size, compress)
+
+
+@binary_seq.writer(Protein)
+def _protein_to_binary_seq(obj, fh, row_group_size=_row_group_size, compress=False):
+    _write_binary_seq([obj], fh, row_group_size, compress)
+
+
+@binary_seq.writer(TabularMSA)
+def _tabular_msa_to_binary_seq(obj, fh, row_group_size=_row_group_size, compress=False):
+    _write_binary_seq(obj, fh, row_group_size, compress)
+
+
+def _write_binary_seq(obj, fh, row_group_size, compress):
+    if row_group_size < 1:
+        raise ValueError(
+            "`row_group_size` must be a positive integer, not %r." % row_group_size
+        )
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(fh, "w", compression=compression) as zf:
+        _write_array(zf, "format", np.array("binary_seq"))
+        _write_array(zf, "version", np.array(_version))
+        sizes = []
+        group = []
+        for seq in obj:
+            group.append(seq)
+            if len(group) == row_group_size:
+                _write_row_group(zf, len(sizes), group, sum(sizes))
+                sizes.append(len(group))
+                group = []
+        if group or not sizes:
+            _write_row_group(zf, len(sizes), group, sum(sizes))
+            sizes.append(len(group))
+        _write_array(zf, "row_groups", np.array(sizes, dtype=np.int64))
+
+
+def _binary_seq_to_single_sequence(fh, seq_num, columns, constructor, kwargs):
+    # Only the row group of the sequence is read.
+    if seq_num is None or seq_num < 1:
+        raise ValueError(
+            "Invalid sequence number (`seq_num`=%s). `seq_num`"
+            " must be between 1 and the number of sequences in"
+            " the file." % str(seq_num)
+        )
+    gen = _read_binary_seq(fh, constructor, columns, [seq_num - 1], False, kwargs)
+    try:
+        for seq in gen:
+            return seq
+    except IndexError:
+        pass
+    raise ValueError(
+        "Reached end of file before finding the %s sequence."
+        % cardinal_to_ordinal(seq_num)
+    )
+
+
+def _load(fh):
+    # Anything but a ZIP file is rejected upfront, as `np.load` would read a
+    # single array from an .npy file.
+    magic = fh.read(4)
+    fh.seek(-len(magic), 1)
+    if magic != b"PK\x03\x04":
+        raise BinarySeqFormatError("The file is not in binary_seq format.")
+    try:
+        return np.load(fh)
+    except (ValueError, zipfile.BadZipFile):
+        raise BinarySeqFormatError("The file is not in binary_seq format.")
+
+
+def _read_binary_seq(fh, constructor, columns, rows, lightweight, kwargs):
+    with _load(fh) as data:
+        _check_header(data)
+        columns = _check_columns(columns)
+        sizes = data["row_groups"]
+        for g, group_rows in _select_rows(sizes, rows):
+            ids, descs, seqs, quals = _read_row_group(
+                data, g, columns, group_rows, lightweight
+            )
+            if lightweight:
+                yield from zip(ids, descs, seqs, quals)
+                continue
+            for id_, desc, seq, qual in zip(ids, descs, seqs, quals):
+                metadata = {}
+                if id_ is not None:
+                    metadata["id"] = id_
+                if desc is not None:
+                    metadata["description"] = desc
+                positional_metadata = None
+                if qual is not None:
+                    positional_metadata = {"quality": qual}
+                yield constructor(
+                    seq,
+                    metadata=metadata,
+                    positional_metadata=positional_metadata,
+                    **kwargs,
+                )
+
+
+def _check_header(data):
+    try:
+        format_ = str(data["format"])
+        version = str(data["version"])
+    except KeyError:
+        format_ = version = None
+    if format_ != "binary_seq":
+        raise BinarySeqFormatError("The file is not in binary_seq format.")
+    if version.split(".")[0] != _version.split(".")[0]:
+        raise BinarySeqFormatError(
+            "Unsupported binary_seq format version: %r." % version
+        )
+
+
+def _check_columns(columns):
+    if columns is None:
+        return frozenset(_columns)
+    columns = frozenset([columns] if isinstance(columns, str) else columns)
+    for column in columns - set(_columns):
+        raise ValueError(
+            "Unknown column %r. Columns must be among %r." % (column, _columns)
+        )
+    return columns
+
+
+def _select_rows(sizes, rows):
+    """Yield the row groups overlapping `rows` and their rows to read.
+
+    Rows are given as indices within the row group, or None for all rows.
+
+    """
+    bounds = np.concatenate(([0], np.cumsum(sizes)))
+    if rows is None:
+        for g in range(len(sizes)):
+            yield g, None
+        return
+    n = int(bounds[-1])
+    if isinstance(rows, slice):
+        rows = np.arange(*rows.indices(n))
+    else:
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1)
+        out = (rows < -n) | (rows >= n)
+        if out.any():
+            raise IndexError(
+                "Row %d is out of bounds for %d sequences." % (rows[out][0], n)
+            )
+        rows = np.unique(np.where(rows < 0, rows + n, rows))
+    groups = np.searchsorted(bounds, rows, side="right") - 1
+    for g in np.unique(groups).tolist():
+        yield g, rows[groups == g] - bounds[g]
+
+
+def _read_row_group(data, g, columns, rows, lightweight=False):
+    """Read the selected columns and rows of a row group.
+
+    Returns lists of IDs, descriptions, sequences (as uint8 arrays, or strings
+    if `lightweight`) and quality scores, with None in place of the values
+    that are not read.
+
+    """
+    offsets = data["%d/sequence_offsets" % g]
+    n = offsets.size - 1
+    if rows is None:
+        rows = np.arange(n)
+    starts, stops = offsets[:-1][rows].tolist(), offsets[1:][rows].tolist()
+    residues = data["%d/sequence" % g]
+    if lightweight:
+        residues = residues.tobytes().decode("ascii")
+    seqs = [residues[i:j] for i, j in zip(starts, stops)]
+
+    ids = descs = quals = [None] * len(starts)
+    if "id" in columns:
+        ids = _read_strings(data, "%d/id" % g, rows)
+    if "description" in columns:
+        descs = _read_strings(data, "%d/description" % g, rows)
+    if "quality" in columns and "%d/quality" % g in data:
+        scores = data["%d/quality" % g]
+        has_quality = data["%d/has_quality" % g][rows].tolist()
+        quals = [
+            scores[i:j] if has else None
+            for i, j, has in zip(starts, stops, has_quality)
+        ]
+    return ids, descs, seqs, quals
+
+
+def _read_strings(data, name, rows):
+    buf = data[name].tobytes()
+    offsets = data[name + "_offsets"]
+    starts, stops = offsets[:-1][rows].tolist(), offsets[1:][rows].tolist()
+    if buf.isascii():
+        # characters are bytes, so the decoded text can be sliced directly
+        text = buf.decode("ascii")
+        return [text[i:j] for i, j in zip(starts, stops)]
+    return [buf[i:j].decode("utf-8") for i, j in zip(starts, stops)]
+
+
+def _write_row_group(zf, g, seqs, start):
+    residues = [seq._bytes for seq in seqs]
+    _write_concatenated(zf, "%d/sequence" % g, residues)
+
+    ids, descs = [], []
+    for seq in seqs:
+        metadata = seq.metadata if seq.has_metadata() else {}
+        ids.append(str(metadata.get("id", "")).encode("utf-8"))
+        descs.append(str(metadata.get("description", "")).encode("utf-8"))
+    _write_concatenated(zf, "%d/id" % g, [np.frombuffer(x, np.uint8) for x in ids])
+    _write_concatenated(
+        zf, "%d/description" % g, [np.frombuffer(x, np.uint8) for x in descs]
+    )
+
+    has_quality = [
+        seq.has_positional_metadata() and "quality" in seq.positional_metadata
+        for seq in seqs
+    ]
+    if any(has_quality):
+        quals = []
+        for i, (seq, has) in enumerate(zip(seqs, has_quality)):
+            if not has:
+                quals.append(np.zeros(len(seq), dtype=np.uint8))
+                continue
+            qual = seq.positional_metadata["quality"].to_numpy()
+            if not (
+                np.issubdtype(qual.dtype, np.integer)
+                and ((qual >= 0) & (qual <= 255)).all()
+            ):
+                raise ValueError(
+                    "Quality scores of the %s sequence must be integers from 0 to "
+                    "255." % cardinal_to_ordinal(start + i + 1)
+                )
+            quals.append(qual.astype(np.uint8))
+        _write_array(zf, "%d/quality" % g, _concatenate(quals))
+        _write_array(zf, "%d/has_quality" % g, np.array(has_quality, dtype=bool))
+
+
+def _write_concatenated(zf, name, arrays):
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum([x.size for x in arrays], out=offsets[1:])
+    _write_array(zf, name, _concatenate(arrays))
+    _write_array(zf, name + "_offsets", offsets)
+
+
+def _concatenate(arrays):
+    if not arrays:
+        return np.empty(0, dtype=np.uint8)
+    return np.concatenate(arrays)
+
+
+def _write_array(zf, name, array):
+    # The same as what `np.savez` does, one array at a time, so that row
+    # groups are written as soon as they are complete.
+    with zf.open(name + ".npy", "w", force_zip64=True) as f:
+        np.lib.format.write_array(f, np.asanyarray(array), allow_pickle=False)
@@ -0,0 +1,316 @@
+"""Simple binary tree format (:mod:`skbio.io.format.binary_tree`)
+=============================================================
+
+.. currentmodule:: skbio.io.format.binary_tree
+
+The binary tree format (``binary_tree``) stores the topology, node names and
+branch lengths of a tree as binary arrays. Reading it requires no parsing and
+no recursion, which makes it suitable for large reference phylogenies with
+millions of tips that are loaded over and over, e.g., at the start of each job
+of a pipeline.
+
+Format Support
+--------------
+**Has Sniffer: Yes**
+
++------+------+---------------------------------------------------------------+
+|Reader|Writer|                          Object Class                         |
++======+======+===============================================================+
+|Yes   |Yes   |:mod:`skbio.tree.TreeNode`                                     |
++------+------+---------------------------------------------------------------+
+
+Format Specification
+--------------------
+**State: Experimental as of 0.6.0.**
+
+A file is a NumPy ``.npz`` archive [1]_, i.e., a ZIP file of arrays in
+NumPy's ``.npy`` format, which is readable without scikit-bio. The nodes are
+numbered in preorder, starting from 0 for the root, and each array has one
+value per node:
+
++----------------+-----------+-----------------------------------------------+
+|Array           |Type       |Description                                    |
++================+===========+===============================================+
+|``parent``      |int32 or   |Number of the parent of each node, or -1 for   |
+|                |int64      |the root                                       |
++----------------+-----------+-----------------------------------------------+
+|``name``        |uint8      |UTF-8 encoded node names, concatenated         |
++----------------+-----------+-----------------------------------------------+
+|``name_offsets``|int64      |Start of each name in ``name``, followed by the|
+|                |           |end of the last one                            |
++----------------+-----------+-----------------------------------------------+
+|``length``      |float64    |Branch length of each node, or NaN if it has   |
+|                |           |none                                           |
++----------------+-----------+-----------------------------------------------+
+|``support``     |float64    |Support value of each node, or NaN if it has   |
+|                |           |none                                           |
++----------------+-----------+-----------------------------------------------+
+
+As the nodes are in preorder, the parent of a node always comes before it, and
+the children of a node are in the same order as the node numbers. The
+``length`` and ``support`` arrays are only present if at least one node has a
+value. In addition, the archive contains a ``format`` array with the value
+``binary_tree``, and a ``version`` array (currently ``1.0``).
+
+Names that are not strings are stored as their string representations. As in
+the :mod:`~skbio.io.format.newick` format, a missing name and an empty name are
+not distinguished, and both are read as ``None``.
+
+The layout matches that of :class:`skbio.tree.CompactTree`, which reads the
+arrays with little conversion. Missing branch lengths and support values are
+NaN in a ``CompactTree`` as well.
+
+Format Parameters
+-----------------
+The ``CompactTree`` reader accepts a ``mmap`` parameter. If ``True`` and the
+file is an uncompressed file on disk, the ``length`` and ``support`` arrays
+are memory-mapped rather than read into memory, so that only the values in use
+are loaded, and a tree that is already in the page cache is opened almost
+instantly. Defaults to ``False``.
+
+The writers accept a ``compress`` parameter. If ``True``, the arrays are
+compressed with DEFLATE. Defaults to ``False``, as reading and writing
+uncompressed arrays is much faster, and only uncompressed arrays can be
+memory-mapped.
+
+Examples
+--------
+>>> from io import BytesIO
+>>> from skbio import TreeNode
+>>> tree = TreeNode.read(['((a:1,b:2)c:3,d:4)e;'])
+>>> fh = BytesIO()
+>>> _ = tree.write(fh, format='binary_tree')
+>>> fh.seek(0)
+0
+>>> print(TreeNode.read(fh, format='binary_tree'))
+((a:1.0,b:2.0)c:3.0,d:4.0)e;
+<BLANKLINE>
+
+Read the tree as a ``CompactTree``:
+
+>>> from skbio.tree import CompactTree
+>>> fh.seek(0)
+0
+>>> CompactTree.read(fh, format='binary_tree')
+<CompactTree, nodes: 5, tips: 3>
+
+The arrays can also be loaded with NumPy:
+
+>>> import numpy as np
+>>> fh.seek(0)
+0
+>>> with np.load(fh) as data:
+...     data['parent']
+array([-1,  0,  1,  1,  0], dtype=int32)
+
+References
+----------
+.. [1] https://numpy.org/doc/stable/reference/generated/numpy.lib.format.html
+
+"""  # noqa: D205, D415
+
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import io
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+from skbio.io import create_format, BinaryTreeFormatError
+from skbio.io.format.binary_seq import _write_array
+from skbio.tree import TreeNode, CompactTree
+
+binary_tree = create_format(
+    "binary_tree", encoding="binary", extensions=(".npz",), magic=(b"PK\x03\x04",)
+)
+
+_version = "1.0"
+_arrays = ("parent", "name", "name_offsets", "length", "support")
+
+
+@binary_tree.sniffer()
+def _binary_tree_sniffer(fh):
+    try:
+        with _load(fh) as data:
+            return str(data["format"]) == "binary_tree", {}
+    except (BinaryTreeFormatError, ValueError, OSError, KeyError):
+        return False, {}
+
+
+@binary_tree.reader(TreeNode)
+def _binary_tree_to_tree_node(fh):
+    return _read_compact_tree(fh, False).to_tree_node()
+
+
+@binary_tree.reader(CompactTree)
+def _binary_tree_to_compact_tree(fh, mmap=False):
+    return _read_compact_tree(fh, mmap)
+
+
+@binary_tree.writer(TreeNode)
+def _tree_node_to_binary_tree(obj, fh, compress=False):
+    _write_compact_tree(CompactTree.from_tree_node(obj), fh, compress)
+
+
+@binary_tree.writer(CompactTree)
+def _compact_tree_to_binary_tree(obj, fh, compress=False):
+    _write_compact_tree(obj, fh, compress)
+
+
+def _load(fh):
+    # Anything but a ZIP file is rejected upfront, as `np.load` would read a
+    # single array from an .npy file.
+    magic = fh.read(4)
+    fh.seek(-len(magic), 1)
+    if magic != b"PK\x03\x04":
+        raise BinaryTreeFormatError("The file is not in binary_tree format.")
+    try:
+        return np.load(fh)
+    except (ValueError, zipfile.BadZipFile):
+        raise BinaryTreeFormatError("The file is not in binary_tree format.")
+
+
+def _read_arrays(fh, mmap=False):
+    """Read the arrays of a tree into a dict.
+
+    If `mmap` is True and `fh` is an uncompressed file on disk, uncompressed
+    arrays are memory-mapped instead of read into memory.
+
+    """
+    start = fh.tell()
+    with _load(fh) as data:
+        _check_header(data)
+        names = [name for name in _arrays if name in data]
+        if mmap:
+            fh.seek(start)
+            arrays = _memmap_arrays(fh, names)
+            if arrays is not None:
+                return arrays
+        return {name: data[name] for name in names}
+
+
+def _check_header(data):
+    try:
+        format_ = str(data["format"])
+        version = str(data["version"])
+    except KeyError:
+        format_ = version = None
+    if format_ != "binary_tree":
+        raise BinaryTreeFormatError("The file is not in binary_tree format.")
+    if version.split(".")[0] != _version.split(".")[0]:
+        raise BinaryTreeFormatError(
+            "Unsupported binary_tree format version: %r." % version
+        )
+
+
+def _memmap_arrays(fh, names):
+    """Memory-map the arrays stored uncompressed in an .npz file on disk.
+
+    Arrays that are compressed are read instead. Returns None if the file
+    cannot be mapped, e.g., if `fh` is not backed by a file, or reads from a
+    decompressed stream.
+
+    """
+    try:
+        fileno = fh.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return None
+    start = fh.tell()
+    fh.seek(0, io.SEEK_END)
+    size = fh.tell() - start
+    # The data read through `fh` must be the file itself.
+    if start or os.fstat(fileno).st_size != size:
+        return None
+    fh.seek(0)
+    if fh.read(4) != b"PK\x03\x04":
+        return None
+
+    arrays = {}
+    with zipfile.ZipFile(fh) as zf:
+        for name in names:
+            info = zf.getinfo(name + ".npy")
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as f:
+                    arrays[name] = np.lib.format.read_array(f, allow_pickle=False)
+                continue
+            # The local header of a member is followed by its name, an extra
+            # field of variable size, and then its data.
+            fh.seek(info.header_offset + 26)
+            name_size, extra_size = struct.unpack("<HH", fh.read(4))
+            fh.seek(name_size + extra_size, io.SEEK_CUR)
+            version = np.lib.format.read_magic(fh)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fh)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fh)
+            if not np.prod(shape):
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(
+                fh,
+                dtype=dtype,
+                mode="r",
+                offset=fh.tell(),
+                shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def _write_arrays(arrays, fh, compress):
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(fh, "w", compression=compression) as zf:
+        _write_array(zf, "format", np.array("binary_tree"))
+        _write_array(zf, "version", np.array(_version))
+        for name in _arrays:
+            if name in arrays:
+                _write_array(zf, name, arrays[name])
+
+
+def _read_compact_tree(fh, mmap):
+    arrays = _read_arrays(fh, mmap)
+    buf = np.asarray(arrays["name"]).tobytes()
+    offsets = arrays["name_offsets"].tolist()
+    if buf.isascii():
+        buf = buf.decode("ascii")
+        names = [buf[i:j] or None for i, j in zip(offsets[:-1], offsets[1:])]
+    else:
+        names = [
+            buf[i:j].decode("utf-8") or None for i, j in zip(offsets[:-1], offsets[1:])
+        ]
+    name = np.empty(len(names), dtype=object)
+    name[:] = names
+    try:
+        return CompactTree(
+            arrays["parent"], name, arrays.get("length"), arrays.get("support")
+        )
+    except ValueError as e:
+        raise BinaryTreeFormatError(str(e))
+
+
+def _write_compact_tree(obj, fh, compress):
+    names = ["" if x is None else str(x) for x in obj.name.tolist()]
+    text = "".join(names)
+    if not text.isascii():
+        names = [x.encode("utf-8") for x in names]
+    n = len(obj)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(x) for x in names], out=offsets[1:])
+    dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+    arrays = {
+        "parent": obj.parent.astype(dtype),
+        "name": np.frombuffer(text.encode("utf-8"), dtype=np.uint8),
+        "name_offsets": offsets,
+    }
+    for key, values in ("length", obj.length), ("support", obj.support):
+        if not np.isnan(values).all():
+            arrays[key] = values
+    _write_arrays(arrays, fh, compress)
@@ -27,6 +27,8 @@ Format Support
 +======+======+===============================================================+
 |Yes   |No    |:mod:`pandas.DataFrame`                                        |
 +------+------+---------------------------------------------------------------+
+|Yes   |No    |generator of :mod:`pandas.DataFrame`                           |
++------+------+---------------------------------------------------------------+
 
 Format Specification
 --------------------
@@ -172,6 +174,30 @@ The following format parameters are available in ``blast+6`` format:
 .. note:: Either ``default_columns`` or ``columns`` must be provided, as
    ``blast+6`` does not contain column headers.
 
+The following parameters are available to all ``blast+6`` (and ``blast+7``)
+readers, and help with hit tables too large to be read at once:
+
+- ``usecols``: ``None`` by default. If provided, only these columns are parsed
+  and returned, in the order they appear in the file.
+
+- ``compact``: ``False`` by default. If ``True``, columns are stored in less
+  memory: identifiers and names (e.g., qseqid and sseqid) as categoricals,
+  integer columns as nullable 32-bit integers (64-bit for GIs), and pident,
+  ppos and bitscore as 32-bit floats. E-values are kept as 64-bit floats, as
+  they are often too small for 32-bit floats.
+
+- ``chunksize``: Only available to the generator reader, which yields data
+  frames of at most this many rows (65536 by default) so that the file is
+  never read into memory at once. Rows are labeled by their number in the
+  file.
+
+- ``best_hits``: Only available to the ``pd.DataFrame`` reader. ``False`` by
+  default. If ``True``, only the hit with the highest bitscore of each query
+  is returned, in the order the queries first appear. Ties are resolved in
+  favor of the first hit. The file is read in chunks, keeping only the best
+  hits found so far, so the full table is never in memory. Requires the
+  bitscore column and a query ID column (qseqid, qaccver or qacc).
+
 Examples
 --------
 Suppose we have a ``blast+6`` file with default columns:
@@ -223,6 +249,23 @@ in the file:
 0   moaC  100.00       0.0   161.0      0.0  161.0     330.0     1.0
 1   moaC   99.38       1.0   161.0      0.0  161.0     329.0     1.0
 
+Read only the best hit of each query, with compact column types:
+
+>>> fh = StringIO(fs)
+>>> df = skbio.io.read(fh, format="blast+6", into=pd.DataFrame,
+...                    columns=['qseqid', 'pident', 'mismatch', 'length',
+...                             'gapopen', 'qend', 'bitscore', 'sstart'],
+...                    usecols=['qseqid', 'length', 'bitscore'],
+...                    compact=True, best_hits=True)
+>>> df
+  qseqid  length  bitscore
+0   moaC     161     330.0
+>>> df.dtypes
+qseqid      category
+length         Int32
+bitscore     float32
+dtype: object
+
 References
 ----------
 .. [1] Altschul, S.F., Gish, W., Miller, W., Myers, E.W. & Lipman, D.J. (1990)
@@ -245,7 +288,7 @@ References
 import pandas as pd
 
 from skbio.io import create_format
-from skbio.io.format._blast import _parse_blast_data, _possible_columns
+from skbio.io.format._blast import _parse_blast_data, _possible_columns, _chunksize
 
 blast6 = create_format("blast+6")
 
@@ -265,8 +308,52 @@ _default_columns = [
 ]
 
 
+@blast6.reader(None)
+def _blast6_to_generator(
+    fh,
+    columns=None,
+    default_columns=False,
+    usecols=None,
+    compact=False,
+    chunksize=_chunksize,
+):
+    yield from _parse_blast_data(
+        fh,
+        _get_columns(columns, default_columns),
+        ValueError,
+        _column_count_message,
+        usecols=usecols,
+        compact=compact,
+        chunksize=chunksize,
+    )
+
+
 @blast6.reader(pd.DataFrame, monkey_patch=False)
-def _blast6_to_data_frame(fh, columns=None, default_columns=False):
+def _blast6_to_data_frame(
+    fh,
+    columns=None,
+    default_columns=False,
+    usecols=None,
+    compact=False,
+    best_hits=False,
+):
+    return _parse_blast_data(
+        fh,
+        _get_columns(columns, default_columns),
+        ValueError,
+        _column_count_message,
+        usecols=usecols,
+        compact=compact,
+        best_hits=best_hits,
+    )
+
+
+_column_count_message = (
+    "Specified number of columns (%r) does not equal number of columns in file (%r)."
+)
+
+
+def _get_columns(columns, default_columns):
     if default_columns and columns is not None:
         raise ValueError("`columns` and `default_columns` cannot both be" " provided.")
     if not default_columns and columns is None:
@@ -280,11 +367,4 @@ def _blast6_to_data_frame(fh, columns=None, default_columns=False):
                     "Unrecognized column (%r)."
                     " Supported columns:\n%r" % (column, set(_possible_columns.keys()))
                 )
-
-    return _parse_blast_data(
-        fh,
-        columns,
-        ValueError,
-        "Specified number of columns (%r) does not equal"
-        " number of columns in file (%r).",
-    )
+    return columns
@@ -37,6 +37,8 @@ Format Support
 +======+======+===============================================================+
 |Yes   |No    |:mod:`pandas.DataFrame`                                        |
 +------+------+---------------------------------------------------------------+
+|Yes   |No    |generator of :mod:`pandas.DataFrame`                           |
++------+------+---------------------------------------------------------------+
 
 Format Specification
 ====================
@@ -180,6 +182,13 @@ For more information on these column types, see :mod:`skbio.io.format.blast6`.
 |per hsp            |                      |
 +-------------------+----------------------+
 
+Format Parameters
+=================
+The ``usecols``, ``compact``, ``chunksize`` and ``best_hits`` parameters of
+the ``blast+6`` readers are also available to the ``blast+7`` readers, to read
+the columns of a large file selectively, in less memory, in chunks, or only
+for the best hit of each query. See :mod:`skbio.io.format.blast6` for details.
+
 Examples
 --------
 Suppose we have a BLAST+7 file:
@@ -261,9 +270,9 @@ References
 import pandas as pd
 
 from skbio.io import create_format, BLAST7FormatError
-from skbio.io.format._blast import _parse_blast_data
+from skbio.io.format._blast import _parse_blast_data, _chunksize
 
-blast7 = create_format("blast+7")
+blast7 = create_format("blast+7", magic=(b"# BLAST",))
 
 column_converter = {
     "query id": "qseqid",
@@ -341,8 +350,45 @@ def _blast7_sniffer(fh):
     return True, {}
 
 
+@blast7.reader(None)
+def _blast7_to_generator(fh, usecols=None, compact=False, chunksize=_chunksize):
+    columns, skiprows = _parse_header(fh)
+    yield from _parse_blast_data(
+        fh,
+        columns,
+        BLAST7FormatError,
+        _field_count_message,
+        comment="#",
+        skiprows=skiprows,
+        usecols=usecols,
+        compact=compact,
+        chunksize=chunksize,
+    )
+
+
 @blast7.reader(pd.DataFrame, monkey_patch=False)
-def _blast7_to_data_frame(fh):
+def _blast7_to_data_frame(fh, usecols=None, compact=False, best_hits=False):
+    columns, skiprows = _parse_header(fh)
+    return _parse_blast_data(
+        fh,
+        columns,
+        BLAST7FormatError,
+        _field_count_message,
+        comment="#",
+        skiprows=skiprows,
+        usecols=usecols,
+        compact=compact,
+        best_hits=best_hits,
+    )
+
+
+_field_count_message = (
+    "Number of fields (%r) does not equal number of data columns (%r)."
+)
+
+
+def _parse_header(fh):
+    """Return the columns of the file and the lines of legacy field names."""
     line_num = 0
     columns = None
     skiprows = []
@@ -377,15 +423,7 @@ def _blast7_to_data_frame(fh):
         # Affirms file contains BLAST data
         raise BLAST7FormatError("File contains no BLAST data.")
     fh.seek(0)
-
-    return _parse_blast_data(
-        fh,
-        columns,
-        BLAST7FormatError,
-        "Number of fields (%r) does not equal number" " of data columns (%r).",
-        comment="#",
-        skiprows=skiprows,
-    )
+    return columns, skiprows
 
 
 def _parse_fields(line, legacy=False):
@@ -148,7 +148,9 @@ from skbio.io import create_format, ClustalFormatError
 from skbio.alignment import TabularMSA
 
 
-clustal = create_format("clustal")
+clustal = create_format(
+    "clustal", extensions=(".aln", ".clustal", ".clw"), magic=(b"CLUSTAL",)
+)
 
 
 def _label_line_parser(record):
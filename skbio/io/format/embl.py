@@ -71,6 +71,20 @@ the EMBL files downloaded from ENA. For the RNA molecules, ``t``
 (thymine), instead of ``u`` (uracil) is used in the sequence. All
 EMBL writers follow these conventions while writing EMBL files.
 
+Format Parameters
+-----------------
+
+Reader-specific Parameters
+^^^^^^^^^^^^^^^^^^^^^^^^^^
+``sections`` lists the sections to parse, named as in GenBank, e.g.
+``sections=('LOCUS', 'ORIGIN')`` to read only the sequences. The other lines
+are skipped without being parsed. ``LOCUS`` (the ``ID`` line) is always
+parsed, but its ``date`` is taken from ``DATE`` and is ``None`` unless that
+section is parsed too. ``FEATURES`` requires ``ORIGIN``. ``PARENT_ACCESSION``
+is also read along with ``FEATURES``, as it tells whether the features belong
+to a parent entry. See the GenBank format for how the ``FEATURES`` section is
+parsed lazily.
+
 Examples
 --------
 Reading EMBL Files
@@ -298,6 +312,7 @@ References
 # std modules
 import re
 import copy
+import string
 import textwrap
 
 from functools import partial
@@ -306,6 +321,7 @@ from functools import partial
 from skbio.io import create_format, EMBLFormatError
 from skbio.io.format._base import _line_generator, _get_nth_sequence
 from skbio.io.format._sequence_feature_vocabulary import (
+    _selected_sections,
     _yield_section,
     _parse_single_feature,
     _serialize_section_default,
@@ -317,7 +333,7 @@ from skbio.util._misc import chunk_str
 
 
 # look at skbio.io.registry to have an idea on how to define this class
-embl = create_format("embl")
+embl = create_format("embl", extensions=(".embl",), magic=(b"ID   ",))
 
 # This list is ordered used to read and write embl file. By processing those
 # values one by one, I will write embl sections with the same order
@@ -538,35 +554,35 @@ def _embl_sniffer(fh):
 
 
 @embl.reader(None)
-def _embl_to_generator(fh, constructor=None, **kwargs):
-    for record in _parse_embls(fh):
+def _embl_to_generator(fh, constructor=None, sections=None, **kwargs):
+    for record in _parse_embls(fh, sections):
         yield _construct(record, constructor, **kwargs)
 
 
 # Method to read EMBL data as skbio.sequence.DNA
 @embl.reader(Sequence)
-def _embl_to_sequence(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_embls(fh), seq_num)
+def _embl_to_sequence(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_embls(fh, sections), seq_num)
     return _construct(record, Sequence, **kwargs)
 
 
 # Method to read EMBL data as skbio.sequence.DNA
 @embl.reader(DNA)
-def _embl_to_dna(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_embls(fh), seq_num)
+def _embl_to_dna(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_embls(fh, sections), seq_num)
     return _construct(record, DNA, **kwargs)
 
 
 # Method to read EMBL data as skbio.sequence.DNA
 @embl.reader(RNA)
-def _embl_to_rna(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_embls(fh), seq_num)
+def _embl_to_rna(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_embls(fh, sections), seq_num)
     return _construct(record, RNA, **kwargs)
 
 
 # No protein support at the moment
 @embl.reader(Protein)
-def _embl_to_protein(fh, seq_num=1, **kwargs):
+def _embl_to_protein(fh, seq_num=1, sections=None, **kwargs):
     # no protein support, at the moment
     raise EMBLFormatError(
         "There's no protein support for EMBL record. "
@@ -629,21 +645,41 @@ def _construct(record, constructor=None, **kwargs):
             raise EMBLFormatError("There's no protein support for EMBL record")
 
     if constructor == RNA:
-        return DNA(seq, metadata=md, interval_metadata=imd, **kwargs).transcribe()
+        obj = DNA(seq, metadata=md, **kwargs).transcribe()
     else:
-        return constructor(seq, metadata=md, interval_metadata=imd, **kwargs)
+        obj = constructor(seq, metadata=md, **kwargs)
+
+    # the feature table is parsed when interval metadata is first accessed,
+    # unless its length doesn't match the sequence, which is reported now
+    if imd is not None:
+        if md["LOCUS"]["size"] == len(obj):
+            obj._defer_interval_metadata_(imd)
+        else:
+            obj.interval_metadata = imd()
+    return obj
 
 
 # looks like the genbank _parse_genbank
-def _parse_embls(fh):
+def _parse_embls(fh, sections=None):
     """Chunk multiple EMBL records by '//', and returns a generator."""
+    selected = _selected_sections(sections)
+    if selected is not None and "FEATURES" in selected:
+        # needed to tell feature-level products, whose features are skipped
+        selected |= {"PARENT_ACCESSION"}
+
     data_chunks = []
     for line in _line_generator(fh, skip_blanks=True, strip=False):
         if line.startswith("//"):
             yield _parse_single_embl(data_chunks)
             data_chunks = []
-        else:
+        elif selected is None:
             data_chunks.append(line)
+        else:
+            # keep spacers, which split references, and unknown keys, which
+            # are reported by the parser
+            section = KEYS_2_SECTIONS.get(_get_embl_key(line), "SPACER")
+            if section in selected or section == "SPACER":
+                data_chunks.append(line)
 
 
 def _parse_single_embl(chunks):
@@ -689,8 +725,12 @@ def _parse_single_embl(chunks):
             # partials add arguments to previous defined functions
             parser = partial(parser, join_delimiter="\n")
 
-        # call function on section
-        parsed = parser(section)
+        # call function on section. The feature table is only parsed when
+        # interval metadata is accessed
+        if section_name == "FEATURES":
+            parsed = partial(parser, section)
+        else:
+            parsed = parser(section)
 
         # reference can appear multiple times
         if section_name == "REFERENCE":
@@ -1331,24 +1371,18 @@ def _serialize_source(header, obj, indent=5):
     return s
 
 
-def _parse_sequence(lines):
-    """Parse the sequence section for sequence."""
-    # result array
-    sequence = []
+_sequence_numbering = re.compile(r"(?<!\S)\d+(?!\S)")
+_whitespace = str.maketrans("", "", string.whitespace)
 
-    for line in lines:
-        # ignore record like:
-        # SQ   Sequence 275 BP; 64 A; 73 C; 88 G; 50 T; 0 other;
-        if line.startswith("SQ"):
-            continue
 
-        # remove the numbers inside strings. revome spaces around string
-        items = [i for i in line.split() if not i.isdigit()]
-
-        # append each sequence items to sequence list
-        sequence += items
+def _parse_sequence(lines):
+    """Parse the sequence section for sequence."""
+    # ignore record like:
+    # SQ   Sequence 275 BP; 64 A; 73 C; 88 G; 50 T; 0 other;
+    sequence = "\n".join(line for line in lines if not line.startswith("SQ"))
 
-    return "".join(sequence)
+    # remove the numbers at the end of lines, then all the spaces
+    return _sequence_numbering.sub("", sequence).translate(_whitespace)
 
 
 def _serialize_sequence(obj, indent=5):
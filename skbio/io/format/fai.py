@@ -0,0 +1,422 @@
+r"""FASTA/FASTQ index format (:mod:`skbio.io.format.fai`)
+====================================================
+
+.. currentmodule:: skbio.io.format.fai
+
+The FASTA index format (``fai``) records, for every sequence in a FASTA or
+FASTQ file, where its data start in the file and how they are wrapped over
+lines. This allows a single sequence, or a region of it, to be read without
+parsing the records preceding it. The format is the one written by
+``samtools faidx`` and ``samtools fqidx`` [1]_, so indexes created by either
+tool can be used by scikit-bio and vice versa.
+
+Format Support
+--------------
+**Has Sniffer: No**
+
++------+------+---------------------------------------------------------------+
+|Reader|Writer|                          Object Class                         |
++======+======+===============================================================+
+|Yes   |Yes   |:mod:`pandas.DataFrame`                                        |
++------+------+---------------------------------------------------------------+
+
+Format Specification
+--------------------
+**State: Experimental as of 0.6.0.**
+
+An index is a tab-separated file without a header line. Each line describes
+one record of the indexed file, in the order the records appear in it, using
+the following columns:
+
++-----------+-----------------------------------------------------------------+
+|Name       |Description                                                      |
++===========+=================================================================+
+|name       |Sequence ID (the first word of the header line)                  |
++-----------+-----------------------------------------------------------------+
+|length     |Total number of characters in the sequence                       |
++-----------+-----------------------------------------------------------------+
+|offset     |Offset in bytes of the first sequence character in the file      |
++-----------+-----------------------------------------------------------------+
+|linebases  |Number of sequence characters on each line                       |
++-----------+-----------------------------------------------------------------+
+|linewidth  |Number of bytes on each line, including the line terminator      |
++-----------+-----------------------------------------------------------------+
+|qualoffset |Offset in bytes of the first quality score character (FASTQ      |
+|           |indexes only)                                                    |
++-----------+-----------------------------------------------------------------+
+
+For an index to be usable, every sequence (and quality score) line of a record
+except the last must contain the same number of characters, and the lines must
+not be padded with whitespace. Blank lines may only appear between records.
+
+When read into a ``pd.DataFrame``, the index is keyed by sequence ID and all
+other columns are integers.
+
+Building and Using an Index
+^^^^^^^^^^^^^^^^^^^^^^^^^^^
+An index for a FASTA or FASTQ file can be built with
+:func:`skbio.io.util.build_fai` and saved in this format. The ``Sequence``,
+``DNA``, ``RNA`` and ``Protein`` readers of :mod:`skbio.io.format.fasta` and
+:mod:`skbio.io.format.fastq` accept the index through their ``fai`` parameter,
+together with the following parameters selecting what to read:
+
+- ``seq_id``: ID of the sequence to read. If not provided, ``seq_num`` selects
+  the sequence instead.
+
+- ``start`` and ``end``: If provided, only the region ``[start:end]`` of the
+  sequence is read, following Python's slicing semantics. The result is
+  identical to slicing the full sequence, but only the requested part of the
+  file is read.
+
+If ``seq_id``, ``start`` or ``end`` are provided without an index, one is
+built in memory first, which requires a single pass through the file that is
+much cheaper than parsing it.
+
+.. note:: Unless ``verify=False`` is passed to the reader, the registry checks
+   that the file is valid FASTA/FASTQ by parsing its first few records before
+   reading. For large genomes this check can take longer than the indexed read
+   itself.
+
+Examples
+--------
+>>> from io import StringIO
+>>> import pandas as pd
+>>> import skbio.io
+>>> from skbio import DNA
+>>> from skbio.io.util import build_fai
+>>> fasta = StringIO('>chr1 first chromosome\nACGTA\nCGTAC\nGT\n'
+...                  '>chr2 second chromosome\nTTTTT\nGGG\n')
+
+Build an index of the FASTA file and save it in ``fai`` format:
+
+>>> fai = build_fai(fasta)
+>>> fai # doctest: +NORMALIZE_WHITESPACE
+      length  offset  linebases  linewidth
+name
+chr1      12      23          5          6
+chr2       8      62          5          6
+>>> fh = skbio.io.write(fai, format='fai', into=StringIO())
+>>> print(fh.getvalue()) # doctest: +NORMALIZE_WHITESPACE
+chr1    12    23    5    6
+chr2    8     62    5    6
+<BLANKLINE>
+
+Use the index to read part of the second sequence:
+
+>>> seq = DNA.read(fasta, fai=fai, seq_id='chr2', start=3, end=7,
+...                verify=False)
+>>> seq
+DNA
+--------------------------------------
+Metadata:
+    'description': 'second chromosome'
+    'id': 'chr2'
+Stats:
+    length: 4
+    has gaps: False
+    has degenerates: False
+    has definites: True
+    GC-content: 50.00%
+--------------------------------------
+0 TTGG
+
+References
+----------
+.. [1] Danecek, P., Bonfield, J. K., Liddle, J., Marshall, J., Ohan, V.,
+   Pollard, M. O., ... & Li, H. (2021). Twelve years of SAMtools and BCFtools.
+   Gigascience, 10(2), giab008.
+
+
+"""  # noqa: D205, D415
+
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import pandas as pd
+
+from skbio.io import create_format, read, FASTAFormatError, FASTQFormatError
+from skbio.io.format._base import _parse_fasta_like_header
+from skbio.util import cardinal_to_ordinal
+
+fai = create_format("fai", extensions=(".fai",))
+
+_fai_columns = ["length", "offset", "linebases", "linewidth", "qualoffset"]
+
+
+@fai.reader(pd.DataFrame, monkey_patch=False)
+def _fai_to_data_frame(fh):
+    try:
+        df = pd.read_csv(fh, sep="\t", header=None, index_col=0, dtype={0: str})
+        if df.shape[1] not in (4, 5):
+            raise ValueError
+        df.columns = _fai_columns[: df.shape[1]]
+        df.index.name = "name"
+        return df.astype(int)
+    except (ValueError, pd.errors.EmptyDataError):
+        raise ValueError("Invalid fai file format.")
+
+
+@fai.writer(pd.DataFrame, monkey_patch=False)
+def _data_frame_to_fai(obj, fh):
+    obj.to_csv(fh, sep="\t", header=False)
+
+
+def _raw(fh):
+    # Offsets in an index refer to the undecoded file, so read through the
+    # underlying binary buffer when there is one. Text-only sources (e.g.,
+    # StringIO) are addressed by character instead, which is the same for the
+    # ASCII files that can be indexed.
+    return getattr(fh, "buffer", fh)
+
+
+def _build_fai(fh, fastq=False):
+    raw = _raw(fh)
+    raw.seek(0)
+    if fastq:
+        records = _index_fastq(raw)
+        columns = _fai_columns
+    else:
+        records = _index_fasta(raw)
+        columns = _fai_columns[:4]
+
+    names = []
+    rows = []
+    for name, *row in records:
+        names.append(name)
+        rows.append(row)
+    df = pd.DataFrame(rows, index=pd.Index(names, name="name"), columns=columns)
+    if not df.index.is_unique:
+        error = FASTQFormatError if fastq else FASTAFormatError
+        raise error(
+            "Cannot index a file with duplicate sequence IDs: %r"
+            % str(df.index[df.index.duplicated()][0])
+        )
+    return df.astype(int)
+
+
+class _LineLayout:
+    # Line layout of one section of a record (sequence or quality scores).
+    # All lines but the last must be equally wide for the position of any
+    # character to be computed from the index alone.
+    def __init__(self, name, error):
+        self.name = name
+        self.error = error
+        self.length = 0
+        self.linebases = None
+        self.linewidth = None
+        self._ended = False
+
+    def add(self, line):
+        bases = len(line.rstrip(b"\r\n" if isinstance(line, bytes) else "\r\n"))
+        if self.linebases is None:
+            self.linebases, self.linewidth = bases, len(line)
+        elif self._ended or bases > self.linebases:
+            raise self.error(
+                "Cannot index record %r: its lines are of different lengths."
+                % str(self.name)
+            )
+        if bases < self.linebases or len(line) != self.linewidth:
+            self._ended = True
+        self.length += bases
+
+
+def _is_blank(line):
+    return not line.strip()
+
+
+def _header_id(line):
+    if isinstance(line, bytes):
+        line = line.decode("utf-8")
+    return _parse_fasta_like_header(line)[0]
+
+
+def _index_fasta(raw):
+    offset = 0
+    name = None
+    blank = False
+    for line in raw:
+        if line[:1] in (b">", ">"):
+            if name is not None:
+                yield _fasta_record(name, seq_offset, layout)
+            name = _header_id(line)
+            seq_offset = offset + len(line)
+            layout = _LineLayout(name, FASTAFormatError)
+            blank = False
+        elif _is_blank(line):
+            blank = True
+        elif name is None:
+            raise FASTAFormatError(
+                "Found non-header line when attempting to read the 1st record."
+            )
+        elif blank:
+            raise FASTAFormatError(
+                "Cannot index record %r: found blank or whitespace-only line "
+                "within record." % str(name)
+            )
+        else:
+            layout.add(line)
+        offset += len(line)
+    if name is not None:
+        yield _fasta_record(name, seq_offset, layout)
+
+
+def _fasta_record(name, offset, layout):
+    if not layout.length:
+        raise FASTAFormatError("Found header without sequence data.")
+    return name, layout.length, offset, layout.linebases, layout.linewidth
+
+
+def _index_fastq(raw):
+    offset = 0
+    lines = iter(raw)
+    for line in lines:
+        offset += len(line)
+        if _is_blank(line):
+            continue
+        if line[:1] not in (b"@", "@"):
+            raise FASTQFormatError(
+                "Expected sequence (@) header line at start of record: %r" % line
+            )
+        name = _header_id(line)
+        seq_offset = offset
+        seq = _LineLayout(name, FASTQFormatError)
+        for line in lines:
+            offset += len(line)
+            if line[:1] in (b"+", "+"):
+                break
+            _check_not_blank(line, name)
+            seq.add(line)
+        else:
+            raise FASTQFormatError(
+                "Found incomplete/truncated FASTQ record at end of file."
+            )
+        if not seq.length:
+            raise FASTQFormatError("Found FASTQ record without sequence data.")
+
+        qual_offset = offset
+        qual = _LineLayout(name, FASTQFormatError)
+        while qual.length < seq.length:
+            line = next(lines, None)
+            if line is None:
+                raise FASTQFormatError(
+                    "Found incomplete/truncated FASTQ record at end of file."
+                )
+            offset += len(line)
+            _check_not_blank(line, name)
+            qual.add(line)
+        if (qual.length, qual.linebases, qual.linewidth) != (
+            seq.length,
+            seq.linebases,
+            seq.linewidth,
+        ):
+            raise FASTQFormatError(
+                "Cannot index record %r: its quality scores are not wrapped "
+                "in the same way as its sequence." % str(name)
+            )
+        yield name, seq.length, seq_offset, seq.linebases, seq.linewidth, qual_offset
+
+
+def _check_not_blank(line, name):
+    if _is_blank(line):
+        raise FASTQFormatError(
+            "Cannot index record %r: found blank or whitespace-only line "
+            "within record." % str(name)
+        )
+
+
+def _read_indexed(fh, fai, seq_num, seq_id, start, end, fastq=False):
+    # Returns the (sequence, id, description, quality) of the requested
+    # record region, reading only that region from `fh`. `quality` is None
+    # for FASTA files.
+    error = FASTQFormatError if fastq else FASTAFormatError
+    if fai is None:
+        fai = _build_fai(fh, fastq=fastq)
+    elif not isinstance(fai, pd.DataFrame):
+        fai = read(fai, format="fai", into=pd.DataFrame)
+    if fastq and "qualoffset" not in fai.columns:
+        raise ValueError("A FASTQ index must have a `qualoffset` column.")
+
+    if seq_id is not None:
+        if seq_id not in fai.index:
+            raise ValueError("Sequence ID %r is not in the index." % str(seq_id))
+        record = fai.loc[seq_id]
+    else:
+        if seq_num is None or seq_num < 1:
+            raise ValueError(
+                "Invalid sequence number (`seq_num`=%s). `seq_num`"
+                " must be between 1 and the number of sequences in"
+                " the file." % str(seq_num)
+            )
+        if seq_num > len(fai):
+            raise ValueError(
+                "Reached end of file before finding the %s sequence."
+                % cardinal_to_ordinal(seq_num)
+            )
+        record = fai.iloc[seq_num - 1]
+
+    start, stop, _ = slice(start, end).indices(int(record["length"]))
+    stop = max(start, stop)
+    offset = int(record["offset"])
+    linebases = int(record["linebases"])
+    linewidth = int(record["linewidth"])
+
+    raw = _raw(fh)
+    header = _read_header(raw, offset)
+    id_, desc = _parse_fasta_like_header(header)
+    seq = _read_region(raw, offset, linebases, linewidth, start, stop)
+    if header[:1] != ("@" if fastq else ">") or id_ != record.name:
+        raise error(
+            "Record %r in the index does not match the file. The index may "
+            "be out of date." % str(record.name)
+        )
+
+    qual = None
+    if fastq:
+        qual = _read_region(
+            raw, int(record["qualoffset"]), linebases, linewidth, start, stop
+        )
+    if len(seq) != stop - start or (fastq and len(qual) != stop - start):
+        raise error(
+            "Record %r in the index does not match the file. The index may "
+            "be out of date." % str(record.name)
+        )
+    return seq, id_, desc, qual
+
+
+def _read_header(raw, offset):
+    # The header is the line immediately preceding the first sequence line.
+    size = 256
+    while True:
+        begin = max(0, offset - size)
+        raw.seek(begin)
+        chunk = raw.read(offset - begin)
+        newline = b"\n" if isinstance(chunk, bytes) else "\n"
+        chunk = chunk.rstrip(b"\r\n" if isinstance(chunk, bytes) else "\r\n")
+        i = chunk.rfind(newline)
+        if i >= 0 or begin == 0:
+            header = chunk[i + 1 :]
+            break
+        size *= 4
+    if isinstance(header, bytes):
+        header = header.decode("utf-8")
+    return header
+
+
+def _read_region(raw, offset, linebases, linewidth, start, stop):
+    if start >= stop:
+        return ""
+    first = offset + start // linebases * linewidth + start % linebases
+    last = offset + (stop - 1) // linebases * linewidth + (stop - 1) % linebases
+    raw.seek(first)
+    data = raw.read(last - first + 1)
+    if isinstance(data, bytes):
+        return data.translate(None, b"\r\n").decode("ascii")
+    return data.translate(_newline_table)
+
+
+_newline_table = str.maketrans("", "", "\r\n")
@@ -216,6 +216,13 @@ sequence to read from the FASTA file (and optional QUAL file), and defaults to
 1 (i.e., such that the first sequence is read). For example, to read the 50th
 sequence from a FASTA file, you would pass ``seq_num=50`` to the reader call.
 
+These readers can also read a sequence, or a region of it, directly through an
+index of the FASTA file, without parsing the preceding records. The index is
+provided with the ``fai`` parameter, and the sequence is selected with
+``seq_id`` (or ``seq_num``) and the region with ``start`` and ``end``. See
+:mod:`skbio.io.format.fai` for details. QUAL files cannot be read through an
+index.
+
 Writer-specific Parameters
 ^^^^^^^^^^^^^^^^^^^^^^^^^^
 The following parameters are available to all FASTA format writers:
@@ -271,6 +278,12 @@ The following parameters are available to all FASTA format writers:
    would result in an ID of ``'seq'``, and ``'1'`` would be part of the
    sequence description.
 
+.. note:: The FASTA and FASTQ writers format many records at a time and write
+   them to the file in large blocks. When writing a compressed file, the
+   ``compresslevel`` parameter of :func:`skbio.io.util.open` can be passed
+   to the write call to trade file size for speed; for example,
+   ``compresslevel=1`` is much faster to write than the default of 9.
+
 Examples
 --------
 Reading and Writing FASTA Files
@@ -613,19 +626,25 @@ import numpy as np
 
 from skbio.io import create_format, FASTAFormatError, QUALFormatError
 from skbio.io.registry import FileSentinel
+from skbio.io.format.fai import _read_indexed
 from skbio.io.format._base import (
     _get_nth_sequence,
     _parse_fasta_like_header,
     _format_fasta_like_records,
+    _batch_fasta_like_records,
+    _wrap_lines,
     _line_generator,
     _too_many_blanks,
 )
-from skbio.util._misc import chunk_str
 from skbio.alignment import TabularMSA
 from skbio.sequence import Sequence, DNA, RNA, Protein
 
 
-fasta = create_format("fasta")
+fasta = create_format(
+    "fasta",
+    extensions=(".fasta", ".fa", ".fna", ".faa", ".ffn", ".fas", ".fsa"),
+    magic=(b">",),
+)
 
 
 @fasta.sniffer()
@@ -713,30 +732,66 @@ def _fasta_to_generator(fh, qual=FileSentinel, constructor=Sequence, **kwargs):
 
 
 @fasta.reader(Sequence)
-def _fasta_to_sequence(fh, qual=FileSentinel, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fasta_to_generator(fh, qual=qual, constructor=Sequence, **kwargs), seq_num
+def _fasta_to_sequence(
+    fh,
+    qual=FileSentinel,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fasta_to_single_sequence(
+        fh, qual, seq_num, fai, seq_id, start, end, Sequence, kwargs
     )
 
 
 @fasta.reader(DNA)
-def _fasta_to_dna(fh, qual=FileSentinel, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fasta_to_generator(fh, qual=qual, constructor=DNA, **kwargs), seq_num
+def _fasta_to_dna(
+    fh,
+    qual=FileSentinel,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fasta_to_single_sequence(
+        fh, qual, seq_num, fai, seq_id, start, end, DNA, kwargs
     )
 
 
 @fasta.reader(RNA)
-def _fasta_to_rna(fh, qual=FileSentinel, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fasta_to_generator(fh, qual=qual, constructor=RNA, **kwargs), seq_num
+def _fasta_to_rna(
+    fh,
+    qual=FileSentinel,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fasta_to_single_sequence(
+        fh, qual, seq_num, fai, seq_id, start, end, RNA, kwargs
     )
 
 
 @fasta.reader(Protein)
-def _fasta_to_protein(fh, qual=FileSentinel, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fasta_to_generator(fh, qual=qual, constructor=Protein, **kwargs), seq_num
+def _fasta_to_protein(
+    fh,
+    qual=FileSentinel,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fasta_to_single_sequence(
+        fh, qual, seq_num, fai, seq_id, start, end, Protein, kwargs
     )
 
 
@@ -782,17 +837,29 @@ def _generator_to_fasta(
         qual is not None,
         lowercase,
     )
-    for header, seq_str, qual_scores in formatted_records:
-        if max_width is not None:
-            seq_str = chunk_str(seq_str, max_width, "\n")
-
-        fh.write(">%s\n%s\n" % (header, seq_str))
+    for batch in _batch_fasta_like_records(formatted_records):
+        seq_strs = [seq_str for _, seq_str, _ in batch]
+        if max_width is None:
+            seq_strs = ["%s\n" % seq_str for seq_str in seq_strs]
+        else:
+            seq_strs = _wrap_lines(seq_strs, max_width)
+        fh.write(
+            "".join(
+                [
+                    ">%s\n%s" % (header, seq_str)
+                    for (header, _, _), seq_str in zip(batch, seq_strs)
+                ]
+            )
+        )
 
         if qual is not None:
-            qual_str = " ".join(np.asarray(qual_scores, dtype=str))
-            if max_width is not None:
-                qual_str = qual_wrapper.fill(qual_str)
-            qual.write(">%s\n%s\n" % (header, qual_str))
+            qual_records = []
+            for header, _, qual_scores in batch:
+                qual_str = " ".join(map(str, qual_scores.tolist()))
+                if max_width is not None:
+                    qual_str = qual_wrapper.fill(qual_str)
+                qual_records.append(">%s\n%s\n" % (header, qual_str))
+            qual.write("".join(qual_records))
 
 
 @fasta.writer(Sequence)
@@ -900,6 +967,21 @@ def _tabular_msa_to_fasta(
     )
 
 
+def _fasta_to_single_sequence(
+    fh, qual, seq_num, fai, seq_id, start, end, constructor, kwargs
+):
+    if fai is None and seq_id is None and start is None and end is None:
+        return _get_nth_sequence(
+            _fasta_to_generator(fh, qual=qual, constructor=constructor, **kwargs),
+            seq_num,
+        )
+
+    if qual is not None:
+        raise ValueError("Cannot read a QUAL file when reading through an index.")
+    seq, id_, desc, _ = _read_indexed(fh, fai, seq_num, seq_id, start, end)
+    return constructor(seq, metadata={"id": id_, "description": desc}, **kwargs)
+
+
 def _parse_fasta_raw(fh, data_parser, error_type):
     """Raw parser for FASTA or QUAL files.
 
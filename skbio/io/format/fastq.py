@@ -158,6 +158,8 @@ The following additional parameters are the same as in FASTA format
 
 - ``seq_num``: see ``seq_num`` parameter in FASTA format
 
+- ``fai``, ``seq_id``, ``start`` and ``end``: see :mod:`skbio.io.format.fai`
+
 - ``id_whitespace_replacement``: see ``id_whitespace_replacement`` parameter in
   FASTA format
 
@@ -166,6 +168,30 @@ The following additional parameters are the same as in FASTA format
 
 - ``lowercase``: see ``lowercase`` parameter in FASTA format
 
+Reading High-Throughput Data
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+Constructing a sequence object for every read is by far the most expensive
+part of parsing a FASTQ file. When reading a FASTQ file into a generator, the
+following parameters can be used to skip object construction entirely:
+
+- ``lightweight``: If ``True``, the generator yields plain tuples of
+  ``(id, description, sequence, quality)`` instead of sequence objects, where
+  ``sequence`` is a string exactly as it appears in the file and ``quality`` is
+  a ``uint8`` array of Phred scores. ``constructor`` and any additional keyword
+  arguments for it are ignored. Defaults to ``False``.
+
+- ``batch_size``: A positive integer. If provided, the generator yields
+  batches of up to ``batch_size`` records instead of individual records. Each
+  batch is a tuple of four lists ``(ids, descriptions, sequences,
+  qualities)`` in the same form as ``lightweight`` records. Implies
+  ``lightweight``.
+
+In all cases, the quality scores of many records are decoded and validated
+together, so it is worthwhile to use a ``batch_size`` of several thousand
+records when reading large files. Records are validated in exactly the same way
+regardless of these parameters, and all records preceding an invalid one are
+yielded before an error is raised.
+
 Examples
 --------
 Suppose we have the following FASTQ file with two DNA sequences::
@@ -240,6 +266,16 @@ Stats:
 ----------------------------------------
 0 TATGTATATA TAACATATAC ATATATACAT ACATA
 
+To iterate over reads without constructing sequence objects, we can read them
+in batches:
+
+>>> from skbio.io import read
+>>> fh = StringIO(fs)
+>>> for ids, descriptions, seqs, quals in read(fh, format='fastq',
+...                                            variant='sanger', batch_size=2):
+...     print(ids, [len(seq) for seq in seqs], quals[1][:5].tolist())
+['seq1', 'seq2'] [35, 35] [60, 42, 57, 58, 47]
+
 To write our ``TabularMSA`` to a FASTQ file with quality scores encoded using
 the ``illumina1.3`` variant:
 
@@ -284,16 +320,21 @@ References
 # ----------------------------------------------------------------------------
 
 import re
+import warnings
+from itertools import chain, islice
 
 import numpy as np
 
 from skbio.io import create_format, FASTQFormatError
+from skbio.io.format.fai import _read_indexed
 from skbio.io.format._base import (
     _decode_qual_to_phred,
-    _encode_phred_to_qual,
+    _decode_qual_block_to_phred,
+    _encode_phred_block_to_qual,
     _get_nth_sequence,
     _parse_fasta_like_header,
     _format_fasta_like_records,
+    _batch_fasta_like_records,
     _line_generator,
     _too_many_blanks,
 )
@@ -302,8 +343,13 @@ from skbio.sequence import Sequence, DNA, RNA, Protein
 
 _whitespace_regex = re.compile(r"\s")
 
+# bounds on the number of records decoded together when reading into sequence
+# objects; see `_parse_fastq_batches`
+_min_batch_size = 16
+_max_batch_size = 4096
+
 
-fastq = create_format("fastq")
+fastq = create_format("fastq", extensions=(".fastq", ".fq"), magic=(b"@",))
 
 
 @fastq.sniffer()
@@ -333,85 +379,98 @@ def _fastq_sniffer(fh):
 
 @fastq.reader(None)
 def _fastq_to_generator(
-    fh, variant=None, phred_offset=None, constructor=Sequence, **kwargs
+    fh,
+    variant=None,
+    phred_offset=None,
+    constructor=Sequence,
+    lightweight=False,
+    batch_size=None,
+    **kwargs,
 ):
-    # Skip any blank or whitespace-only lines at beginning of file
-    try:
-        seq_header = next(_line_generator(fh, skip_blanks=True))
-    except StopIteration:
+    if batch_size is not None:
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be a positive integer.")
+        yield from _parse_fastq_batches(fh, variant, phred_offset, batch_size)
         return
 
-    if not seq_header.startswith("@"):
-        raise FASTQFormatError(
-            "Expected sequence (@) header line at start of file: %r" % str(seq_header)
-        )
-
-    while seq_header is not None:
-        id_, desc = _parse_fasta_like_header(seq_header)
-        seq, qual_header = _parse_sequence_data(fh, seq_header)
-
-        if qual_header != "+" and qual_header[1:] != seq_header[1:]:
-            raise FASTQFormatError(
-                "Sequence (@) and quality (+) header lines do not match: "
-                "%r != %r" % (str(seq_header[1:]), str(qual_header[1:]))
-            )
-
-        phred_scores, seq_header = _parse_quality_scores(
-            fh, len(seq), variant, phred_offset, qual_header
-        )
-        yield constructor(
-            seq,
-            metadata={"id": id_, "description": desc},
-            positional_metadata={"quality": phred_scores},
-            **kwargs,
-        )
+    for ids, descs, seqs, quals in _parse_fastq_batches(fh, variant, phred_offset):
+        if lightweight:
+            yield from zip(ids, descs, seqs, quals)
+        else:
+            for id_, desc, seq, phred_scores in zip(ids, descs, seqs, quals):
+                yield constructor(
+                    seq,
+                    metadata={"id": id_, "description": desc},
+                    positional_metadata={"quality": phred_scores},
+                    **kwargs,
+                )
 
 
 @fastq.reader(Sequence)
-def _fastq_to_sequence(fh, variant=None, phred_offset=None, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fastq_to_generator(
-            fh,
-            variant=variant,
-            phred_offset=phred_offset,
-            constructor=Sequence,
-            **kwargs,
-        ),
-        seq_num,
+def _fastq_to_sequence(
+    fh,
+    variant=None,
+    phred_offset=None,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fastq_to_single_sequence(
+        fh, variant, phred_offset, seq_num, fai, seq_id, start, end, Sequence, kwargs
     )
 
 
 @fastq.reader(DNA)
-def _fastq_to_dna(fh, variant=None, phred_offset=None, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fastq_to_generator(
-            fh, variant=variant, phred_offset=phred_offset, constructor=DNA, **kwargs
-        ),
-        seq_num,
+def _fastq_to_dna(
+    fh,
+    variant=None,
+    phred_offset=None,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fastq_to_single_sequence(
+        fh, variant, phred_offset, seq_num, fai, seq_id, start, end, DNA, kwargs
     )
 
 
 @fastq.reader(RNA)
-def _fastq_to_rna(fh, variant=None, phred_offset=None, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fastq_to_generator(
-            fh, variant=variant, phred_offset=phred_offset, constructor=RNA, **kwargs
-        ),
-        seq_num,
+def _fastq_to_rna(
+    fh,
+    variant=None,
+    phred_offset=None,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fastq_to_single_sequence(
+        fh, variant, phred_offset, seq_num, fai, seq_id, start, end, RNA, kwargs
     )
 
 
 @fastq.reader(Protein)
-def _fastq_to_protein(fh, variant=None, phred_offset=None, seq_num=1, **kwargs):
-    return _get_nth_sequence(
-        _fastq_to_generator(
-            fh,
-            variant=variant,
-            phred_offset=phred_offset,
-            constructor=Protein,
-            **kwargs,
-        ),
-        seq_num,
+def _fastq_to_protein(
+    fh,
+    variant=None,
+    phred_offset=None,
+    seq_num=1,
+    fai=None,
+    seq_id=None,
+    start=None,
+    end=None,
+    **kwargs,
+):
+    return _fastq_to_single_sequence(
+        fh, variant, phred_offset, seq_num, fai, seq_id, start, end, Protein, kwargs
     )
 
 
@@ -450,17 +509,45 @@ def _generator_to_fastq(
         True,
         lowercase=lowercase,
     )
-    for header, seq_str, qual_scores in formatted_records:
-        qual_str = _encode_phred_to_qual(
-            qual_scores, variant=variant, phred_offset=phred_offset
+    for batch in _batch_fasta_like_records(formatted_records):
+        try:
+            qual_strs = _encode_phred_block_to_qual(
+                [qual_scores for _, _, qual_scores in batch],
+                variant=variant,
+                phred_offset=phred_offset,
+            )
+        except ValueError:
+            # The records preceding the invalid one are written before the
+            # error is raised, as when each record was written on its own.
+            # Their warnings were issued by the batch already.
+            qual_strs = []
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                for _, _, qual_scores in batch:
+                    try:
+                        qual_strs.extend(
+                            _encode_phred_block_to_qual(
+                                [qual_scores],
+                                variant=variant,
+                                phred_offset=phred_offset,
+                            )
+                        )
+                    except ValueError:
+                        break
+            _write_fastq_records(fh, batch, qual_strs)
+            raise
+        _write_fastq_records(fh, batch, qual_strs)
+
+
+def _write_fastq_records(fh, records, qual_strs):
+    fh.write(
+        "".join(
+            [
+                "@%s\n%s\n+\n%s\n" % (header, seq_str, qual_str)
+                for (header, seq_str, _), qual_str in zip(records, qual_strs)
+            ]
         )
-        fh.write("@")
-        fh.write(header)
-        fh.write("\n")
-        fh.write(seq_str)
-        fh.write("\n+\n")
-        fh.write(qual_str)
-        fh.write("\n")
+    )
 
 
 @fastq.writer(Sequence)
@@ -568,6 +655,36 @@ def _tabular_msa_to_fastq(
     )
 
 
+def _fastq_to_single_sequence(
+    fh, variant, phred_offset, seq_num, fai, seq_id, start, end, constructor, kwargs
+):
+    if fai is None and seq_id is None and start is None and end is None:
+        return _get_nth_sequence(
+            _fastq_to_generator(
+                fh,
+                variant=variant,
+                phred_offset=phred_offset,
+                constructor=constructor,
+                **kwargs,
+            ),
+            seq_num,
+        )
+
+    seq, id_, desc, qual = _read_indexed(
+        fh, fai, seq_num, seq_id, start, end, fastq=True
+    )
+    return constructor(
+        seq,
+        metadata={"id": id_, "description": desc},
+        positional_metadata={
+            "quality": _decode_qual_to_phred(
+                qual, variant=variant, phred_offset=phred_offset
+            )
+        },
+        **kwargs,
+    )
+
+
 def _blank_error(unique_text):
     error_string = ("Found blank or whitespace-only line {} in " "FASTQ file").format(
         unique_text
@@ -575,6 +692,111 @@ def _blank_error(unique_text):
     raise FASTQFormatError(error_string)
 
 
+def _parse_fastq_batches(fh, variant, phred_offset, batch_size=None):
+    # Group records into batches and decode the quality scores of each batch
+    # as a single block. Without an explicit batch size, batches start small
+    # and grow, so that consumers that only look at the first few records
+    # (e.g., the sniffer or `seq_num=1`) don't parse much more than that.
+    if batch_size is None:
+        size, max_size = _min_batch_size, _max_batch_size
+    else:
+        size = max_size = batch_size
+
+    records = _parse_records(map(str.strip, fh), variant, phred_offset)
+    while True:
+        batch = []
+        error = None
+        try:
+            for record in islice(records, size):
+                batch.append(record)
+        except (FASTQFormatError, ValueError) as e:
+            # hand out the records parsed so far before raising
+            error = e
+
+        encoded = [i for i, record in enumerate(batch) if isinstance(record[3], str)]
+        if encoded:
+            scores, decode_error, n_valid = _decode_qual_block_to_phred(
+                [batch[i][3] for i in encoded],
+                variant=variant,
+                phred_offset=phred_offset,
+            )
+            if decode_error is not None:
+                del batch[encoded[n_valid] :]
+                error = decode_error
+            for i, phred_scores in zip(encoded, scores):
+                batch[i] = batch[i][:3] + (phred_scores,)
+
+        if batch:
+            yield tuple(list(field) for field in zip(*batch))
+        if error is not None:
+            raise error
+        if len(batch) < size:
+            return
+        size = min(size * 2, max_size)
+
+
+def _parse_records(lines, variant, phred_offset):
+    # Yields (id, description, sequence, quality) tuples. Records laid out on
+    # exactly four lines are split without decoding their quality scores,
+    # which are left as strings for block decoding. Anything else (wrapped
+    # sequence or quality lines, blank lines within a record, malformed
+    # records) is re-read by the line-based parsers below, which also produce
+    # the error messages.
+    try:
+        seq_header = next(_line_generator(lines, skip_blanks=True))
+    except StopIteration:
+        return
+
+    if not seq_header.startswith("@"):
+        raise FASTQFormatError(
+            "Expected sequence (@) header line at start of file: %r" % str(seq_header)
+        )
+
+    while seq_header is not None:
+        id_, desc = _parse_fasta_like_header(seq_header)
+
+        seq = next(lines, None)
+        qual_header = next(lines, None)
+        if not (
+            seq
+            and qual_header is not None
+            and qual_header.startswith("+")
+            and seq[0] not in "@+"
+            and not _whitespace_regex.search(seq)
+        ):
+            seq, qual_header = _parse_sequence_data(
+                chain([line for line in (seq, qual_header) if line is not None], lines),
+                seq_header,
+            )
+
+        if qual_header != "+" and qual_header[1:] != seq_header[1:]:
+            raise FASTQFormatError(
+                "Sequence (@) and quality (+) header lines do not match: "
+                "%r != %r" % (str(seq_header[1:]), str(qual_header[1:]))
+            )
+
+        qual = next(lines, None)
+        if qual is not None and len(qual) == len(seq):
+            blanks = 0
+            seq_header = None
+            for line in lines:
+                if line:
+                    seq_header = line
+                    break
+                blanks += 1
+            if seq_header is None or seq_header.startswith("@"):
+                yield id_, desc, seq, qual
+                continue
+            pending = [qual] + [""] * blanks + [seq_header]
+        else:
+            pending = [] if qual is None else [qual]
+
+        phred_scores, seq_header = _parse_quality_scores(
+            chain(pending, lines), len(seq), variant, phred_offset, qual_header
+        )
+        yield id_, desc, seq, phred_scores
+
+
 def _parse_sequence_data(fh, prev):
     seq_chunks = []
     for chunk in _line_generator(fh, skip_blanks=False):
@@ -170,6 +170,17 @@ its sub-class constructor.
 ``Protein`` GenBank readers. It specifies which GenBank record to read from
 a GenBank file with multiple records in it.
 
+``sections`` is available for all GenBank readers. It lists the headers of
+the sections to parse, e.g. ``sections=('LOCUS', 'ORIGIN')`` to read only the
+sequences of a large file. The lines of the other sections are skipped
+without being parsed, and they are left out of ``metadata``. ``LOCUS`` is
+always parsed, and ``FEATURES`` requires ``ORIGIN``. By default, all sections
+are parsed.
+
+The ``FEATURES`` section is parsed lazily: its lines are kept as they are
+until ``interval_metadata`` is first accessed. Errors in the feature table
+are therefore raised on that access rather than while reading the file.
+
 Examples
 --------
 Reading and Writing GenBank Files
@@ -316,6 +327,7 @@ References
 # ----------------------------------------------------------------------------
 
 import re
+import string
 from functools import partial
 
 from skbio.io import create_format, GenBankFormatError
@@ -323,6 +335,7 @@ from skbio.io.format._base import _get_nth_sequence, _line_generator, _too_many_
 from skbio.util._misc import chunk_str
 from skbio.sequence import Sequence, DNA, RNA, Protein
 from skbio.io.format._sequence_feature_vocabulary import (
+    _selected_sections,
     _yield_section,
     _parse_section_default,
     _serialize_section_default,
@@ -331,7 +344,9 @@ from skbio.io.format._sequence_feature_vocabulary import (
 )
 
 
-genbank = create_format("genbank")
+genbank = create_format(
+    "genbank", extensions=(".gb", ".gbk", ".gbff", ".genbank"), magic=(b"LOCUS",)
+)
 
 # This list is ordered
 # used to read and write genbank file.
@@ -369,32 +384,32 @@ def _genbank_sniffer(fh):
 
 
 @genbank.reader(None)
-def _genbank_to_generator(fh, constructor=None, **kwargs):
-    for record in _parse_genbanks(fh):
+def _genbank_to_generator(fh, constructor=None, sections=None, **kwargs):
+    for record in _parse_genbanks(fh, sections):
         yield _construct(record, constructor, **kwargs)
 
 
 @genbank.reader(Sequence)
-def _genbank_to_sequence(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_genbanks(fh), seq_num)
+def _genbank_to_sequence(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_genbanks(fh, sections), seq_num)
     return _construct(record, Sequence, **kwargs)
 
 
 @genbank.reader(DNA)
-def _genbank_to_dna(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_genbanks(fh), seq_num)
+def _genbank_to_dna(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_genbanks(fh, sections), seq_num)
     return _construct(record, DNA, **kwargs)
 
 
 @genbank.reader(RNA)
-def _genbank_to_rna(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_genbanks(fh), seq_num)
+def _genbank_to_rna(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_genbanks(fh, sections), seq_num)
     return _construct(record, RNA, **kwargs)
 
 
 @genbank.reader(Protein)
-def _genbank_to_protein(fh, seq_num=1, **kwargs):
-    record = _get_nth_sequence(_parse_genbanks(fh), seq_num)
+def _genbank_to_protein(fh, seq_num=1, sections=None, **kwargs):
+    record = _get_nth_sequence(_parse_genbanks(fh, sections), seq_num)
     return _construct(record, Protein, **kwargs)
 
 
@@ -438,19 +453,35 @@ def _construct(record, constructor=None, **kwargs):
             constructor = Protein
 
     if constructor == RNA:
-        return DNA(seq, metadata=md, interval_metadata=imd, **kwargs).transcribe()
+        obj = DNA(seq, metadata=md, **kwargs).transcribe()
     else:
-        return constructor(seq, metadata=md, interval_metadata=imd, **kwargs)
+        obj = constructor(seq, metadata=md, **kwargs)
+    if imd is not None:
+        if md["LOCUS"]["size"] == len(obj):
+            obj._defer_interval_metadata_(imd)
+        else:
+            # Parse now so that the mismatch is reported while reading.
+            obj.interval_metadata = imd()
+    return obj
 
 
-def _parse_genbanks(fh):
+def _parse_genbanks(fh, sections=None):
+    headers = _selected_sections(sections)
     data_chunks = []
+    keep = True
     for line in _line_generator(fh, skip_blanks=True, strip=False):
         if line.startswith("//"):
             yield _parse_single_genbank(data_chunks)
             data_chunks = []
-        else:
+            keep = True
+        elif headers is None:
             data_chunks.append(line)
+        else:
+            # drop the lines of unselected sections before they are parsed
+            if not line[0].isspace():
+                keep = line.split(None, 1)[0] in headers
+            if keep:
+                data_chunks.append(line)
 
 
 def _parse_single_genbank(chunks):
@@ -465,10 +496,11 @@ def _parse_single_genbank(chunks):
 
         if header == "FEATURES":
             # This requires 'LOCUS' line parsed before 'FEATURES', which should
-            # be true and is implicitly checked by the sniffer.
-            parser = partial(parser, length=metadata["LOCUS"]["size"])
-
-        parsed = parser(section)
+            # be true and is implicitly checked by the sniffer. The feature
+            # table is only parsed when the interval metadata is accessed.
+            parsed = partial(parser, section, length=metadata["LOCUS"]["size"])
+        else:
+            parsed = parser(section)
 
         # reference can appear multiple times
         if header == "REFERENCE":
@@ -703,16 +735,15 @@ def _serialize_source(header, obj, indent=12):
     return s
 
 
+_origin_numbering = re.compile(r"^[ \t]*\S+", re.MULTILINE)
+_whitespace = str.maketrans("", "", string.whitespace)
+
+
 def _parse_origin(lines):
     """Parse the ORIGIN section for sequence."""
-    sequence = []
-    for line in lines:
-        if line.startswith("ORIGIN"):
-            continue
-        # remove the number at the beg of each line
-        items = line.split()
-        sequence.append("".join(items[1:]))
-    return "".join(sequence)
+    sequence = "\n".join(line for line in lines if not line.startswith("ORIGIN"))
+    # remove the number at the beg of each line, then the spaces in between
+    return _origin_numbering.sub("", sequence).translate(_whitespace)
 
 
 def _serialize_origin(seq, indent=9):
@@ -53,6 +53,13 @@ Reader-specific Parameters
 It reads the annotation with the specified
 sequence ID from the GFF3 file into an ``IntervalMetadata`` object.
 
+The features of a region of the sequence can be read by passing ``start``
+and ``end`` (0-based, following Python's slicing semantics) to this reader.
+The region is located through an index of the GFF3 file, which is provided
+with the ``gfi`` parameter or otherwise saved next to the file and reused
+automatically, so only the annotation lines of the requested features are
+parsed. See :mod:`skbio.io.format.gfi` for details.
+
 ``DNA`` and ``Sequence`` GFF3 readers require ``seq_num`` of int as
 parameter. It specifies which GFF3 record to read from a GFF3 file
 with annotations of multiple sequences in it.
@@ -221,6 +228,7 @@ from skbio.io import create_format, GFF3FormatError
 from skbio.metadata import IntervalMetadata
 from skbio.io.format._base import _line_generator, _too_many_blanks, _get_nth_sequence
 from skbio.io.format.fasta import _fasta_to_generator
+from skbio.io.format.gfi import _read_indexed, _sidecar_gfi
 from skbio.io.format._sequence_feature_vocabulary import (
     _vocabulary_change,
     _vocabulary_skip,
@@ -228,7 +236,7 @@ from skbio.io.format._sequence_feature_vocabulary import (
 from skbio.io import write
 
 
-gff3 = create_format("gff3")
+gff3 = create_format("gff3", extensions=(".gff", ".gff3"), magic=(b"##gff-version 3",))
 
 
 @gff3.sniffer()
@@ -319,7 +327,7 @@ def _dna_to_gff3(obj, fh, skip_subregion=True):
 
 
 @gff3.reader(IntervalMetadata)
-def _gff3_to_interval_metadata(fh, seq_id):
+def _gff3_to_interval_metadata(fh, seq_id, gfi=None, start=None, end=None):
     """Read a GFF3 record into the specified interval metadata.
 
     Parameters
@@ -328,8 +336,19 @@ def _gff3_to_interval_metadata(fh, seq_id):
         GFF3 file to read.
     seq_id : str
         Sequence ID which the interval metadata is associated with.
+    gfi : pd.DataFrame or file, optional
+        Index of the GFF3 file, used to read only the lines of `seq_id`. If
+        not provided, an up-to-date index saved next to the file is used.
+    start, end : int, optional
+        Region of the sequence to read the overlapping features of.
 
     """
+    if gfi is None and start is None and end is None:
+        gfi = _sidecar_gfi(fh)
+    if gfi is not None or start is not None or end is not None:
+        length, lines = _read_indexed(fh, gfi, seq_id, start, end)
+        return _parse_record(lines, length)
+
     length = None
     for data_type, sid, data in _yield_record(fh):
         if seq_id == sid:
@@ -0,0 +1,304 @@
+r"""GFF3 feature index format (:mod:`skbio.io.format.gfi`)
+======================================================
+
+.. currentmodule:: skbio.io.format.gfi
+
+The GFF3 feature index format (``gfi``) records where the annotation lines
+of each sequence are found in a GFF3 file, and which coordinates they span.
+This allows the features of one sequence, or of a region of it, to be read
+without parsing the rest of the file, which is useful for genome-scale
+annotation sets. It plays the same role for GFF3 files as the
+:mod:`~skbio.io.format.fai` format does for FASTA files.
+
+Format Support
+--------------
+**Has Sniffer: No**
+
++------+------+---------------------------------------------------------------+
+|Reader|Writer|                          Object Class                         |
++======+======+===============================================================+
+|Yes   |Yes   |:mod:`pandas.DataFrame`                                        |
++------+------+---------------------------------------------------------------+
+
+Format Specification
+--------------------
+**State: Experimental as of 0.6.0.**
+
+The annotation lines of a GFF3 file are split into blocks of consecutive
+lines with the same sequence ID, each at most a given number of bytes long.
+An index is a tab-separated file without a header line, which describes each
+block on one line, in the order the blocks appear in the GFF3 file, using the
+following columns:
+
++-----------+-----------------------------------------------------------------+
+|Name       |Description                                                      |
++===========+=================================================================+
+|seqid      |Sequence ID (column 1 of the annotation lines)                   |
++-----------+-----------------------------------------------------------------+
+|offset     |Offset in bytes of the first line of the block in the file       |
++-----------+-----------------------------------------------------------------+
+|size       |Size of the block in bytes, including comment lines within it    |
++-----------+-----------------------------------------------------------------+
+|start      |Smallest start of the features in the block (0-based)            |
++-----------+-----------------------------------------------------------------+
+|end        |Largest end of the features in the block (exclusive)             |
++-----------+-----------------------------------------------------------------+
+|length     |Sequence length given by the ``##sequence-region`` pragma, or    |
+|           |empty if there is none                                           |
++-----------+-----------------------------------------------------------------+
+
+The features of a sequence can be spread over several blocks, which need not
+be adjacent. When the annotation lines of each sequence are sorted by start
+position, as is common, the coordinate range of each block is narrow and a
+region query only reads the few blocks overlapping the region.
+
+Lines starting with ``#`` are comments and are ignored.
+
+When read into a ``pd.DataFrame``, the index is keyed by sequence ID. The
+``length`` column has the nullable ``Int64`` dtype and all other columns are
+integers.
+
+Building and Using an Index
+^^^^^^^^^^^^^^^^^^^^^^^^^^^
+An index for a GFF3 file can be built with :func:`skbio.io.util.build_gfi`
+and saved in this format, e.g. next to the GFF3 file. The ``IntervalMetadata``
+reader of :mod:`skbio.io.format.gff3` accepts the index through its ``gfi``
+parameter, together with ``start`` and ``end`` selecting a region of the
+sequence ``seq_id``. Only the features overlapping the region are read, and
+their bounds are not truncated to it. ``start`` and ``end`` are 0-based and
+follow Python's slicing semantics.
+
+If ``start`` or ``end`` are provided without an index and the GFF3 file is
+stored on disk, an index saved next to it as ``<path>.gfi`` is used. If there
+is none yet, or the size or modification time of the GFF3 file changed since
+it was saved, the index is built and saved there, which requires a single
+pass through the file that is much cheaper than parsing it. Its first line is
+a comment recording the size and modification time of the GFF3 file. When
+the index cannot be saved (e.g., in a read-only directory), or the input is
+not a file on disk, the index is built in memory only. An up-to-date saved
+index is also used when reading all the features of a sequence, but one is
+not built for that.
+
+Examples
+--------
+>>> from io import StringIO
+>>> import skbio.io
+>>> from skbio.metadata import IntervalMetadata
+>>> from skbio.io.util import build_gfi
+>>> gff = StringIO('##gff-version 3\n'
+...                '##sequence-region chr1 1 1000\n'
+...                'chr1\t.\tgene\t10\t90\t.\t+\t.\tID=gen1\n'
+...                'chr1\t.\tgene\t500\t700\t.\t-\t.\tID=gen2\n'
+...                'chr2\t.\tgene\t80\t96\t.\t-\t.\tID=gen3\n')
+
+Build an index of the GFF3 file in blocks of at most 50 bytes and save it in
+``gfi`` format:
+
+>>> gfi = build_gfi(gff, block_size=50)
+>>> gfi # doctest: +NORMALIZE_WHITESPACE
+       offset  size  start  end  length
+seqid
+chr1       46    32      9   90    1000
+chr1       78    34    499  700    1000
+chr2      112    32     79   96    <NA>
+>>> fh = skbio.io.write(gfi, format='gfi', into=StringIO())
+>>> print(fh.getvalue()) # doctest: +NORMALIZE_WHITESPACE
+chr1    46     32    9     90    1000
+chr1    78     34    499   700   1000
+chr2    112    32    79    96
+<BLANKLINE>
+
+Use the index to read the features overlapping a region of ``chr1``:
+
+>>> im = IntervalMetadata.read(gff, seq_id='chr1', gfi=gfi, start=600,
+...                            end=800, verify=False)
+>>> im.num_interval_features
+1
+>>> im.upper_bound
+1000
+
+"""  # noqa: D205, D415
+
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import os
+import tempfile
+
+import pandas as pd
+
+from skbio.io import create_format, read, GFF3FormatError
+from skbio.io._iosources import get_file_path
+from skbio.io.format.fai import _raw
+
+gfi = create_format("gfi", extensions=(".gfi",))
+
+_gfi_columns = ["offset", "size", "start", "end", "length"]
+_gfi_dtypes = {"offset": int, "size": int, "start": int, "end": int, "length": "Int64"}
+
+# Default size of the blocks of an index. Reading a block costs about as much
+# as seeking to it, while more blocks make the index larger.
+_block_size = 1 << 16
+
+
+@gfi.reader(pd.DataFrame, monkey_patch=False)
+def _gfi_to_data_frame(fh):
+    try:
+        df = pd.read_csv(
+            fh, sep="\t", header=None, index_col=0, dtype={0: str}, comment="#"
+        )
+        if df.shape[1] != len(_gfi_columns):
+            raise ValueError
+        df.columns = _gfi_columns
+        df.index.name = "seqid"
+        return df.astype(_gfi_dtypes)
+    except (ValueError, TypeError, pd.errors.EmptyDataError):
+        raise ValueError("Invalid gfi file format.")
+
+
+@gfi.writer(pd.DataFrame, monkey_patch=False)
+def _data_frame_to_gfi(obj, fh):
+    obj.to_csv(fh, sep="\t", header=False)
+
+
+def _build_gfi(fh, block_size=_block_size):
+    if block_size < 1:
+        raise ValueError("`block_size` must be positive, not %r." % block_size)
+    raw = _raw(fh)
+    raw.seek(0)
+
+    lengths = {}
+    rows = []
+    block = None
+    offset = 0
+    for line in raw:
+        size = len(line)
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if line.startswith("##FASTA"):
+            break
+        if line.startswith("##sequence-region"):
+            _, seq_id, start, end = line.split()
+            lengths[seq_id] = int(end) - int(start) + 1
+        elif line.strip() and not line.startswith("#"):
+            columns = line.split("\t", 5)
+            try:
+                seq_id = columns[0]
+                start, end = int(columns[3]) - 1, int(columns[4])
+            except (IndexError, ValueError):
+                raise GFF3FormatError("Wrong GFF3 format at line: %s" % line.strip())
+            if block is None or block[0] != seq_id or block[2] + size > block_size:
+                block = [seq_id, offset, 0, start, end]
+                rows.append(block)
+            else:
+                block[3] = min(block[3], start)
+                block[4] = max(block[4], end)
+        offset += size
+        if block is not None:
+            # comment lines within a block are part of it
+            block[2] = offset - block[1]
+
+    df = pd.DataFrame(
+        [row[1:] for row in rows],
+        index=pd.Index([row[0] for row in rows], name="seqid", dtype=str),
+        columns=_gfi_columns[:4],
+    )
+    df["length"] = [lengths.get(seq_id) for seq_id in df.index]
+    return df.astype(_gfi_dtypes)
+
+
+def _sidecar_gfi(fh, build=False):
+    """Return the index saved next to a GFF3 file on disk, if up to date.
+
+    The index is saved as ``<path>.gfi`` with a first comment line recording
+    the size and modification time of the GFF3 file, so that it is only used
+    while the file is unchanged. If `build` is True, a missing or out-of-date
+    index is built and saved there, or only kept in memory if the input is not
+    a file on disk or the index cannot be written.
+
+    """
+    path = get_file_path(fh)
+    if path is None:
+        return _build_gfi(fh) if build else None
+    stat = os.stat(path)
+    stamp = "#stamp\t%d\t%d\n" % (stat.st_size, stat.st_mtime_ns)
+    index_path = path + ".gfi"
+    try:
+        with open(index_path) as f:
+            if f.readline() == stamp:
+                return _gfi_to_data_frame(f)
+    except (OSError, ValueError):
+        pass
+    if not build:
+        return None
+    gfi = _build_gfi(fh)
+    # The index is written to a temporary file that then replaces it, so that
+    # an interrupted or concurrent write does not leave a partial one.
+    try:
+        fd, tmp = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(index_path)), suffix=".tmp"
+        )
+    except OSError:
+        return gfi
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(stamp)
+            _data_frame_to_gfi(gfi, f)
+        os.replace(tmp, index_path)
+    except OSError:
+        # the index is only a cache, so failing to save it is not an error
+        os.remove(tmp)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return gfi
+
+
+def _read_indexed(fh, gfi, seq_id, start, end):
+    # Returns the length of the sequence `seq_id` according to the index and
+    # the annotation lines of the features overlapping the region
+    # [start:end] of it, reading only the blocks that may contain them.
+    if gfi is None:
+        gfi = _sidecar_gfi(fh, build=True)
+    elif not isinstance(gfi, pd.DataFrame):
+        gfi = read(gfi, format="gfi", into=pd.DataFrame)
+
+    blocks = gfi[gfi.index == seq_id]
+    length = None
+    if len(blocks) and not pd.isna(blocks["length"].iloc[0]):
+        length = int(blocks["length"].iloc[0])
+    region = start is not None or end is not None
+    if region:
+        if length is None:
+            # only needed to resolve negative positions
+            length = int(blocks["end"].max()) if len(blocks) else 0
+            start, stop, _ = slice(start, end).indices(length)
+            length = None
+        else:
+            start, stop, _ = slice(start, end).indices(length)
+        blocks = blocks[(blocks["start"] < stop) & (blocks["end"] > start)]
+
+    raw = _raw(fh)
+    lines = []
+    for offset, size in zip(blocks["offset"], blocks["size"]):
+        raw.seek(offset)
+        data = raw.read(size)
+        if isinstance(data, bytes):
+            data = data.decode("utf-8")
+        for line in data.splitlines():
+            if not line.strip() or line.startswith("#"):
+                continue
+            columns = line.split("\t", 5)
+            if columns[0] != seq_id or len(columns) < 6:
+                raise GFF3FormatError(
+                    "Sequence %r in the index does not match the file. The index "
+                    "may be out of date." % str(seq_id)
+                )
+            if not region or (int(columns[3]) - 1 < stop and int(columns[4]) > start):
+                lines.append(line.strip())
+    return length, lines
@@ -65,6 +65,19 @@ length. This value is useful for reading a fixed-width text file. However, it
 cannot be automatically determined, nor can it be specified when writing to a
 file.
 
+When reading, ``out`` may be given a preallocated ``numpy.ndarray`` of shape
+``(n, n)``, where ``n`` is the number of IDs in the header, to parse the matrix
+into instead of a newly allocated array. Passing a memory-mapped array (e.g.,
+created with ``numpy.lib.format.open_memmap``) allows reading a matrix that is
+larger than the available memory, and the resulting object will be backed by
+that file.
+
+When writing, values are formatted with their shortest exact representation by
+default, so that reading the file back yields the same matrix. ``float_format``
+may be given a printf-style format for all values instead (e.g., ``'%.6g'``),
+which is several times faster and produces smaller files at the cost of
+precision.
+
 """  # noqa: D205, D415
 
 # ----------------------------------------------------------------------------
@@ -76,6 +89,7 @@ file.
 # ----------------------------------------------------------------------------
 
 import csv
+import warnings
 
 import numpy as np
 
@@ -107,36 +121,43 @@ def _lsmat_sniffer(fh):
 
 
 @lsmat.reader(DissimilarityMatrix)
-def _lsmat_to_dissimilarity_matrix(fh, delimiter="\t"):
-    return _lsmat_to_matrix(DissimilarityMatrix, fh, delimiter)
+def _lsmat_to_dissimilarity_matrix(fh, delimiter="\t", out=None):
+    return _lsmat_to_matrix(DissimilarityMatrix, fh, delimiter, out)
 
 
 @lsmat.reader(DistanceMatrix)
-def _lsmat_to_distance_matrix(fh, delimiter="\t"):
-    return _lsmat_to_matrix(DistanceMatrix, fh, delimiter)
+def _lsmat_to_distance_matrix(fh, delimiter="\t", out=None):
+    return _lsmat_to_matrix(DistanceMatrix, fh, delimiter, out)
 
 
 @lsmat.writer(DissimilarityMatrix)
-def _dissimilarity_matrix_to_lsmat(obj, fh, delimiter="\t"):
-    _matrix_to_lsmat(obj, fh, delimiter)
+def _dissimilarity_matrix_to_lsmat(obj, fh, delimiter="\t", float_format=None):
+    _matrix_to_lsmat(obj, fh, delimiter, float_format)
 
 
 @lsmat.writer(DistanceMatrix)
-def _distance_matrix_to_lsmat(obj, fh, delimiter="\t"):
-    _matrix_to_lsmat(obj, fh, delimiter)
+def _distance_matrix_to_lsmat(obj, fh, delimiter="\t", float_format=None):
+    _matrix_to_lsmat(obj, fh, delimiter, float_format)
+
+
+# Approximate number of characters parsed or formatted at a time.
+_block_size = 1 << 24
 
 
-def _lsmat_to_matrix(cls, fh, delimiter):
-    # We aren't using np.loadtxt because it uses *way* too much memory
+def _lsmat_to_matrix(cls, fh, delimiter, out=None):
+    # We aren't using np.loadtxt on the whole file because, besides needing
+    # to validate the IDs, older versions of it use *way* too much memory
     # (e.g, a 2GB matrix eats up 10GB, which then isn't freed after parsing
     # has finished). See:
     # http://mail.scipy.org/pipermail/numpy-tickets/2012-August/006749.html
 
     # Strategy:
     #   - find the header
-    #   - initialize an empty ndarray
-    #   - for each row of data in the input file:
-    #     - populate the corresponding row in the ndarray with floats
+    #   - initialize an empty ndarray, or use the one provided
+    #   - collect blocks of data rows from the input file, checking the row
+    #     IDs and number of values as they are read:
+    #     - parse each block of numbers at once into the ndarray, falling back
+    #       to row-by-row parsing to report the exact error if that fails
 
     header = _find_header(fh)
     if header is None:
@@ -148,28 +169,44 @@ def _lsmat_to_matrix(cls, fh, delimiter):
 
     ids = _parse_header(header, delimiter)
     num_ids = len(ids)
-    data = np.empty((num_ids, num_ids), dtype=np.float64)
+    if out is None:
+        data = np.empty((num_ids, num_ids), dtype=np.float64)
+    else:
+        data = out
+        if data.shape != (num_ids, num_ids):
+            raise ValueError(
+                "`out` must have shape %r to hold the matrix, not %r."
+                % ((num_ids, num_ids), data.shape)
+            )
 
     row_idx = -1
-    for row_idx, (row_id, row_data) in enumerate(_parse_data(fh, delimiter)):
+    block = []
+    block_start = 0
+    block_chars = 0
+    for row_idx, (row_id, row_data) in enumerate(_split_data(fh, delimiter)):
         if row_idx >= num_ids:
             # We've hit a nonempty line after we already filled the data
             # matrix. Raise an error because we shouldn't ignore extra data.
+            _parse_rows(data, block_start, block, delimiter, num_ids)
             raise LSMatFormatError(
                 "Encountered extra row(s) without corresponding IDs in " "the header."
             )
 
-        num_vals = len(row_data)
-        if num_vals != num_ids:
-            raise LSMatFormatError(
-                "There are %d value(s) in row %d, which is not equal to the "
-                "number of ID(s) in the header (%d)." % (num_vals, row_idx + 1, num_ids)
-            )
+        # With a whitespace delimiter values can't be counted without
+        # splitting them, so miscounted rows are caught while parsing.
+        if delimiter is not None:
+            num_vals = 0 if row_data is None else row_data.count(delimiter) + 1
+            if num_vals != num_ids:
+                _parse_rows(data, block_start, block, delimiter, num_ids)
+                raise LSMatFormatError(
+                    "There are %d value(s) in row %d, which is not equal to the "
+                    "number of ID(s) in the header (%d)."
+                    % (num_vals, row_idx + 1, num_ids)
+                )
 
         expected_id = ids[row_idx]
-        if row_id == expected_id:
-            data[row_idx, :] = np.asarray(row_data, dtype=float)
-        else:
+        if row_id != expected_id:
+            _parse_rows(data, block_start, block, delimiter, num_ids)
             raise LSMatFormatError(
                 "Encountered mismatched IDs while parsing the "
                 "dissimilarity matrix file. Found %r but expected "
@@ -178,6 +215,15 @@ def _lsmat_to_matrix(cls, fh, delimiter):
                 "labels (first column)." % (str(row_id), str(expected_id))
             )
 
+        block.append(row_data)
+        block_chars += len(row_data)
+        if block_chars >= _block_size:
+            _parse_rows(data, block_start, block, delimiter, num_ids)
+            block_start = row_idx + 1
+            block = []
+            block_chars = 0
+    _parse_rows(data, block_start, block, delimiter, num_ids)
+
     if row_idx != num_ids - 1:
         raise LSMatFormatError(
             "Expected %d row(s) of data, but found %d." % (num_ids, row_idx + 1)
@@ -186,6 +232,38 @@ def _lsmat_to_matrix(cls, fh, delimiter):
     return cls(data, ids)
 
 
+def _parse_rows(data, start, rows, delimiter, num_ids):
+    """Parse the numbers in a block of rows into `data`, starting at `start`."""
+    if not rows:
+        return
+    values = None
+    # `np.loadtxt` only splits on whitespace or on a single character.
+    if delimiter is None or len(delimiter) == 1:
+        try:
+            # Problems such as empty rows are reported below instead.
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                values = np.loadtxt(
+                    rows, delimiter=delimiter, comments=None, dtype=np.float64, ndmin=2
+                )
+        except ValueError:
+            pass
+    if values is None or values.shape != (len(rows), num_ids):
+        # Parse row by row to raise the same error as for a single row.
+        for row_idx, row_data in enumerate(rows, start):
+            row_data = row_data.split(delimiter)
+            num_vals = len(row_data)
+            if num_vals != num_ids:
+                raise LSMatFormatError(
+                    "There are %d value(s) in row %d, which is not equal to the "
+                    "number of ID(s) in the header (%d)."
+                    % (num_vals, row_idx + 1, num_ids)
+                )
+            data[row_idx, :] = np.asarray(row_data, dtype=float)
+    else:
+        data[start : start + len(rows)] = values
+
+
 def _find_header(fh):
     header = None
 
@@ -227,17 +305,62 @@ def _parse_data(fh, delimiter):
         yield id_, tokens[1:]
 
 
-def _matrix_to_lsmat(obj, fh, delimiter):
+def _split_data(fh, delimiter):
+    # Like `_parse_data`, but the values of each row are left in one string.
+    for line in fh:
+        line = line.rstrip()
+
+        if not line:
+            continue
+
+        if delimiter is None:
+            tokens = line.split(None, 1)
+            id_ = tokens[0]
+            row_data = tokens[1] if len(tokens) > 1 else ""
+        else:
+            id_, found, row_data = line.partition(delimiter)
+            id_ = id_.strip()
+            if not found:
+                row_data = None
+
+        yield id_, row_data
+
+
+def _matrix_to_lsmat(obj, fh, delimiter, float_format=None):
     delimiter = "%s" % delimiter
     ids = obj.ids
     fh.write(_format_ids(ids, delimiter))
     fh.write("\n")
 
-    for id_, vals in zip(ids, obj.data):
-        fh.write("%s" % id_)
-        fh.write(delimiter)
-        fh.write(delimiter.join(np.asarray(vals, dtype=str)))
-        fh.write("\n")
+    data = obj.data
+    if float_format is not None:
+        row_format = delimiter.join([float_format] * len(ids))
+
+        def format_row(vals):
+            return row_format % tuple(vals.tolist())
+
+    elif data.dtype == np.float64:
+        # Python's float repr is the same as NumPy's string conversion of
+        # doubles, but much faster.
+        def format_row(vals):
+            return delimiter.join(map(repr, vals.tolist()))
+
+    else:
+
+        def format_row(vals):
+            return delimiter.join(np.asarray(vals, dtype=str))
+
+    lines = []
+    num_chars = 0
+    for id_, vals in zip(ids, data):
+        line = "%s%s%s\n" % (id_, delimiter, format_row(vals))
+        lines.append(line)
+        num_chars += len(line)
+        if num_chars >= _block_size:
+            fh.write("".join(lines))
+            lines = []
+            num_chars = 0
+    fh.write("".join(lines))
 
 
 def _format_ids(ids, delimiter):
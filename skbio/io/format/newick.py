@@ -220,10 +220,23 @@ References
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import re
+from itertools import chain
+
 from skbio.io import create_format, NewickFormatError
 from skbio.tree import TreeNode
+from skbio.util._misc import pause_gc
+
+newick = create_format(
+    "newick", extensions=(".nwk", ".newick", ".tre", ".tree"), magic=(b"(",)
+)
 
-newick = create_format("newick")
+_structure = re.compile(r"([(),;:])")
+_label_whitespace = re.compile(r"[^\s(),;:]\s+[^\s(),;:]")
+_operators = re.compile(r"[,:_;()\[\]]")
+
+# Number of text fragments collected before writing them out.
+_buffer_size = 1 << 16
 
 
 @newick.sniffer()
@@ -269,62 +282,83 @@ def _newick_sniffer(fh):
 
 @newick.reader(TreeNode)
 def _newick_to_tree_node(fh, convert_underscores=True):
-    tree_stack = []
-    current_depth = 0
-    last_token = ""
-    next_is_distance = False
-    root = TreeNode()
-    tree_stack.append((root, current_depth))
-    for token in _tokenize_newick(fh, convert_underscores=convert_underscores):
-        # Check for a label
-        if last_token not in "(,):":
-            if not next_is_distance:
-                tree_stack[-1][0].name = last_token if last_token else None
-            else:
-                next_is_distance = False
-        # Check for a distance
-        if token == ":":
-            next_is_distance = True
-        elif last_token == ":":
+    # Strategy:
+    #   Most files have neither quoted labels nor comments. For these, the text
+    #   of the tree is split on the structure characters with a regex, which is
+    #   far faster than inspecting each character in Python. Otherwise the
+    #   character-level tokenizer is used. Either way, the tokens are assembled
+    #   into a tree without recursion.
+    lines = []
+    for line in fh:
+        lines.append(line)
+        if ";" in line:
+            break
+    text = "".join(lines)
+    if "'" in text or "[" in text:
+        tokens = _tokenize_newick(
+            chain([text], fh), convert_underscores=convert_underscores
+        )
+    else:
+        tokens = _split_newick(text, convert_underscores=convert_underscores)
+    with pause_gc():
+        return _build_tree(tokens)
+
+
+def _split_newick(text, convert_underscores=True):
+    # Whitespace is only allowed around structure characters, so once this is
+    # checked, all of it can be dropped.
+    if _label_whitespace.search(text):
+        raise NewickFormatError(
+            "Newick files cannot have unescaped whitespace in their labels."
+        )
+    text = "".join(text.split())
+    if convert_underscores:
+        text = text.replace("_", " ")
+    return [token for token in _structure.split(text) if token]
+
+
+def _build_tree(tokens):
+    root = node = TreeNode()
+    # parents of the current node with their children read so far
+    stack = []
+    is_length = False
+    for token in tokens:
+        if is_length:
+            is_length = False
             try:
-                tree_stack[-1][0].length = float(token)
+                node.length = float(token)
             except ValueError:
                 raise NewickFormatError(
-                    "Could not read length as numeric type" ": %s." % token
+                    "Could not read length as numeric type: %s." % token
                 )
-
-        elif token == "(":
-            current_depth += 1
-            tree_stack.append((TreeNode(), current_depth))
         elif token == ",":
-            tree_stack.append((TreeNode(), current_depth))
-        elif token == ")":
-            if len(tree_stack) < 2:
+            if not stack:
+                break
+            node = TreeNode(parent=stack[-1][0])
+            stack[-1][1].append(node)
+        elif token == "(":
+            if node.children:
                 raise NewickFormatError(
-                    "Could not parse file as newick." " Parenthesis are unbalanced."
+                    "Could not parse file as newick. Contains unnested children."
                 )
-            children = []
-            # Pop all nodes at this depth as they belong to the remaining
-            # node on the top of the stack as children.
-            while current_depth == tree_stack[-1][1]:
-                node, _ = tree_stack.pop()
-                children.insert(0, node)
-            parent = tree_stack[-1][0]
-            if parent.children:
+            child = TreeNode(parent=node)
+            stack.append((node, [child]))
+            node = child
+        elif token == ")":
+            if not stack:
                 raise NewickFormatError(
-                    "Could not parse file as newick." " Contains unnested children."
+                    "Could not parse file as newick. Parenthesis are unbalanced."
                 )
-            # This is much faster than TreeNode.extend
-            for child in children:
-                child.parent = parent
-            parent.children = children
-            current_depth -= 1
+            node, children = stack.pop()
+            node.children = children
+        elif token == ":":
+            is_length = True
         elif token == ";":
-            if len(tree_stack) == 1:
+            if not stack:
                 return root
             break
-
-        last_token = token
+        elif token:
+            node.name = token
 
     raise NewickFormatError(
         "Could not parse file as newick."
@@ -336,41 +370,49 @@ def _newick_to_tree_node(fh, convert_underscores=True):
 
 @newick.writer(TreeNode)
 def _tree_node_to_newick(obj, fh):
-    operators = set(",:_;()[]")
-    current_depth = 0
-    nodes_left = [(obj, 0)]
-    while len(nodes_left) > 0:
+    # The text is collected in a buffer that is written out in large chunks.
+    buf = []
+    write = buf.append
+    # A stack of nodes to write, and of None for the commas between siblings.
+    # A node is visited a second time to close its parenthesis.
+    nodes_left = [(obj, False)]
+    while nodes_left:
         entry = nodes_left.pop()
-        node, node_depth = entry
-        if node.children and node_depth >= current_depth:
-            fh.write("(")
-            nodes_left.append(entry)
-            nodes_left += ((child, node_depth + 1) for child in reversed(node.children))
-            current_depth = node_depth + 1
-        else:
-            if node_depth < current_depth:
-                fh.write(")")
-                current_depth -= 1
-
-            # Note we don't check for None because there is no way to represent
-            # an empty string as a label in Newick. Therefore, both None and ''
-            # are considered to be the absence of a label.
-            label = node._node_label()
-            if label:
-                escaped = "%s" % label.replace("'", "''")
-                if any(t in operators for t in label):
-                    fh.write("'")
-                    fh.write(escaped)
-                    fh.write("'")
-                else:
-                    fh.write(escaped.replace(" ", "_"))
-            if node.length is not None:
-                fh.write(":")
-                fh.write("%s" % node.length)
-            if nodes_left and nodes_left[-1][1] == current_depth:
-                fh.write(",")
-
-    fh.write(";\n")
+        if entry is None:
+            write(",")
+            continue
+        node, closing = entry
+        children = node.children
+        if children and not closing:
+            write("(")
+            nodes_left.append((node, True))
+            nodes_left.append((children[-1], False))
+            for child in children[-2::-1]:
+                nodes_left.append(None)
+                nodes_left.append((child, False))
+            continue
+        if closing:
+            write(")")
+
+        # Note we don't check for None because there is no way to represent
+        # an empty string as a label in Newick. Therefore, both None and ''
+        # are considered to be the absence of a label.
+        label = node._node_label()
+        if label:
+            escaped = label.replace("'", "''")
+            if _operators.search(label):
+                write("'%s'" % escaped)
+            else:
+                write(escaped.replace(" ", "_"))
+        if node.length is not None:
+            write(":%s" % node.length)
+
+        if len(buf) >= _buffer_size:
+            fh.write("".join(buf))
+            buf.clear()
+
+    write(";\n")
+    fh.write("".join(buf))
 
 
 def _tokenize_newick(fh, convert_underscores=True):
@@ -192,7 +192,7 @@ import pandas as pd
 from skbio.stats.ordination import OrdinationResults
 from skbio.io import create_format, OrdinationFormatError
 
-ordination = create_format("ordination")
+ordination = create_format("ordination", magic=(b"Eigvals",))
 
 
 @ordination.sniffer()
@@ -228,7 +228,7 @@ from skbio.io import create_format, PhylipFormatError
 from skbio.util._misc import chunk_str
 
 
-phylip = create_format("phylip")
+phylip = create_format("phylip", extensions=(".phy", ".phylip"))
 
 
 @phylip.sniffer()
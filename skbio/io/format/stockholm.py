@@ -408,7 +408,9 @@ from skbio.alignment import TabularMSA
 from skbio.sequence._grammared_sequence import GrammaredSequence
 from skbio.io import create_format, StockholmFormatError
 
-stockholm = create_format("stockholm")
+stockholm = create_format(
+    "stockholm", extensions=(".sto", ".stk"), magic=(b"# STOCKHOLM",)
+)
 _REFERENCE_TAGS = frozenset({"RM", "RT", "RA", "RL", "RC"})
 
 
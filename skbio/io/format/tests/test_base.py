@@ -13,9 +13,13 @@ import numpy as np
 
 from skbio import Sequence, DNA, RNA
 from skbio.io.format._base import (_decode_qual_to_phred,
-                                   _encode_phred_to_qual, _get_nth_sequence,
+                                   _decode_qual_block_to_phred,
+                                   _encode_phred_to_qual,
+                                   _encode_phred_block_to_qual,
+                                   _get_nth_sequence,
                                    _parse_fasta_like_header,
-                                   _format_fasta_like_records)
+                                   _format_fasta_like_records,
+                                   _batch_fasta_like_records, _wrap_lines)
 
 
 class PhredDecoderTests(unittest.TestCase):
@@ -103,6 +107,49 @@ class PhredDecoderTests(unittest.TestCase):
         self.assertIn('printable', str(cm.exception))
 
 
+class PhredBlockDecoderTests(unittest.TestCase):
+    def test_missing_variant_and_phred_offset(self):
+        with self.assertRaises(ValueError) as cm:
+            _decode_qual_block_to_phred(['abcd'])
+        self.assertIn('`variant`', str(cm.exception))
+        self.assertIn('`phred_offset`', str(cm.exception))
+        self.assertIn('decode', str(cm.exception))
+
+    def test_solexa_variant(self):
+        with self.assertRaises(ValueError) as cm:
+            _decode_qual_block_to_phred(['abcd'], variant='solexa')
+        self.assertIn('719', str(cm.exception))
+
+    def test_matches_single_decoder(self):
+        quals = ['!"#$%&', "'()*+,-./0123456789:", ';', '<=>?@ABCDEFGHIJKLMN']
+        obs, error, n_valid = _decode_qual_block_to_phred(quals,
+                                                          variant='sanger')
+        self.assertIsNone(error)
+        self.assertEqual(n_valid, 4)
+        self.assertEqual(len(obs), 4)
+        for o, q in zip(obs, quals):
+            self.assertEqual(o.dtype, np.uint8)
+            npt.assert_equal(o, _decode_qual_to_phred(q, variant='sanger'))
+
+    def test_out_of_range(self):
+        quals = ['IIII', 'IIII', 'II~I', 'II~I']
+        obs, error, n_valid = _decode_qual_block_to_phred(
+            quals, variant='illumina1.8')
+        self.assertEqual(n_valid, 2)
+        self.assertEqual(len(obs), 2)
+        npt.assert_equal(obs[1], np.array([40, 40, 40, 40]))
+        self.assertIsInstance(error, ValueError)
+        self.assertIn('[0, 62]', str(error))
+
+    def test_non_ascii(self):
+        quals = ['IIII', 'II\u00e9I', '~']
+        obs, error, n_valid = _decode_qual_block_to_phred(quals,
+                                                          variant='sanger')
+        self.assertEqual(n_valid, 1)
+        self.assertIsInstance(error, UnicodeEncodeError)
+        self.assertEqual(error.object, 'II\u00e9I')
+
+
 class PhredEncoderTests(unittest.TestCase):
     def test_missing_variant_and_phred_offset(self):
         with self.assertRaises(ValueError) as cm:
@@ -195,6 +242,28 @@ class PhredEncoderTests(unittest.TestCase):
         self.assertEqual(obs, 'T~K')
 
 
+class PhredBlockEncoderTests(unittest.TestCase):
+    def test_matches_single_encoder(self):
+        phreds = [np.array([0, 40, 2], dtype=np.uint8), np.array([], int),
+                  [10, 20]]
+        obs = _encode_phred_block_to_qual(phreds, variant='sanger')
+        exp = [_encode_phred_to_qual(p, variant='sanger') for p in phreds]
+        self.assertEqual(obs, exp)
+        self.assertEqual(obs, ['!I#', '', '+5'])
+
+    def test_empty(self):
+        self.assertEqual(_encode_phred_block_to_qual([], phred_offset=33), [])
+
+    def test_out_of_range(self):
+        with self.assertRaisesRegex(ValueError, r'-1.*\[0, 62\]'):
+            _encode_phred_block_to_qual([[1, 2], [42, -1]],
+                                        variant='illumina1.8')
+
+        obs = npt.assert_warns(UserWarning, _encode_phred_block_to_qual,
+                               [[1], [42, 99]], variant='illumina1.8')
+        self.assertEqual(obs, ['"', 'K_'])
+
+
 class TestGetNthSequence(unittest.TestCase):
     def setUp(self):
         def generator():
@@ -321,5 +390,31 @@ class TestFormatFASTALikeRecords(unittest.TestCase):
                                             True))
 
 
+class TestBatchFASTALikeRecords(unittest.TestCase):
+    def test_batches(self):
+        records = [('a', 'AC', None), ('b', 'G', None), ('c', 'TTT', None),
+                   ('d', 'A', None)]
+        obs = list(_batch_fasta_like_records(iter(records), buffer_size=3))
+        self.assertEqual(obs, [records[:2], records[2:3], records[3:]])
+
+        obs = list(_batch_fasta_like_records(iter(records)))
+        self.assertEqual(obs, [records])
+
+        self.assertEqual(list(_batch_fasta_like_records(iter([]))), [])
+
+
+class TestWrapLines(unittest.TestCase):
+    def test_wrap_lines(self):
+        strs = ['ACGTA', 'A', 'ACG', 'ACGTAC']
+        self.assertEqual(_wrap_lines(strs, 3),
+                         ['ACG\nTA\n', 'A\n', 'ACG\n', 'ACG\nTAC\n'])
+        self.assertEqual(_wrap_lines(strs, 1)[0], 'A\nC\nG\nT\nA\n')
+        self.assertEqual(_wrap_lines(strs, 100),
+                         ['ACGTA\n', 'A\n', 'ACG\n', 'ACGTAC\n'])
+
+    def test_empty(self):
+        self.assertEqual(_wrap_lines([], 3), [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -10,12 +10,17 @@ import unittest
 import tempfile
 import shutil
 import os
+import io
+from unittest import mock
 
 import numpy as np
 import numpy.testing as npt
+import pandas.testing as pdt
 import h5py
 
 from skbio import DistanceMatrix
+from skbio.stats.distance import DissimilarityMatrix, MissingIDError
+from skbio.io.format import binary_dm
 from skbio.io.format.binary_dm import (_h5py_mat_to_skbio_mat,
                                        _skbio_mat_to_h5py_mat, _get_header,
                                        _parse_ids, _verify_dimensions,
@@ -37,7 +42,7 @@ class BinaryMatrixTests(unittest.TestCase):
         self.basic_fname = os.path.join(self.tempdir.name, 'basic')
         self.basic = h5py.File(self.basic_fname, 'a')
         ids = self.basic.create_dataset('order', shape=(3, ),
-                                        dtype=_vlen_dtype)
+                                        dtype=_vlen_dtype())
         ids[:] = self.ids
         self.basic.create_dataset('matrix', data=self.mat)
         _set_header(self.basic)
@@ -46,7 +51,7 @@ class BinaryMatrixTests(unittest.TestCase):
         self.badids_fname = os.path.join(self.tempdir.name, 'badids')
         self.badids = h5py.File(self.badids_fname, 'a')
         ids = self.badids.create_dataset('order', shape=(2, ),
-                                         dtype=_vlen_dtype)
+                                         dtype=_vlen_dtype())
         ids[:] = ['a', 'b']
         self.badids.create_dataset('matrix', data=self.mat)
         _set_header(self.badids)
@@ -55,7 +60,7 @@ class BinaryMatrixTests(unittest.TestCase):
         self.noheader_fname = os.path.join(self.tempdir.name, 'noheader')
         self.noheader = h5py.File(self.noheader_fname, 'a')
         ids = self.noheader.create_dataset('order', shape=(3, ),
-                                           dtype=_vlen_dtype)
+                                           dtype=_vlen_dtype())
         ids[:] = self.ids
         self.noheader.create_dataset('matrix', data=self.mat)
 
@@ -121,5 +126,167 @@ class BinaryMatrixTests(unittest.TestCase):
         _set_header(m)
 
 
+class LazyBinaryMatrixTests(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        data = rng.random((7, 7))
+        data = data + data.T
+        np.fill_diagonal(data, 0)
+        self.ids = ['s%d' % i for i in range(7)]
+        self.dm = DistanceMatrix(data, self.ids)
+        self.dism = DissimilarityMatrix(rng.random((7, 7)), self.ids)
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.fname = os.path.join(self.tempdir.name, 'dm.h5')
+        self.dm.write(self.fname, format='binary_dm')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def read_lazy(self):
+        return DistanceMatrix.read(self.fname, format='binary_dm', lazy=True)
+
+    def test_roundtrip(self):
+        obs = DistanceMatrix.read(self.fname, format='binary_dm')
+        self.assertIs(type(obs), DistanceMatrix)
+        self.assertEqual(obs, self.dm)
+
+        fh = io.BytesIO()
+        self.dism.write(fh, format='binary_dm')
+        fh.seek(0)
+        obs = DissimilarityMatrix.read(fh, format='binary_dm')
+        self.assertEqual(obs, self.dism)
+
+    def test_write_chunked(self):
+        with h5py.File(self.fname, 'r') as f:
+            self.assertEqual(f['matrix'].chunks, (7, 7))
+            self.assertEqual(f['matrix'].compression, 'gzip')
+
+        self.dm.write(self.fname, format='binary_dm', compress=False)
+        with h5py.File(self.fname, 'r') as f:
+            self.assertIsNone(f['matrix'].compression)
+        self.assertEqual(DistanceMatrix.read(self.fname), self.dm)
+
+    def test_write_chunk_rows(self):
+        fh = h5py.File('f1', 'a', driver='core', backing_store=False)
+        with mock.patch.object(binary_dm, '_chunk_size', 100), \
+                mock.patch.object(binary_dm, '_block_size', 200):
+            _skbio_mat_to_h5py_mat(self.dm, fh)
+        self.assertEqual(fh['matrix'].chunks, (1, 7))
+        npt.assert_equal(fh['matrix'][()], self.dm.data)
+
+    def test_read_lazy(self):
+        obs = self.read_lazy()
+        self.assertIsInstance(obs, DistanceMatrix)
+        self.assertEqual(obs.shape, (7, 7))
+        self.assertEqual(obs.size, 49)
+        self.assertEqual(obs.dtype, np.float64)
+        self.assertEqual(obs.ids, tuple(self.ids))
+        self.assertIn('s3', obs)
+        self.assertEqual(obs.index('s3'), 3)
+        self.assertIsNone(obs._loaded)
+
+    def test_read_lazy_bytesio(self):
+        fh = io.BytesIO()
+        self.dism.write(fh, format='binary_dm')
+        fh.seek(0)
+        obs = DissimilarityMatrix.read(fh, format='binary_dm', lazy=True)
+        self.assertNotIsInstance(obs, DistanceMatrix)
+        npt.assert_equal(obs['s1'], self.dism['s1'])
+        self.assertEqual(obs, self.dism)
+
+    def test_getitem(self):
+        obs = self.read_lazy()
+        npt.assert_equal(obs['s2'], self.dm['s2'])
+        self.assertEqual(obs['s2', 's5'], self.dm['s2', 's5'])
+        npt.assert_equal(obs[1:4], self.dm[1:4])
+        npt.assert_equal(obs[3], self.dm[3])
+        npt.assert_equal(obs[[0, 4]], self.dm[[0, 4]])
+        npt.assert_equal(obs[[5, 1, 5, -1]], self.dm[[5, 1, 5, -1]])
+        self.assertIsNone(obs._loaded)
+
+        with self.assertRaises(MissingIDError):
+            obs['x']
+
+    def test_filter(self):
+        obs = self.read_lazy()
+        for ids in (['s4', 's0', 's2'], self.ids, ['s1']):
+            res = obs.filter(ids)
+            self.assertIs(type(res), DistanceMatrix)
+            self.assertEqual(res, self.dm.filter(ids))
+        self.assertEqual(obs.filter(['x', 's3', 's1'], strict=False),
+                         self.dm.filter(['s3', 's1']))
+        self.assertIsNone(obs._loaded)
+
+        with self.assertRaises(MissingIDError):
+            obs.filter(['x', 's3'])
+
+    def test_within_between(self):
+        obs = self.read_lazy()
+        ids = ['s6', 's1', 's3']
+        pdt.assert_frame_equal(obs.within(ids), self.dm.within(ids))
+        pdt.assert_frame_equal(obs.between(ids, ['s0', 's2']),
+                               self.dm.between(ids, ['s0', 's2']))
+        pdt.assert_frame_equal(obs.between([], ['s0']),
+                               self.dm.between([], ['s0']))
+        self.assertIsNone(obs._loaded)
+
+    def test_to_series(self):
+        obs = self.read_lazy()
+        npt.assert_equal(obs.condensed_form(), self.dm.condensed_form())
+        with mock.patch.object(binary_dm, '_block_size', 1):
+            pdt.assert_series_equal(obs.to_series(), self.dm.to_series())
+        self.assertIsNone(obs._loaded)
+
+    def test_load_on_demand(self):
+        obs = self.read_lazy()
+        npt.assert_equal(obs.data, self.dm.data)
+        self.assertIsNotNone(obs._loaded)
+        self.assertEqual(obs.filter(['s1', 's0']), self.dm.filter(['s1', 's0']))
+        self.assertEqual(obs.copy(), self.dm)
+
+    def test_ids_setter(self):
+        obs = self.read_lazy()
+        obs.ids = list('abcdefg')
+        npt.assert_equal(obs['c'], self.dm['s2'])
+        self.assertIsNone(obs._loaded)
+
+    def test_close(self):
+        obs = self.read_lazy()
+        npt.assert_equal(obs['s2'], self.dm['s2'])
+        obs.close()
+        self.assertFalse(obs._dataset.id.valid)
+        with self.assertRaises(Exception):
+            obs['s2']
+        obs.close()
+
+        with self.read_lazy() as obs:
+            self.assertEqual(obs.filter(['s1', 's0']),
+                             self.dm.filter(['s1', 's0']))
+            npt.assert_equal(obs.data, self.dm.data)
+        self.assertFalse(obs._dataset.id.valid)
+        # values loaded before closing remain available
+        self.assertEqual(obs, self.dm)
+
+        # an in-memory copy has no file to close
+        obs = self.read_lazy()
+        with obs.copy() as copy:
+            self.assertEqual(copy, self.dm)
+        obs.close()
+
+    def test_write_lazy(self):
+        obs = self.read_lazy()
+        fh = io.BytesIO()
+        obs.write(fh, format='binary_dm')
+        self.assertIsNone(obs._loaded)
+        fh.seek(0)
+        self.assertEqual(DistanceMatrix.read(fh, format='binary_dm'), self.dm)
+
+        fh = io.StringIO()
+        obs.write(fh, format='lsmat')
+        fh.seek(0)
+        self.assertEqual(DistanceMatrix.read(fh), self.dm)
+
+
 if __name__ == '__main__':
     unittest.main()
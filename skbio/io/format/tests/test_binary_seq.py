@@ -0,0 +1,265 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+
+from skbio import Sequence, DNA, RNA, Protein, TabularMSA
+from skbio.io import BinarySeqFormatError
+from skbio.io.format import binary_seq
+from skbio.io.format.binary_seq import (
+    _binary_seq_sniffer, _binary_seq_to_generator, _binary_seq_to_sequence,
+    _binary_seq_to_dna, _binary_seq_to_rna, _binary_seq_to_protein,
+    _binary_seq_to_tabular_msa, _generator_to_binary_seq,
+    _sequence_to_binary_seq, _dna_to_binary_seq, _rna_to_binary_seq,
+    _protein_to_binary_seq, _tabular_msa_to_binary_seq)
+
+
+def _write(seqs, **kwargs):
+    fh = io.BytesIO()
+    _generator_to_binary_seq((seq for seq in seqs), fh, **kwargs)
+    return fh.getvalue()
+
+
+def _read(data, reader=_binary_seq_to_generator, **kwargs):
+    obs = reader(io.BytesIO(data), **kwargs)
+    return obs if isinstance(obs, (Sequence, TabularMSA)) else list(obs)
+
+
+class BinarySeqTests(unittest.TestCase):
+    def setUp(self):
+        qual1 = np.array([40, 40, 38, 30, 12], dtype=np.uint8)
+        qual2 = np.array([0, 1, 254, 255], dtype=np.uint8)
+        self.seqs = [
+            DNA('ACGT', metadata={'id': 'seq1', 'description': 'first'}),
+            DNA('GGTTA', metadata={'id': 'seq2', 'description': ''},
+                positional_metadata={'quality': qual1}),
+            DNA('T', metadata={'id': 'séq3', 'description': 'ünïcode'}),
+            DNA('', metadata={'id': 'empty', 'description': 'no residues'}),
+            DNA('NNAC', metadata={'id': 'seq5', 'description': 'last'},
+                positional_metadata={'quality': qual2})]
+
+
+class SnifferTests(BinarySeqTests):
+    def test_positives(self):
+        for data in (_write(self.seqs), _write([]),
+                     _write(self.seqs, compress=True)):
+            self.assertEqual(_binary_seq_sniffer(io.BytesIO(data)),
+                             (True, {}))
+
+    def test_negatives(self):
+        npz = io.BytesIO()
+        np.savez(npz, format=np.array('binary_dm'))
+        npy = io.BytesIO()
+        np.save(npy, np.arange(3))
+        empty_zip = io.BytesIO()
+        zipfile.ZipFile(empty_zip, 'w').close()
+        for data in (b'', b'>seq1\nACGT\n', b'PK\x03\x04garbage',
+                     npz.getvalue(), npy.getvalue(), empty_zip.getvalue()):
+            self.assertEqual(_binary_seq_sniffer(io.BytesIO(data)),
+                             (False, {}))
+
+
+class ReaderTests(BinarySeqTests):
+    def test_roundtrip(self):
+        for kwargs in ({}, {'row_group_size': 1}, {'row_group_size': 2},
+                       {'compress': True}):
+            obs = _read(_write(self.seqs, **kwargs), constructor=DNA)
+            self.assertEqual(obs, self.seqs)
+
+    def test_default_metadata(self):
+        fh = _write([Sequence('AC'), Sequence('G', metadata={'id': 1})])
+        obs = _read(fh)
+        self.assertEqual(obs, [
+            Sequence('AC', metadata={'id': '', 'description': ''}),
+            Sequence('G', metadata={'id': '1', 'description': ''})])
+
+    def test_empty(self):
+        self.assertEqual(_read(_write([])), [])
+
+    def test_quality_dtype(self):
+        obs = _read(_write(self.seqs))
+        self.assertEqual(obs[1].positional_metadata['quality'].dtype,
+                         np.uint8)
+        self.assertFalse(obs[0].has_positional_metadata())
+
+    def test_kwargs(self):
+        fh = _write([Sequence('acgT')])
+        obs = _read(fh, constructor=DNA, lowercase='lower')
+        self.assertEqual(str(obs[0]), 'ACGT')
+        npt.assert_array_equal(obs[0].positional_metadata['lower'],
+                               [True, True, True, False])
+
+    def test_columns(self):
+        fh = _write(self.seqs)
+        obs = _read(fh, columns=['id'])
+        self.assertEqual([seq.metadata for seq in obs],
+                         [{'id': seq.metadata['id']} for seq in self.seqs])
+        self.assertFalse(any(seq.has_positional_metadata() for seq in obs))
+
+        obs = _read(fh, columns='quality')
+        self.assertFalse(any(seq.has_metadata() for seq in obs))
+        self.assertEqual(obs[4].positional_metadata['quality'].tolist(),
+                         [0, 1, 254, 255])
+
+        obs = _read(fh, columns=[])
+        self.assertEqual([str(seq) for seq in obs],
+                         [str(seq) for seq in self.seqs])
+
+    def test_invalid_columns(self):
+        with self.assertRaisesRegex(ValueError, "'sequence'"):
+            _read(_write(self.seqs), columns=['id', 'sequence'])
+
+    def test_rows(self):
+        fh = _write(self.seqs, row_group_size=2)
+        for rows, exp in [(slice(None), [0, 1, 2, 3, 4]),
+                          (slice(1, 4), [1, 2, 3]),
+                          (slice(None, None, -2), [0, 2, 4]),
+                          ([4, 0, 0], [0, 4]),
+                          ([-1], [4]),
+                          ([], []),
+                          (3, [3])]:
+            obs = _read(fh, constructor=DNA, rows=rows)
+            self.assertEqual(obs, [self.seqs[i] for i in exp])
+
+    def test_rows_out_of_bounds(self):
+        fh = _write(self.seqs)
+        for rows in [5], [0, -6]:
+            with self.assertRaisesRegex(IndexError, 'out of bounds'):
+                _read(fh, rows=rows)
+
+    def test_row_group_skipping(self):
+        fh = _write(self.seqs, row_group_size=2)
+        with mock.patch.object(binary_seq, '_read_row_group',
+                               wraps=binary_seq._read_row_group) as read:
+            obs = _read(fh, constructor=DNA, rows=[1, 4])
+        self.assertEqual(obs, [self.seqs[1], self.seqs[4]])
+        self.assertEqual([call.args[1] for call in read.call_args_list],
+                         [0, 2])
+
+    def test_lightweight(self):
+        fh = _write(self.seqs, row_group_size=3)
+        obs = _read(fh, lightweight=True)
+        self.assertEqual([x[:3] for x in obs], [
+            ('seq1', 'first', 'ACGT'), ('seq2', '', 'GGTTA'),
+            ('séq3', 'ünïcode', 'T'), ('empty', 'no residues', ''),
+            ('seq5', 'last', 'NNAC')])
+        self.assertIsNone(obs[0][3])
+        npt.assert_array_equal(obs[1][3], [40, 40, 38, 30, 12])
+
+        obs = _read(fh, lightweight=True, columns=['description'], rows=[2])
+        self.assertEqual(obs, [(None, 'ünïcode', 'T', None)])
+
+    def test_single_sequence(self):
+        fh = _write(self.seqs, row_group_size=2)
+        for reader, cls in ((_binary_seq_to_sequence, Sequence),
+                            (_binary_seq_to_dna, DNA)):
+            self.assertEqual(_read(fh, reader), cls(self.seqs[0]))
+            self.assertEqual(_read(fh, reader, seq_num=5), cls(self.seqs[4]))
+        obs = _read(fh, _binary_seq_to_dna, seq_num=2, columns=['id'])
+        self.assertEqual(obs, DNA('GGTTA', metadata={'id': 'seq2'}))
+
+        fh = _write([RNA('ACGU')])
+        self.assertEqual(_read(fh, _binary_seq_to_rna),
+                         RNA('ACGU', metadata={'id': '', 'description': ''}))
+        fh = _write([Protein('PAW')])
+        self.assertEqual(_read(fh, _binary_seq_to_protein),
+                         Protein('PAW', metadata={'id': '',
+                                                  'description': ''}))
+
+    def test_invalid_seq_num(self):
+        fh = _write(self.seqs)
+        for seq_num in 0, -1, None:
+            with self.assertRaisesRegex(ValueError, 'Invalid sequence number'):
+                _read(fh, _binary_seq_to_sequence, seq_num=seq_num)
+        with self.assertRaisesRegex(ValueError, '6th sequence'):
+            _read(fh, _binary_seq_to_sequence, seq_num=6)
+
+    def test_tabular_msa(self):
+        msa = TabularMSA([DNA('AC-T', metadata={'id': 'a'}),
+                          DNA('A-GT', metadata={'id': 'b'})])
+        fh = io.BytesIO()
+        _tabular_msa_to_binary_seq(msa, fh)
+        data = fh.getvalue()
+        obs = _read(data, _binary_seq_to_tabular_msa, constructor=DNA)
+        self.assertEqual([str(seq) for seq in obs], ['AC-T', 'A-GT'])
+        self.assertEqual([seq.metadata['id'] for seq in obs], ['a', 'b'])
+        obs = _read(data, _binary_seq_to_tabular_msa, constructor=DNA,
+                    rows=[1], columns=[])
+        self.assertEqual(obs, TabularMSA([DNA('A-GT')]))
+        with self.assertRaisesRegex(ValueError, '`constructor`'):
+            _read(data, _binary_seq_to_tabular_msa)
+
+    def test_invalid_header(self):
+        fh = io.BytesIO()
+        np.savez(fh, format=np.array('binary_seq'), version=np.array('2.0'))
+        with self.assertRaisesRegex(BinarySeqFormatError, "version: '2.0'"):
+            _read(fh.getvalue())
+        with self.assertRaisesRegex(BinarySeqFormatError, 'not in binary_seq'):
+            _read(b'>seq1\nACGT\n')
+
+
+class WriterTests(BinarySeqTests):
+    def test_arrays(self):
+        fh = _write(self.seqs, row_group_size=3)
+        with np.load(io.BytesIO(fh)) as data:
+            self.assertEqual(str(data['format']), 'binary_seq')
+            self.assertEqual(str(data['version']), '1.0')
+            npt.assert_array_equal(data['row_groups'], [3, 2])
+            self.assertEqual(data['0/sequence'].tobytes(), b'ACGTGGTTAT')
+            npt.assert_array_equal(data['0/sequence_offsets'], [0, 4, 9, 10])
+            self.assertEqual(data['1/id'].tobytes(), b'emptyseq5')
+            npt.assert_array_equal(data['1/id_offsets'], [0, 5, 9])
+            npt.assert_array_equal(data['0/has_quality'],
+                                   [False, True, False])
+            npt.assert_array_equal(data['0/quality'],
+                                   [0] * 4 + [40, 40, 38, 30, 12] + [0])
+
+    def test_no_quality(self):
+        fh = _write(self.seqs[:1])
+        with np.load(io.BytesIO(fh)) as data:
+            self.assertNotIn('0/quality', data)
+
+    def test_single_sequence(self):
+        for writer, seq in ((_sequence_to_binary_seq, Sequence('AC')),
+                            (_dna_to_binary_seq, DNA('AC')),
+                            (_rna_to_binary_seq, RNA('AC')),
+                            (_protein_to_binary_seq, Protein('AC'))):
+            fh = io.BytesIO()
+            writer(seq, fh)
+            self.assertEqual(
+                _read(fh.getvalue(), constructor=type(seq)),
+                [type(seq)('AC', metadata={'id': '', 'description': ''})])
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            fp = os.path.join(tmp, 'seqs.npz')
+            DNA.write(self.seqs[1], fp, format='binary_seq')
+            self.assertEqual(DNA.read(fp), self.seqs[1])
+
+    def test_invalid_quality(self):
+        for qual in [-1, 0], [256, 0], [0.5, 1.0]:
+            seqs = [DNA('AC'),
+                    DNA('AC', positional_metadata={'quality': qual})]
+            with self.assertRaisesRegex(ValueError, '2nd sequence'):
+                _write(seqs)
+
+    def test_invalid_row_group_size(self):
+        with self.assertRaisesRegex(ValueError, '`row_group_size`'):
+            _write(self.seqs, row_group_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
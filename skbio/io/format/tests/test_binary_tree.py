@@ -0,0 +1,248 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from skbio import TreeNode, DNA
+from skbio.io import BinaryTreeFormatError
+from skbio.io.format.binary_seq import _generator_to_binary_seq
+from skbio.io.format.binary_tree import (
+    _binary_tree_sniffer, _binary_tree_to_tree_node, _tree_node_to_binary_tree,
+    _binary_tree_to_compact_tree, _compact_tree_to_binary_tree, _read_arrays,
+    _write_arrays)
+from skbio.tree import CompactTree
+
+
+def _write(tree, **kwargs):
+    fh = io.BytesIO()
+    _tree_node_to_binary_tree(tree, fh, **kwargs)
+    return fh.getvalue()
+
+
+def _read(data):
+    return _binary_tree_to_tree_node(io.BytesIO(data))
+
+
+def _attrs(tree):
+    return [(node.name, node.length, node.support)
+            for node in tree.preorder()]
+
+
+class BinaryTreeTests(unittest.TestCase):
+    def setUp(self):
+        self.tree = TreeNode.read(
+            ["((a:1,b:2)c:3,(d,'é_f':0.5)'0.9:g',h:4)i;"])
+        self.tree.assign_supports()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+
+class SnifferTests(BinaryTreeTests):
+    def test_positives(self):
+        for data in (_write(self.tree), _write(TreeNode()),
+                     _write(self.tree, compress=True)):
+            self.assertEqual(_binary_tree_sniffer(io.BytesIO(data)),
+                             (True, {}))
+
+    def test_negatives(self):
+        seqs = io.BytesIO()
+        _generator_to_binary_seq((x for x in [DNA('A')]), seqs)
+        npy = io.BytesIO()
+        np.save(npy, np.arange(3))
+        for data in (b'', b'(a,b);', b'PK\x03\x04garbage', seqs.getvalue(),
+                     npy.getvalue()):
+            self.assertEqual(_binary_tree_sniffer(io.BytesIO(data)),
+                             (False, {}))
+
+
+class ReaderWriterTests(BinaryTreeTests):
+    def test_roundtrip(self):
+        for kwargs in {}, {'compress': True}:
+            obs = _read(_write(self.tree, **kwargs))
+            self.assertEqual(_attrs(obs), _attrs(self.tree))
+            self.assertEqual(str(obs), str(self.tree))
+            for node in obs.non_tips():
+                for child in node.children:
+                    self.assertIs(child.parent, node)
+
+    def test_single_node(self):
+        for tree in TreeNode(), TreeNode('a', 1.0, 0.5):
+            self.assertEqual(_attrs(_read(_write(tree))), _attrs(tree))
+
+    def test_subtree(self):
+        subtree = self.tree.find('c')
+        obs = _read(_write(subtree))
+        self.assertIsNone(obs.parent)
+        self.assertEqual(str(obs), '(a:1.0,b:2.0)c:3.0;\n')
+
+    def test_names(self):
+        tree = TreeNode.read(['(a,b,c);'])
+        tree.children[0].name = ''
+        tree.children[1].name = 42
+        obs = _read(_write(tree))
+        self.assertEqual([node.name for node in obs.children],
+                         [None, '42', 'c'])
+
+    def test_deep_tree(self):
+        tree = node = TreeNode('0')
+        for i in range(1, 5000):
+            node = TreeNode(str(i), parent=node)
+            node.parent.children.append(node)
+        obs = _read(_write(tree))
+        self.assertEqual([node.name for node in obs.preorder()],
+                         [str(i) for i in range(5000)])
+
+    def test_arrays(self):
+        data = _write(self.tree)
+        with np.load(io.BytesIO(data)) as arrays:
+            self.assertEqual(str(arrays['format']), 'binary_tree')
+            self.assertEqual(str(arrays['version']), '1.0')
+            npt.assert_array_equal(arrays['parent'],
+                                   [-1, 0, 1, 1, 0, 4, 4, 0])
+            self.assertEqual(arrays['parent'].dtype, np.int32)
+            self.assertEqual(arrays['name'].tobytes().decode('utf-8'),
+                             'icabgdé_fh')
+            npt.assert_array_equal(arrays['name_offsets'],
+                                   [0, 1, 2, 3, 4, 5, 6, 10, 11])
+            npt.assert_array_equal(
+                arrays['length'], [np.nan, 3, 1, 2, np.nan, np.nan, 0.5, 4])
+            npt.assert_array_equal(
+                arrays['support'], [np.nan] * 4 + [0.9] + [np.nan] * 3)
+
+    def test_no_lengths(self):
+        with np.load(io.BytesIO(_write(TreeNode.read(['(a,b);'])))) as arrays:
+            self.assertNotIn('length', arrays)
+            self.assertNotIn('support', arrays)
+
+    def test_file(self):
+        fp = self.path('tree.npz')
+        self.tree.write(fp, format='binary_tree')
+        self.assertEqual(str(TreeNode.read(fp)), str(self.tree))
+
+    def test_invalid_header(self):
+        fh = io.BytesIO()
+        np.savez(fh, format=np.array('binary_tree'), version=np.array('2.0'))
+        with self.assertRaisesRegex(BinaryTreeFormatError, "version: '2.0'"):
+            _read(fh.getvalue())
+        with self.assertRaisesRegex(BinaryTreeFormatError,
+                                    'not in binary_tree'):
+            _read(b'(a,b);')
+
+    def test_invalid_parents(self):
+        for parent in ([], [0], [-1, -1], [-1, 0, 2], [-1, 2, 0],
+                       [-1, 0, 0, 1]):
+            fh = io.BytesIO()
+            _write_arrays({'parent': np.array(parent),
+                           'name': np.empty(0, dtype=np.uint8),
+                           'name_offsets': np.zeros(len(parent) + 1,
+                                                    dtype=np.int64)},
+                          fh, False)
+            with self.assertRaisesRegex(BinaryTreeFormatError, 'preorder'):
+                _read(fh.getvalue())
+
+
+class CompactTreeTests(BinaryTreeTests):
+    def test_roundtrip(self):
+        ct = CompactTree.from_tree_node(self.tree)
+        fh = io.BytesIO()
+        _compact_tree_to_binary_tree(ct, fh)
+        self.assertEqual(fh.getvalue(), _write(self.tree))
+        fh.seek(0)
+        obs = _binary_tree_to_compact_tree(fh)
+        npt.assert_array_equal(obs.parent, ct.parent)
+        self.assertEqual(obs.name.tolist(), ct.name.tolist())
+        npt.assert_array_equal(obs.length, ct.length)
+        npt.assert_array_equal(obs.support, ct.support)
+
+    def test_no_lengths(self):
+        fh = io.BytesIO(_write(TreeNode.read(['(a,b);'])))
+        obs = _binary_tree_to_compact_tree(fh)
+        self.assertEqual(obs.name.tolist(), [None, 'a', 'b'])
+        self.assertTrue(np.isnan(obs.length).all())
+        self.assertTrue(np.isnan(obs.support).all())
+
+    def test_mmap(self):
+        fp = self.path('tree.npz')
+        CompactTree.from_tree_node(self.tree).write(fp)
+        obs = CompactTree.read(fp, format='binary_tree', mmap=True)
+        self.assertIsInstance(obs.length.base, np.memmap)
+        npt.assert_array_equal(obs.root_distances(),
+                               [0, 3, 4, 5, 0, 0, 0.5, 4])
+        self.assertEqual(str(obs), str(self.tree))
+
+    def test_invalid_parents(self):
+        fh = io.BytesIO()
+        for parent in [-1, 2, 0], [-1, 0, 0, 1]:
+            fh = io.BytesIO()
+            _write_arrays({'parent': np.array(parent),
+                           'name': np.empty(0, dtype=np.uint8),
+                           'name_offsets': np.zeros(len(parent) + 1,
+                                                    dtype=np.int64)},
+                          fh, False)
+            fh.seek(0)
+            with self.assertRaisesRegex(BinaryTreeFormatError, 'preorder'):
+                _binary_tree_to_compact_tree(fh)
+
+
+class ReadArraysTests(BinaryTreeTests):
+    def test_memmap(self):
+        fp = self.path('tree.npz')
+        self.tree.write(fp, format='binary_tree')
+        with open(fp, 'rb') as fh:
+            arrays = _read_arrays(fh, mmap=True)
+        self.assertIsInstance(arrays['parent'], np.memmap)
+        npt.assert_array_equal(arrays['parent'], [-1, 0, 1, 1, 0, 4, 4, 0])
+        npt.assert_array_equal(arrays['length'][1:4], [3, 1, 2])
+        with open(fp, 'rb') as fh:
+            exp = _read_arrays(fh)
+        self.assertEqual(arrays.keys(), exp.keys())
+        for key in exp:
+            self.assertNotIsInstance(exp[key], np.memmap)
+            npt.assert_array_equal(arrays[key], exp[key])
+
+    def test_memmap_empty_array(self):
+        fp = self.path('tree.npz')
+        TreeNode().write(fp, format='binary_tree')
+        with open(fp, 'rb') as fh:
+            arrays = _read_arrays(fh, mmap=True)
+        self.assertEqual(arrays['name'].size, 0)
+        npt.assert_array_equal(arrays['parent'], [-1])
+
+    def test_memmap_compressed(self):
+        fp = self.path('tree.npz')
+        self.tree.write(fp, format='binary_tree', compress=True)
+        with open(fp, 'rb') as fh:
+            arrays = _read_arrays(fh, mmap=True)
+        self.assertNotIsInstance(arrays['parent'], np.memmap)
+        npt.assert_array_equal(arrays['parent'], [-1, 0, 1, 1, 0, 4, 4, 0])
+
+    def test_memmap_unsupported(self):
+        data = _write(self.tree)
+        fp = self.path('tree.npz.gz')
+        with gzip.open(fp, 'wb') as fh:
+            fh.write(data)
+        with gzip.open(fp, 'rb') as gz, io.BytesIO(data) as bio:
+            for fh in gz, bio:
+                arrays = _read_arrays(fh, mmap=True)
+                self.assertNotIsInstance(arrays['parent'], np.memmap)
+                npt.assert_array_equal(arrays['parent'],
+                                       [-1, 0, 1, 1, 0, 4, 4, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,13 +6,16 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import io
 import unittest
 
 import pandas as pd
 import numpy as np
 
 from skbio.util import get_data_path, assert_data_frame_almost_equal
-from skbio.io.format.blast6 import _blast6_to_data_frame
+from skbio.io.format.blast6 import (
+    _blast6_to_data_frame, _blast6_to_generator)
+from skbio.io.format._blast import _parse_blast_data
 
 
 class TestBlast6Reader(unittest.TestCase):
@@ -116,5 +119,105 @@ class TestBlast6Reader(unittest.TestCase):
                                                'send', 'abcd', 'bitscore'])
 
 
+class TestBlast6LargeFiles(unittest.TestCase):
+    def setUp(self):
+        self.fp = get_data_path('blast6_default_multi_line')
+        self.columns = ['qseqid', 'sseqid', 'pident', 'length', 'mismatch',
+                        'gapopen', 'qstart', 'qend', 'sstart', 'send',
+                        'evalue', 'bitscore']
+
+    def test_usecols(self):
+        df = _blast6_to_data_frame(self.fp, default_columns=True,
+                                   usecols=['bitscore', 'qseqid'])
+        exp = pd.DataFrame([['query1', 16.9], ['query1', 11.5],
+                            ['query2', 11.9]],
+                           columns=['qseqid', 'bitscore'])
+        assert_data_frame_almost_equal(df, exp)
+
+    def test_usecols_error(self):
+        with self.assertRaisesRegex(ValueError, r"'qlen'.*not in the file"):
+            _blast6_to_data_frame(self.fp, default_columns=True,
+                                  usecols=['qseqid', 'qlen'])
+
+    def test_compact(self):
+        df = _blast6_to_data_frame(self.fp, default_columns=True,
+                                   compact=True)
+        exp = _blast6_to_data_frame(self.fp, default_columns=True)
+        self.assertEqual(df['qseqid'].dtype, 'category')
+        self.assertEqual(df['sseqid'].dtype, 'category')
+        self.assertEqual(df['length'].dtype, 'Int32')
+        self.assertEqual(df['pident'].dtype, np.float32)
+        self.assertEqual(df['evalue'].dtype, np.float64)
+        assert_data_frame_almost_equal(df.astype(exp.dtypes), exp)
+
+    def test_compact_nans(self):
+        fp = get_data_path('blast6_custom_mixed_nans')
+        df = _blast6_to_data_frame(fp, columns=['qacc', 'qseq', 'qlen',
+                                                'sgi', 'ppos', 'sseqid',
+                                                'gapopen'], compact=True)
+        self.assertEqual(df['qlen'].dtype, 'Int32')
+        self.assertEqual(df['sgi'].dtype, 'Int64')
+        self.assertEqual(df['qseq'].dtype, object)
+        self.assertTrue(pd.isna(df['qacc'][0]))
+        self.assertTrue(pd.isna(df['sseqid'][0]))
+        self.assertTrue(pd.isna(df['ppos'][1]))
+        self.assertEqual(df['qlen'].tolist(), [8, 8])
+
+    def test_generator(self):
+        exp = _blast6_to_data_frame(self.fp, default_columns=True)
+        chunks = list(_blast6_to_generator(self.fp, default_columns=True,
+                                           chunksize=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        assert_data_frame_almost_equal(pd.concat(chunks), exp)
+
+    def test_generator_compact(self):
+        chunks = list(_blast6_to_generator(self.fp, default_columns=True,
+                                           usecols=['qseqid', 'length'],
+                                           compact=True, chunksize=2))
+        self.assertEqual(chunks[1].index.tolist(), [2])
+        for chunk in chunks:
+            self.assertEqual(chunk.columns.tolist(), ['qseqid', 'length'])
+            self.assertEqual(chunk['length'].dtype, 'Int32')
+
+    def test_best_hits(self):
+        df = _blast6_to_data_frame(self.fp, default_columns=True,
+                                   best_hits=True)
+        exp = _blast6_to_data_frame(self.fp, default_columns=True)
+        assert_data_frame_almost_equal(df, exp.iloc[[0, 2]])
+
+    def parse(self, fs, **kwargs):
+        columns = ['qseqid', 'sseqid', 'bitscore']
+        with io.StringIO(fs) as fh:
+            return _parse_blast_data(fh, columns, ValueError, '%d %d',
+                                     **kwargs)
+
+    def test_best_hits_chunks(self):
+        # ties go to the first hit, missing scores are the worst
+        fs = ('q1\ts1\t10\n'
+              'q2\ts2\tN/A\n'
+              'q1\ts3\t20\n'
+              'q3\ts4\t5\n'
+              'q1\ts5\t20\n'
+              'q2\ts6\t1\n'
+              'q3\ts7\tN/A\n')
+        for chunksize in 1, 2, 3, None:
+            df = self.parse(fs, best_hits=True, chunksize=chunksize)
+            self.assertEqual(df.index.tolist(), [2, 5, 3])
+            self.assertEqual(df['sseqid'].tolist(), ['s3', 's6', 's4'])
+
+        df = self.parse(fs, best_hits=True, compact=True, chunksize=2)
+        self.assertEqual(df['qseqid'].dtype, 'category')
+        self.assertEqual(df['bitscore'].dtype, np.float32)
+
+    def test_best_hits_error(self):
+        with self.assertRaisesRegex(ValueError, 'bitscore'):
+            _blast6_to_data_frame(self.fp, default_columns=True,
+                                  usecols=['qseqid', 'evalue'],
+                                  best_hits=True)
+        with self.assertRaisesRegex(ValueError, 'query ID'):
+            _blast6_to_data_frame(self.fp, columns=self.columns[1:] + ['qlen'],
+                                  best_hits=True)
+
+
 if __name__ == '__main__':
     unittest.main()
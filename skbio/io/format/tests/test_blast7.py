@@ -13,7 +13,8 @@ import numpy as np
 
 from skbio.util import get_data_path, assert_data_frame_almost_equal
 from skbio.io import BLAST7FormatError
-from skbio.io.format.blast7 import _blast7_to_data_frame, _blast7_sniffer
+from skbio.io.format.blast7 import (
+    _blast7_to_data_frame, _blast7_to_generator, _blast7_sniffer)
 
 
 class TestBLAST7Sniffer(unittest.TestCase):
@@ -206,5 +207,28 @@ class TestBlast7Reader(unittest.TestCase):
             _blast7_to_data_frame(fp)
 
 
+class TestBlast7LargeFiles(unittest.TestCase):
+    def setUp(self):
+        self.fp = get_data_path("blast7_default_multi_line")
+
+    def test_usecols_compact(self):
+        df = _blast7_to_data_frame(self.fp, usecols=["sseqid", "length"],
+                                   compact=True)
+        self.assertEqual(df.columns.tolist(), ["sseqid", "length"])
+        self.assertEqual(df["sseqid"].dtype, "category")
+        self.assertEqual(df["length"].tolist(), [5, 8, 2])
+
+    def test_generator(self):
+        exp = _blast7_to_data_frame(self.fp)
+        chunks = list(_blast7_to_generator(self.fp, chunksize=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        assert_data_frame_almost_equal(pd.concat(chunks), exp)
+
+    def test_best_hits(self):
+        df = _blast7_to_data_frame(self.fp, best_hits=True)
+        exp = _blast7_to_data_frame(self.fp)
+        assert_data_frame_almost_equal(df, exp.iloc[[1]])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -655,6 +655,32 @@ AS   1-426          AC004528.1
             # read a generic record
             _embl_to_protein(self.multi_fp, seq_num=i+1)
 
+    def test_embl_to_generator_sections(self):
+        obs = list(_embl_to_generator(self.multi_fp,
+                                      sections=('LOCUS', 'ORIGIN')))
+        self.assertEqual(len(obs), len(self.multi))
+        for (seq, md, imd, constructor), obj in zip(self.multi, obs):
+            # the date is only set when DATE is parsed
+            locus = dict(md['LOCUS'], date=None)
+            exp = constructor(seq, metadata={'LOCUS': locus}, lowercase=True)
+            self.assertEqual(obj, exp)
+
+    def test_embl_to_dna_lazy_features(self):
+        seq, md, imd, constructor = self.multi[1]
+        obs = _embl_to_dna(self.multi_fp, seq_num=2,
+                           sections=('FEATURES', 'ORIGIN'))
+        self.assertNotIsInstance(obs._interval_metadata, IntervalMetadata)
+        self.assertEqual(obs.interval_metadata, imd)
+        self.assertEqual(obs.metadata['LOCUS']['locus_name'], 'KX454487')
+        self.assertEqual(list(obs.metadata), ['LOCUS'])
+
+    def test_feature_level_products_sections(self):
+        seq, md, imd, constructor = self.feature_level
+        obs = _embl_to_rna(self.feature_level_fp,
+                           sections=('FEATURES', 'ORIGIN'))
+        self.assertFalse(obs.has_interval_metadata())
+        self.assertEqual(str(obs), seq)
+
     # deal with feature-level-products: ignore feature table
     def test_feature_level_products(self):
         seq, md, imd, constructor = self.feature_level
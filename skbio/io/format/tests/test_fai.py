@@ -0,0 +1,225 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import io
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+
+from skbio import read, Sequence, DNA, Protein
+from skbio.io import FASTAFormatError, FASTQFormatError
+from skbio.io.format.fai import (
+    _fai_to_data_frame, _data_frame_to_fai, _build_fai, _read_indexed)
+from skbio.util import assert_data_frame_almost_equal
+
+
+class FAITests(unittest.TestCase):
+    def setUp(self):
+        self.fasta = ('>chr1 first chromosome\nACGTA\nCGTAC\nGT\n'
+                      '\n'
+                      '>chr2\nTTTTT\nGGG\n'
+                      '>chr3 x\nA\n')
+        self.fasta_fai = pd.DataFrame(
+            [[12, 23, 5, 6], [8, 45, 5, 6], [1, 63, 1, 2]],
+            index=pd.Index(['chr1', 'chr2', 'chr3'], name='name'),
+            columns=['length', 'offset', 'linebases', 'linewidth'])
+
+        self.fastq = ('@r1 read one\nACGT\n+\nABCD\n'
+                      '@r2\nGGCCA\nTT\n+r2\nIIIII\n##\n')
+        self.fastq_fai = pd.DataFrame(
+            [[4, 13, 4, 5, 20], [7, 29, 5, 6, 42]],
+            index=pd.Index(['r1', 'r2'], name='name'),
+            columns=['length', 'offset', 'linebases', 'linewidth',
+                     'qualoffset'])
+
+
+class TestReaderWriter(FAITests):
+    def test_roundtrip(self):
+        for df in self.fasta_fai, self.fastq_fai:
+            fh = io.StringIO()
+            _data_frame_to_fai(df, fh)
+            fh.seek(0)
+            obs = _fai_to_data_frame(fh)
+            assert_data_frame_almost_equal(obs, df)
+
+    def test_samtools_format(self):
+        fh = io.StringIO()
+        _data_frame_to_fai(self.fastq_fai, fh)
+        self.assertEqual(fh.getvalue(),
+                         'r1\t4\t13\t4\t5\t20\nr2\t7\t29\t5\t6\t42\n')
+
+    def test_numeric_names(self):
+        obs = _fai_to_data_frame(io.StringIO('1\t4\t3\t4\t5\n'))
+        self.assertEqual(list(obs.index), ['1'])
+
+    def test_invalid(self):
+        for fs in ['', 'a\t1\t2\t3\n', 'a\t1\t2\t3\t4\t5\t6\n',
+                   'a\t1\tb\t3\t4\n']:
+            with self.assertRaisesRegex(ValueError, 'Invalid fai'):
+                _fai_to_data_frame(io.StringIO(fs))
+
+
+class TestBuild(FAITests):
+    def test_fasta(self):
+        obs = _build_fai(io.StringIO(self.fasta))
+        assert_data_frame_almost_equal(obs, self.fasta_fai)
+
+    def test_fasta_bytes(self):
+        obs = _build_fai(io.TextIOWrapper(io.BytesIO(self.fasta.encode())))
+        assert_data_frame_almost_equal(obs, self.fasta_fai)
+
+    def test_fasta_crlf(self):
+        fh = io.BytesIO(self.fasta.replace('\n', '\r\n').encode())
+        obs = _build_fai(io.TextIOWrapper(fh))
+        self.assertEqual(obs['offset'].tolist(), [24, 51, 72])
+        self.assertEqual(obs['linewidth'].tolist(), [7, 7, 3])
+        self.assertEqual(obs['length'].tolist(), [12, 8, 1])
+
+    def test_fastq(self):
+        obs = _build_fai(io.StringIO(self.fastq), fastq=True)
+        assert_data_frame_almost_equal(obs, self.fastq_fai)
+
+    def test_empty(self):
+        obs = _build_fai(io.StringIO(''))
+        self.assertEqual(obs.shape, (0, 4))
+
+    def test_fasta_invalid(self):
+        for fs, msg in [
+                ('>a\nAC\nACG\n', "'a'.*different lengths"),
+                ('>a\nACG\nA\nACG\n', "'a'.*different lengths"),
+                ('>a\nAC\n\nAC\n', "'a'.*blank"),
+                ('>a\n>b\nAC\n', 'without sequence data'),
+                ('AC\n>a\nAC\n', 'non-header'),
+                ('>a\nAC\n>a\nAC\n', "duplicate.*'a'")]:
+            with self.assertRaisesRegex(FASTAFormatError, msg):
+                _build_fai(io.StringIO(fs))
+
+    def test_fastq_invalid(self):
+        for fs, msg in [
+                ('@a\nAC\nACG\n+\nIIIII\n', "'a'.*different lengths"),
+                ('@a\nACG\nAC\n+\nIIIII\n', "'a'.*not wrapped"),
+                ('@a\nAC\n\n+\nII\n', "'a'.*blank"),
+                ('@a\n+\nII\n', 'without sequence data'),
+                ('@a\nAC\n+\nI\n', 'truncated'),
+                ('@a\nAC\n', 'truncated'),
+                ('AC\n', 'header'),
+                ('@a\nAC\n+\nII\n@a\nAC\n+\nII\n', "duplicate.*'a'")]:
+            with self.assertRaisesRegex(FASTQFormatError, msg):
+                _build_fai(io.StringIO(fs), fastq=True)
+
+
+class TestReadIndexed(FAITests):
+    def test_by_id(self):
+        fh = io.StringIO(self.fasta)
+        self.assertEqual(
+            _read_indexed(fh, self.fasta_fai, 1, 'chr2', None, None),
+            ('TTTTTGGG', 'chr2', '', None))
+        self.assertEqual(
+            _read_indexed(fh, self.fasta_fai, 1, 'chr1', None, None),
+            ('ACGTACGTACGT', 'chr1', 'first chromosome', None))
+
+    def test_by_number(self):
+        fh = io.StringIO(self.fasta)
+        self.assertEqual(
+            _read_indexed(fh, self.fasta_fai, 3, None, None, None),
+            ('A', 'chr3', 'x', None))
+
+    def test_regions(self):
+        fh = io.StringIO(self.fasta)
+        seq = 'ACGTACGTACGT'
+        for start, end in [(0, 12), (0, 5), (4, 6), (5, 10), (11, None),
+                           (-3, None), (None, -3), (3, 3), (8, 2), (0, 100)]:
+            obs = _read_indexed(fh, self.fasta_fai, 1, 'chr1', start, end)
+            self.assertEqual(obs[0], seq[start:end])
+
+    def test_fastq(self):
+        fh = io.StringIO(self.fastq)
+        self.assertEqual(
+            _read_indexed(fh, self.fastq_fai, 1, 'r2', 3, 6, fastq=True),
+            ('CAT', 'r2', '', 'II#'))
+
+    def test_index_built_when_missing(self):
+        fh = io.StringIO(self.fasta)
+        self.assertEqual(_read_indexed(fh, None, 1, 'chr3', None, None),
+                         ('A', 'chr3', 'x', None))
+
+    def test_index_from_file(self):
+        fai = io.StringIO('chr3\t1\t63\t1\t2\n')
+        fh = io.StringIO(self.fasta)
+        self.assertEqual(_read_indexed(fh, fai, 1, 'chr3', None, None),
+                         ('A', 'chr3', 'x', None))
+
+    def test_missing_record(self):
+        fh = io.StringIO(self.fasta)
+        with self.assertRaisesRegex(ValueError, "'chr4'.*not in the index"):
+            _read_indexed(fh, self.fasta_fai, 1, 'chr4', None, None)
+        with self.assertRaisesRegex(ValueError, '4th sequence'):
+            _read_indexed(fh, self.fasta_fai, 4, None, None, None)
+        with self.assertRaisesRegex(ValueError, '`seq_num`=0'):
+            _read_indexed(fh, self.fasta_fai, 0, None, None, None)
+
+    def test_fasta_index_for_fastq(self):
+        fh = io.StringIO(self.fastq)
+        with self.assertRaisesRegex(ValueError, '`qualoffset`'):
+            _read_indexed(fh, self.fasta_fai, 1, None, None, None, fastq=True)
+
+    def test_stale_index(self):
+        fh = io.StringIO('>chr0 a description\nA\n' + self.fasta)
+        with self.assertRaisesRegex(FASTAFormatError, "'chr1'.*out of date"):
+            _read_indexed(fh, self.fasta_fai, 1, 'chr1', None, None)
+
+        fh = io.StringIO(self.fasta[:50])
+        with self.assertRaisesRegex(FASTAFormatError, "'chr2'.*out of date"):
+            _read_indexed(fh, self.fasta_fai, 1, 'chr2', None, None)
+
+
+class TestSequenceReaders(FAITests):
+    def test_fasta(self):
+        fai = io.StringIO()
+        _data_frame_to_fai(self.fasta_fai, fai)
+        fai.seek(0)
+        obs = read(io.StringIO(self.fasta), format='fasta', into=DNA,
+                   fai=fai, seq_id='chr1', start=2, end=9)
+        self.assertEqual(obs, DNA('GTACGTA', metadata={
+            'id': 'chr1', 'description': 'first chromosome'}))
+
+        for seq_num in 1, 2, 3:
+            exp = read(io.StringIO(self.fasta), format='fasta', into=Protein,
+                       seq_num=seq_num)
+            obs = read(io.StringIO(self.fasta), format='fasta', into=Protein,
+                       seq_num=seq_num, fai=self.fasta_fai)
+            self.assertEqual(obs, exp)
+            self.assertEqual(obs[1:3], read(
+                io.StringIO(self.fasta), format='fasta', into=Protein,
+                seq_num=seq_num, start=1, end=3))
+
+    def test_fasta_qual(self):
+        with self.assertRaisesRegex(ValueError, 'QUAL'):
+            read(io.StringIO(self.fasta), format='fasta', into=DNA,
+                 seq_id='chr1', qual=io.StringIO('>chr1\n1\n'))
+
+    def test_fastq(self):
+        obs = read(io.StringIO(self.fastq), format='fastq', into=Sequence,
+                   variant='sanger', seq_id='r2', start=4)
+        exp = read(io.StringIO(self.fastq), format='fastq', into=Sequence,
+                   variant='sanger', seq_num=2)[4:]
+        self.assertEqual(obs, exp)
+        npt.assert_equal(obs.positional_metadata['quality'].values,
+                         np.array([40, 2, 2], dtype=np.uint8))
+
+        obs = read(io.StringIO(self.fastq), format='fastq', into=Sequence,
+                   variant='sanger', fai=self.fastq_fai, seq_num=1)
+        exp = read(io.StringIO(self.fastq), format='fastq', into=Sequence,
+                   variant='sanger', seq_num=1)
+        self.assertEqual(obs, exp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -877,6 +877,21 @@ class WriterTests(TestCase):
                 _generator_to_fasta(obj, fh, **kwargs)
             fh.close()
 
+    def test_generator_to_fasta_records_before_error(self):
+        # the records preceding an invalid one are written
+        def gen():
+            yield DNA('ACGT', metadata={'id': 'a'},
+                      positional_metadata={'quality': range(4)})
+            yield DNA('GG', metadata={'id': 'b'},
+                      positional_metadata={'quality': [5, 6]})
+            yield DNA('', metadata={'id': 'c'})
+
+        fh, qual = io.StringIO(), io.StringIO()
+        with self.assertRaisesRegex(ValueError, r'3rd.*empty'):
+            _generator_to_fasta(gen(), fh, qual=qual)
+        self.assertEqual(fh.getvalue(), '>a\nACGT\n>b\nGG\n')
+        self.assertEqual(qual.getvalue(), '>a\n0 1 2 3\n>b\n5 6\n')
+
     # light testing of object -> fasta writers to ensure interface is present
     # and kwargs are passed through. extensive testing of underlying writer is
     # performed above
@@ -23,6 +23,7 @@ from skbio.util import classproperty
 from skbio.util._decorator import overrides
 
 import numpy as np
+import numpy.testing as npt
 
 # Note: the example FASTQ files with file extension .fastq are taken from the
 # following open-access publication's supplementary data:
@@ -345,6 +346,76 @@ class TestReaders(unittest.TestCase):
             with self.assertRaisesRegex(ValueError, r'out of range \[0, 62\]'):
                 list(_fastq_to_generator(fp, variant='illumina1.8'))
 
+    def test_fastq_to_generator_lightweight(self):
+        for valid_files, kwargs, components in self.valid_configurations:
+            for valid in valid_files:
+                for observed_kwargs in kwargs:
+                    _drop_kwargs(observed_kwargs, 'seq_num', 'constructor')
+                    observed = list(_fastq_to_generator(
+                        valid, lightweight=True, **observed_kwargs))
+                    self.assertEqual(len(observed), len(components))
+                    for o, c in zip(observed, components):
+                        self.assertEqual(o[:3], c[:3])
+                        self.assertEqual(o[3].dtype, np.uint8)
+                        npt.assert_equal(o[3], np.array(c[3]))
+
+    def test_fastq_to_generator_batches(self):
+        for valid_files, kwargs, components in self.valid_configurations:
+            for valid in valid_files:
+                for observed_kwargs in kwargs:
+                    _drop_kwargs(observed_kwargs, 'seq_num', 'constructor')
+                    for batch_size in 1, 2, 1000:
+                        batches = list(_fastq_to_generator(
+                            valid, batch_size=batch_size, **observed_kwargs))
+                        self.assertTrue(all(len(b[0]) <= batch_size
+                                            for b in batches))
+                        observed = [r for b in batches for r in zip(*b)]
+                        self.assertEqual(len(observed), len(components))
+                        for o, c in zip(observed, components):
+                            self.assertEqual(o[:3], c[:3])
+                            npt.assert_equal(o[3], np.array(c[3]))
+
+    def test_fastq_to_generator_invalid_batch_size(self):
+        with self.assertRaisesRegex(ValueError, r'`batch_size`'):
+            list(_fastq_to_generator(get_data_path('fastq_multi_seq_sanger'),
+                                     variant='sanger', batch_size=0))
+
+    def test_fastq_to_generator_records_before_error(self):
+        # records preceding an invalid one are yielded before raising,
+        # irrespective of how many records are decoded together
+        records = ''.join('@r%d\nACGT\n+\nIIII\n' % i for i in range(100))
+        for invalid, error_type in (('@bad\nACGT\n+\nII~I\n', ValueError),
+                                    ('@bad\nACGT\n+\nIII\n',
+                                     FASTQFormatError)):
+            fh = io.StringIO(records + invalid + records)
+            observed = []
+            with self.assertRaises(error_type):
+                for seq in _fastq_to_generator(fh, variant='illumina1.8'):
+                    observed.append(seq.metadata['id'])
+            self.assertEqual(observed, ['r%d' % i for i in range(100)])
+
+            fh = io.StringIO(records + invalid + records)
+            observed = []
+            with self.assertRaises(error_type):
+                for batch in _fastq_to_generator(fh, variant='illumina1.8',
+                                                 batch_size=30):
+                    observed.append(len(batch[0]))
+            self.assertEqual(observed, [30, 30, 30, 10])
+
+    def test_fastq_to_generator_mixed_layouts(self):
+        # four-line records mixed with wrapped records
+        fh = io.StringIO('@a\nAC\n+\nII\n'
+                         '@b\nAC\nGT\n+b\nI\nIII\n'
+                         '\n'
+                         '@c\nA\n+\n@\n')
+        observed = list(_fastq_to_generator(fh, variant='sanger',
+                                            lightweight=True))
+        self.assertEqual([o[:3] for o in observed],
+                         [('a', '', 'AC'), ('b', '', 'ACGT'), ('c', '', 'A')])
+        npt.assert_equal(observed[0][3], np.array([40, 40]))
+        npt.assert_equal(observed[1][3], np.array([40, 40, 40, 40]))
+        npt.assert_equal(observed[2][3], np.array([31]))
+
     def test_fastq_to_generator_solexa(self):
         # solexa support isn't implemented yet. should raise error even with
         # valid solexa file
@@ -551,6 +622,26 @@ class TestWriters(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, r'2nd.*quality scores'):
             _generator_to_fastq(gen(), io.StringIO(), variant='illumina1.8')
 
+    def test_generator_to_fastq_records_before_error(self):
+        # the records preceding an invalid one are written, whether it cannot
+        # be formatted or its quality scores cannot be encoded
+        def gen(last):
+            yield DNA('ACGT', metadata={'id': 'a'},
+                      positional_metadata={'quality': range(4)})
+            yield DNA('GG', metadata={'id': 'b'},
+                      positional_metadata={'quality': [50, 6]})
+            yield last
+
+        exp = '@a\nACGT\n+\n!"#$\n@b\nGG\n+\nS\'\n'
+        for last, error in ((DNA('T', metadata={'id': 'c'}), 'quality'),
+                            (DNA('T', metadata={'id': 'c'},
+                                 positional_metadata={'quality': [-1]}),
+                             'out of range')):
+            fh = io.StringIO()
+            with self.assertRaisesRegex(ValueError, error):
+                _generator_to_fastq(gen(last), fh, variant='sanger')
+            self.assertEqual(fh.getvalue(), exp)
+
 
 class TestConversions(unittest.TestCase):
     def setUp(self):
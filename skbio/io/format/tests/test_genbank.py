@@ -292,6 +292,54 @@ REFERENCE   1  (bases 1 to 154478)
                       lowercase=True, interval_metadata=exp[2])
         self.assertEqual(exp, obs)
 
+    def test_genbank_to_generator_sections(self):
+        obs = list(_genbank_to_generator(self.multi_fp,
+                                         sections=('LOCUS', 'ORIGIN')))
+        self.assertEqual(len(obs), len(self.multi))
+        for (seq, md, imd, constructor), obj in zip(self.multi, obs):
+            exp = constructor(seq, metadata={'LOCUS': md['LOCUS']},
+                              lowercase=True)
+            self.assertEqual(obj, exp)
+            self.assertFalse(obj.has_interval_metadata())
+
+    def test_genbank_to_sequence_sections(self):
+        seq, md, imd, constructor = self.multi[1]
+        obs = _genbank_to_sequence(self.multi_fp, seq_num=2,
+                                   sections=['FEATURES', 'ORIGIN'])
+        exp = Sequence(seq, metadata={'LOCUS': md['LOCUS']},
+                       lowercase=True, interval_metadata=imd)
+        self.assertEqual(obs, exp)
+
+        # LOCUS is always parsed
+        obs = _genbank_to_sequence(self.multi_fp, seq_num=2,
+                                   sections='DEFINITION')
+        self.assertEqual(obs.metadata, {'LOCUS': md['LOCUS'],
+                                        'DEFINITION': md['DEFINITION']})
+        self.assertEqual(len(obs), 0)
+
+    def test_genbank_to_sequence_sections_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'without ORIGIN'):
+            _genbank_to_sequence(self.multi_fp, sections=['FEATURES'])
+
+    def test_genbank_to_dna_lazy_features(self):
+        seq, md, imd, constructor = self.multi[1]
+        obs = _genbank_to_dna(self.multi_fp, seq_num=2)
+        # the feature table is parsed when it is first accessed
+        self.assertNotIsInstance(obs._interval_metadata, IntervalMetadata)
+        self.assertEqual(obs.interval_metadata, imd)
+        self.assertIs(obs.interval_metadata, obs._interval_metadata)
+
+    def test_genbank_to_dna_length_mismatch(self):
+        fh = io.StringIO(
+            'LOCUS       AB000001   12 bp    DNA     linear   BCT 03-JUL-2017\n'
+            'FEATURES             Location/Qualifiers\n'
+            '     gene            1..10\n'
+            'ORIGIN\n'
+            '        1 atgcatgcat\n'
+            '//\n')
+        with self.assertRaisesRegex(ValueError, 'upper bound'):
+            _genbank_to_dna(fh)
+
 
 class WriterTests(GenBankIOTests):
     def test_serialize_locus(self):
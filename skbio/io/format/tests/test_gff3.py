@@ -8,8 +8,12 @@
 
 from unittest import TestCase, main
 import io
+import os
+import shutil
+import tempfile
 
 from skbio.util import get_data_path
+from skbio.io.util import build_gfi
 from skbio.metadata import IntervalMetadata
 from skbio import DNA, Sequence
 from skbio.io import GFF3FormatError
@@ -177,6 +181,30 @@ class ReaderTests(GFF3IOTests):
                 get_data_path('gff3_bad_wrong_columns'),
                 seq_id='Chromosome')
 
+    def test_gff3_to_interval_metadata_region(self):
+        gfi = build_gfi(self.multi_fp)
+        obs = _gff3_to_interval_metadata(
+            self.multi_fp, seq_id='Chromosome', gfi=gfi)
+        self.assertEqual(obs, self.imd1)
+
+        obs = _gff3_to_interval_metadata(
+            self.multi_fp, seq_id='Chromosome', gfi=gfi, start=200, end=300)
+        self.assertEqual(obs.upper_bound, self.upper_bound)
+        self.assertEqual([x.metadata['type'] for x in obs.query()],
+                         ['chromosome'])
+
+        # without an index, one is saved next to the file and reused
+        with tempfile.TemporaryDirectory() as dir:
+            fp = os.path.join(dir, 'multi.gff3')
+            shutil.copy(self.multi_fp, fp)
+            obs = _gff3_to_interval_metadata(
+                fp, seq_id='gi|556503834|ref|NC_000913.3|', start=2799)
+            self.assertEqual(obs, IntervalMetadata(None))
+            self.assertTrue(os.path.exists(fp + '.gfi'))
+
+            obs = _gff3_to_interval_metadata(fp, seq_id='Chromosome')
+            self.assertEqual(obs, self.imd1)
+
     def test_gff3_to_generator(self):
         exps = [('Chromosome', self.imd1),
                 ('gi|556503834|ref|NC_000913.3|', self.imd2)]
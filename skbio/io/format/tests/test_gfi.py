@@ -0,0 +1,223 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from skbio.io import GFF3FormatError
+from skbio.io.format.gfi import (
+    _gfi_to_data_frame, _data_frame_to_gfi, _build_gfi, _read_indexed,
+    _sidecar_gfi)
+from skbio.util import assert_data_frame_almost_equal
+
+
+class GFITests(unittest.TestCase):
+    def setUp(self):
+        self.gff3 = ('##gff-version 3\n'
+                     '##sequence-region ctg1 1 1000\n'
+                     'ctg1\t.\tgene\t10\t90\t.\t+\t.\tID=g1\n'
+                     'ctg1\t.\tgene\t200\t300\t.\t+\t.\tID=g2\n'
+                     '###\n'
+                     'ctg1\t.\tgene\t500\t700\t.\t-\t.\tID=g3\n'
+                     'ctg2\t.\tgene\t5\t50\t.\t-\t.\tID=g4\n'
+                     '\n'
+                     'ctg1\t.\tgene\t800\t900\t.\t+\t.\tID=g5\n'
+                     '##FASTA\n'
+                     '>ctg1\n'
+                     'ACGT\n')
+        self.gfi = pd.DataFrame(
+            [[46, 66, 9, 300, 1000], [112, 32, 499, 700, 1000],
+             [144, 30, 4, 50, pd.NA], [174, 32, 799, 900, 1000]],
+            index=pd.Index(['ctg1', 'ctg1', 'ctg2', 'ctg1'], name='seqid'),
+            columns=['offset', 'size', 'start', 'end', 'length']).astype(
+                {'length': 'Int64'})
+
+
+class TestReaderWriter(GFITests):
+    def test_roundtrip(self):
+        fh = io.StringIO()
+        _data_frame_to_gfi(self.gfi, fh)
+        self.assertEqual(fh.getvalue().splitlines()[2], 'ctg2\t144\t30\t4\t50\t')
+        fh.seek(0)
+        obs = _gfi_to_data_frame(fh)
+        assert_data_frame_almost_equal(obs, self.gfi)
+
+    def test_invalid(self):
+        for fs in ['', 'a\t1\t2\t3\t4\n', 'a\t1\tb\t3\t4\t5\n',
+                   'a\t1\t2\t3\t4\t5\t6\n']:
+            with self.assertRaisesRegex(ValueError, 'Invalid gfi'):
+                _gfi_to_data_frame(io.StringIO(fs))
+
+
+class TestBuild(GFITests):
+    def test_blocks(self):
+        obs = _build_gfi(io.StringIO(self.gff3), block_size=70)
+        assert_data_frame_almost_equal(obs, self.gfi)
+
+    def test_bytes(self):
+        fh = io.TextIOWrapper(io.BytesIO(self.gff3.encode()))
+        obs = _build_gfi(fh, block_size=70)
+        assert_data_frame_almost_equal(obs, self.gfi)
+
+    def test_default_block_size(self):
+        obs = _build_gfi(io.StringIO(self.gff3))
+        self.assertEqual(obs.index.tolist(), ['ctg1', 'ctg2', 'ctg1'])
+        self.assertEqual(obs['size'].tolist(), [98, 30, 32])
+
+    def test_empty(self):
+        obs = _build_gfi(io.StringIO('##gff-version 3\n'))
+        self.assertEqual(obs.shape, (0, 5))
+
+    def test_invalid(self):
+        for fs in ['ctg1\t.\tgene\n', 'ctg1\t.\tgene\ta\t3\t.\t+\t.\tID=g\n']:
+            with self.assertRaisesRegex(GFF3FormatError, 'Wrong GFF3'):
+                _build_gfi(io.StringIO(fs))
+        with self.assertRaisesRegex(ValueError, 'block_size'):
+            _build_gfi(io.StringIO(self.gff3), block_size=0)
+
+
+class TestReadIndexed(GFITests):
+    def ids(self, lines):
+        return [line.rsplit('=', 1)[1] for line in lines]
+
+    def test_whole_sequence(self):
+        fh = io.StringIO(self.gff3)
+        length, lines = _read_indexed(fh, self.gfi, 'ctg1', None, None)
+        self.assertEqual(length, 1000)
+        self.assertEqual(self.ids(lines), ['g1', 'g2', 'g3', 'g5'])
+
+        length, lines = _read_indexed(fh, self.gfi, 'ctg2', None, None)
+        self.assertIsNone(length)
+        self.assertEqual(self.ids(lines), ['g4'])
+
+        self.assertEqual(_read_indexed(fh, self.gfi, 'foo', None, None),
+                         (None, []))
+
+    def test_regions(self):
+        fh = io.StringIO(self.gff3)
+        for start, end, exp in [(0, 10, ['g1']), (90, 199, []),
+                                (250, 600, ['g2', 'g3']), (-150, None, ['g5']),
+                                (None, 9, []), (None, None, ['g1', 'g2', 'g3',
+                                                             'g5'])]:
+            _, lines = _read_indexed(fh, self.gfi, 'ctg1', start, end)
+            self.assertEqual(self.ids(lines), exp)
+
+        # negative positions without a sequence region are relative to the
+        # end of the last feature
+        _, lines = _read_indexed(fh, self.gfi, 'ctg2', -10, None)
+        self.assertEqual(self.ids(lines), ['g4'])
+
+    def test_build_in_memory(self):
+        fh = io.StringIO(self.gff3)
+        _, lines = _read_indexed(fh, None, 'ctg1', 600, None)
+        self.assertEqual(self.ids(lines), ['g3', 'g5'])
+
+    def test_from_file(self):
+        index = io.StringIO()
+        _data_frame_to_gfi(self.gfi, index)
+        index.seek(0)
+        _, lines = _read_indexed(io.StringIO(self.gff3), index, 'ctg2', 0, 10)
+        self.assertEqual(self.ids(lines), ['g4'])
+
+    def test_out_of_date(self):
+        fh = io.StringIO(self.gff3.replace('ctg2', 'ctg3'))
+        with self.assertRaisesRegex(GFF3FormatError, "'ctg2'.*out of date"):
+            _read_indexed(fh, self.gfi, 'ctg2', None, None)
+
+
+class TestSidecar(GFITests):
+    def setUp(self):
+        super().setUp()
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'a.gff3')
+        self.index_path = self.path + '.gfi'
+        with open(self.path, 'w') as f:
+            f.write(self.gff3)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def read(self, build=True):
+        with open(self.path) as fh:
+            return _sidecar_gfi(fh, build=build)
+
+    def test_not_a_file(self):
+        self.assertIsNone(_sidecar_gfi(io.StringIO(self.gff3)))
+        obs = _sidecar_gfi(io.StringIO(self.gff3), build=True)
+        assert_data_frame_almost_equal(obs, _build_gfi(io.StringIO(self.gff3)))
+
+    def test_build_and_reuse(self):
+        self.assertIsNone(self.read(build=False))
+        self.assertFalse(os.path.exists(self.index_path))
+
+        exp = _build_gfi(io.StringIO(self.gff3))
+        assert_data_frame_almost_equal(self.read(), exp)
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ['a.gff3', 'a.gff3.gfi'])
+        with open(self.index_path) as f:
+            self.assertTrue(f.readline().startswith('#stamp\t'))
+
+        # the saved index is read rather than built again
+        with mock.patch('skbio.io.format.gfi._build_gfi') as build:
+            assert_data_frame_almost_equal(self.read(build=False), exp)
+            assert_data_frame_almost_equal(self.read(), exp)
+            build.assert_not_called()
+
+        # and it can be read in gfi format
+        assert_data_frame_almost_equal(
+            _gfi_to_data_frame(self.index_path), exp)
+
+    def test_modified_file(self):
+        self.read()
+        with open(self.path, 'w') as f:
+            f.write(self.gff3.replace('ctg2', 'ctg3'))
+        # the size is unchanged, so make sure the modification time is not
+        os.utime(self.path, ns=(0, 0))
+        self.assertIsNone(self.read(build=False))
+        obs = self.read()
+        self.assertEqual(obs.index.tolist(), ['ctg1', 'ctg3', 'ctg1'])
+        assert_data_frame_almost_equal(self.read(build=False), obs)
+
+    def test_invalid_index(self):
+        for content in ['', '#stamp\t1\t2\n', 'foo\n']:
+            with open(self.index_path, 'w') as f:
+                f.write(content)
+            self.assertIsNone(self.read(build=False))
+            self.assertEqual(self.read().shape, (3, 5))
+
+    def test_unwritable(self):
+        with mock.patch('tempfile.mkstemp', side_effect=PermissionError):
+            self.assertEqual(self.read().shape, (3, 5))
+        self.assertEqual(os.listdir(self.dir), ['a.gff3'])
+
+        with mock.patch('os.replace', side_effect=OSError):
+            self.assertEqual(self.read().shape, (3, 5))
+        self.assertEqual(os.listdir(self.dir), ['a.gff3'])
+
+    def test_interrupted(self):
+        with mock.patch('skbio.io.format.gfi._data_frame_to_gfi',
+                        side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.read()
+        self.assertEqual(os.listdir(self.dir), ['a.gff3'])
+
+    def test_read_indexed(self):
+        with open(self.path) as fh:
+            _, lines = _read_indexed(fh, None, 'ctg1', 600, None)
+        self.assertEqual([line[-2:] for line in lines], ['g3', 'g5'])
+        self.assertTrue(os.path.exists(self.index_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,10 +7,16 @@
 # ----------------------------------------------------------------------------
 
 import io
-from unittest import TestCase, main
+import os
+import tempfile
+from unittest import TestCase, main, mock
+
+import numpy as np
+import numpy.testing as npt
 
 from skbio import DistanceMatrix
 from skbio.io import LSMatFormatError
+from skbio.io.format import lsmat
 from skbio.io.format.lsmat import (
     _lsmat_to_dissimilarity_matrix, _lsmat_to_distance_matrix,
     _dissimilarity_matrix_to_lsmat, _distance_matrix_to_lsmat, _lsmat_sniffer)
@@ -116,6 +122,15 @@ class DissimilarityAndDistanceMatrixReaderWriterTests(LSMatTestData):
             self.assertEqual(obs, exp)
             self.assertIsInstance(obs, cls)
 
+        # Multi-character delimiters are supported as well.
+        for fn, cls in ((_lsmat_to_dissimilarity_matrix, DissimilarityMatrix),
+                        (_lsmat_to_distance_matrix, DistanceMatrix)):
+            exp = cls(self.lsmat_3x3_data, ['a', 'b', 'c'])
+            obs = fn(io.StringIO(LSMat_3x3_CSV.replace(',', '::')),
+                     delimiter='::')
+            self.assertEqual(obs, exp)
+            self.assertIsInstance(obs, cls)
+
         # Test that fixed-width works too.
         for fn, cls in ((_lsmat_to_dissimilarity_matrix, DissimilarityMatrix),
                         (_lsmat_to_distance_matrix, DistanceMatrix)):
@@ -182,6 +197,82 @@ class DissimilarityAndDistanceMatrixReaderWriterTests(LSMatTestData):
 
                 self.assertEqual(lsmat1, lsmat2)
 
+    def test_read_into_out(self):
+        out = np.full((3, 3), np.nan)
+        obs = _lsmat_to_distance_matrix(io.StringIO(LSMat_3x3), out=out)
+        self.assertIs(obs.data, out)
+        self.assertEqual(obs, DistanceMatrix(self.lsmat_3x3_data,
+                                             ['a', 'b', 'c']))
+
+        with self.assertRaisesRegex(ValueError, r'shape \(3, 3\)'):
+            _lsmat_to_distance_matrix(io.StringIO(LSMat_3x3),
+                                      out=np.empty((2, 2)))
+
+    def test_read_into_memmap(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'dm.npy')
+            out = np.lib.format.open_memmap(path, mode='w+', dtype=float,
+                                            shape=(3, 3))
+            obs = _lsmat_to_distance_matrix(io.StringIO(LSMat_3x3), out=out)
+            out.flush()
+            npt.assert_equal(np.load(path), self.lsmat_3x3_data)
+            self.assertEqual(obs.data.shape, (3, 3))
+            del obs, out
+
+    def test_read_in_blocks(self):
+        exp = DissimilarityMatrix(self.lsmat_3x3_data, ['a', 'b', 'c'])
+        with mock.patch.object(lsmat, '_block_size', 1):
+            for fh, delimiter in ((LSMat_3x3, '\t'),
+                                  (LSMat_3x3_WHITESPACE, '\t'),
+                                  (LSMat_3x3_CSV, ','),
+                                  (LSMat_3x3_FW, None)):
+                obs = _lsmat_to_dissimilarity_matrix(io.StringIO(fh),
+                                                     delimiter=delimiter)
+                self.assertEqual(obs, exp)
+
+    def test_read_invalid_values(self):
+        for fh, error, msg in (
+                ('\ta\tb\na\t0\tx\nb\t1\t0\n', ValueError, 'x'),
+                # the first error in the file is reported
+                ('\ta\tb\na\t0\tx\nc\t1\t0\n', ValueError, 'x'),
+                ('\ta\tb\na\t0\tx\nb\t1\n', ValueError, 'x'),
+                ('\ta\na\n', LSMatFormatError, r'0 value\(s\)'),
+                ('\ta\na\t1\t\t2\n', LSMatFormatError, r'3 value\(s\)')):
+            with self.assertRaisesRegex(error, msg):
+                _lsmat_to_dissimilarity_matrix(io.StringIO(fh))
+
+        for fh, msg in (('a b\na 0 1\nb 1\n', r'1 value\(s\) in row 2'),
+                        ('a b\na 0 1\nb 1 0 2\n', r'3 value\(s\) in row 2'),
+                        ('a\na\n', r'0 value\(s\) in row 1')):
+            with self.assertRaisesRegex(LSMatFormatError, msg):
+                _lsmat_to_dissimilarity_matrix(io.StringIO(fh),
+                                               delimiter=None)
+
+    def test_write_float_format(self):
+        obj = DissimilarityMatrix(self.lsmat_3x3_data, ['a', 'b', 'c'])
+        fh = io.StringIO()
+        _dissimilarity_matrix_to_lsmat(obj, fh, delimiter=',',
+                                       float_format='%.3f')
+        self.assertEqual(fh.getvalue(),
+                         ',a,b,c\n'
+                         'a,0.000,0.010,4.200\n'
+                         'b,0.010,0.000,12.000\n'
+                         'c,4.200,12.000,0.000\n')
+
+    def test_write_float32(self):
+        obj = DissimilarityMatrix(
+            np.array(self.lsmat_3x3_data, dtype=np.float32), ['a', 'b', 'c'])
+        fh = io.StringIO()
+        _dissimilarity_matrix_to_lsmat(obj, fh)
+        self.assertEqual(fh.getvalue(), LSMat_3x3)
+
+    def test_write_in_blocks(self):
+        obj = DissimilarityMatrix(self.lsmat_3x3_data, ['a', 'b', 'c'])
+        fh = io.StringIO()
+        with mock.patch.object(lsmat, '_block_size', 1):
+            _dissimilarity_matrix_to_lsmat(obj, fh)
+        self.assertEqual(fh.getvalue(), LSMat_3x3)
+
 
 class SnifferTests(LSMatTestData):
     def setUp(self):
@@ -8,11 +8,14 @@
 
 import io
 import unittest
+from unittest import mock
 
 from skbio import TreeNode
 from skbio.io import NewickFormatError
+from skbio.io.format import newick as newick_module
 from skbio.io.format.newick import (
-    _newick_to_tree_node, _tree_node_to_newick, _newick_sniffer)
+    _newick_to_tree_node, _tree_node_to_newick, _newick_sniffer,
+    _tokenize_newick, _split_newick)
 
 
 class TestNewick(unittest.TestCase):
@@ -351,6 +354,52 @@ class TestNewick(unittest.TestCase):
         fh2.close()
         fh.close()
 
+    def test_split_newick_matches_tokenizer(self):
+        for _, newicks in self.trees_newick_lists:
+            for newick in newicks:
+                if "'" in newick or "[" in newick:
+                    continue
+                for convert in True, False:
+                    exp = [t for t in _tokenize_newick(
+                        io.StringIO(newick), convert_underscores=convert) if t]
+                    self.assertEqual(
+                        _split_newick(newick, convert_underscores=convert),
+                        exp)
+
+    def test_split_newick_whitespace(self):
+        self.assertEqual(_split_newick(' ( a ,\tb_c : 1.0\n) ;'),
+                         ['(', 'a', ',', 'b c', ':', '1.0', ')', ';'])
+        for newick in 'a b;', '(a,b:1 .0);', '(a,b)c\nd;':
+            with self.assertRaisesRegex(NewickFormatError, 'whitespace'):
+                _split_newick(newick)
+
+    def test_newick_to_tree_node_first_tree(self):
+        fh = io.StringIO('(a,b)c;\n(d,e)f;\n')
+        tree = _newick_to_tree_node(fh)
+        self.assertEqual(str(tree), '(a,b)c;\n')
+        self.assertEqual(fh.read(), '(d,e)f;\n')
+
+    def test_newick_to_tree_node_quotes_after_first_line(self):
+        fh = io.StringIO("(a,\n'b c'[comment]);")
+        tree = _newick_to_tree_node(fh)
+        self.assertEqual([x.name for x in tree.tips()], ['a', 'b c'])
+
+    def test_deep_tree(self):
+        # neither reading nor writing may recurse
+        n = 10000
+        newick = '(' * n + 'a' + ')' * n + ';\n'
+        tree = _newick_to_tree_node(io.StringIO(newick))
+        fh = io.StringIO()
+        _tree_node_to_newick(tree, fh)
+        self.assertEqual(fh.getvalue(), newick)
+
+    def test_tree_node_to_newick_buffered(self):
+        for tree, newicks in self.trees_newick_lists:
+            fh = io.StringIO()
+            with mock.patch.object(newick_module, '_buffer_size', 2):
+                _tree_node_to_newick(tree, fh)
+            self.assertEqual(fh.getvalue(), newicks[0])
+
     def test_newick_sniffer_valid_files(self):
         for _, newicks in self.trees_newick_lists:
             for newick in newicks:
@@ -6,14 +6,20 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import os
+import gzip
+import shutil
+import tempfile
 import unittest
 from io import StringIO
+from unittest import mock
 
 import pandas as pd
 import numpy as np
 
 from skbio.util import get_data_path, assert_data_frame_almost_equal
-from skbio.io.format.taxdump import _taxdump_to_data_frame
+from skbio.io.format.taxdump import _taxdump_to_data_frame, _file_stamp
+from skbio.io.util import open_file
 
 
 class TestTaxdumpReader(unittest.TestCase):
@@ -165,5 +171,137 @@ class TestTaxdumpReader(unittest.TestCase):
                          'Invalid taxdump file format.')
 
 
+    def test_invalid_separator(self):
+        fs = StringIO('1\t1\tno rank\n2\t1\tgenus\n')
+        with self.assertRaisesRegex(ValueError, 'Invalid taxdump'):
+            _taxdump_to_data_frame(fs, scheme='nodes_slim')
+
+    def test_quotes(self):
+        fs = StringIO('562\t|\t"Bacillus coli" Migula 1895\t|\t\t|\t'
+                      'authority\t|\n')
+        obs = _taxdump_to_data_frame(fs, scheme='names')
+        self.assertEqual(obs.loc[562, 'name_txt'],
+                         '"Bacillus coli" Migula 1895')
+
+
+class TestTaxdumpSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = os.path.join(self.dir, 'taxdump.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_roundtrip(self):
+        for fname, scheme in (('taxdump_nodes.dmp', 'nodes'),
+                              ('taxdump_names.dmp', 'names')):
+            fp = get_data_path(fname)
+            exp = _taxdump_to_data_frame(fp, scheme=scheme)
+            obs = _taxdump_to_data_frame(fp, scheme=scheme, cache=self.cache)
+            assert_data_frame_almost_equal(obs, exp)
+            self.assertTrue(os.path.exists(self.cache))
+
+            # read from the snapshot, not the file
+            with open(self.cache, 'rb') as f:
+                snapshot = f.read()
+            obs = _taxdump_to_data_frame(fp, scheme=scheme, cache=self.cache)
+            assert_data_frame_almost_equal(obs, exp)
+            self.assertTrue(obs.dtypes.equals(exp.dtypes))
+            with open(self.cache, 'rb') as f:
+                self.assertEqual(f.read(), snapshot)
+            os.remove(self.cache)
+
+    def test_custom_scheme(self):
+        scheme = {'self': str, 'parent': str}
+        fs = 'a\t|\ta\nb\t|\ta\n'
+        exp = _taxdump_to_data_frame(StringIO(fs), scheme=scheme)
+        for _ in range(2):
+            obs = _taxdump_to_data_frame(StringIO(fs), scheme=scheme,
+                                         cache=self.cache)
+            assert_data_frame_almost_equal(obs, exp)
+
+    def test_outdated(self):
+        fs = '1\t|\t1\t|\tno rank\t|\n2\t|\t1\t|\tgenus\t|\n'
+        _taxdump_to_data_frame(StringIO(fs), scheme='nodes_slim',
+                               cache=self.cache)
+
+        # different file
+        fs += '3\t|\t2\t|\tspecies\t|\n'
+        obs = _taxdump_to_data_frame(StringIO(fs), scheme='nodes_slim',
+                                     cache=self.cache)
+        self.assertEqual(obs.index.tolist(), [1, 2, 3])
+
+        # different scheme
+        scheme = {'tax_id': int, 'parent_tax_id': str}
+        obs = _taxdump_to_data_frame(StringIO(fs), scheme=scheme,
+                                     cache=self.cache)
+        self.assertEqual(obs.columns.tolist(), ['parent_tax_id'])
+        self.assertEqual(obs['parent_tax_id'].tolist(), ['1', '1', '2'])
+
+    def test_modified_file(self):
+        # a file of the same size is parsed again once it is modified
+        fp = os.path.join(self.dir, 'nodes.dmp')
+        for parent, mtime in (('1', 1e9), ('2', 2e9)):
+            with open(fp, 'w') as f:
+                f.write('1\t|\t1\t|\tno rank\t|\n2\t|\t%s\t|\tgenus\t|\n'
+                        % parent)
+            os.utime(fp, (mtime, mtime))
+            obs = _taxdump_to_data_frame(fp, scheme='nodes_slim',
+                                         cache=self.cache)
+            self.assertEqual(obs.loc[2, 'parent_tax_id'], int(parent))
+
+    def test_file_stamp(self):
+        # the size of a compressed file on disk is that of the file itself
+        fp = os.path.join(self.dir, 'nodes.dmp.gz')
+        with gzip.open(fp, 'wt') as f:
+            f.write('1\t|\t1\t|\tno rank\t|\n' * 100)
+        stat = os.stat(fp)
+        with open_file(fp) as f:
+            self.assertEqual(_file_stamp(f),
+                             [stat.st_size, stat.st_mtime_ns])
+        obs = _taxdump_to_data_frame(fp, scheme='nodes_slim', cache=self.cache)
+        self.assertEqual(obs.shape, (100, 2))
+        self.assertEqual(_file_stamp(StringIO('abc')), [3, 0])
+
+    def test_empty_or_truncated_snapshot(self):
+        fp = get_data_path('taxdump_nodes.dmp')
+        exp = _taxdump_to_data_frame(fp, scheme='nodes_slim')
+        _taxdump_to_data_frame(fp, scheme='nodes_slim', cache=self.cache)
+        with open(self.cache, 'rb') as f:
+            snapshot = f.read()
+        for content in b'', snapshot[:len(snapshot) // 2], snapshot[:-10]:
+            with open(self.cache, 'wb') as f:
+                f.write(content)
+            obs = _taxdump_to_data_frame(fp, scheme='nodes_slim',
+                                         cache=self.cache)
+            assert_data_frame_almost_equal(obs, exp)
+            # the snapshot was written again
+            with open(self.cache, 'rb') as f:
+                self.assertEqual(f.read(), snapshot)
+
+    def test_interrupted_snapshot(self):
+        fp = get_data_path('taxdump_nodes.dmp')
+        _taxdump_to_data_frame(fp, scheme='nodes_slim', cache=self.cache)
+        with open(self.cache, 'rb') as f:
+            snapshot = f.read()
+        with mock.patch('numpy.savez', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                _taxdump_to_data_frame(fp, scheme='nodes', cache=self.cache)
+        # the previous snapshot is left as it was, with no temporary file
+        self.assertEqual(os.listdir(self.dir), ['taxdump.npz'])
+        with open(self.cache, 'rb') as f:
+            self.assertEqual(f.read(), snapshot)
+
+    def test_invalid_snapshot(self):
+        with open(self.cache, 'w') as f:
+            f.write('not a snapshot')
+        fp = get_data_path('taxdump_nodes.dmp')
+        obs = _taxdump_to_data_frame(fp, scheme='nodes_slim', cache=self.cache)
+        exp = _taxdump_to_data_frame(fp, scheme='nodes_slim')
+        assert_data_frame_almost_equal(obs, exp)
+        obs = _taxdump_to_data_frame(fp, scheme='nodes_slim', cache=self.cache)
+        assert_data_frame_almost_equal(obs, exp)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -75,6 +75,17 @@ handling you can also specify that:
 This will ensure that our registry will open files with a default encoding of
 `'ascii'` for `'myformat'` and expect all newlines to be `'\n'` characters.
 
+If files of your format commonly have certain file extensions, or always start
+with certain bytes, you can specify those as well:
+
+.. code-block:: python
+
+   myformat = create_format('myformat', extensions=('.myf',), magic=(b'MYF',))
+
+When sniffing, formats suggested by the file's extension or first bytes are
+tried before all others, so these are a hint that makes sniffing faster. They
+do not decide the format on their own: the sniffer still has to claim the file.
+
 Having worked out these details, we are ready to register the actual
 functionality of our format (e.g., sniffer, readers, and writers).
 
@@ -121,10 +132,15 @@ receive the object we are writing as the first parameter instead of the file
    subclass of ``FileFormatError`` specific to your new format.
 
 Once you are satisfied with the functionality, you will need to ensure that
-`skbio/io/__init__.py` contains an import of your new submodule so the
-decorators are executed. Add the function
-``import_module('skbio.io.format.myformat')`` with your module name to the
-existing list.
+`skbio/io/__init__.py` lists your new submodule so the decorators are executed.
+Add ``"myformat": "skbio.io.format.myformat"`` with your format and module
+names to the formats it defers. Their modules are imported on first use of the
+registry, as importing them all is slow.
+
+If your format adds ``read`` and ``write`` methods to a class that did not have
+them yet, also add ``read = _LazyIOMethod("read")`` and
+``write = _LazyIOMethod("write")`` to the class, so that accessing these
+methods imports the formats.
 
 .. note:: Because scikit-bio handles all of the I/O boilerplate, you only need
    to unit-test the actual business logic of your `readers`, `writers`, and
@@ -166,12 +182,18 @@ The following are not yet used but should be avoided as well:
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from collections import OrderedDict
 from warnings import warn
+import codecs
+import io
+import os
 import types
 import traceback
 import itertools
 import inspect
+import sys
 from functools import wraps
+from importlib import import_module
 
 from ._exception import DuplicateRegistrationError, InvalidRegistrationError
 from . import (
@@ -181,10 +203,15 @@ from . import (
 )
 from .util import _resolve_file, open_file, open_files, _d as _open_kwargs
 from skbio.util._misc import make_sentinel, find_sentinels
-from skbio.util._decorator import stable, classonlymethod
+from skbio.util._decorator import stable, experimental, classonlymethod
 
 FileSentinel = make_sentinel("FileSentinel")
 
+# Suffixes stripped from file names before matching format extensions.
+_compression_extensions = (".gz", ".bgz", ".bz2")
+# Number of leading bytes read to match the magic bytes of formats.
+_magic_size = 64
+
 
 class IORegistry:
     """Create a registry of formats and implementations which map to classes."""
@@ -206,6 +233,9 @@ class IORegistry:
         self._binary_formats = {}
         self._text_formats = {}
         self._lookups = (self._binary_formats, self._text_formats)
+        self._deferred_formats = None
+        self._sniff_cache = None
+        self._sniff_cache_size = 0
 
     @stable(as_of="0.4.0")
     def create_format(self, *args, **kwargs):
@@ -238,6 +268,12 @@ class IORegistry:
         # See comment in the constructor for an explanation for why this split
         # occurs.
         name = format_object.name
+        if self._deferred_formats and name in self._deferred_formats:
+            if self._deferred_formats[name] in sys.modules:
+                # The deferred module is being imported and adds its format.
+                del self._deferred_formats[name]
+            else:
+                self._load_formats()
         if name in self._binary_formats or name in self._text_formats:
             raise DuplicateRegistrationError(
                 "A format already exists with" " that name: %s" % name
@@ -248,6 +284,36 @@ class IORegistry:
         else:
             self._text_formats[name] = format_object
 
+        # Cached results may be claimed by the new format as well.
+        if self._sniff_cache is not None:
+            self._sniff_cache.clear()
+
+    def _defer_formats(self, formats):
+        """Add formats once the registry is used, by importing their modules.
+
+        Parameters
+        ----------
+        formats : dict of str
+            Names of the modules adding formats to the registry, keyed by the
+            names of the formats. The modules are imported when the formats of
+            the registry are first looked up, or when a format of the same name
+            is added from elsewhere.
+
+        """
+        if self._deferred_formats is None:
+            self._deferred_formats = {}
+        self._deferred_formats.update(formats)
+
+    def _load_formats(self):
+        """Import the modules of deferred formats and monkey-patch classes."""
+        if self._deferred_formats is None:
+            return
+        modules = dict.fromkeys(self._deferred_formats.values())
+        self._deferred_formats = None
+        for module in modules:
+            import_module(module)
+        self.monkey_patch()
+
     @stable(as_of="0.4.0")
     def get_sniffer(self, format_name):
         """Locate the sniffer for a format.
@@ -263,6 +329,7 @@ class IORegistry:
             The sniffer associated with `format_name`
 
         """
+        self._load_formats()
         for lookup in self._lookups:
             if format_name in lookup:
                 return lookup[format_name].sniffer_function
@@ -311,6 +378,7 @@ class IORegistry:
         return self._get_rw(format_name, cls, "writers")
 
     def _get_rw(self, format_name, cls, lookup_name):
+        self._load_formats()
         for lookup in self._lookups:
             if format_name in lookup:
                 format_lookup = getattr(lookup[format_name], lookup_name)
@@ -357,6 +425,7 @@ class IORegistry:
         return list(self._iter_rw_formats(cls, "writers"))
 
     def _iter_rw_formats(self, cls, lookup_name):
+        self._load_formats()
         for lookup in self._lookups:
             for format in lookup.values():
                 if cls in getattr(format, lookup_name):
@@ -389,10 +458,72 @@ class IORegistry:
         TypeError
             If `newline` is provided in `kwargs`.
 
+        See Also
+        --------
+        set_sniff_cache
+
+        Notes
+        -----
+        Formats suggested by the extension of the file name (ignoring a
+        compression suffix such as ``.gz``) or by the first bytes of the file
+        are tried first. If exactly one of them claims the file, it is returned
+        without running any other sniffer. Otherwise, all remaining sniffers
+        are run as well.
+
         """
         if "newline" in kwargs:
             raise TypeError("Cannot provide `newline` keyword argument when sniffing.")
 
+        return self._sniff(file, file, kwargs)
+
+    @experimental(as_of="0.6.0")
+    def set_sniff_cache(self, maxsize=1024):
+        """Cache the sniffed formats of files on disk.
+
+        Reading many files without specifying their format sniffs each of
+        them. With the cache enabled, the result of sniffing a file path is
+        reused for as long as the file's modification time and size are
+        unchanged.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of files to remember the format of, discarding
+            the least recently sniffed files first. ``0`` disables and clears
+            the cache, which is the initial state.
+
+        """
+        if maxsize < 0:
+            raise ValueError("`maxsize` must be non-negative, not %r" % maxsize)
+        self._sniff_cache_size = maxsize
+        if maxsize == 0:
+            self._sniff_cache = None
+        else:
+            if self._sniff_cache is None:
+                self._sniff_cache = OrderedDict()
+            while len(self._sniff_cache) > maxsize:
+                self._sniff_cache.popitem(last=False)
+
+    def _sniff_cache_key(self, origin, kwargs):
+        if self._sniff_cache is None or not isinstance(origin, str):
+            return None
+        try:
+            stat = os.stat(origin)
+            options = tuple(sorted(kwargs.items()))
+            key = (os.path.abspath(origin), stat.st_mtime_ns, stat.st_size, options)
+            hash(key)
+        except (OSError, ValueError, TypeError):
+            return None
+        return key
+
+    def _sniff(self, file, origin, kwargs):
+        self._load_formats()
+        key = self._sniff_cache_key(origin, kwargs)
+        if key is not None and key in self._sniff_cache:
+            self._sniff_cache.move_to_end(key)
+            fmt, skwargs = self._sniff_cache[key]
+            return fmt, skwargs.copy()
+
         # By resolving the input here, we have the oppurtunity to reuse the
         # file (which is potentially ephemeral). Each sniffer will also resolve
         # the file, but that call will short-circuit and won't claim
@@ -407,31 +538,59 @@ class IORegistry:
         with _resolve_file(file, mode="r", **kwargs) as (fh, _, is_binary_file):
             # tell may fail noisily if the user provided a TextIOBase or
             # BufferedReader which has already been iterated over (via next()).
-            matches = []
             backup = fh.tell()
+            lookup = {}
             if is_binary_file and kwargs.get("encoding", "binary") == "binary":
-                matches = self._find_matches(fh, self._binary_formats, **kwargs)
+                lookup.update(self._binary_formats)
 
             if kwargs.get("encoding", None) != "binary":
                 # We can always turn a binary file into a text file, but the
                 # reverse doesn't make sense.
-                matches += self._find_matches(fh, self._text_formats, **kwargs)
-                fh.seek(backup)
+                lookup.update(self._text_formats)
             elif not is_binary_file:
                 raise ValueError("Cannot decode text source (%r) as binary." % file)
-            # else we are a binary_file and our encoding did not exclude binary
-            # so we have already handled that condition
+
+            hinted = self._hinted_formats(fh, origin, lookup, kwargs)
+            matches = self._find_matches(fh, hinted, **kwargs)
+            if len(matches) != 1:
+                rest = {k: v for k, v in lookup.items() if k not in hinted}
+                matches += self._find_matches(fh, rest, **kwargs)
+            fh.seek(backup)
 
         if len(matches) > 1:
             raise UnrecognizedFormatError(
                 "File format for %r is ambiguous,"
-                " may be one of: %r" % (file, [m for m, s in matches])
+                " may be one of: %r" % (origin, [m for m, s in matches])
             )
         elif len(matches) == 0:
-            raise UnrecognizedFormatError("Could not detect the format of %r" % file)
+            raise UnrecognizedFormatError("Could not detect the format of %r" % origin)
+
+        if key is not None:
+            fmt, skwargs = matches[0]
+            self._sniff_cache[key] = (fmt, skwargs.copy())
+            if len(self._sniff_cache) > self._sniff_cache_size:
+                self._sniff_cache.popitem(last=False)
 
         return matches[0]
 
+    def _hinted_formats(self, fh, origin, lookup, kwargs):
+        """Find the formats suggested by a file's extension and first bytes."""
+        hinted = {}
+        name = origin if isinstance(origin, str) else getattr(origin, "name", None)
+        if isinstance(name, str):
+            extension = _file_extension(name)
+            for format in lookup.values():
+                if extension in format.extensions:
+                    hinted[format.name] = format
+
+        if any(format.magic for format in lookup.values()):
+            head = _peek(fh, kwargs)
+            for format in lookup.values():
+                start = head if format.is_binary_format else head.lstrip()
+                if format.name not in hinted and start.startswith(format.magic):
+                    hinted[format.name] = format
+        return hinted
+
     def _find_matches(self, file, lookup, **kwargs):
         matches = []
         for format in lookup.values():
@@ -513,11 +672,11 @@ class IORegistry:
 
     def _read_ret(self, file, fmt, into, verify, kwargs):
         io_kwargs = self._find_io_kwargs(kwargs)
-        with _resolve_file(file, **io_kwargs) as (file, _, _):
+        with _resolve_file(file, **io_kwargs) as (fh, _, _):
             reader, kwargs = self._init_reader(
-                file, fmt, into, verify, kwargs, io_kwargs
+                fh, file, fmt, into, verify, kwargs, io_kwargs
             )
-            return reader(file, **kwargs)
+            return reader(fh, **kwargs)
 
     def _read_gen(self, file, fmt, into, verify, kwargs):
         io_kwargs = self._find_io_kwargs(kwargs)
@@ -525,19 +684,19 @@ class IORegistry:
         # _resolve_file and for verifying a format.
         # kwargs should still retain the contents of io_kwargs because the
         # actual reader will also need them.
-        with _resolve_file(file, **io_kwargs) as (file, _, _):
+        with _resolve_file(file, **io_kwargs) as (fh, _, _):
             reader, kwargs = self._init_reader(
-                file, fmt, into, verify, kwargs, io_kwargs
+                fh, file, fmt, into, verify, kwargs, io_kwargs
             )
-            yield from reader(file, **kwargs)
+            yield from reader(fh, **kwargs)
 
     def _find_io_kwargs(self, kwargs):
         return {k: kwargs[k] for k in _open_kwargs if k in kwargs}
 
-    def _init_reader(self, file, fmt, into, verify, kwargs, io_kwargs):
+    def _init_reader(self, file, origin, fmt, into, verify, kwargs, io_kwargs):
         skwargs = {}
         if fmt is None:
-            fmt, skwargs = self.sniff(file, **io_kwargs)
+            fmt, skwargs = self._sniff(file, origin, io_kwargs)
         elif verify:
             sniffer = self.get_sniffer(fmt)
             if sniffer is not None:
@@ -582,6 +741,7 @@ class IORegistry:
         return reader, kwargs
 
     def _get_possible_readers(self, fmt):
+        self._load_formats()
         for lookup in self._lookups:
             if fmt in lookup:
                 return list(lookup[fmt].readers)
@@ -617,10 +777,15 @@ class IORegistry:
 
         """
         # The simplest functionality here.
-        cls = None
-        if not isinstance(obj, types.GeneratorType):
-            cls = obj.__class__
-        writer = self.get_writer(format, cls)
+        if isinstance(obj, types.GeneratorType):
+            writer = self.get_writer(format, None)
+        else:
+            # Instances of a subclass are written as the nearest registered
+            # class, e.g., lazily read distance matrices.
+            for cls in obj.__class__.__mro__:
+                writer = self.get_writer(format, cls)
+                if writer is not None:
+                    break
         if writer is None:
             raise UnrecognizedFormatError(
                 "Cannot write %r into %r, no %s writer found."
@@ -641,6 +806,7 @@ class IORegistry:
         The actual functionality will be a pass-through to `skbio.io.read`
         and `skbio.io.write` respectively.
         """
+        self._load_formats()
         reads = set()
         writes = set()
         for lookup in self._lookups:
@@ -796,6 +962,11 @@ class Format:
     newline : str, optional
         What the default newline handling of this format is. Default is to use
         universal newline handling.
+    extensions : iterable of str, optional
+        File extensions (e.g., ``'.fasta'``) commonly used for this format.
+    magic : iterable of bytes, optional
+        Bytes that files of this format start with (ignoring leading
+        whitespace for text formats).
 
     """
 
@@ -811,6 +982,18 @@ class Format:
         """Return True if this is a binary format."""
         return self._encoding == "binary"
 
+    @property
+    @experimental(as_of="0.6.0")
+    def extensions(self):
+        """File extensions commonly used for this format."""
+        return self._extensions
+
+    @property
+    @experimental(as_of="0.6.0")
+    def magic(self):
+        """Bytes that files of this format start with."""
+        return self._magic
+
     @property
     @stable(as_of="0.4.0")
     def sniffer_function(self):
@@ -841,11 +1024,13 @@ class Format:
         """Set of classes bound to writers to monkey patch."""
         return self._monkey_patch["write"]
 
-    def __init__(self, name, encoding=None, newline=None):
+    def __init__(self, name, encoding=None, newline=None, extensions=(), magic=()):
         """Initialize format for registering sniffers, readers, and writers."""
         self._encoding = encoding
         self._newline = newline
         self._name = name
+        self._extensions = frozenset(e.lower() for e in extensions)
+        self._magic = tuple(magic)
 
         self._sniffer_function = None
         self._readers = {}
@@ -1187,6 +1372,56 @@ class Format:
             self._monkey_patch["read"].add(cls)
 
 
+def _file_extension(name):
+    """Return the lowercase extension of a file name, past compression."""
+    root, extension = os.path.splitext(name.lower())
+    if extension in _compression_extensions:
+        extension = os.path.splitext(root)[1]
+    return extension
+
+
+def _peek(fh, kwargs):
+    """Read the first bytes of a file, decompressed, without consuming them."""
+    backup = fh.tell()
+    try:
+        fh.seek(0)
+        if isinstance(fh, io.TextIOBase):
+            return fh.read(_magic_size).encode("utf-8")
+        compression = kwargs.get("compression", _open_kwargs["compression"])
+        with open_file(
+            fh, mode="r", encoding="binary", compression=compression
+        ) as bfh:
+            head = bfh.read(_magic_size)
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8) :]
+        return head
+    except Exception:
+        # Sniffers will report whatever is wrong with the file.
+        return b""
+    finally:
+        fh.seek(backup)
+
+
+class _LazyIOMethod:
+    """Placeholder for the ``read`` or ``write`` method of a class.
+
+    Accessing it loads the deferred formats of `io_registry`, which replaces
+    it with the method monkey-patched onto the class.
+
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __get__(self, obj, cls):
+        io_registry._load_formats()
+        if inspect.getattr_static(cls, self._name) is self:
+            raise AttributeError(
+                "type object %r has no attribute %r" % (cls.__name__, self._name)
+            )
+        return getattr(cls if obj is None else obj, self._name)
+
+
 io_registry = IORegistry()
 
 
@@ -0,0 +1,176 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import io
+import gzip
+import unittest
+
+import skbio.io
+from skbio.io.util import open_file
+from skbio.io._bgzf import (
+    BgzfReader, BgzfWriter, is_bgzf, _EOF_BLOCK, _BLOCK_SIZE)
+
+
+class BgzfTests(unittest.TestCase):
+    def setUp(self):
+        self.data = b''.join(b'>seq%d\nACGTTGCA%d\n' % (i, i)
+                             for i in range(20000))
+        self.assertGreater(len(self.data), 4 * _BLOCK_SIZE)
+
+    def compress(self, data, threads=1, chunk=1000):
+        fh = io.BytesIO()
+        writer = BgzfWriter(fh, compresslevel=6, threads=threads)
+        for i in range(0, len(data), chunk):
+            writer.write(data[i:i + chunk])
+        writer.close()
+        self.assertFalse(fh.closed)
+        return fh.getvalue()
+
+    def reader(self, compressed, threads=1):
+        return io.BufferedReader(BgzfReader(io.BytesIO(compressed),
+                                            threads=threads))
+
+
+class TestBgzfWriter(BgzfTests):
+    def test_valid_gzip(self):
+        for threads in 1, 3:
+            compressed = self.compress(self.data, threads=threads)
+            self.assertTrue(is_bgzf(compressed))
+            self.assertTrue(compressed.endswith(_EOF_BLOCK))
+            self.assertEqual(gzip.decompress(compressed), self.data)
+
+    def test_empty(self):
+        self.assertEqual(self.compress(b''), _EOF_BLOCK)
+
+    def test_tell(self):
+        writer = BgzfWriter(io.BytesIO(), threads=1)
+        writer.write(b'abc')
+        writer.write(b'de')
+        self.assertEqual(writer.tell(), 5)
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.write(b'f')
+
+
+class TestBgzfReader(BgzfTests):
+    def test_read(self):
+        compressed = self.compress(self.data)
+        for threads in 1, 4:
+            self.assertEqual(self.reader(compressed, threads).read(),
+                             self.data)
+
+    def test_read_lines(self):
+        fh = self.reader(self.compress(self.data))
+        self.assertEqual(list(fh), self.data.splitlines(True))
+
+    def test_seek(self):
+        fh = self.reader(self.compress(self.data), threads=2)
+        for offset in (_BLOCK_SIZE * 3 + 5, 0, _BLOCK_SIZE - 1, _BLOCK_SIZE,
+                       len(self.data) - 3, 12345):
+            self.assertEqual(fh.seek(offset), offset)
+            self.assertEqual(fh.read(10), self.data[offset:offset + 10])
+            self.assertEqual(fh.tell(), min(offset + 10, len(self.data)))
+
+        self.assertEqual(fh.seek(-4, io.SEEK_END), len(self.data) - 4)
+        self.assertEqual(fh.read(), self.data[-4:])
+        self.assertEqual(fh.seek(len(self.data) + 10), len(self.data) + 10)
+        self.assertEqual(fh.read(), b'')
+
+    def test_virtual_offsets(self):
+        compressed = self.compress(self.data)
+        fh = self.reader(compressed)
+        raw = fh.raw
+
+        self.assertEqual(raw.offset_to_virtual(0), 0)
+        voffset = raw.offset_to_virtual(_BLOCK_SIZE + 7)
+        self.assertEqual(voffset & 0xFFFF, 7)
+        # the second block starts right after the first one
+        second = voffset >> 16
+        self.assertTrue(is_bgzf(compressed[second:]))
+        self.assertEqual(raw.virtual_to_offset(voffset), _BLOCK_SIZE + 7)
+
+        # a fresh reader maps blocks on demand
+        raw = self.reader(compressed).raw
+        self.assertEqual(raw.virtual_to_offset(voffset), _BLOCK_SIZE + 7)
+        raw.seek_virtual(voffset)
+        self.assertEqual(raw.tell_virtual(), voffset)
+        self.assertEqual(raw.read(3), self.data[_BLOCK_SIZE + 7:][:3])
+
+        with self.assertRaisesRegex(ValueError, 'start of a block'):
+            raw.virtual_to_offset((second + 1) << 16)
+        with self.assertRaisesRegex(ValueError, 'past the end'):
+            raw.offset_to_virtual(len(self.data) + 1)
+
+    def test_mapping_does_not_disturb_reading(self):
+        fh = self.reader(self.compress(self.data))
+        self.assertEqual(fh.read(5), self.data[:5])
+        fh.raw.offset_to_virtual(len(self.data) - 1)
+        self.assertEqual(fh.read(), self.data[5:])
+
+    def test_close_with_pending_blocks(self):
+        raw = BgzfReader(io.BytesIO(self.compress(self.data)), threads=2)
+        self.assertEqual(raw.read(5), self.data[:5])
+        futures = [future for _, _, future in raw._pending]
+        self.assertTrue(futures)
+        raw.close()
+        self.assertTrue(raw.closed)
+        self.assertIsNone(raw._executor)
+        self.assertTrue(all(future.done() for future in futures))
+
+    def test_multiple_gzip_members(self):
+        # concatenated BGZF files are valid BGZF files
+        compressed = self.compress(b'abc') + self.compress(b'def')
+        self.assertEqual(self.reader(compressed).read(), b'abcdef')
+
+    def test_invalid(self):
+        compressed = self.compress(self.data)
+        with self.assertRaisesRegex(gzip.BadGzipFile, 'truncated'):
+            self.reader(compressed[:-100]).read()
+        with self.assertRaisesRegex(gzip.BadGzipFile, 'header'):
+            self.reader(compressed + gzip.compress(b'abc')).read()
+
+        corrupt = bytearray(compressed)
+        corrupt[-len(_EOF_BLOCK) - 8] ^= 0xFF
+        with self.assertRaisesRegex(gzip.BadGzipFile, 'CRC'):
+            self.reader(bytes(corrupt)).read()
+
+
+class TestBgzfOpen(BgzfTests):
+    def test_roundtrip(self):
+        fh = io.BytesIO()
+        with open_file(fh, mode='w', compression='bgzf') as f:
+            f.write(self.data.decode())
+        compressed = fh.getvalue()
+        self.assertTrue(is_bgzf(compressed))
+        self.assertTrue(compressed.endswith(_EOF_BLOCK))
+
+        fh.seek(0)
+        with open_file(fh) as f:
+            self.assertIsInstance(f.buffer.raw, BgzfReader)
+            self.assertEqual(f.read(), self.data.decode())
+
+    def test_read_as_gzip(self):
+        compressed = self.compress(self.data)
+        with skbio.io.open(io.BytesIO(compressed), compression='gzip',
+                           encoding='binary') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_registry(self):
+        fh = io.BytesIO()
+        seqs = [skbio.DNA('ACGT' * 100, metadata={'id': 's%d' % i,
+                                                 'description': ''})
+                for i in range(500)]
+        skbio.io.write((s for s in seqs), format='fasta', into=fh,
+                       compression='bgzf')
+        fh.seek(0)
+        obs = list(skbio.io.read(fh, format='fasta', constructor=skbio.DNA))
+        self.assertEqual(obs, seqs)
+
+
+if __name__ == '__main__':
+    unittest.main()
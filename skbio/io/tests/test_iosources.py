@@ -6,9 +6,17 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import io
+import os
+import gzip
+import tempfile
 import unittest
 
-from skbio.io._iosources import IOSource, Compressor
+from skbio.io._iosources import (
+    IOSource, Compressor, AutoCompressor, BgzfCompressor, GzipCompressor,
+    get_compression_handler, get_file_path, unwrap_file)
+from skbio.io._bgzf import BgzfReader, BgzfWriter
+from skbio.io.util import open_file
 
 
 class TestIOSource(unittest.TestCase):
@@ -47,5 +55,71 @@ class TestCompressor(TestIOSource):
         self.assertEqual(self.compressor.can_write(), True)
 
 
+class TestBgzfCompressor(unittest.TestCase):
+    def setUp(self):
+        fh = io.BytesIO()
+        writer = BgzfWriter(fh, threads=1)
+        writer.write(b'abc\n')
+        writer.close()
+        self.bgzf = fh.getvalue()
+        self.options = {'compresslevel': 9}
+
+    def test_handler(self):
+        self.assertIs(get_compression_handler('bgzf'), BgzfCompressor)
+        self.assertFalse(BgzfCompressor.streamable)
+
+    def test_can_read(self):
+        fh = io.BufferedReader(io.BytesIO(self.bgzf))
+        self.assertTrue(BgzfCompressor(fh, self.options).can_read())
+        self.assertTrue(GzipCompressor(fh, self.options).can_read())
+
+        fh = io.BufferedReader(io.BytesIO(gzip.compress(b'abc\n')))
+        self.assertFalse(BgzfCompressor(fh, self.options).can_read())
+
+    def test_auto_detection(self):
+        fh = io.BufferedReader(io.BytesIO(self.bgzf))
+        reader = AutoCompressor(fh, self.options).get_reader()
+        self.assertIsInstance(reader, BgzfReader)
+        self.assertEqual(reader.read(), b'abc\n')
+
+        fh = io.BufferedReader(io.BytesIO(gzip.compress(b'abc\n')))
+        reader = AutoCompressor(fh, self.options).get_reader()
+        self.assertIsInstance(reader, gzip.GzipFile)
+
+
+class TestUnwrapFile(unittest.TestCase):
+    def test_uncompressed(self):
+        fh = io.BytesIO(b'abc\n')
+        with open_file(fh, encoding='binary') as f:
+            self.assertIs(unwrap_file(f).raw, fh)
+
+    def test_compressed(self):
+        fh = io.BytesIO(gzip.compress(b'abc\n'))
+        with open_file(fh, encoding='binary') as f:
+            self.assertIs(unwrap_file(f), f)
+
+    def test_not_wrapped(self):
+        fh = io.BufferedReader(io.BytesIO(b'abc\n'))
+        self.assertIs(unwrap_file(fh), fh)
+
+
+class TestGetFilePath(unittest.TestCase):
+    def test_file_on_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'a.gz')
+            with open(path, 'wb') as f:
+                f.write(gzip.compress(b'abc\n'))
+            for encoding in None, 'binary':
+                with open_file(path, encoding=encoding) as f:
+                    self.assertEqual(get_file_path(f), path)
+            with open(path, 'rb') as f:
+                self.assertEqual(get_file_path(f), path)
+
+    def test_in_memory(self):
+        self.assertIsNone(get_file_path(io.StringIO('abc\n')))
+        with open_file(io.BytesIO(b'abc\n')) as f:
+            self.assertIsNone(get_file_path(f))
+
+
 if __name__ == "__main__":
     unittest.main()
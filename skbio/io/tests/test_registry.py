@@ -8,19 +8,24 @@
 
 from io import StringIO
 import io
+import gzip
+import tempfile
 import itertools
 import os
 import unittest
 import warnings
 import types
+import sys
+import inspect
 from tempfile import mkstemp
+from unittest import mock
 
 from skbio.io import (FormatIdentificationWarning, UnrecognizedFormatError,
                       ArgumentOverrideWarning, io_registry, sniff,
                       create_format)
 from skbio.io.registry import (IORegistry, FileSentinel, Format,
                                DuplicateRegistrationError,
-                               InvalidRegistrationError)
+                               InvalidRegistrationError, _LazyIOMethod)
 from skbio.util import get_data_path
 from skbio.util._exception import TestingUtilError
 from skbio import DNA, read, write
@@ -846,6 +851,173 @@ class TestSniff(RegistryTest):
         self.assertFalse(self._check_textf)
 
 
+class TestSniffHints(RegistryTest):
+    def setUp(self):
+        super(TestSniffHints, self).setUp()
+        self.calls = []
+        extf = self.registry.create_format('extf', extensions=('.ext',))
+        magicf = self.registry.create_format('magicf', magic=(b'MAGIC',))
+        otherf = self.registry.create_format('otherf')
+
+        @extf.sniffer()
+        def extf_sniffer(fh):
+            self.calls.append('extf')
+            return 'ext' in fh.read(), {}
+
+        @magicf.sniffer()
+        def magicf_sniffer(fh):
+            self.calls.append('magicf')
+            return fh.read().lstrip().startswith('MAGIC'), {}
+
+        @otherf.sniffer()
+        def otherf_sniffer(fh):
+            self.calls.append('otherf')
+            return 'other' in fh.read(), {'from_otherf': True}
+
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        super(TestSniffHints, self).tearDown()
+        self.tempdir.cleanup()
+
+    def write(self, name, content):
+        fp = os.path.join(self.tempdir.name, name)
+        with io.open(fp, 'w') as fh:
+            fh.write(content)
+        return fp
+
+    def test_format_attributes(self):
+        fmt = Format('f', extensions=('.ABC', '.d'), magic=(b'x', b'y'))
+        self.assertEqual(fmt.extensions, {'.abc', '.d'})
+        self.assertEqual(fmt.magic, (b'x', b'y'))
+
+        fmt = Format('f')
+        self.assertEqual(fmt.extensions, set())
+        self.assertEqual(fmt.magic, ())
+
+    def test_extension(self):
+        # Also claimed by otherf, but only the hinted sniffer runs.
+        fp = self.write('a.EXT', 'ext other')
+        self.assertEqual(self.registry.sniff(fp), ('extf', {}))
+        self.assertEqual(self.calls, ['extf'])
+
+    def test_extension_compressed(self):
+        fp = os.path.join(self.tempdir.name, 'a.ext.gz')
+        with gzip.open(fp, 'wt') as fh:
+            fh.write('ext other')
+        self.assertEqual(self.registry.sniff(fp), ('extf', {}))
+        self.assertEqual(self.calls, ['extf'])
+
+    def test_extension_of_file_handle(self):
+        fp = self.write('a.ext', 'ext other')
+        with io.open(fp) as fh:
+            self.assertEqual(self.registry.sniff(fh), ('extf', {}))
+        self.assertEqual(self.calls, ['extf'])
+
+    def test_magic(self):
+        fh = StringIO('\n  MAGIC other')
+        self.assertEqual(self.registry.sniff(fh), ('magicf', {}))
+        self.assertEqual(self.calls, ['magicf'])
+        self.assertEqual(fh.tell(), 0)
+
+    def test_magic_compressed(self):
+        fh = io.BytesIO(gzip.compress(b'MAGIC other'))
+        self.assertEqual(self.registry.sniff(fh), ('magicf', {}))
+        self.assertEqual(self.calls, ['magicf'])
+
+    def test_hint_not_claimed(self):
+        fp = self.write('a.ext', 'other')
+        self.assertEqual(self.registry.sniff(fp),
+                         ('otherf', {'from_otherf': True}))
+        self.assertEqual(self.calls, ['extf', 'magicf', 'otherf'])
+
+    def test_hints_ambiguous(self):
+        fp = self.write('a.ext', 'MAGIC ext')
+        with self.assertRaises(UnrecognizedFormatError) as cm:
+            self.registry.sniff(fp)
+        self.assertIn('extf', str(cm.exception))
+        self.assertIn('magicf', str(cm.exception))
+
+    def test_no_hints(self):
+        fh = StringIO('other')
+        self.assertEqual(self.registry.sniff(fh)[0], 'otherf')
+        self.assertEqual(self.calls, ['extf', 'magicf', 'otherf'])
+
+    def test_cache_disabled(self):
+        fp = self.write('a.txt', 'other')
+        self.registry.sniff(fp)
+        self.registry.sniff(fp)
+        self.assertEqual(self.calls.count('otherf'), 2)
+
+    def test_cache(self):
+        self.registry.set_sniff_cache()
+        fp = self.write('a.txt', 'other')
+        self.assertEqual(self.registry.sniff(fp),
+                         ('otherf', {'from_otherf': True}))
+        fmt, skwargs = self.registry.sniff(fp)
+        self.assertEqual((fmt, skwargs), ('otherf', {'from_otherf': True}))
+        self.assertEqual(self.calls.count('otherf'), 1)
+
+        # Changes to the returned kwargs are not cached.
+        skwargs['from_otherf'] = False
+        self.assertEqual(self.registry.sniff(fp)[1], {'from_otherf': True})
+
+        # Different options are sniffed separately.
+        self.registry.sniff(fp, encoding='ascii')
+        self.assertEqual(self.calls.count('otherf'), 2)
+
+        # File handles are never cached.
+        with io.open(fp) as fh:
+            self.registry.sniff(fh)
+        self.assertEqual(self.calls.count('otherf'), 3)
+
+    def test_cache_read(self):
+        self.registry.set_sniff_cache()
+        fmt = self.registry._text_formats['otherf']
+
+        @fmt.reader(MockClass)
+        def reader(fh, from_otherf=False):
+            return MockClass([fh.read(), from_otherf])
+
+        fp = self.write('a.txt', 'other')
+        for _ in range(2):
+            obs = self.registry.read(fp, into=MockClass)
+            self.assertEqual(obs.list, ['other', True])
+        self.assertEqual(self.calls.count('otherf'), 1)
+
+    def test_cache_modified(self):
+        self.registry.set_sniff_cache()
+        fp = self.write('a.txt', 'other')
+        self.assertEqual(self.registry.sniff(fp)[0], 'otherf')
+        fp = self.write('a.txt', 'MAGIC and more')
+        self.assertEqual(self.registry.sniff(fp)[0], 'magicf')
+
+    def test_cache_cleared_by_new_format(self):
+        self.registry.set_sniff_cache()
+        fp = self.write('a.txt', 'other')
+        self.registry.sniff(fp)
+        self.registry.create_format('newf')
+        self.registry.sniff(fp)
+        self.assertEqual(self.calls.count('otherf'), 2)
+
+    def test_cache_maxsize(self):
+        self.registry.set_sniff_cache(maxsize=1)
+        fp1 = self.write('a.txt', 'other')
+        fp2 = self.write('b.txt', 'other')
+        self.registry.sniff(fp1)
+        self.registry.sniff(fp2)
+        self.registry.sniff(fp1)
+        self.assertEqual(self.calls.count('otherf'), 3)
+
+        self.registry.set_sniff_cache(maxsize=0)
+        self.registry.sniff(fp1)
+        self.registry.sniff(fp1)
+        self.assertEqual(self.calls.count('otherf'), 5)
+
+        with self.assertRaises(ValueError):
+            self.registry.set_sniff_cache(maxsize=-1)
+
+
 class TestRead(RegistryTest):
     def test_format_and_into_are_none(self):
         fh = StringIO()
@@ -1488,6 +1660,24 @@ class TestWrite(RegistryTest):
         self.assertEqual("1\n2\n3\n4", fh.read())
         fh.close()
 
+    def test_writer_of_base_class(self):
+        format1 = self.registry.create_format('format1')
+
+        class SubMockClass(MockClass):
+            pass
+
+        obj = SubMockClass(['1', '2', '3', '4'])
+        fh = StringIO()
+
+        @format1.writer(MockClass)
+        def writer(obj, fh):
+            fh.write('\n'.join(obj.list))
+
+        self.registry.write(obj, format='format1', into=fh)
+        fh.seek(0)
+        self.assertEqual("1\n2\n3\n4", fh.read())
+        fh.close()
+
     def test_writer_exists_real_file(self):
         format1 = self.registry.create_format('format1')
 
@@ -1909,6 +2099,71 @@ class TestMonkeyPatch(RegistryTest):
         fh.close()
 
 
+class TestDeferredFormats(RegistryTest):
+    def setUp(self):
+        super(TestDeferredFormats, self).setUp()
+        self.imported = []
+        self.registry._defer_formats({'fmt1': 'mod.fmt1', 'fmt2': 'mod.fmt2'})
+
+        class UnassumingClass:
+            default_write_format = 'fmt1'
+
+        self.unassuming_class = UnassumingClass
+
+    def import_module(self, name):
+        # stands in for the module adding its format
+        self.imported.append(name)
+        fmt = self.registry.create_format(name.split('.')[-1])
+
+        @fmt.reader(self.unassuming_class)
+        def reader(fh):
+            return
+
+    def patch_import(self):
+        return mock.patch('skbio.io.registry.import_module',
+                          side_effect=self.import_module)
+
+    def test_load_on_lookup(self):
+        with self.patch_import():
+            self.assertEqual(self.imported, [])
+            self.assertIsNotNone(
+                self.registry.get_reader('fmt2', self.unassuming_class))
+            self.assertEqual(self.imported, ['mod.fmt1', 'mod.fmt2'])
+            self.assertTrue(hasattr(self.unassuming_class, 'read'))
+
+            self.registry.list_read_formats(self.unassuming_class)
+            self.assertEqual(self.imported, ['mod.fmt1', 'mod.fmt2'])
+
+    def test_add_format_of_same_name(self):
+        with self.patch_import():
+            self.registry.create_format('fmt3')
+            self.assertEqual(self.imported, [])
+            with self.assertRaises(DuplicateRegistrationError):
+                self.registry.create_format('fmt1')
+            self.assertEqual(self.imported, ['mod.fmt1', 'mod.fmt2'])
+
+    def test_module_imported_directly(self):
+        # a deferred module being imported adds its own format
+        with self.patch_import(), \
+                mock.patch.dict(sys.modules, {'mod.fmt1': None}):
+            self.registry.create_format('fmt1')
+            self.assertEqual(self.imported, [])
+            self.registry.get_sniffer('fmt1')
+            self.assertEqual(self.imported, ['mod.fmt2'])
+
+    def test_lazy_io_method(self):
+        class WithoutFormats:
+            read = _LazyIOMethod('read')
+
+        self.assertFalse(hasattr(WithoutFormats, 'read'))
+        self.assertFalse(hasattr(WithoutFormats(), 'read'))
+
+        self.assertIn('fasta', DNA.read.__doc__)
+        self.assertIn('fasta', DNA('A').write.__doc__)
+        self.assertNotIsInstance(inspect.getattr_static(DNA, 'read'),
+                                 _LazyIOMethod)
+
+
 class TestModuleFunctions(unittest.TestCase):
 
     def test_sniff_matches(self):
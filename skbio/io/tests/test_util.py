@@ -12,6 +12,7 @@ import shutil
 import io
 import os.path
 import gc
+import gzip
 
 try:
     import responses
@@ -21,6 +22,7 @@ except ImportError:
 
 import skbio.io
 from skbio.io.registry import open_file
+from skbio.io.util import build_fai, build_gfi
 from skbio.util import get_data_path
 
 
@@ -624,5 +626,60 @@ class TestIterableReaderWriter(unittest.TestCase):
         self.assertTrue(fh.closed)
 
 
+class TestOpenFileCompressedWrite(unittest.TestCase):
+    def test_gzip_stream_is_complete(self):
+        for file in io.BytesIO(), tempfile.NamedTemporaryFile():
+            with open_file(file, mode='w', compression='gzip',
+                           compresslevel=1) as fh:
+                fh.write('abc\n' * 100)
+            file.seek(0)
+            self.assertEqual(gzip.decompress(file.read()), b'abc\n' * 100)
+            file.close()
+
+
+class TestBuildFAI(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.fasta = '>a x\nACG\nTA\n>b\nGGGG\n'
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_fasta_path(self):
+        fp = os.path.join(self.tempdir, 'test.fa')
+        with io.open(fp, 'w') as fh:
+            fh.write(self.fasta)
+        obs = build_fai(fp)
+        self.assertEqual(list(obs.index), ['a', 'b'])
+        self.assertEqual(obs.values.tolist(), [[5, 5, 3, 4], [4, 15, 4, 5]])
+
+    def test_compressed(self):
+        fh = io.BytesIO(gzip.compress(self.fasta.encode()))
+        obs = build_fai(fh)
+        self.assertEqual(obs.values.tolist(), [[5, 5, 3, 4], [4, 15, 4, 5]])
+
+    def test_fastq(self):
+        obs = build_fai(io.StringIO('@a\nAC\n+\nII\n'), format='fastq')
+        self.assertEqual(obs.values.tolist(), [[2, 3, 2, 3, 8]])
+
+    def test_unsupported_format(self):
+        with self.assertRaisesRegex(ValueError, "'newick'"):
+            build_fai(io.StringIO('(a,b);\n'), format='newick')
+
+
+
+class TestBuildGFI(unittest.TestCase):
+    def test_gff3(self):
+        gff3 = ('##gff-version 3\n'
+                'a\t.\tgene\t1\t9\t.\t+\t.\tID=g1\n'
+                'b\t.\tgene\t5\t8\t.\t+\t.\tID=g2\n')
+        obs = build_gfi(io.BytesIO(gzip.compress(gff3.encode())))
+        self.assertEqual(list(obs.index), ['a', 'b'])
+        self.assertEqual(obs.iloc[:, :4].values.tolist(),
+                         [[16, 25, 0, 9], [41, 25, 4, 8]])
+
+        obs = build_gfi(io.StringIO(gff3), block_size=1)
+        self.assertEqual(len(obs), 2)
+
 if __name__ == '__main__':
     unittest.main()
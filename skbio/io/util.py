@@ -15,6 +15,8 @@ Functions
    open
    open_file
    open_files
+   build_fai
+   build_gfi
 
 """  # noqa: D205, D415
 
@@ -37,7 +39,7 @@ from skbio.io._fileobject import (
     CompressedBufferedReader,
     CompressedBufferedWriter,
 )
-from skbio.util._decorator import stable
+from skbio.util._decorator import stable, experimental
 
 _d = dict(
     mode="r",
@@ -144,7 +146,7 @@ def open(
         Otherwise this matches the behavior of :func:`io.open`.
     newline : {None, "", '\\n', '\\r\\n', '\\r'}, optional
         Matches the behavior of :func:`io.open`.
-    compression : {'auto', 'gzip', 'bz2', None}, optional
+    compression : {'auto', 'gzip', 'bgzf', 'bz2', None}, optional
         Will compress or decompress `file` depending on `mode`. If 'auto' then
         determining the compression of the file will be attempted and the
         result will be transparently decompressed. 'auto' will do nothing
@@ -287,6 +289,8 @@ def _flush_compressor(file):
         # only flush once they have been closed. These kinds of files do not
         # close their underlying buffer, but only testing can prove that...
         file.raw.close()
+        # What they wrote on closing may still sit in the buffer beneath
+        file._before_file.flush()
 
 
 @contextmanager
@@ -299,3 +303,110 @@ def open_files(files, **kwargs):
     """
     with ExitStack() as stack:
         yield [stack.enter_context(open_file(f, **kwargs)) for f in files]
+
+
+@experimental(as_of="0.6.0")
+def build_fai(file, format="fasta", **kwargs):
+    r"""Build an index of a FASTA or FASTQ file for random access.
+
+    Parameters
+    ----------
+    file : filepath, url, filehandle
+        The FASTA or FASTQ file to index.
+    format : {'fasta', 'fastq'}, optional
+        The format of `file`.
+    kwargs : dict, optional
+        Keyword arguments will be passed to :func:`open`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The index, keyed by sequence ID, in the same form as read from the
+        :mod:`~skbio.io.format.fai` format.
+
+    Raises
+    ------
+    FASTAFormatError or FASTQFormatError
+        If the lines of a record are not wrapped consistently, a record
+        contains blank lines or has no sequence data, or sequence IDs are not
+        unique.
+
+    See Also
+    --------
+    skbio.io.format.fai
+
+    Notes
+    -----
+    The index is compatible with the ones created by ``samtools faidx`` and
+    ``samtools fqidx``. It can be saved in ``fai`` format and passed to the
+    FASTA and FASTQ sequence readers through their ``fai`` parameter.
+
+    Examples
+    --------
+    >>> from io import StringIO
+    >>> fai = build_fai(StringIO('>s1\nACGT\nAC\n>s2 two\nGGCC\n'))
+    >>> fai # doctest: +NORMALIZE_WHITESPACE
+          length  offset  linebases  linewidth
+    name
+    s1         6       4          4          5
+    s2         4      20          4          5
+
+    """
+    from skbio.io.format.fai import _build_fai
+
+    if format not in ("fasta", "fastq"):
+        raise ValueError("Cannot build an index of a %r file." % format)
+    with open_file(file, **kwargs) as fh:
+        return _build_fai(fh, fastq=format == "fastq")
+
+
+@experimental(as_of="0.6.0")
+def build_gfi(file, block_size=65536, **kwargs):
+    r"""Build an index of a GFF3 file for region queries.
+
+    Parameters
+    ----------
+    file : filepath, url, filehandle
+        The GFF3 file to index.
+    block_size : int, optional
+        Maximum size in bytes of the blocks of annotation lines described by
+        the index. Smaller blocks make region queries read less of the file,
+        at the cost of a larger index.
+    kwargs : dict, optional
+        Keyword arguments will be passed to :func:`open`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The index, keyed by sequence ID, in the same form as read from the
+        :mod:`~skbio.io.format.gfi` format.
+
+    Raises
+    ------
+    GFF3FormatError
+        If an annotation line does not have valid start and end columns.
+
+    See Also
+    --------
+    skbio.io.format.gfi
+
+    Notes
+    -----
+    The index can be saved in ``gfi`` format and passed to the
+    ``IntervalMetadata`` GFF3 reader through its ``gfi`` parameter.
+
+    Examples
+    --------
+    >>> from io import StringIO
+    >>> gfi = build_gfi(StringIO('##gff-version 3\n'
+    ...                          's1\t.\tgene\t1\t9\t.\t+\t.\tID=g1\n'))
+    >>> gfi # doctest: +NORMALIZE_WHITESPACE
+           offset  size  start  end  length
+    seqid
+    s1         16    26      0    9    <NA>
+
+    """
+    from skbio.io.format.gfi import _build_gfi
+
+    with open_file(file, **kwargs) as fh:
+        return _build_gfi(fh, block_size=block_size)
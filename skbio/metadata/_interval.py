@@ -12,6 +12,7 @@ import functools
 
 from ._intersection import IntervalTree
 from skbio.util._decorator import experimental, classonlymethod
+from skbio.io.registry import _LazyIOMethod
 
 
 class Interval:
@@ -522,6 +523,8 @@ fuzzy=[(False, False)], metadata={'gene': 'sagB'})
     """
 
     default_write_format = "gff3"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
 
     def __init__(self, upper_bound, copy_from=None):
         self._upper_bound = upper_bound
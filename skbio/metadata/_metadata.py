@@ -17,6 +17,7 @@ import pandas as pd
 import numpy as np
 
 import skbio.metadata.missing as _missing
+from skbio.io.registry import _LazyIOMethod
 from ._util import find_duplicates
 from .base import SUPPORTED_COLUMN_TYPES, FORMATTED_ID_HEADERS, is_id_header
 
@@ -357,6 +358,8 @@ class SampleMetadata(_MetadataBase):
     """
 
     default_write_format = "sample_metadata"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
 
     @classmethod
     def load(
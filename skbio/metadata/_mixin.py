@@ -452,6 +452,16 @@ class IntervalMetadataMixin(metaclass=abc.ABCMeta):
             # Use setter for validation and copy.
             self.interval_metadata = interval_metadata
 
+    def _defer_interval_metadata_(self, loader):
+        """Build interval metadata with `loader` when it is first accessed.
+
+        `loader` takes no arguments and returns an ``IntervalMetadata``
+        object whose upper bound is the interval metadata axis length. It is
+        not validated or copied, so it must not be shared with other objects.
+
+        """
+        self._interval_metadata = loader
+
     @property
     @experimental(as_of="0.5.1")
     def interval_metadata(self):
@@ -463,12 +473,17 @@ class IntervalMetadataMixin(metaclass=abc.ABCMeta):
         interval metadata, a shallow copy of the ``IntervalMetadata``
         object is made.
 
+        Readers may defer building interval metadata until this property is
+        first accessed.
+
         """
         if self._interval_metadata is None:
             # Not using setter to avoid copy.
             self._interval_metadata = IntervalMetadata(
                 self._interval_metadata_axis_len_()
             )
+        elif not isinstance(self._interval_metadata, IntervalMetadata):
+            self._interval_metadata = self._interval_metadata()
         return self._interval_metadata
 
     @interval_metadata.setter
@@ -30,6 +30,7 @@ from skbio.sequence._alphabet import (
 )
 from skbio.util import find_duplicates
 from skbio.util._decorator import stable, experimental, classonlymethod, overrides
+from skbio.io.registry import _LazyIOMethod
 
 
 class Sequence(
@@ -371,6 +372,8 @@ fuzzy=[(True, False)], metadata={'gene': 'foo'})
     _ascii_invert_case_bit_offset = 32
     _ascii_lowercase_boundary = 90
     default_write_format = "fasta"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
     __hash__ = None
 
     @property
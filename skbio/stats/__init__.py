@@ -38,6 +38,18 @@ Functions
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from importlib import import_module
+
 from ._subsample import subsample_counts, isubsample
 
 __all__ = ["subsample_counts", "isubsample"]
+
+_subpackages = {"composition", "distance", "evolve", "gradient", "ordination", "power"}
+
+
+def __getattr__(name):
+    # Submodules are imported on first access, as `import skbio` does not
+    # import all of them.
+    if name in _subpackages:
+        return import_module("skbio.stats." + name)
+    raise AttributeError("module 'skbio.stats' has no attribute %r" % name)
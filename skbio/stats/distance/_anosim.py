@@ -9,7 +9,6 @@
 from functools import partial
 
 import numpy as np
-from scipy.stats import rankdata
 
 from ._base import _preprocess_input, _run_monte_carlo_stats, _build_results
 from skbio.util._decorator import experimental
@@ -171,6 +170,9 @@ def anosim(distance_matrix, grouping, column=None, permutations=999):
         distance_matrix, grouping, column
     )
 
+    # scipy.stats is slow to import, so it is imported on first use.
+    from scipy.stats import rankdata
+
     divisor = sample_size * ((sample_size - 1) / 4)
     ranked_dists = rankdata(distances, method="average")
 
@@ -19,6 +19,7 @@ from skbio.util import find_duplicates
 from skbio.util._decorator import experimental, classonlymethod
 from skbio.util._misc import resolve_key
 from skbio.util._plotting import PlottableMixin
+from skbio.io.registry import _LazyIOMethod
 
 from ._utils import is_symmetric_and_hollow
 from ._utils import distmat_reorder, distmat_reorder_condensed
@@ -95,6 +96,8 @@ class DissimilarityMatrix(SkbioObject, PlottableMixin):
     """
 
     default_write_format = "lsmat"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
     # Used in __str__
     _matrix_element_name = "dissimilarity"
 
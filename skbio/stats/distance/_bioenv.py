@@ -11,7 +11,6 @@ from itertools import combinations
 import numpy as np
 import pandas as pd
 from scipy.spatial.distance import pdist
-from scipy.stats import spearmanr
 
 from skbio.stats.distance import DistanceMatrix
 from skbio.util._decorator import experimental
@@ -188,6 +187,8 @@ def bioenv(distance_matrix, data_frame, columns=None):
     vars_array = _scale(vars_df).values
     dm_flat = distance_matrix.condensed_form()
 
+    from scipy.stats import spearmanr
+
     num_vars = len(columns)
     var_idxs = np.arange(num_vars)
 
@@ -12,9 +12,6 @@ import warnings
 import numpy as np
 import pandas as pd
 import scipy.special
-from scipy.stats import kendalltau
-from scipy.stats import ConstantInputWarning
-from scipy.stats import NearConstantInputWarning
 
 from skbio.stats.distance import DistanceMatrix
 from skbio.util._decorator import experimental
@@ -268,6 +265,8 @@ def mantel(
     elif method == "spearman":
         special = True
     elif method == "kendalltau":
+        from scipy.stats import kendalltau
+
         corr_func = kendalltau
     else:
         raise ValueError("Invalid correlation method '%s'." % method)
@@ -359,6 +358,8 @@ def _mantel_stats_pearson_flat(x, y_flat, permutations):
         Permuted correlation coefficients of the test.
 
     """
+    from scipy.stats import ConstantInputWarning, NearConstantInputWarning
+
     x_flat = x.condensed_form()
 
     # If an input is constant, the correlation coefficient is not defined.
@@ -477,6 +478,8 @@ def _mantel_stats_spearman(x, y, permutations):
         Permuted correlation coefficients of the test.
 
     """
+    from scipy.stats import ConstantInputWarning, rankdata
+
     x_flat = x.condensed_form()
     y_flat = y.condensed_form()
 
@@ -485,10 +488,10 @@ def _mantel_stats_spearman(x, y, permutations):
         warnings.warn(ConstantInputWarning())
         return np.nan, np.nan, []
 
-    y_rank = scipy.stats.rankdata(y_flat)
+    y_rank = rankdata(y_flat)
     del y_flat
 
-    x_rank = scipy.stats.rankdata(x_flat)
+    x_rank = rankdata(x_flat)
     del x_flat
 
     x_rank_matrix = DistanceMatrix(x_rank, x.ids)
@@ -10,7 +10,6 @@ from functools import partial
 
 import numpy as np
 import pandas as pd
-from scipy.stats import f_oneway
 from scipy.spatial.distance import cdist
 
 import hdmedians as hd
@@ -302,6 +301,8 @@ def _compute_groups(samples, test_type, grouping):
             )
         )
 
+    from scipy.stats import f_oneway
+
     stat, _ = f_oneway(*groups)
     stat = stat[0]
 
@@ -7,7 +7,6 @@
 # ----------------------------------------------------------------------------
 
 import numpy as np
-from scipy.stats import pearsonr
 
 from skbio import DistanceMatrix
 from skbio.util._decorator import experimental
@@ -178,6 +177,8 @@ def hommola_cospeciation(host_dist, par_dist, interaction, permutations=999):
     x = _get_dist(hosts_k_labels, hosts_t_labels, host_dist.data, np.arange(num_hosts))
     y = _get_dist(pars_k_labels, pars_t_labels, par_dist.data, np.arange(num_pars))
 
+    from scipy.stats import pearsonr
+
     # calculate the observed correlation coefficient for these hosts/symbionts
     corr_coeff = pearsonr(x, y)[0]
 
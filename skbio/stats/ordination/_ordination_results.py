@@ -14,6 +14,7 @@ from skbio._base import SkbioObject
 from skbio.stats._misc import _pprint_strs
 from skbio.util._decorator import experimental
 from skbio.util._plotting import PlottableMixin
+from skbio.io.registry import _LazyIOMethod
 
 
 class OrdinationResults(SkbioObject, PlottableMixin):
@@ -59,6 +60,8 @@ class OrdinationResults(SkbioObject, PlottableMixin):
     """
 
     default_write_format = "ordination"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
 
     @experimental(as_of="0.4.0")
     def __init__(
@@ -0,0 +1,99 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import subprocess
+import sys
+import unittest
+from importlib import import_module
+
+import skbio
+
+
+def _imported_modules(statement):
+    """Run `statement` in a new interpreter and list the modules it imports."""
+    result = subprocess.run(
+        [sys.executable, "-c", statement + "; import sys; print(*sys.modules)"],
+        capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+
+def _import_time(statement, repeats=3):
+    """Time `statement` in new interpreters, returning the best of `repeats`."""
+    timer = ("import time; start = time.perf_counter(); %s; "
+             "print(time.perf_counter() - start)" % statement)
+    times = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-c", timer],
+                                capture_output=True, text=True, check=True)
+        times.append(float(result.stdout))
+    return min(times)
+
+
+class TestImport(unittest.TestCase):
+    # Slow to import and not needed until used.
+    deferred = ("pandas", "scipy", "requests", "h5py", "skbio.diversity",
+                "skbio.stats.evolve", "skbio.sequence", "skbio.tree")
+
+    def test_deferred_imports(self):
+        modules = _imported_modules("import skbio")
+        self.assertIn("skbio", modules)
+        self.assertIn("skbio.io", modules)
+        for module in self.deferred:
+            self.assertNotIn(module, modules)
+        self.assertFalse([module for module in modules
+                          if module.startswith("skbio.io.format.")])
+
+    def test_import_time(self):
+        # Importing everything (as `import skbio` used to) takes several times
+        # as long, so this bound is loose enough not to depend on the machine.
+        lazy = _import_time("import skbio")
+        full = _import_time(
+            "import skbio; skbio.io.io_registry._load_formats()")
+        self.assertLess(lazy, full / 2)
+        self.assertLess(lazy, 2.0)
+
+    def test_deferred_on_use(self):
+        modules = _imported_modules(
+            "import skbio; skbio.diversity.alpha_diversity; "
+            "skbio.stats.evolve.hommola_cospeciation")
+        self.assertIn("skbio.diversity", modules)
+        self.assertIn("skbio.stats.evolve", modules)
+        self.assertNotIn("h5py", modules)
+
+    def test_formats_on_use(self):
+        modules = _imported_modules(
+            "import skbio; skbio.io.sniff(['>a\\n', 'ACGT\\n'])")
+        self.assertIn("skbio.io.format.fasta", modules)
+        self.assertIn("skbio.io.format.binary_dm", modules)
+        self.assertNotIn("h5py", modules)
+
+    def test_lazy_attributes(self):
+        for name, module in skbio._lazy_imports.items():
+            self.assertIn(name, skbio.__all__)
+            self.assertIs(getattr(skbio, name),
+                          getattr(import_module(module), name))
+        self.assertIs(skbio.diversity, sys.modules["skbio.diversity"])
+        self.assertIs(skbio.stats.evolve, sys.modules["skbio.stats.evolve"])
+        self.assertIn("DNA", dir(skbio))
+        self.assertIn("tree", dir(skbio))
+
+    def test_missing_attribute(self):
+        with self.assertRaisesRegex(AttributeError, "no attribute 'spam'"):
+            skbio.spam
+        with self.assertRaisesRegex(AttributeError, "no attribute 'spam'"):
+            skbio.stats.spam
+
+    def test_read_write_methods(self):
+        # Formats are registered without accessing anything through `skbio`.
+        modules = _imported_modules(
+            "from skbio.sequence import DNA; DNA.read; DNA.write")
+        self.assertIn("skbio.io.format.fasta", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,6 +16,7 @@ Classes
    :toctree: generated/
 
     TreeNode
+    CompactTree
 
 Phylogenetic Reconstruction
 ---------------------------
@@ -24,6 +25,17 @@ Phylogenetic Reconstruction
    :toctree: generated/
 
     nj
+    upgma
+    bme
+
+Tree Comparison
+---------------
+
+.. autosummary::
+   :toctree: generated/
+
+    rf_dists
+    wrf_dists
 
 Utility Functions
 -----------------
@@ -181,8 +193,12 @@ pairwise tip-to-tip distances between trees:
 # ----------------------------------------------------------------------------
 
 from ._tree import TreeNode
+from ._compact import CompactTree
 from ._nj import nj
+from ._upgma import upgma
+from ._me import bme
 from ._majority_rule import majority_rule
+from ._compare import rf_dists, wrf_dists
 from ._exception import (
     TreeError,
     NoLengthError,
@@ -193,8 +209,13 @@ from ._exception import (
 
 __all__ = [
     "TreeNode",
+    "CompactTree",
     "nj",
+    "upgma",
+    "bme",
     "majority_rule",
+    "rf_dists",
+    "wrf_dists",
     "TreeError",
     "NoLengthError",
     "DuplicateNodeError",
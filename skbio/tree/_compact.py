@@ -0,0 +1,594 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import numpy as np
+
+from skbio._base import SkbioObject
+from skbio.tree._exception import MissingNodeError
+from skbio.util._decorator import experimental, classonlymethod
+from skbio.util._misc import pause_gc
+from skbio.io.registry import _LazyIOMethod
+
+
+class CompactTree(SkbioObject):
+    r"""Array-backed representation of a tree.
+
+    A `CompactTree` stores a whole tree in a few NumPy arrays rather than as a
+    graph of :class:`TreeNode` objects. The nodes are numbered in preorder,
+    starting from 0 for the root, and a node is referred to by its number
+    (index). This takes a small fraction of the memory of a ``TreeNode`` tree,
+    and traversals and other operations on all nodes are vectorized.
+
+    Parameters
+    ----------
+    parent : array_like of int
+        Index of the parent of each node, or -1 for the root. Nodes must be in
+        preorder, i.e., the root comes first, every other node comes after its
+        parent, and the descendants of a node come right after it, with the
+        children of a node in order.
+    name : array_like of str, optional
+        Name of each node, or None for nodes without a name.
+    length : array_like of float, optional
+        Branch length of each node, or NaN for nodes without one.
+    support : array_like of float, optional
+        Support value of each node, or NaN for nodes without one.
+
+    Attributes
+    ----------
+    parent
+    first_child
+    next_sibling
+    name
+    length
+    support
+    is_tip
+
+    See Also
+    --------
+    TreeNode
+
+    Notes
+    -----
+    The topology is stored as three arrays of indices: the parent, the first
+    child, and the next sibling of each node, with -1 where there is none.
+    Preorder is the order of the nodes themselves, and the postorder and the
+    other quantities derived from the topology (e.g., depths and distances to
+    the root) are computed with a number of vectorized operations that grows
+    with the logarithm of the height of the tree, rather than with a Python
+    loop over the nodes. They are cached, as the arrays are not meant to be
+    modified.
+
+    Examples
+    --------
+    >>> from skbio import TreeNode
+    >>> from skbio.tree import CompactTree
+    >>> tree = TreeNode.read(['((a:1,b:2)c:3,d:4)e;'])
+    >>> ct = CompactTree.from_tree_node(tree)
+    >>> ct
+    <CompactTree, nodes: 5, tips: 3>
+    >>> ct.parent
+    array([-1,  0,  1,  1,  0])
+    >>> ct.name[ct.postorder()]
+    array(['a', 'b', 'c', 'd', 'e'], dtype=object)
+    >>> ct.root_distances()
+    array([ 0.,  3.,  4.,  5.,  4.])
+
+    """
+
+    default_write_format = "binary_tree"
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
+
+    @experimental(as_of="0.6.0")
+    def __init__(self, parent, name=None, length=None, support=None):
+        parent = np.asarray(parent, dtype=np.intp)
+        n = parent.size
+        if (
+            parent.ndim != 1
+            or not n
+            or parent[0] != -1
+            or not ((parent[1:] >= 0) & (parent[1:] < np.arange(1, n))).all()
+        ):
+            raise ValueError(
+                "Nodes must be in preorder, with the root first and every other "
+                "node after its parent."
+            )
+        self._parent = parent
+        self._name = self._column(name, n, object, None, "name")
+        self._length = self._column(length, n, float, np.nan, "length")
+        self._support = self._column(support, n, float, np.nan, "support")
+
+        # Siblings are ordered by index, so sorting the nodes by their parents
+        # (stably) puts the children of each node next to each other in order.
+        children = np.argsort(parent[1:], kind="stable") + 1
+        parents = parent[children]
+        first = np.ones(n - 1, dtype=bool)
+        np.not_equal(parents[1:], parents[:-1], out=first[1:])
+        self._first_child = np.full(n, -1, dtype=np.intp)
+        self._first_child[parents[first]] = children[first]
+        self._next_sibling = np.full(n, -1, dtype=np.intp)
+        same = ~first[1:]
+        self._next_sibling[children[:-1][same]] = children[1:][same]
+
+        # The descendants of a node are the nodes between it and the end of
+        # its subtree: its next sibling, or that of its closest ancestor with
+        # one, or the end of the array.
+        has_sibling = self._next_sibling >= 0
+        jump = np.where(has_sibling, np.arange(n), parent)
+        jump[0] = 0
+        jump, _ = _jump(jump)
+        self._subtree_end = np.where(has_sibling[jump], self._next_sibling[jump], n)
+
+        # Each node lies before the end of the subtree of its parent only if
+        # the nodes are in preorder (e.g., not if a node follows a sibling of
+        # its parent).
+        if not (np.arange(1, n) < self._subtree_end[parent[1:]]).all():
+            raise ValueError(
+                "Nodes must be in preorder, with the root first and every other "
+                "node after its parent."
+            )
+
+        self._cache = {}
+
+    @staticmethod
+    def _column(values, n, dtype, missing, label):
+        if values is None:
+            return np.full(n, missing, dtype=dtype)
+        values = np.asarray(values, dtype=dtype)
+        if values.shape != (n,):
+            raise ValueError(
+                "There must be one %s per node (%d), not %r." % (label, n, values.shape)
+            )
+        return values
+
+    @classonlymethod
+    @experimental(as_of="0.6.0")
+    def from_tree_node(cls, tree):
+        r"""Create a compact tree from a ``TreeNode`` tree.
+
+        Parameters
+        ----------
+        tree : TreeNode
+            The tree to convert. If it is not the root of its tree, only its
+            subtree is converted, with it as the root.
+
+        Returns
+        -------
+        CompactTree
+            The tree, with the same nodes in the same order.
+
+        Notes
+        -----
+        The names, branch lengths and support values of the nodes are copied.
+        Missing branch lengths and support values are stored as NaN. Other
+        attributes of the nodes are not kept.
+
+        """
+        parents, names, lengths, supports = [], [], [], []
+        nodes_left = [(tree, -1)]
+        while nodes_left:
+            node, parent = nodes_left.pop()
+            parents.append(parent)
+            names.append(node.name)
+            lengths.append(node.length)
+            supports.append(node.support)
+            if node.children:
+                i = len(parents) - 1
+                nodes_left.extend([(child, i) for child in reversed(node.children)])
+
+        name = np.empty(len(names), dtype=object)
+        name[:] = names
+        return cls(
+            parents,
+            name,
+            [np.nan if x is None else x for x in lengths],
+            [np.nan if x is None else x for x in supports],
+        )
+
+    @experimental(as_of="0.6.0")
+    def to_tree_node(self, cls=None):
+        r"""Create a ``TreeNode`` tree from the compact tree.
+
+        Parameters
+        ----------
+        cls : type, optional
+            The class of the nodes, ``TreeNode`` by default.
+
+        Returns
+        -------
+        TreeNode
+            The root of the tree. NaN branch lengths and support values become
+            None.
+
+        """
+        if cls is None:
+            from skbio.tree import TreeNode as cls
+
+        parents = self._parent.tolist()
+        names = self._name.tolist()
+        lengths = _optional_values(self._length)
+        supports = _optional_values(self._support)
+
+        with pause_gc():
+            nodes = [cls(names[0], lengths[0], supports[0])]
+            for i in range(1, len(parents)):
+                parent = nodes[parents[i]]
+                node = cls(names[i], lengths[i], supports[i], parent)
+                parent.children.append(node)
+                nodes.append(node)
+        return nodes[0]
+
+    @experimental(as_of="0.6.0")
+    def __str__(self):
+        r"""Return the tree in Newick format.
+
+        Returns
+        -------
+        str
+            The Newick string.
+
+        """
+        return str(self.to_tree_node())
+
+    @experimental(as_of="0.6.0")
+    def __repr__(self):
+        r"""Return a summary of the tree.
+
+        Returns
+        -------
+        str
+            The numbers of nodes and tips.
+
+        """
+        return "<%s, nodes: %d, tips: %d>" % (
+            type(self).__name__,
+            len(self),
+            np.count_nonzero(self.is_tip),
+        )
+
+    @experimental(as_of="0.6.0")
+    def __len__(self):
+        r"""Return the number of nodes in the tree.
+
+        Returns
+        -------
+        int
+            The number of nodes, including the root and the tips.
+
+        """
+        return self._parent.size
+
+    @property
+    @experimental(as_of="0.6.0")
+    def parent(self):
+        r"""Index of the parent of each node, or -1 for the root."""
+        return self._parent
+
+    @property
+    @experimental(as_of="0.6.0")
+    def first_child(self):
+        r"""Index of the first child of each node, or -1 for tips."""
+        return self._first_child
+
+    @property
+    @experimental(as_of="0.6.0")
+    def next_sibling(self):
+        r"""Index of the next sibling of each node, or -1 for last children."""
+        return self._next_sibling
+
+    @property
+    @experimental(as_of="0.6.0")
+    def name(self):
+        r"""Name of each node, or None."""
+        return self._name
+
+    @property
+    @experimental(as_of="0.6.0")
+    def length(self):
+        r"""Branch length of each node, or NaN."""
+        return self._length
+
+    @property
+    @experimental(as_of="0.6.0")
+    def support(self):
+        r"""Support value of each node, or NaN."""
+        return self._support
+
+    @property
+    @experimental(as_of="0.6.0")
+    def is_tip(self):
+        r"""Whether each node is a tip."""
+        return self._first_child < 0
+
+    @experimental(as_of="0.6.0")
+    def children(self, node):
+        r"""Return the children of a node.
+
+        Parameters
+        ----------
+        node : int
+            Index of the node.
+
+        Returns
+        -------
+        ndarray of int
+            Indices of its children, in order.
+
+        """
+        child = self._first_child[node]
+        children = []
+        while child >= 0:
+            children.append(child)
+            child = self._next_sibling[child]
+        return np.array(children, dtype=np.intp)
+
+    @experimental(as_of="0.6.0")
+    def subtree(self, node):
+        r"""Return a node and all of its descendants.
+
+        Parameters
+        ----------
+        node : int
+            Index of the node.
+
+        Returns
+        -------
+        ndarray of int
+            Indices of the nodes of its subtree, in preorder.
+
+        """
+        return np.arange(node, self._subtree_end[node])
+
+    @experimental(as_of="0.6.0")
+    def find(self, name):
+        r"""Find a node by name.
+
+        Parameters
+        ----------
+        name : str
+            The name of the node.
+
+        Returns
+        -------
+        int
+            Index of the first node with the name, in preorder.
+
+        Raises
+        ------
+        MissingNodeError
+            If no node has the name.
+
+        """
+        index = self._cache.get("name_index")
+        if index is None:
+            index = {}
+            for i, x in enumerate(self._name.tolist()):
+                index.setdefault(x, i)
+            self._cache["name_index"] = index
+        try:
+            return index[name]
+        except (KeyError, TypeError):
+            raise MissingNodeError("Node %r is not in self." % name)
+
+    @experimental(as_of="0.6.0")
+    def tips(self):
+        r"""Return the tips of the tree.
+
+        Returns
+        -------
+        ndarray of int
+            Indices of the tips, in preorder.
+
+        """
+        return np.flatnonzero(self.is_tip)
+
+    @experimental(as_of="0.6.0")
+    def preorder(self):
+        r"""Return the nodes in preorder.
+
+        Returns
+        -------
+        ndarray of int
+            Indices of all nodes, parents before their children.
+
+        """
+        return np.arange(len(self))
+
+    @experimental(as_of="0.6.0")
+    def postorder(self):
+        r"""Return the nodes in postorder.
+
+        Returns
+        -------
+        ndarray of int
+            Indices of all nodes, children before their parents.
+
+        Notes
+        -----
+        A node is preceded in postorder by its descendants and by the nodes
+        preceding it in preorder, except for its ancestors.
+
+        """
+        order = self._cache.get("postorder")
+        if order is None:
+            n = len(self)
+            index = np.arange(n)
+            position = self._subtree_end - 1 - self.depths()
+            order = np.empty(n, dtype=np.intp)
+            order[position] = index
+            self._cache["postorder"] = order
+        return order
+
+    @experimental(as_of="0.6.0")
+    def depths(self):
+        r"""Return the number of ancestors of each node.
+
+        Returns
+        -------
+        ndarray of int
+            Depth of each node, 0 for the root.
+
+        """
+        depths = self._cache.get("depths")
+        if depths is None:
+            weights = np.ones(len(self), dtype=np.intp)
+            weights[0] = 0
+            depths = _ancestor_sums(self._parent, weights)
+            self._cache["depths"] = depths
+        return depths
+
+    @experimental(as_of="0.6.0")
+    def root_distances(self):
+        r"""Return the distance from the root to each node.
+
+        Returns
+        -------
+        ndarray of float
+            The sum of the branch lengths from each node up to the root,
+            excluding that of the root. Missing branch lengths count as 0.
+
+        """
+        lengths = np.nan_to_num(self._length)
+        lengths[0] = 0.0
+        return _ancestor_sums(self._parent, lengths)
+
+    @experimental(as_of="0.6.0")
+    def to_array(self, nan_length_value=None):
+        r"""Return an array representation of the tree.
+
+        This is the counterpart of :meth:`TreeNode.to_array` and is accepted
+        wherever the latter is used, e.g., to compute phylogenetic diversity
+        metrics.
+
+        Parameters
+        ----------
+        nan_length_value : float, optional
+            If provided, replaces any NaN in the branch length vector.
+
+        Returns
+        -------
+        dict of array
+            ``child_index``, ``name``, ``length`` and ``id`` as returned by
+            :meth:`TreeNode.to_array`, and ``parent`` with the id of the parent
+            of each node (-1 for the root).
+
+        Notes
+        -----
+        The nodes are renumbered so that the children of each node have
+        consecutive ids, with the root last, as ``child_index`` requires. The
+        rows of ``child_index`` come after the rows of any descendants of
+        their node.
+
+        """
+        n = len(self)
+        children = np.argsort(self._parent[1:], kind="stable") + 1
+        ids = np.empty(n, dtype=np.int64)
+        ids[children] = np.arange(n - 1)
+        ids[0] = n - 1
+
+        internal = np.flatnonzero(~self.is_tip)[::-1]
+        first = ids[self._first_child[internal]]
+        counts = np.bincount(self._parent[1:], minlength=n)[internal]
+        child_index = np.column_stack(
+            [ids[internal], first, first + counts - 1]
+        ).astype(np.int64)
+        child_index = np.atleast_2d(child_index)
+
+        order = np.empty(n, dtype=np.intp)
+        order[ids] = np.arange(n)
+        length = self._length[order]
+        if nan_length_value is not None:
+            length[np.isnan(length)] = nan_length_value
+        parent = np.full(n, -1, dtype=np.int64)
+        parent[ids[1:]] = ids[self._parent[1:]]
+        return {
+            "child_index": child_index,
+            "name": self._name[order],
+            "length": length,
+            "id": np.arange(n),
+            "parent": parent,
+        }
+
+
+def _jump(jump, weights=None):
+    """Follow pointers until reaching nodes that point to themselves.
+
+    Returns the node reached from each node and, if `weights` are given, the
+    sums of the weights of the nodes passed on the way, excluding the last.
+    The pointers are doubled at each step (pointer jumping), so the number of
+    steps grows with the logarithm of the longest path.
+
+    """
+    jump = jump.copy()
+    sums = None if weights is None else weights.copy()
+    active = np.flatnonzero(jump[jump] != jump)
+    while active.size:
+        target = jump[active]
+        if sums is not None:
+            sums[active] += sums[target]
+        jump[active] = jump[target]
+        active = active[jump[active] != jump[jump[active]]]
+    if sums is not None:
+        # the last jump of the nodes pointing to a fixed point directly
+        last = jump != np.arange(jump.size)
+        sums[last] += sums[jump[last]]
+    return jump, sums
+
+
+def _ancestor_sums(parent, weights):
+    """Sum the weights of each node and its ancestors.
+
+    `parent` gives the parent of each node and -1 for the root, whose weight
+    must be 0.
+
+    """
+    jump = parent.copy()
+    jump[parent < 0] = np.flatnonzero(parent < 0)
+    _, sums = _jump(jump, weights)
+    return sums
+
+
+def _optional_values(values):
+    missing = np.isnan(values)
+    values = values.tolist()
+    for i in np.flatnonzero(missing).tolist():
+        values[i] = None
+    return values
+
+
+def _from_joins(children, lengths, names):
+    """Create a compact tree from the nodes joined by a clustering.
+
+    `children` holds the children of each internal node, padded with -1, and
+    `lengths` their branch lengths. The tips are numbered 0 to n - 1 after
+    `names`, the internal node of row i is n + i, and the last row is the root.
+
+    """
+    n = len(names)
+    children = np.asarray(children)
+    kids = children.tolist()
+    parent, order = [], []
+    nodes_left = [(n + len(kids) - 1, -1)]
+    while nodes_left:
+        node, i = nodes_left.pop()
+        parent.append(i)
+        order.append(node)
+        if node >= n:
+            i = len(order) - 1
+            row = kids[node - n]
+            nodes_left.extend([(x, i) for x in reversed(row) if x >= 0])
+
+    order = np.array(order)
+    # the branch length of each node, found from the row it is listed in
+    length = np.full(n + len(kids), np.nan)
+    joined = children >= 0
+    length[children[joined]] = np.asarray(lengths, dtype=float)[joined]
+    name = np.full(order.size, None, dtype=object)
+    tips = order < n
+    name[tips] = np.asarray(names, dtype=object)[order[tips]]
+    return CompactTree(parent, name, length[order])
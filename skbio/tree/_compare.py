@@ -0,0 +1,528 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from skbio.stats.distance import DistanceMatrix
+from skbio.util._decorator import experimental
+from ._compact import CompactTree
+
+
+class _TaxonBits:
+    """Mapping of tip names to the bits of fixed-size bitsets.
+
+    Taxon ``i`` is bit ``i % 64`` of word ``i // 64`` of an array of uint64.
+
+    """
+
+    def __init__(self, names):
+        self.index = {}
+        for name in names:
+            self.index.setdefault(name, len(self.index))
+        self.n_words = max(-(-len(self.index) // 64), 1)
+
+    def bitset(self, names):
+        """Return the bitset of a collection of tip names."""
+        positions = np.array([self.index[x] for x in names], dtype=np.intp)
+        bits = np.zeros(self.n_words, dtype=np.uint64)
+        np.bitwise_or.at(bits, positions >> 6, _bit(positions))
+        return bits
+
+    def clades(self, tree):
+        """Return the bitset of the taxa descending from each node of a tree.
+
+        Parameters
+        ----------
+        tree : CompactTree
+            The tree. Tips whose names are not mapped are left out.
+
+        Returns
+        -------
+        ndarray of uint64 of shape (n_nodes, n_words)
+            One bitset per node, with the nodes in preorder.
+
+        """
+        n = len(tree)
+        tips = np.flatnonzero(tree.is_tip)
+        index = self.index
+        positions = np.array(
+            [index.get(x, -1) for x in tree.name[tips].tolist()], dtype=np.intp
+        )
+        mapped = positions >= 0
+        tips, positions = tips[mapped], positions[mapped]
+
+        bits = np.zeros((n, self.n_words), dtype=np.uint64)
+        bits[tips, positions >> 6] = _bit(positions)
+
+        # The children of the nodes at each depth are ORed into them, from the
+        # deepest nodes up. In preorder, the nodes at a given depth are grouped
+        # by parent, and the parents are in order.
+        depths = tree.depths()
+        order = np.argsort(depths, kind="stable")
+        levels = np.searchsorted(depths[order], np.arange(depths.max() + 2))
+        parent = tree.parent
+        for start, end in zip(levels[-2:0:-1], levels[-1:1:-1]):
+            nodes = order[start:end]
+            parents = parent[nodes]
+            first = np.flatnonzero(parents[1:] != parents[:-1]) + 1
+            first = np.concatenate(([0], first))
+            bits[parents[first]] = np.bitwise_or.reduceat(bits[nodes], first, axis=0)
+        return bits
+
+
+def _bit(positions):
+    return np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64))
+
+
+def _popcount(bits):
+    """Return the number of bits set in each row of a 2-D array of uint64."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.intp)
+    # SWAR population count of each word
+    x = bits - ((bits >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + (
+        (x >> np.uint64(2)) & np.uint64(0x3333333333333333)
+    )
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    x = (x * np.uint64(0x0101010101010101)) >> np.uint64(56)
+    return x.sum(axis=1, dtype=np.intp)
+
+
+def _hash(bits):
+    """Return a hashable, sortable key for each row of a 2-D array of uint64."""
+    bits = np.ascontiguousarray(bits)
+    if bits.shape[1] == 1:
+        return bits[:, 0]
+    return bits.view(np.dtype((np.void, bits.itemsize * bits.shape[1])))[:, 0]
+
+
+def _splits(
+    tree,
+    clades,
+    mask,
+    weighted=False,
+    rooted=False,
+    include_tips=False,
+    include_all=False,
+):
+    """Return the distinct splits of a tree on a set of taxa.
+
+    Parameters
+    ----------
+    tree : CompactTree
+        The tree.
+    clades : ndarray of uint64 of shape (n_nodes, n_words)
+        Bitsets of the tips descending from each node (see
+        ``_TaxonBits.clades``).
+    mask : ndarray of uint64 of shape (n_words,)
+        Bitset of the taxa to restrict the tree to.
+    weighted : bool, optional
+        Whether to return the branch lengths of the splits. The lengths of the
+        branches that are merged into the same split are summed. Missing
+        lengths count as 0.
+    rooted : bool, optional
+        If True, the splits are the clades of the non-root nodes. If False,
+        they are the bipartitions of the taxa defined by the branches, and the
+        taxa in `mask` must all be in the tree.
+    include_tips : bool, optional
+        Whether to include the splits of single taxa.
+    include_all : bool, optional
+        In rooted mode, whether to include the clade of all taxa, if any.
+
+    Returns
+    -------
+    keys : ndarray
+        Sorted hashed bitsets of the splits (see ``_hash``).
+    lengths : ndarray of float or None
+        Summed branch lengths of the splits, if `weighted` is True.
+
+    """
+    # Tips only make splits of single taxa.
+    is_tip = tree.is_tip
+    if include_tips:
+        nodes = np.arange(1, len(tree))
+    else:
+        nodes = np.flatnonzero(~is_tip[1:]) + 1
+    bits = clades[nodes] & mask
+
+    # The number of taxa in each clade is counted from the tips in its range
+    # of the preorder, which is much faster than counting the bits, unless
+    # several tips have the same name.
+    tips = np.flatnonzero(is_tip)
+    inside = np.zeros(len(tree) + 1, dtype=np.intp)
+    inside[tips + 1] = (clades[tips] & mask).any(axis=1)
+    counts = np.cumsum(inside)
+    total = _popcount(clades[:1] & mask)[0]
+    if counts[-1] == total:
+        sizes = counts[tree._subtree_end[nodes]] - counts[nodes]
+    else:
+        sizes = _popcount(bits)
+
+    if rooted:
+        if not include_all:
+            sizes[sizes == total] = 0
+    else:
+        # A bipartition is stored as its side without the first taxon.
+        words = np.flatnonzero(mask)
+        if words.size:
+            word = words[0]
+            first = mask[word] & (~mask[word] + np.uint64(1))
+            flip = (bits[:, word] & first).astype(bool)
+            bits[flip] = ~bits[flip] & mask
+            sizes = np.minimum(sizes, total - sizes)
+    keep = sizes > 1
+    if include_tips:
+        keep |= sizes == 1
+    keys, inverse = np.unique(_hash(bits[keep]), return_inverse=True)
+    if not weighted:
+        return keys, None
+    lengths = np.nan_to_num(tree.length[nodes[keep]])
+    return keys, np.bincount(inverse.ravel(), weights=lengths, minlength=keys.size)
+
+
+def _compact(tree):
+    if isinstance(tree, CompactTree):
+        return tree
+    return CompactTree.from_tree_node(tree)
+
+
+def _tip_names(tree):
+    return tree.name[tree.is_tip].tolist()
+
+
+def _pair_splits(tree1, tree2, taxa, **kwargs):
+    """Return the splits of two trees restricted to a set of taxa."""
+    bits = _TaxonBits(taxa)
+    mask = bits.bitset(bits.index)
+    return [
+        _splits(tree, bits.clades(tree), mask, **kwargs)[0]
+        for tree in map(_compact, (tree1, tree2))
+    ]
+
+
+def _map_rows(func, n, threads):
+    """Apply a function to chunks of the rows of a matrix, and stack them."""
+    threads = max(int(threads or 1), 1)
+    if threads == 1 or n < 2:
+        return func(np.arange(n))
+    chunks = np.array_split(np.arange(n), min(4 * threads, n))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return np.vstack(list(executor.map(func, chunks)))
+
+
+def _incidence(splits, weighted):
+    """Return a sparse matrix of the splits (columns) of each tree (rows)."""
+    sizes = np.array([keys.size for keys, _ in splits], dtype=np.intp)
+    keys, ids = np.unique(
+        np.concatenate([keys for keys, _ in splits]), return_inverse=True
+    )
+    rows = np.repeat(np.arange(len(splits)), sizes)
+    if weighted:
+        data = np.concatenate([lengths for _, lengths in splits])
+    else:
+        data = np.ones(ids.size)
+    matrix = csr_matrix((data, (rows, ids.ravel())), shape=(len(splits), keys.size))
+    return matrix, sizes, ids.ravel()
+
+
+def _rf_pair(splits1, splits2, proportion):
+    keys1, keys2 = splits1[0], splits2[0]
+    total = keys1.size + keys2.size
+    dist = float(total - 2 * np.intersect1d(keys1, keys2, assume_unique=True).size)
+    if proportion:
+        dist = dist / total if total else 0.0
+    return dist
+
+
+def _wrf_pair(splits1, splits2, func):
+    (keys1, lengths1), (keys2, lengths2) = splits1, splits2
+    _, i, j = np.intersect1d(keys1, keys2, assume_unique=True, return_indices=True)
+    shared1, shared2 = lengths1[i], lengths2[j]
+    return (
+        func(lengths1).sum()
+        + func(lengths2).sum()
+        - func(shared1).sum()
+        - func(shared2).sum()
+        + func(shared1 - shared2).sum()
+    )
+
+
+def _pairwise(trees, ids, shared_by_all, rooted, include_tips, weighted, matrix, pair):
+    """Compute a distance matrix from the splits of a list of trees.
+
+    The splits of all trees are computed on a single mapping of taxa to bits.
+    If the trees must be compared on the taxa of each pair, as they have
+    different taxa and `shared_by_all` is False, `pair` is called on the
+    splits of every pair. Otherwise, `matrix` computes all distances at once
+    from the splits of each tree.
+
+    """
+    trees = [_compact(x) for x in trees]
+    taxa = [set(_tip_names(x)) for x in trees]
+    names = [x for tree in trees for x in _tip_names(tree)]
+    same = all(x == taxa[0] for x in taxa[1:])
+    if shared_by_all or same:
+        shared = set.intersection(*taxa) if taxa else set()
+        names = [x for x in names if x in shared]
+    bits = _TaxonBits(names)
+
+    def splits(tree, clades, mask):
+        return _splits(tree, clades, mask, weighted, rooted, include_tips)
+
+    if shared_by_all or same:
+        mask = bits.bitset(bits.index)
+        dm = matrix([splits(x, bits.clades(x), mask) for x in trees])
+    else:
+        n = len(trees)
+        clades = [bits.clades(x) for x in trees]
+        masks = [bits.bitset(x) for x in taxa]
+        dm = np.zeros((n, n))
+        for i, j in combinations(range(n), 2):
+            mask = masks[i] & masks[j]
+            dm[i, j] = dm[j, i] = pair(
+                splits(trees[i], clades[i], mask), splits(trees[j], clades[j], mask)
+            )
+    return DistanceMatrix(dm, ids)
+
+
+@experimental(as_of="0.6.0")
+def rf_dists(
+    trees, ids=None, shared_by_all=True, proportion=False, rooted=False, threads=1
+):
+    r"""Calculate Robinson-Foulds distances among trees.
+
+    Parameters
+    ----------
+    trees : list of TreeNode or CompactTree
+        Input trees.
+    ids : list of str, optional
+        Unique identifiers of the trees. If omitted, they are numbers from 0.
+    shared_by_all : bool, optional
+        Compare all trees on the taxa shared by all of them (True, default),
+        or each pair of trees on the taxa shared by the pair (False).
+    proportion : bool, optional
+        Return the distances as proportions of the total number of splits of
+        each pair of trees.
+    rooted : bool, optional
+        Compare the clades of rooted trees rather than the bipartitions of
+        unrooted trees (default).
+    threads : int, optional
+        Number of threads with which to compute the distances. Default is 1.
+
+    Returns
+    -------
+    DistanceMatrix
+        Robinson-Foulds distance matrix.
+
+    See Also
+    --------
+    wrf_dists
+    TreeNode.compare_rfd
+
+    Notes
+    -----
+    The Robinson-Foulds (RF) distance [1]_ between two trees is the number of
+    splits found in only one of the trees. In unrooted trees, a split is the
+    bipartition of the taxa defined by a branch, and in rooted trees, it is the
+    set of taxa descending from a node, i.e., a clade. The splits of single
+    taxa and of all taxa, which are in every tree, are not counted.
+
+    Each split is stored as a bitset of the taxa on one side of it, with one
+    bit per taxon, in an array of 64-bit integers. The taxa are mapped to bits
+    once for all trees, and the splits of each tree are computed with a few
+    vectorized operations on its nodes, and hashed. The numbers of splits
+    shared by every pair of trees are then obtained from the product of a
+    sparse matrix of the splits found in each tree with its transpose. This is
+    much faster than comparing the trees pair by pair, and makes it possible
+    to compare thousands of trees, such as those from bootstrapping.
+
+    If the trees do not have the same taxa and `shared_by_all` is False,
+    each pair of trees is compared on the splits restricted to the taxa shared
+    by the pair, which is slower. This is what ``TreeNode.compare_rfd`` does
+    for rooted trees.
+
+    References
+    ----------
+    .. [1] Robinson, D. F., & Foulds, L. R. (1981). Comparison of phylogenetic
+       trees. Mathematical biosciences, 53(1-2), 131-147.
+
+    Examples
+    --------
+    >>> from skbio import TreeNode
+    >>> from skbio.tree import rf_dists
+    >>> trees = [TreeNode.read(["((a,b),c,(d,e));"]),
+    ...          TreeNode.read(["((a,c),b,(d,e));"]),
+    ...          TreeNode.read(["((a,b),(c,d),e);"])]
+    >>> dm = rf_dists(trees, ids=["t1", "t2", "t3"])
+    >>> print(dm)
+    3x3 distance matrix
+    IDs:
+    't1', 't2', 't3'
+    Data:
+    [[ 0.  2.  2.]
+     [ 2.  0.  4.]
+     [ 2.  4.  0.]]
+
+    """
+
+    def matrix(splits):
+        incidence, sizes, _ = _incidence(splits, False)
+        transposed = incidence.T.tocsr()
+
+        def rows(chunk):
+            return (incidence[chunk] @ transposed).toarray()
+
+        shared = _map_rows(rows, len(splits), threads)
+        total = np.add.outer(sizes, sizes).astype(float)
+        dm = total - 2 * shared
+        if proportion:
+            np.divide(dm, total, out=dm, where=total > 0)
+        return dm
+
+    return _pairwise(
+        trees,
+        ids,
+        shared_by_all,
+        rooted,
+        False,
+        False,
+        matrix,
+        lambda x, y: _rf_pair(x, y, proportion),
+    )
+
+
+@experimental(as_of="0.6.0")
+def wrf_dists(
+    trees,
+    ids=None,
+    shared_by_all=True,
+    metric="cityblock",
+    rooted=False,
+    include_tips=True,
+    threads=1,
+):
+    r"""Calculate weighted Robinson-Foulds distances among trees.
+
+    Parameters
+    ----------
+    trees : list of TreeNode or CompactTree
+        Input trees.
+    ids : list of str, optional
+        Unique identifiers of the trees. If omitted, they are numbers from 0.
+    shared_by_all : bool, optional
+        Compare all trees on the taxa shared by all of them (True, default),
+        or each pair of trees on the taxa shared by the pair (False).
+    metric : {"cityblock", "euclidean"}, optional
+        Distance metric between the branch lengths of the splits of two trees.
+        Default is "cityblock", i.e., the sum of the absolute differences.
+    rooted : bool, optional
+        Compare the clades of rooted trees rather than the bipartitions of
+        unrooted trees (default).
+    include_tips : bool, optional
+        Include the splits of single taxa, i.e., the terminal branches (True,
+        default).
+    threads : int, optional
+        Number of threads with which to compute the distances. Default is 1.
+
+    Returns
+    -------
+    DistanceMatrix
+        Weighted Robinson-Foulds distance matrix.
+
+    Raises
+    ------
+    ValueError
+        If `metric` is not supported.
+
+    See Also
+    --------
+    rf_dists
+
+    Notes
+    -----
+    The weighted Robinson-Foulds distance [1]_ between two trees takes the
+    branch lengths into account: it is the sum of the absolute differences
+    between the lengths of the branches defining each split in the two trees,
+    where a split absent from a tree has a length of 0. Missing branch lengths
+    are also 0. With the Euclidean metric, it is the square root of the sum of
+    the squared differences, which is also known as the branch score distance
+    [2]_.
+
+    The splits are computed as in :func:`rf_dists`. The distances of each tree
+    to all others are computed at once from a dense matrix of the lengths of
+    its splits in every tree.
+
+    References
+    ----------
+    .. [1] Robinson, D. F., & Foulds, L. R. (1979) Comparison of weighted
+       labelled trees. In Combinatorial Mathematics VI: Proceedings of the
+       Sixth Australian Conference on Combinatorial Mathematics, Armidale,
+       Australia (pp. 119-126).
+
+    .. [2] Kuhner, M. K., & Felsenstein, J. (1994). A simulation comparison of
+       phylogeny algorithms under equal and unequal evolutionary rates.
+       Molecular biology and evolution, 11(3), 459-468.
+
+    Examples
+    --------
+    >>> from skbio import TreeNode
+    >>> from skbio.tree import wrf_dists
+    >>> trees = [TreeNode.read(["((a:1,b:2):1,c:4,(d:4,e:5):2);"]),
+    ...          TreeNode.read(["((a:1,c:3):2,b:2,(d:3,e:4):3);"]),
+    ...          TreeNode.read(["((a:1,b:1):1,(c:2,d:3):3,e:4);"])]
+    >>> dm = wrf_dists(trees, ids=["t1", "t2", "t3"])
+    >>> print(dm)
+    3x3 distance matrix
+    IDs:
+    't1', 't2', 't3'
+    Data:
+    [[  0.   7.  10.]
+     [  7.   0.  11.]
+     [ 10.  11.   0.]]
+
+    """
+    funcs = {"cityblock": np.abs, "euclidean": np.square}
+    if metric not in funcs:
+        raise ValueError("Unsupported metric: %r." % metric)
+    func = funcs[metric]
+
+    def matrix(splits):
+        incidence, sizes, ids = _incidence(splits, True)
+        columns = incidence.tocsc()
+        totals = np.array([func(lengths).sum() for _, lengths in splits])
+        starts = np.concatenate([[0], np.cumsum(sizes)])
+
+        def rows(chunk):
+            out = np.empty((chunk.size, len(splits)))
+            for k, i in enumerate(chunk):
+                # lengths in all trees of the splits of tree i
+                cols = ids[starts[i] : starts[i + 1]]
+                other = columns[:, cols].toarray()
+                own = splits[i][1]
+                out[k] = (
+                    totals - func(other).sum(axis=1) + func(other - own).sum(axis=1)
+                )
+            return out
+
+        dm = _map_rows(rows, len(splits), threads)
+        # rounding errors may leave the distances not exactly symmetric
+        dm = np.maximum((dm + dm.T) / 2, 0.0)
+        np.fill_diagonal(dm, 0.0)
+        return dm
+
+    def pair(x, y):
+        return _wrf_pair(x, y, func)
+
+    dm = _pairwise(trees, ids, shared_by_all, rooted, include_tips, True, matrix, pair)
+    if metric == "euclidean":
+        dm = DistanceMatrix(np.sqrt(dm.data), dm.ids)
+    return dm
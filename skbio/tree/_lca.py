@@ -0,0 +1,128 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import numpy as np
+
+from skbio.tree._compact import _ancestor_sums
+from skbio.tree._exception import NoLengthError
+
+
+class LCAIndex:
+    r"""Index of a tree for constant-time lowest common ancestor queries.
+
+    Parameters
+    ----------
+    parent : array_like of int
+        Index of the parent of each node, or -1 for the root, with the nodes
+        in preorder.
+    length : array_like of float
+        Branch length of each node, or NaN if it has none.
+
+    Notes
+    -----
+    The lowest common ancestor (LCA) of two nodes is usually found with a range
+    minimum query (RMQ) on the depths of the nodes along an Euler tour of the
+    tree [1]_. An equivalent query on the nodes in preorder takes half the
+    memory: the LCA of two different nodes :math:`u < v` is the parent of the
+    shallowest node among :math:`u + 1, ..., v`. The shallowest node of every
+    range of :math:`2^k` nodes is precomputed (a sparse table), so that a query
+    is answered from two overlapping ranges in constant time. Building the
+    index takes :math:`O(n \log n)` time and memory.
+
+    The distances of the nodes from the root are precomputed as well, so the
+    distance between two nodes is that of each node from their LCA, summed.
+
+    References
+    ----------
+    .. [1] Bender, M. A., & Farach-Colton, M. (2000). The LCA problem
+       revisited. In LATIN 2000: Theoretical Informatics (pp. 88-94).
+
+    """
+
+    def __init__(self, parent, length):
+        parent = np.asarray(parent, dtype=np.intp)
+        n = parent.size
+        self.parent = parent
+
+        weights = np.ones(n, dtype=np.intp)
+        weights[0] = 0
+        self.depth = depth = _ancestor_sums(parent, weights)
+
+        length = np.array(length, dtype=float)
+        missing = np.isnan(length)
+        missing[0] = False
+        length[missing] = 0.0
+        length[0] = 0.0
+        self.root_distance = _ancestor_sums(parent, length)
+        # number of nodes without a length from each node up to the root
+        self.missing = _ancestor_sums(parent, missing.astype(np.intp))
+
+        # table[k, i] is the shallowest node among i, ..., i + 2 ** k - 1
+        dtype = np.int32 if n <= np.iinfo(np.int32).max else np.intp
+        table = np.empty((n.bit_length(), n), dtype=dtype)
+        table[0] = np.arange(n)
+        for k in range(1, len(table)):
+            half, size = 1 << (k - 1), n - (1 << k) + 1
+            first = table[k - 1, :size]
+            second = table[k - 1, half : half + size]
+            table[k, :size] = np.where(depth[first] <= depth[second], first, second)
+        self.table = table
+
+    def lca(self, u, v):
+        """Return the lowest common ancestors of pairs of nodes.
+
+        Parameters
+        ----------
+        u, v : array_like of int
+            Indices of the nodes of each pair.
+
+        Returns
+        -------
+        ndarray of int
+            Index of the lowest common ancestor of each pair.
+
+        """
+        u, v = np.asarray(u, dtype=np.intp), np.asarray(v, dtype=np.intp)
+        same = u == v
+        start = np.where(same, 0, np.minimum(u, v) + 1)
+        stop = np.where(same, 0, np.maximum(u, v))
+        # the largest power of 2 not greater than the size of each range
+        k = np.frexp(stop - start + 1)[1] - 1
+        first = self.table[k, start]
+        second = self.table[k, stop - (1 << k) + 1]
+        depth = self.depth
+        shallowest = np.where(depth[first] <= depth[second], first, second)
+        return np.where(same, u, self.parent[shallowest])
+
+    def distance(self, u, v):
+        """Return the distances between pairs of nodes.
+
+        Parameters
+        ----------
+        u, v : array_like of int
+            Indices of the nodes of each pair.
+
+        Returns
+        -------
+        ndarray of float
+            Sum of the branch lengths on the path between each pair.
+
+        Raises
+        ------
+        NoLengthError
+            If a node on one of the paths, other than the lowest common
+            ancestor, has no length.
+
+        """
+        u, v = np.asarray(u, dtype=np.intp), np.asarray(v, dtype=np.intp)
+        lca = self.lca(u, v)
+        missing = self.missing
+        if np.any(missing[u] + missing[v] != 2 * missing[lca]):
+            raise NoLengthError("A node on a path between the nodes has no length.")
+        dist = self.root_distance
+        return (dist[u] - dist[lca]) + (dist[v] - dist[lca])
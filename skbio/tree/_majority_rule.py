@@ -6,122 +6,231 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
-from collections import defaultdict
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, zip_longest
 
 import numpy as np
 
 from skbio.tree import TreeNode
 from skbio.util._decorator import experimental
+from ._compact import CompactTree
+from ._compare import _TaxonBits, _hash, _popcount
 
+# number of trees counted in one step
+_batch_size = 64
 
-def _walk_clades(trees, weights):
-    """Walk all the clades of all the trees.
+
+def _count_batch(bits, trees, weights):
+    """Count the clades of a batch of trees.
 
     Parameters
     ----------
-    trees : list of TreeNode
-        The trees to walk
-    weights : np.array
-        Tree weights
+    bits : _TaxonBits
+        Mapping of the tip names of all the trees to bits.
+    trees : list of CompactTree
+        The trees.
+    weights : list of float
+        Tree weights.
 
     Returns
     -------
-    list of tuple
-        The clades and support values sorted by support value such that the
-        most supported clade is index 0. The tuples are of the form:
-        (frozenset, float).
-    defaultdict(float)
-        The edge lengths, keyed by frozenset of the clade, and valued by the
-        weighted average length of the clade by the trees the clade was
-        observed in.
+    rows : ndarray of uint64 of shape (n_clades, n_words)
+        Bitsets of the distinct clades.
+    counts : ndarray of float
+        Summed weights of the trees in which each clade was observed.
+    lengths : ndarray of float
+        Summed weighted branch lengths of each clade.
+    missing : ndarray of int
+        Number of times each clade was observed without a branch length.
 
     """
-    clade_counts = defaultdict(float)
-    edge_lengths = defaultdict(float)
-    total = weights.sum()
-
-    # get clade counts
-    def tipnames_f(n):
-        return [n.name] if n.is_tip() else []
-
-    for tree, weight in zip(trees, weights):
-        tree.cache_attr(tipnames_f, "tip_names", frozenset)
-
-        for node in tree.postorder():
-            tip_names = node.tip_names
+    clades = np.vstack([bits.clades(tree) for tree in trees])
+    sizes = [len(tree) for tree in trees]
+    weights = np.repeat(np.asarray(weights, dtype=float), sizes)
+    lengths = np.concatenate([tree.length for tree in trees])
+    missing = np.isnan(lengths)
+    _, index, inverse = np.unique(_hash(clades), return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    return (
+        clades[index],
+        np.bincount(inverse, weights=weights),
+        np.bincount(inverse, weights=np.where(missing, 0.0, lengths) * weights),
+        np.bincount(inverse, weights=missing),
+    )
+
+
+def _walk_clades(trees, weights, threads=1):
+    """Walk all the clades of all the trees.
 
-            # if node.length is not None, fetch it and weight it
-            length = node.length * weight if node.length is not None else None
+    Parameters
+    ----------
+    trees : iterable of TreeNode or CompactTree
+        The trees to walk. They are consumed in batches, and only the clade
+        counts are kept.
+    weights : iterable of float or None
+        Tree weights, or None if all trees have a weight of 1.
+    threads : int
+        Number of threads counting the clades of batches of trees.
 
-            clade_counts[tip_names] += weight
+    Returns
+    -------
+    names : list
+        Tip names, in the order of their bits.
+    rows : ndarray of uint64 of shape (n_clades, n_words)
+        Bitsets of the tip names of each clade.
+    counts : ndarray of float
+        Support of each clade, i.e., the summed weights of the trees in which
+        it was observed.
+    lengths : ndarray of float
+        Edge length of each clade: its weighted lengths summed and divided by
+        the total weight of the trees, or NaN if it was observed without a
+        length.
+    total : float
+        Total weight of the trees.
+
+    Raises
+    ------
+    ValueError
+        If the numbers of weights and trees differ.
 
-            if length is None:
-                edge_lengths[tip_names] = None
+    """
+    if weights is None:
+        pairs = ((tree, 1.0) for tree in trees)
+    else:
+        pairs = zip_longest(trees, weights)
+
+    names, bits = [], _TaxonBits([])
+    # A clade is identified by the bytes of its bitset. Bitsets are padded
+    # with zeros when new tip names need more words.
+    index = {}
+    n_words = bits.n_words
+    counts, lengths, missing = [], [], []
+    total = 0.0
+
+    def merge(result):
+        rows, batch_counts, batch_lengths, batch_missing = result
+        if rows.shape[1] < n_words:
+            rows = np.pad(rows, ((0, 0), (0, n_words - rows.shape[1])))
+        for row, count, length, miss in zip(
+            rows, batch_counts.tolist(), batch_lengths.tolist(), batch_missing.tolist()
+        ):
+            key = row.tobytes()
+            i = index.get(key)
+            if i is None:
+                index[key] = len(counts)
+                counts.append(count)
+                lengths.append(length)
+                missing.append(miss)
             else:
-                edge_lengths[tip_names] += length / total
-
-    # sort clades by number times observed
-    clade_counts = sorted(clade_counts.items(), key=lambda x: len(x[0]), reverse=True)
-
-    return clade_counts, edge_lengths
-
-
-def _filter_clades(clade_counts, cutoff_threshold):
+                counts[i] += count
+                lengths[i] += length
+                missing[i] += miss
+
+    threads = max(int(threads or 1), 1)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        while True:
+            batch = list(islice(pairs, _batch_size))
+            if not batch:
+                break
+            if any(tree is None or weight is None for tree, weight in batch):
+                raise ValueError("Number of weights and trees differ.")
+            batch_trees = [
+                tree
+                if isinstance(tree, CompactTree)
+                else CompactTree.from_tree_node(tree)
+                for tree, _ in batch
+            ]
+            batch_weights = [float(weight) for _, weight in batch]
+            total += sum(batch_weights)
+
+            for tree in batch_trees:
+                tips = tree.name[tree.is_tip].tolist()
+                if not bits.index.keys() >= set(tips):
+                    names.extend(x for x in dict.fromkeys(tips) if x not in bits.index)
+                    bits = _TaxonBits(names)
+            if bits.n_words > n_words:
+                padding = bytes(8 * (bits.n_words - n_words))
+                index = {key + padding: i for key, i in index.items()}
+                n_words = bits.n_words
+
+            pending.append(
+                executor.submit(_count_batch, bits, batch_trees, batch_weights)
+            )
+            while len(pending) > threads:
+                merge(pending.popleft().result())
+        while pending:
+            merge(pending.popleft().result())
+
+    rows = np.frombuffer(b"".join(index), dtype=np.uint64).reshape(-1, n_words)
+    lengths = np.array(lengths) / total if total else np.array(lengths)
+    lengths[np.array(missing) > 0] = np.nan
+    return names, rows, np.array(counts), lengths, total
+
+
+def _filter_clades(rows, counts, cutoff_threshold, check=True):
     """Filter clades that not well supported or are contradicted.
 
     Parameters
     ----------
-    clade_counts : list of tuple
-        Where the first element in each tuple is the frozenset of the clade,
-        and the second element is the support value. It is expected that this
-        list is sorted by descending order by support.
+    rows : ndarray of uint64 of shape (n_clades, n_words)
+        Bitsets of the clades.
+    counts : ndarray of float
+        Support of each clade.
     cutoff_threshold : float
         The minimum weighted observation count that a clade must have to be
         considered supported.
+    check : bool, optional
+        Whether to check the supported clades for conflicts. Clades supported
+        by more than half of the total weight never conflict.
 
     Returns
     -------
-    dict
-        A dict of the accepted clades, keyed by the frozenset of the clade and
-        valued by the support value.
+    ndarray of int
+        Indices of the accepted clades.
 
     """
-    accepted_clades = {}
-
-    for clade, count in clade_counts:
-        conflict = False
-
-        if count <= cutoff_threshold:
-            continue
-
-        if len(clade) > 1:
-            # check the current clade against all the accepted clades to see if
-            # it conflicts. A conflict is defined as:
+    sizes = _popcount(rows)
+    supported = np.flatnonzero(counts > cutoff_threshold)
+    # larger clades are accepted first
+    supported = supported[np.argsort(-sizes[supported], kind="stable")]
+    if not check:
+        return supported
+
+    accepted = np.empty_like(rows, shape=(supported.size, rows.shape[1]))
+    indices = []
+    for i in supported.tolist():
+        clade = rows[i]
+        if sizes[i] > 1 and indices:
+            # A conflict is defined as:
             # 1. the clades are not disjoint
             # 2. neither clade is a subset of the other
-            for accepted_clade in accepted_clades:
-                intersect = clade.intersection(accepted_clade)
-                subset = clade.issubset(accepted_clade)
-                superset = clade.issuperset(accepted_clade)
-
-                if intersect and not (subset or superset):
-                    conflict = True
-
-        if conflict is False:
-            accepted_clades[clade] = count
-
-    return accepted_clades
-
-
-def _build_trees(clade_counts, edge_lengths, support_attr, tree_node_class):
+            others = accepted[: len(indices)]
+            intersect = (others & clade).any(axis=1)
+            subset = ~(clade & ~others).any(axis=1)
+            superset = ~(others & ~clade).any(axis=1)
+            if (intersect & ~subset & ~superset).any():
+                continue
+        accepted[len(indices)] = clade
+        indices.append(i)
+    return np.array(indices, dtype=np.intp)
+
+
+def _build_trees(names, rows, counts, lengths, support_attr, tree_node_class):
     """Construct the trees with support.
 
     Parameters
     ----------
-    clade_counts : dict
-        Keyed by the frozenset of the clade and valued by the support
-    edge_lengths : dict
-        Keyed by the frozenset of the clade and valued by the weighted length
+    names : list
+        Tip names, in the order of their bits.
+    rows : ndarray of uint64 of shape (n_clades, n_words)
+        Bitsets of the clades, which must be pairwise compatible, with every
+        tip name in a clade also being a clade.
+    counts : ndarray of float
+        Support of each clade.
+    lengths : ndarray of float
+        Edge length of each clade, or NaN if it has none.
     support_attr : str
         The name of the attribute to hold the support value
     tree_node_class : type
@@ -135,61 +244,58 @@ def _build_trees(clade_counts, edge_lengths, support_attr, tree_node_class):
         A list of the constructed trees
 
     """
-    nodes = {}
-    queue = [(len(clade), clade) for clade in clade_counts]
-    while queue:
-        # The values within the queue are updated on each iteration, so it
-        # doesn't look like an insertion sort will make sense unfortunately
-        queue.sort()
-        (clade_size, clade) = queue.pop(0)
-        new_queue = []
-
-        # search for ancestors of clade
-        for _, ancestor in queue:
-            if clade.issubset(ancestor):
-                # update ancestor such that, in the following example:
-                # ancestor == {1, 2, 3, 4}
-                # clade == {2, 3}
-                # new_ancestor == {1, {2, 3}, 4}
-                new_ancestor = (ancestor - clade) | frozenset([clade])
-
-                # update references for counts and lengths
-                clade_counts[new_ancestor] = clade_counts.pop(ancestor)
-                edge_lengths[new_ancestor] = edge_lengths.pop(ancestor)
-
-                ancestor = new_ancestor
-
-            new_queue.append((len(ancestor), ancestor))
-
-        # if the clade is a tip, then we have a name
-        if clade_size == 1:
-            name = list(clade)[0]
-        else:
-            name = None
-
-        # the clade will not be in nodes if it is a tip
-        children = [nodes.pop(c) for c in clade if c in nodes]
-        length = edge_lengths[clade]
-
-        node = tree_node_class(children=children, length=length, name=name)
-        setattr(node, support_attr, clade_counts[clade])
-        nodes[clade] = node
-
-        queue = new_queue
-
-    return list(nodes.values())
+    # Tip names of each clade, as positions of bits.
+    members = np.unpackbits(
+        np.ascontiguousarray(rows).view(np.uint8), axis=1, bitorder="little"
+    ).astype(bool)
+    sizes = members.sum(axis=1)
+    firsts = members.argmax(axis=1)
+
+    # The parent of a clade is the smallest clade containing it. Clades are
+    # visited from the largest, so that the last clade visited containing a
+    # tip name is the parent of the next one containing it.
+    order = np.argsort(-sizes, kind="stable")
+    owner = np.full(members.shape[1], -1, dtype=np.intp)
+    parents = np.empty(len(rows), dtype=np.intp)
+    for i in order.tolist():
+        tips = members[i]
+        parents[i] = owner[firsts[i]]
+        owner[tips] = i
+
+    # Nodes are created from the smallest clades, with children ordered by
+    # their first tip name.
+    children = {}
+    for i in np.lexsort((firsts, parents)).tolist():
+        children.setdefault(parents[i], []).append(i)
+    nodes = [None] * len(rows)
+    counts, lengths = counts.tolist(), lengths.tolist()
+    for i in order[::-1].tolist():
+        node = tree_node_class(
+            children=[nodes[j] for j in children.get(i, ())],
+            length=None if lengths[i] != lengths[i] else lengths[i],
+            name=names[firsts[i]] if sizes[i] == 1 else None,
+        )
+        setattr(node, support_attr, counts[i])
+        nodes[i] = node
+    return [nodes[i] for i in order[::-1].tolist() if parents[i] < 0]
 
 
 @experimental(as_of="0.4.0")
 def majority_rule(
-    trees, weights=None, cutoff=0.5, support_attr="support", tree_node_class=TreeNode
+    trees,
+    weights=None,
+    cutoff=0.5,
+    support_attr="support",
+    tree_node_class=TreeNode,
+    threads=1,
 ):
     r"""Determine consensus trees from a list of rooted trees.
 
     Parameters
     ----------
-    trees : list of TreeNode
-        The trees to operate on
+    trees : iterable of TreeNode or CompactTree
+        The trees to operate on. They may be generated one at a time, e.g.,
+        while reading them from a file, as they are not all kept in memory.
     weights : list or np.array of {int, float}, optional
         If provided, the list must be in index order with `trees`. Each tree
         will receive the corresponding weight. If omitted, all trees will be
@@ -205,6 +311,8 @@ def majority_rule(
         Specifies type of consensus trees that are returned. Either
         ``TreeNode`` (the default) or a type that implements the same interface
         (most usefully, a subclass of ``TreeNode``).
+    threads : int, optional
+        Number of threads counting the clades of the trees. Default is 1.
 
     Returns
     -------
@@ -225,6 +333,14 @@ def majority_rule(
     clade was observed in. For instance, if {A, B, C} was observed in 5 trees
     all with a weight of 1, its support would then be 5.
 
+    The tip names of each clade are stored as a bitset, with one bit per tip
+    name, and the clades of a batch of trees are computed, hashed and counted
+    in a few vectorized steps. Only the counts and summed branch lengths of the
+    distinct clades are kept from batch to batch, which takes little memory
+    for trees sampled from the same distribution, such as bootstrap or
+    posterior trees. With multiple `threads`, batches are counted in parallel
+    and their counts are merged.
+
     References
     ----------
     .. [1] Margush T, McMorris FR. (1981) "Consensus n-trees." Bulletin for
@@ -275,18 +391,27 @@ def majority_rule(
     >>> len(consensus_trees)
     4
 
-    """
-    if weights is None:
-        weights = np.ones(len(trees), dtype=float)
-    else:
-        weights = np.asarray(weights)
-        if len(weights) != len(trees):
-            raise ValueError("Number of weights and trees differ.")
+    Trees can be read from a file, with one tree per line, while they are
+    counted:
 
-    cutoff_threshold = cutoff * weights.sum()
+    >>> fh = StringIO("((a,b),(c,d));\n((a,b),c,d);\n(a,(b,(c,d)));\n")
+    >>> consensus = majority_rule(TreeNode.read([line]) for line in fh)[0]
+    >>> for node in consensus.non_tips():
+    ...     print(sorted(n.name for n in node.tips()), node.support)
+    ['a', 'b'] 2.0
+    ['c', 'd'] 2.0
 
-    clade_counts, edge_lengths = _walk_clades(trees, weights)
-    clade_counts = _filter_clades(clade_counts, cutoff_threshold)
-    trees = _build_trees(clade_counts, edge_lengths, support_attr, tree_node_class)
+    """
+    names, rows, counts, lengths, total = _walk_clades(trees, weights, threads)
+    # Clades in more than half of the trees are always compatible.
+    accepted = _filter_clades(rows, counts, cutoff * total, check=cutoff < 0.5)
+    trees = _build_trees(
+        names,
+        rows[accepted],
+        counts[accepted],
+        lengths[accepted],
+        support_attr,
+        tree_node_class,
+    )
 
     return trees
@@ -0,0 +1,432 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import numpy as np
+
+from skbio.tree._compact import _from_joins
+from skbio.util._decorator import experimental
+
+
+@experimental(as_of="0.6.0")
+def bme(dm, nni=True, compact=False):
+    r"""Build a tree by greedy balanced minimum evolution.
+
+    Parameters
+    ----------
+    dm : skbio.DistanceMatrix
+        Input distance matrix containing distances between OTUs.
+    nni : bool, optional
+        If `True` (default), refine the tree by nearest neighbor interchanges
+        (NNIs) while they shorten it.
+    compact : bool, optional
+        If `True`, return a ``CompactTree`` instead of a ``TreeNode``.
+
+    Returns
+    -------
+    TreeNode or CompactTree
+        The unrooted tree, with the first OTU as a child of the root, which
+        has three children.
+
+    Raises
+    ------
+    ValueError
+        If the distance matrix is smaller than 3x3.
+
+    See Also
+    --------
+    nj
+    upgma
+
+    Notes
+    -----
+    The balanced minimum evolution (BME) criterion scores a tree by the sum of
+    its branch lengths estimated by weighted least squares [1]_, equivalently
+    the sum of the distances between all pairs of OTUs, each weighted by
+    :math:`2^{-k}` for a path of :math:`k` branches [2]_.
+
+    The OTUs are added one by one, in the order of the distance matrix, on
+    the branch that lengthens the tree the least, then branches are swapped
+    by NNIs, following FastME [3]_. The averages of the distances between the
+    subtrees on the two sides of each pair of branches are kept in a matrix of
+    about :math:`(2n)^2` elements, the memory needed. Each insertion updates
+    the averages between each branch and those below it, and all averages of
+    the branches above the new one, which takes :math:`O(nd)` time for a tree
+    of depth :math:`d`, and :math:`O(n^2 d)` time overall. The NNIs that
+    shorten the tree are applied in rounds, those of each round being
+    independent of each other, with the matrix recomputed in :math:`O(n^2)`
+    time after each round.
+
+    The branch lengths are estimated for the final tree by the BME formulas of
+    Desper and Gascuel [1]_, and may be negative.
+
+    References
+    ----------
+    .. [1] Desper R, and Gascuel O. (2002) "Fast and accurate phylogeny
+       reconstruction algorithms based on the minimum-evolution principle."
+       Journal of Computational Biology, 9(5), 687-705.
+    .. [2] Pauplin Y. (2000) "Direct calculation of a tree length using a
+       distance matrix." Journal of Molecular Evolution, 51(1), 41-47.
+    .. [3] Lefort V, Desper R, and Gascuel O. (2015) "FastME 2.0: a
+       comprehensive, accurate, and fast distance-based phylogeny inference
+       program." Molecular Biology and Evolution, 32(10), 2798-2800.
+
+    Examples
+    --------
+    >>> from skbio import DistanceMatrix
+    >>> from skbio.tree import bme
+    >>> dm = DistanceMatrix([[0, 3, 7, 6],
+    ...                      [3, 0, 8, 7],
+    ...                      [7, 8, 0, 5],
+    ...                      [6, 7, 5, 0]], ids=list('abcd'))
+    >>> tree = bme(dm)
+    >>> print(tree)
+    (a:1.0,b:2.0,(c:3.0,d:2.0):3.0);
+    <BLANKLINE>
+
+    """
+    if dm.shape[0] < 3:
+        raise ValueError(
+            "Distance matrix must be at least 3x3 to generate a minimum evolution tree."
+        )
+    me = _BalancedME(dm.data)
+    for k in range(3, dm.shape[0]):
+        me.insert(k)
+    if nni:
+        me.nni()
+    children, lengths = me.joins()
+    tree = _from_joins(children, lengths, dm.ids)
+    return tree if compact else tree.to_tree_node()
+
+
+class _BalancedME:
+    """A tree built by balanced minimum evolution.
+
+    The tree is rooted at the first OTU, and every other node stands for the
+    branch to its parent. The nodes are numbered in the order they are added:
+    the root 0, its child 1, OTUs 1 and 2 as 2 and 3, then OTU k as 2k - 2 and
+    the node inserted above it as 2k - 1.
+
+    `avg[a, b]` holds the average distance between the OTUs of the two
+    subtrees facing each other across branches a and b: below both if they
+    are not on one path to the root, and otherwise above the upper one and
+    below the lower one. `avg[a, a]` is the average distance between the two
+    sides of branch a. If a is an ancestor of b, `avg[b, a]` is not kept up to
+    date during insertions, but only `avg[a, b]`.
+
+    """
+
+    def __init__(self, data):
+        self.data = data = np.asarray(data, dtype=float)
+        n = data.shape[0]
+        size = 2 * n - 2
+        self.parent = np.full(size, -1, dtype=np.intp)
+        self.children = np.full((size, 2), -1, dtype=np.intp)
+        self.sibling = np.full(size, -1, dtype=np.intp)
+        self.depth = np.zeros(size, dtype=np.intp)
+        self.otu = np.full(size, -1, dtype=np.intp)
+        self.avg = np.zeros((size, size))
+        # powers of 1/2 by exponent, enough for any path between two nodes
+        self.half = np.ldexp(1.0, -np.arange(2 * size))
+        self.size = 4
+
+        self.parent[1:4] = 0, 1, 1
+        self.children[0, 0] = 1
+        self.children[1] = 2, 3
+        self.sibling[2:4] = 3, 2
+        self.depth[1:4] = 1, 2, 2
+        self.otu[[0, 2, 3]] = 0, 1, 2
+
+        d = data[:3, :3]
+        avg = self.avg
+        avg[2, 3] = avg[3, 2] = d[1, 2]
+        avg[1, 2] = avg[2, 1] = d[0, 1]
+        avg[1, 3] = avg[3, 1] = d[0, 2]
+        avg[1, 1] = (d[0, 1] + d[0, 2]) / 2
+        avg[2, 2] = (d[0, 1] + d[1, 2]) / 2
+        avg[3, 3] = (d[0, 2] + d[1, 2]) / 2
+
+    def insert(self, k):
+        """Add OTU k on the branch that lengthens the tree the least."""
+        m = self.size
+        parent, children, sibling = self.parent, self.children, self.sibling
+        depth, otu, avg = self.depth[:m], self.otu, self.avg
+        top = children[0, 0]
+        dist = self.data[k]
+
+        # the nodes below the root by depth, from the top down
+        order = np.argsort(depth, kind="stable")
+        bounds = np.cumsum(np.bincount(depth)).tolist()
+        levels = [order[i:j] for i, j in zip(bounds, bounds[1:])]
+
+        # average distances from OTU k to the OTUs below and above each node
+        tips = otu[:m] >= 0
+        below = np.where(tips, dist[otu[:m]], 0.0)
+        for nodes in reversed(levels):
+            nodes = nodes[~tips[nodes]]
+            below[nodes] = (below[children[nodes, 0]] + below[children[nodes, 1]]) / 2
+        above = np.empty(m)
+        above[top] = dist[0]
+        for nodes in levels[1:]:
+            above[nodes] = (above[parent[nodes]] + below[sibling[nodes]]) / 2
+
+        # lengthening of the tree by inserting OTU k on each branch
+        cost = below + above - avg.diagonal()[:m]
+        cost[0] = np.inf
+        z = int(cost.argmin())
+        y = parent[z]
+
+        # the ancestors of z below the root, from the top down
+        path = [z]
+        while path[-1] != top:
+            path.append(parent[path[-1]])
+        path = np.array(path[::-1], dtype=np.intp)
+        upper = path[:-1]
+        on_path = np.zeros(m, dtype=bool)
+        on_path[path] = True
+        # the depth of the lowest common ancestor of each node with z
+        shared = np.zeros(m, dtype=np.intp)
+        shared[top] = 1
+        for nodes in levels[1:]:
+            shared[nodes] = np.where(
+                on_path[nodes], depth[nodes], shared[parent[nodes]]
+            )
+        in_z = shared == depth[z]
+
+        # distances from the new OTU, and from the new node w above z
+        new = below.copy()
+        new[upper] = above[upper]
+        old = avg[z, :m].copy()
+        old[upper] = avg[upper, z]
+        diff = new - old
+        new_w = np.where(in_z, old, (old + new) / 2)
+
+        # Every average over a subtree split by the insertion gets a share
+        # of the change of the averages from z, halved at each node between
+        # the two branches.
+        steps = np.where(in_z, depth - 1 - depth[z], depth - 1 + depth[y] - 2 * shared)
+        steps[upper] = depth[y] - depth[upper]
+        weight = self.half[steps + 2]
+        weight[z] = 0.5
+        # pairs of a node and a descendant (or itself), except on the path
+        # above z, walking up from every node
+        off_path = ~on_path
+        off_path[z] = True
+        off_path[0] = False
+        node = lower = np.flatnonzero(off_path)
+        while lower.size:
+            avg[node, lower] += weight[node] * diff[lower]
+            node = parent[node]
+            keep = off_path[node]
+            node, lower = node[keep], lower[keep]
+        # the path above z, with the subtrees below each node excluded
+        level = np.arange(upper.size)
+        delta = weight[upper, None] * diff
+        delta[(shared > level[:, None]) & (np.arange(m) != upper[:, None])] = 0
+        avg[upper, :m] += delta
+        for a, values in zip(upper.tolist(), delta):
+            avg[:m, a] += values
+        avg[upper, upper] -= delta[level, upper]
+
+        w, x = m + 1, m
+        above_k = above[z]
+        avg[x, :m] = avg[:m, x] = new
+        avg[w, :m] = avg[:m, w] = new_w
+        avg[x, w] = avg[w, x] = above_k
+        avg[x, x] = (new[z] + above_k) / 2
+        avg[w, w] = (old[z] + above_k) / 2
+
+        # attach w in place of z, with z and OTU k as its children
+        row = children[y]
+        row[row == z] = w
+        parent[w], parent[x], parent[z] = y, w, w
+        children[w] = z, x
+        otu[x] = k
+        s = sibling[z]
+        sibling[w] = s
+        if s >= 0:
+            sibling[s] = w
+        sibling[z], sibling[x] = x, z
+        depth = self.depth
+        depth[w], depth[x] = depth[z], depth[z] + 1
+        depth[:m][in_z] += 1
+        self.size = m + 2
+
+    def _preorder(self):
+        """Return the nodes in preorder, and the end of each subtree in it."""
+        kids = self.children.tolist()
+        order, end = [], [0] * self.size
+        nodes_left = [0]
+        while nodes_left:
+            node = nodes_left.pop()
+            if node < 0:
+                end[~node] = len(order)
+                continue
+            order.append(node)
+            nodes_left.append(~node)
+            nodes_left.extend([x for x in reversed(kids[node]) if x >= 0])
+        return np.array(order), np.array(end)
+
+    def update(self):
+        """Compute the averages of the current tree from scratch."""
+        m = self.size
+        order, end = self._preorder()
+        pos = np.empty(m, dtype=np.intp)
+        pos[order] = np.arange(m)
+        children, otu = self.children, self.otu
+        tips = np.flatnonzero(otu[:m] >= 0)
+        inner = order[otu[order] < 0][::-1].tolist()
+
+        # Averages of the OTUs below all pairs of nodes, first for the tips
+        # against all nodes, then for the other nodes in postorder, correct
+        # between nodes not on one path to the root.
+        avg = self.avg
+        avg[:] = 0
+        to_tips = np.zeros((m, tips.size))
+        to_tips[tips] = self.data[np.ix_(otu[tips], otu[tips])]
+        for node in inner:
+            a, b = children[node]
+            to_tips[node] = (to_tips[a] + to_tips[b]) / 2
+        avg[tips, :m] = to_tips.T
+        for node in inner:
+            a, b = children[node]
+            avg[node] = (avg[a] + avg[b]) / 2
+
+        # averages above each node against its subtree, from the top down
+        parent, sibling = self.parent, self.sibling
+        top = children[0, 0]
+        for node in order[1:].tolist():
+            sub = order[pos[node] : end[node]]
+            if node == top:
+                values = avg[0, sub]
+            else:
+                values = (avg[parent[node], sub] + avg[sibling[node], sub]) / 2
+            avg[node, sub] = values
+            avg[sub, node] = values
+
+    def _branches(self):
+        """Return the lengths of the branches below all nodes."""
+        m = self.size
+        avg, parent, sibling, children = (
+            self.avg,
+            self.parent,
+            self.sibling,
+            self.children,
+        )
+        length = np.zeros(m)
+        top = children[0, 0]
+        # branches to the OTUs other than the root, and to the root
+        tips = np.flatnonzero(self.otu[1:m] >= 0) + 1
+        p, s = parent[tips], sibling[tips]
+        length[tips] = (avg[tips, s] + avg[p, tips] - avg[p, s]) / 2
+        a, b = children[top]
+        length[top] = (avg[top, a] + avg[top, b] - avg[a, b]) / 2
+        # branches between two nodes, with two subtrees at each end
+        inner = np.flatnonzero(self.otu[:m] < 0)
+        inner = inner[inner != top]
+        u, s = parent[inner], sibling[inner]
+        c1, c2 = children[inner, 0], children[inner, 1]
+        length[inner] = (avg[u, c1] + avg[u, c2] + avg[s, c1] + avg[s, c2]) / 4 - (
+            avg[u, s] + avg[c1, c2]
+        ) / 2
+        return length
+
+    def nni(self):
+        """Apply the NNIs that shorten the tree, in rounds."""
+        self.update()
+        length = self._branches().sum()
+        while swaps := self._improving_swaps():
+            saved = [x.copy() for x in (self.parent, self.children, self.sibling)]
+            for node, child in swaps:
+                self._swap(node, child)
+            self.update()
+            new = self._branches().sum()
+            if new >= length and len(swaps) > 1:
+                # The NNIs are independent, but their changes of length do
+                # not quite add up: fall back to the best one.
+                self._restore(saved)
+                self._swap(*swaps[0])
+                self.update()
+                new = self._branches().sum()
+            if new >= length:
+                # only possible by rounding errors
+                self._restore(saved)
+                self.update()
+                break
+            length = new
+
+    def _restore(self, saved):
+        for x, y in zip((self.parent, self.children, self.sibling), saved):
+            x[:] = y
+
+    def _improving_swaps(self):
+        """Find independent NNIs that shorten the tree, best first."""
+        m = self.size
+        avg, parent, sibling, children = (
+            self.avg,
+            self.parent,
+            self.sibling,
+            self.children,
+        )
+        inner = np.flatnonzero(self.otu[:m] < 0)
+        inner = inner[inner != children[0, 0]]
+        u, s = parent[inner], sibling[inner]
+        c1, c2 = children[inner, 0], children[inner, 1]
+        base = avg[u, s] + avg[c1, c2]
+        # four times the changes of length by swapping s with either child
+        gain1 = avg[u, c1] + avg[s, c2] - base
+        gain2 = avg[u, c2] + avg[s, c1] - base
+        second = gain2 < gain1
+        gain = np.where(second, gain2, gain1)
+        tolerance = 1e-12 * (np.abs(avg[u, s]) + np.abs(avg[c1, c2]))
+        found = np.flatnonzero(gain < -tolerance)
+        found = found[np.argsort(gain[found], kind="stable")]
+
+        swaps, used = [], np.zeros(m, dtype=bool)
+        for i in found.tolist():
+            node = inner[i]
+            near = [u[i], node, s[i], c1[i], c2[i], parent[u[i]]]
+            if used[near].any():
+                continue
+            used[near] = True
+            swaps.append((node, int(c2[i] if second[i] else c1[i])))
+        return swaps
+
+    def _swap(self, node, child):
+        """Swap the sibling of a node with one of its children."""
+        parent, children, sibling = self.parent, self.children, self.sibling
+        u, s = parent[node], sibling[node]
+        other = sibling[child]
+        row = children[u]
+        row[row == s] = child
+        row = children[node]
+        row[row == child] = s
+        parent[s], parent[child] = node, u
+        sibling[child], sibling[node] = node, child
+        sibling[s], sibling[other] = other, s
+
+    def joins(self):
+        """Return the tree as joins of nodes, rooted at the top node."""
+        m = self.size
+        n = self.data.shape[0]
+        length = self._branches()
+        order, _ = self._preorder()
+        # internal nodes in postorder, ending with the top node
+        inner = order[self.otu[order] < 0][::-1]
+        row = np.empty(m, dtype=np.intp)
+        row[inner] = n + np.arange(inner.size)
+        tips = self.otu[:m] >= 0
+        row[tips] = self.otu[:m][tips]
+
+        children = np.full((inner.size, 3), -1, dtype=np.intp)
+        children[:, :2] = self.children[inner]
+        children[-1] = 0, *self.children[inner[-1]]
+        lengths = np.where(children >= 0, length[children], 0.0)
+        lengths[-1, 0] = length[inner[-1]]
+        joined = children >= 0
+        children[joined] = row[children[joined]]
+        return children, lengths
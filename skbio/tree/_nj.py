@@ -10,13 +10,21 @@ import io
 
 import numpy as np
 
-from skbio.stats.distance import DistanceMatrix
 from skbio.tree import TreeNode
 from skbio.util._decorator import experimental
 
+# number of elements of the Q matrix computed at once by the full search
+_block_size = 1 << 16
+
 
 @experimental(as_of="0.4.0")
-def nj(dm, disallow_negative_branch_length=True, result_constructor=None):
+def nj(
+    dm,
+    disallow_negative_branch_length=True,
+    result_constructor=None,
+    method="nj",
+    rapid=False,
+):
     r"""Apply neighbor joining for phylogenetic reconstruction.
 
     Parameters
@@ -33,6 +41,21 @@ def nj(dm, disallow_negative_branch_length=True, result_constructor=None):
         newick-formatted string as input. The result of applying this function
         to a newick-formatted string will be returned from this function. This
         defaults to ``lambda x: TreeNode.read(StringIO(x), format='newick')``.
+    method : {'nj', 'bionj'}, optional
+        Algorithm for reducing the distance matrix after each join. ``'nj'``
+        (default) is the original neighbor joining. ``'bionj'`` weighs the
+        distances of the two joined nodes by their estimated variances [2]_.
+
+        .. versionadded:: 0.6.0
+
+    rapid : bool, optional
+        If `True`, find the pair of nodes to join by scanning the rows of the
+        distance matrix in sorted order and stopping at a lower bound of the Q
+        values [3]_. This finds the same pairs as the full search, usually
+        much faster for large matrices, at the cost of memory for a sorted
+        copy of the matrix.
+
+        .. versionadded:: 0.6.0
 
     Returns
     -------
@@ -40,6 +63,12 @@ def nj(dm, disallow_negative_branch_length=True, result_constructor=None):
         By default, the result object is a `TreeNode`, though this can be
         overridden by passing `result_constructor`.
 
+    Raises
+    ------
+    ValueError
+        If the distance matrix is smaller than 3x3, or `method` is not
+        supported.
+
     See Also
     --------
     TreeNode.root_at_midpoint
@@ -48,20 +77,32 @@ def nj(dm, disallow_negative_branch_length=True, result_constructor=None):
     -----
     Neighbor joining was initially described in Saitou and Nei (1987) [1]_. The
     example presented here is derived from the Wikipedia page on neighbor
-    joining [2]_. The Phylip manual also describes the method [3]_ and Phylip
+    joining [4]_. The Phylip manual also describes the method [5]_ and Phylip
     itself provides an implementation which is useful for comparison.
 
     Neighbor joining, by definition, creates unrooted trees. One strategy for
     rooting the resulting trees is midpoint rooting, which is accessible as
     ``TreeNode.root_at_midpoint``.
 
+    The distance matrix is reduced in place in a single copy of the input
+    data, with the row sums updated after each join, so that each of the
+    :math:`n - 3` joins takes :math:`O(n^2)` time for the full search of the Q
+    matrix and :math:`O(n)` time for the rest. If several pairs have the lowest
+    Q value, the one closest to the top-left of the matrix is joined, with
+    each new node listed before the remaining nodes.
+
     References
     ----------
     .. [1] Saitou N, and Nei M. (1987) "The neighbor-joining method: a new
        method for reconstructing phylogenetic trees." Molecular Biology and
        Evolution. PMID: 3447015.
-    .. [2] http://en.wikipedia.org/wiki/Neighbour_joining
-    .. [3] http://evolution.genetics.washington.edu/phylip/doc/neighbor.html
+    .. [2] Gascuel O. (1997) "BIONJ: an improved version of the NJ algorithm
+       based on a simple model of sequence data." Molecular Biology and
+       Evolution. PMID: 9254330.
+    .. [3] Simonsen M, Mailund T, and Pedersen CNS. (2008) "Rapid
+       neighbour-joining." In Algorithms in Bioinformatics (pp. 113-122).
+    .. [4] http://en.wikipedia.org/wiki/Neighbour_joining
+    .. [5] http://evolution.genetics.washington.edu/phylip/doc/neighbor.html
 
     Examples
     --------
@@ -106,183 +147,316 @@ def nj(dm, disallow_negative_branch_length=True, result_constructor=None):
     """
     if dm.shape[0] < 3:
         raise ValueError(
-            "Distance matrix must be at least 3x3 to "
-            "generate a neighbor joining tree."
+            "Distance matrix must be at least 3x3 to generate a neighbor joining tree."
         )
+    if method not in ("nj", "bionj"):
+        raise ValueError("Unsupported method: %r." % method)
 
     if result_constructor is None:
 
         def result_constructor(x):
             return TreeNode.read(io.StringIO(x), format="newick")
 
-    # initialize variables
-    node_definition = None
-
-    # while there are still more than three distances in the distance matrix,
-    # join neighboring nodes.
-    while dm.shape[0] > 3:
-        # compute the Q matrix
-        q = _compute_q(dm)
-
-        # identify the pair of nodes that have the lowest Q value. if multiple
-        # pairs have equally low Q values, the first pair identified (closest
-        # to the top-left of the matrix) will be chosen. these will be joined
-        # in the current node.
-        idx1, idx2 = _lowest_index(q)
-        pair_member_1 = dm.ids[idx1]
-        pair_member_2 = dm.ids[idx2]
-        # determine the distance of each node to the new node connecting them.
-        pair_member_1_len, pair_member_2_len = _pair_members_to_new_node(
-            dm, idx1, idx2, disallow_negative_branch_length
-        )
-        # define the new node in newick style
-        node_definition = "(%s:%f, %s:%f)" % (
-            pair_member_1,
-            pair_member_1_len,
-            pair_member_2,
-            pair_member_2_len,
-        )
-        # compute the new distance matrix, which will contain distances of all
-        # other nodes to this new node
-        dm = _compute_collapsed_dm(
-            dm,
-            pair_member_1,
-            pair_member_2,
-            disallow_negative_branch_length=disallow_negative_branch_length,
-            new_node_id=node_definition,
-        )
-
-    # When there are three distances left in the distance matrix, we have a
-    # fully defined tree. The last node is internal, and its distances are
-    # defined by these last three values.
-    # First determine the distance between the last two nodes to be joined in
-    # a pair...
-    pair_member_1 = dm.ids[1]
-    pair_member_2 = dm.ids[2]
-    pair_member_1_len, pair_member_2_len = _pair_members_to_new_node(
-        dm, pair_member_1, pair_member_2, disallow_negative_branch_length
-    )
-    # ...then determine their distance to the other remaining node, but first
-    # handle the trival case where the input dm was only 3 x 3
-    node_definition = node_definition or dm.ids[0]
-    internal_len = 0.5 * (
-        dm[pair_member_1, node_definition]
-        + dm[pair_member_2, node_definition]
-        - dm[pair_member_1, pair_member_2]
-    )
-    if disallow_negative_branch_length and internal_len < 0:
-        internal_len = 0
-
-    # ...and finally create the newick string describing the whole tree.
-    newick = "(%s:%f, %s:%f, %s:%f);" % (
-        pair_member_1,
-        pair_member_1_len,
-        node_definition,
-        internal_len,
-        pair_member_2,
-        pair_member_2_len,
+    children, lengths = _nj_joins(
+        dm.data,
+        bionj=method == "bionj",
+        rapid=rapid,
+        clip=disallow_negative_branch_length,
     )
+    return result_constructor(_to_newick(dm.ids, children, lengths))
 
-    # package the result as requested by the user and return it.
-    return result_constructor(newick)
 
+def _nj_joins(data, bionj=False, rapid=False, clip=True):
+    r"""Join the nodes of a distance matrix into a tree.
 
-def _compute_q(dm):
-    """Compute Q matrix, used to identify the next pair of nodes to join."""
-    q = np.zeros(dm.shape)
-    n = dm.shape[0]
-    big_sum = np.array([dm.data.sum(1)] * dm.shape[0])
-    big_sum_diffs = big_sum + big_sum.T
-    q = (n - 2) * dm.data - big_sum_diffs
-    np.fill_diagonal(q, 0)
-    return DistanceMatrix(q, dm.ids)
-
+    Parameters
+    ----------
+    data : (n, n) array_like of float
+        Distances between the tips.
+    bionj : bool, optional
+        Reduce the matrix with BIONJ instead of NJ.
+    rapid : bool, optional
+        Search for the pair to join in sorted rows.
+    clip : bool, optional
+        Replace negative branch lengths and distances with zero.
 
-def _compute_collapsed_dm(dm, i, j, disallow_negative_branch_length, new_node_id):
-    """Return the distance matrix resulting from joining ids i and j in a node.
+    Returns
+    -------
+    (n - 2, 3) ndarray of int
+        Children of each internal node, in the order of the joins. The tips are
+        numbered 0 to n - 1 and the internal nodes from n, in this order. The
+        last internal node, the root, has three children, and the others have
+        two, padded with -1.
+    (n - 2, 3) ndarray of float
+        Branch lengths of the children.
 
-    If the input distance matrix has shape ``(n, n)``, the result will have
-    shape ``(n-1, n-1)`` as the ids `i` and `j` are collapsed to a single new
-    ids.
+    Notes
+    -----
+    The active nodes are kept in the first rows and columns of a single copy
+    of the matrix. The new node of a join takes the upper of the rows of the
+    two joined nodes, and the last active row is moved into the lower one.
 
     """
-    in_n = dm.shape[0]
-    out_n = in_n - 1
-    out_ids = [new_node_id]
-    out_ids.extend([e for e in dm.ids if e not in (i, j)])
-    result = np.zeros((out_n, out_n))
-    # pre-populate the result array with known distances
-    ij_indexes = [dm.index(i), dm.index(j)]
-    result[1:, 1:] = np.delete(
-        np.delete(dm.data, ij_indexes, axis=0), ij_indexes, axis=1
-    )
-    # calculate the new distances from the current DistanceMatrix
-    k_to_u = 0.5 * (dm[i] + dm[j] - dm[i, j])
-    # set negative branches to 0 if specified
-    if disallow_negative_branch_length:
-        k_to_u[k_to_u < 0] = 0
-    # drop nodes being joined
-    k_to_u = np.delete(k_to_u, ij_indexes)
-    # assign the distances to the result array
-    result[0] = result[:, 0] = np.concatenate([[0], k_to_u])
-    return DistanceMatrix(result, out_ids)
-
-
-def _lowest_index(dm):
-    """Return the index of the lowest value in the input distance matrix.
-
-    If there are ties for the lowest value, the index of top-left most
-    occurrence of that value will be returned.
-
-    This should be ultimately be replaced with a new DistanceMatrix object
-    method (#228).
+    dm = np.array(data, dtype=float)
+    n = m = dm.shape[0]
+    rs = dm.sum(axis=1)
+    var = dm.copy() if bionj else None
+
+    # node in each row, and rank of each row in the order of the nodes used
+    # to break ties
+    node = np.arange(n)
+    rank = np.arange(n)
+    children = np.full((n - 2, 3), -1, dtype=np.intp)
+    lengths = np.zeros((n - 2, 3))
+    search = _RapidSearch(dm) if rapid else None
+
+    for t in range(n - 3):
+        if rapid:
+            pairs = search(rs, m)
+        else:
+            pairs = _full_search(dm, rs, m)
+        i, j = _tie_break(pairs, rank[:m])
+
+        dij = dm[i, j]
+        li = 0.5 * dij + (rs[i] - rs[j]) / (2 * (m - 2))
+        lj = dij - li
+        joined = node[[i, j]]
+        children[t, :2] = joined
+        lengths[t, :2] = _clip_lengths(li, dij, clip)
+
+        if bionj:
+            vij = var[i, j]
+            lam = 0.5
+            if vij > 0:
+                lam += (var[j, :m].sum() - var[i, :m].sum()) / (2 * (m - 2) * vij)
+                lam = min(max(lam, 0.0), 1.0)
+            new = lam * (dm[i, :m] - li) + (1 - lam) * (dm[j, :m] - lj)
+            newvar = lam * var[i, :m] + (1 - lam) * var[j, :m] - lam * (1 - lam) * vij
+        else:
+            new = 0.5 * (dm[i, :m] + dm[j, :m] - dij)
+        if clip:
+            np.maximum(new, 0.0, out=new)
+        new[[i, j]] = 0.0
+
+        rs[:m] += new - dm[i, :m] - dm[j, :m]
+        a, b = min(i, j), max(i, j)
+        _set_row(dm, a, new, m)
+        rs[a] = new.sum()
+        if bionj:
+            newvar[[i, j]] = 0.0
+            _set_row(var, a, newvar, m)
+
+        # move the last active row into the other row of the joined nodes
+        last = m - 1
+        if b != last:
+            _set_row(dm, b, dm[last, :m], m)
+            if bionj:
+                _set_row(var, b, var[last, :m], m)
+            rs[b] = rs[last]
+            node[b] = node[last]
+            rank[b] = rank[last]
+        m -= 1
+        node[a] = n + t
+        rank[a] = -t - 1
+        if rapid:
+            search.join(a, b, m, node, joined)
+
+    # the last three nodes are joined at the root, in the order of the nodes
+    k, i, j = np.argsort(rank[:3])
+    dij = dm[i, j]
+    li = 0.5 * dij + (dm[i, :3].sum() - dm[j, :3].sum()) / 2
+    lk = 0.5 * (dm[i, k] + dm[j, k] - dij)
+    if clip and lk < 0:
+        lk = 0
+    children[-1] = node[i], node[k], node[j]
+    li, lj = _clip_lengths(li, dij, clip)
+    lengths[-1] = li, lk, lj
+    return children, lengths
+
+
+def _to_newick(ids, children, lengths):
+    """Format the joins of neighbor joining as a newick string."""
+    n = len(ids)
+    tokens = []
+    stack = [n + len(children) - 1]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            tokens.append(item)
+        elif item < n:
+            tokens.append(str(ids[item]))
+        else:
+            row = item - n
+            tokens.append("(")
+            stack.append(")")
+            for k in range(2 if children[row, 2] < 0 else 3, 0, -1):
+                stack.append(":%f" % lengths[row, k - 1])
+                stack.append(int(children[row, k - 1]))
+                if k > 1:
+                    stack.append(", ")
+    tokens.append(";")
+    return "".join(tokens)
+
+
+def _tie_break(pairs, rank):
+    """Return the pair of rows closest to the top-left of the matrix.
+
+    The rows are sorted by `rank`, and ties of distance to the top-left are
+    broken by the lower row. The row listed later is returned first.
 
     """
-    # get the positions of the lowest value
-    results = np.vstack(np.where(dm.data == np.amin(dm.condensed_form()))).T
-    # select results in the bottom-left of the array
-    results = results[results[:, 0] > results[:, 1]]
-    # calculate the distances of the results to [0, 0]
-    res_distances = np.sqrt(results[:, 0] ** 2 + results[:, 1] ** 2)
-    # detect distance ties & return the point which would have
-    # been produced by the original function
-    if np.count_nonzero(res_distances == np.amin(res_distances)) > 1:
-        eqdistres = results[res_distances == np.amin(res_distances)]
-        res_coords = eqdistres[np.argmin([r[0] for r in eqdistres])]
+    if len(pairs) > 1:
+        pos = np.sort(rank).searchsorted(rank[pairs])
+        low, high = pos.min(axis=1), pos.max(axis=1)
+        key = high * high + low * low
+        ties = np.flatnonzero(key == key.min())
+        pairs = pairs[ties[np.argmin(high[ties])]]
     else:
-        res_coords = results[np.argmin(res_distances)]
+        pairs = pairs[0]
+    i, j = pairs
+    return (i, j) if rank[i] > rank[j] else (j, i)
 
-    return tuple([res_coords[0], res_coords[1]])
 
+def _clip_lengths(li, dij, clip):
+    """Return the lengths of two joined branches given one of them."""
+    if clip and li < 0:
+        li = 0
+    lj = dij - li
+    if clip and lj < 0:
+        lj = 0
+    return li, lj
 
-def _pair_members_to_new_node(dm, i, j, disallow_negative_branch_length):
-    """Return the distance between a new node and decendants of that new node.
 
-    Parameters
-    ----------
-    dm : skbio.DistanceMatrix
-        The input distance matrix.
-    i, j : str
-        Identifiers of entries in the distance matrix to be collapsed (i.e.,
-        the descendents of the new node, which is internally represented as
-        `u`).
-    disallow_negative_branch_length : bool
-        Neighbor joining can result in negative branch lengths, which don't
-        make sense in an evolutionary context. If `True`, negative branch
-        lengths will be returned as zero, a common strategy for handling this
-        issue that was proposed by the original developers of the algorithm.
+def _set_row(dm, i, values, m):
+    """Set a row and a column of the active part of a symmetric matrix."""
+    dm[i, :m] = values
+    dm[:m, i] = values
+    dm[i, i] = 0.0
 
-    """
-    n = dm.shape[0]
-    i_to_j = dm[i, j]
-    i_to_u = (0.5 * i_to_j) + ((dm[i].sum() - dm[j].sum()) / (2 * (n - 2)))
 
-    if disallow_negative_branch_length and i_to_u < 0:
-        i_to_u = 0
+def _full_search(dm, rs, m):
+    """Return the pairs of rows with the lowest Q value.
+
+    The Q matrix is computed in blocks of rows, below the diagonal only.
 
-    j_to_u = i_to_j - i_to_u
+    """
+    best, pairs = np.inf, []
+    step = max(_block_size // m, 1)
+    for lo in range(1, m, step):
+        hi = min(lo + step, m)
+        q = (m - 2) * dm[lo:hi, :hi] - (rs[lo:hi, None] + rs[:hi])
+        q[:, lo:][np.triu_indices(hi - lo)] = np.inf
+        qmin = q.min()
+        if qmin < best:
+            best, pairs = qmin, []
+        if qmin == best:
+            rows, cols = np.nonzero(q == qmin)
+            pairs.append(np.column_stack((rows + lo, cols)))
+    return np.concatenate(pairs)
+
+
+class _RapidSearch:
+    r"""Search for the pairs with the lowest Q value in sorted rows.
+
+    Each row keeps the distances to the nodes that existed when the node of the
+    row was created, sorted, so that every pair of active nodes is found in the
+    row of the newer node. The Q values of the few nodes with the largest row
+    sums are computed in full. As the row sums of the other nodes are at most
+    their maximum :math:`r_{max}`, :math:`(m - 2) d_{ij} - (r_i + r_{max})` is a
+    lower bound of the Q values in the rest of a row, and a row is scanned
+    until its bound exceeds the lowest Q value found so far.
 
-    if disallow_negative_branch_length and j_to_u < 0:
-        j_to_u = 0
+    """
 
-    return i_to_u, j_to_u
+    def __init__(self, dm):
+        n = dm.shape[0]
+        self.n = n
+        self.dists = np.empty_like(dm)
+        dtype = np.int32 if 2 * n < np.iinfo(np.int32).max else np.intp
+        self.ids = np.empty(dm.shape, dtype=dtype)
+        step = max(_block_size // n, 1)
+        for lo in range(0, n, step):
+            hi = min(lo + step, n)
+            data = dm[lo:hi].copy()
+            data[np.arange(hi - lo), np.arange(lo, hi)] = np.inf
+            order = data.argsort(axis=1, kind="stable")
+            self.dists[lo:hi] = np.take_along_axis(data, order, axis=1)
+            self.ids[lo:hi] = order
+        # first entry of each row that may be active
+        self.start = np.zeros(n, dtype=np.intp)
+        self.row = np.arange(2 * n - 2)
+        self.active = np.zeros(2 * n - 2, dtype=bool)
+        self.active[:n] = True
+        self.dm = dm
+
+    def __call__(self, rs, m):
+        dists, ids, row, active = self.dists, self.ids, self.row, self.active
+        start = self.start[:m]
+        last = self.n - 1
+
+        # skip inactive entries at the start of each row
+        rows = np.arange(m)
+        while rows.size:
+            idx = start[rows]
+            rows = rows[~active[ids[rows, idx]] & (dists[rows, idx] < np.inf)]
+            start[rows] += 1
+
+        scale = m - 2
+        k = min(m // 32 + 16, m)
+        heavy = np.argpartition(rs[:m], m - k)[m - k :]
+        q = scale * self.dm[heavy, :m] - (rs[heavy, None] + rs[:m])
+        q[np.arange(k), heavy] = np.inf
+        best = q.min()
+        hits, cols = np.nonzero(q == best)
+        pairs = [np.column_stack((heavy[hits], cols))]
+        light = np.ones(m, dtype=bool)
+        light[heavy] = False
+        rows = np.flatnonzero(light)
+        if rows.size:
+            top = rs[rows].max()
+        depth, width = 0, 8
+        while rows.size:
+            cols = start[rows, None] + np.arange(depth, depth + width)
+            np.minimum(cols, last, out=cols)
+            other = ids[rows[:, None], cols]
+            others = row[other]
+            q = scale * dists[rows[:, None], cols] - (rs[rows, None] + rs[others])
+            q[~active[other]] = np.inf
+            qmin = q.min()
+            if qmin < best:
+                best, pairs = qmin, []
+            if qmin == best:
+                hits, cols = np.nonzero(q == qmin)
+                pairs.append(np.column_stack((rows[hits], others[hits, cols])))
+            depth += width
+            width *= 2
+            bound = np.minimum(start[rows] + depth, last)
+            bound = scale * dists[rows, bound] - (rs[rows] + top)
+            rows = rows[bound <= best]
+        return np.concatenate(pairs)
+
+    def join(self, a, b, m, node, joined):
+        """Update the rows after joining two nodes into row `a`.
+
+        `m` is the new number of active rows, and row `b` has received the
+        former last row unless it was the last row itself.
+
+        """
+        dists, ids, row, active = self.dists, self.ids, self.row, self.active
+        active[joined] = False
+        if b < m:
+            dists[b] = dists[m]
+            ids[b] = ids[m]
+            self.start[b] = self.start[m]
+            row[node[b]] = b
+
+        new = node[a]
+        active[new] = True
+        row[new] = a
+        values = self.dm[a, :m].copy()
+        values[a] = np.inf
+        order = values.argsort(kind="stable")
+        dists[a, :m] = values[order]
+        dists[a, m:] = np.inf
+        ids[a, :m] = node[order]
+        self.start[a] = 0
@@ -0,0 +1,123 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import numpy as np
+
+from skbio.tree._compact import _ancestor_sums
+
+
+class TraversalPlan:
+    r"""Nodes of a tree in traversal orders, with its structure as arrays.
+
+    Parameters
+    ----------
+    root : TreeNode
+        Root of the tree.
+
+    Attributes
+    ----------
+    nodes : list of TreeNode
+        Nodes in preorder.
+    index : dict
+        Index of each node in `nodes`.
+    parent : ndarray of int
+        Index of the parent of each node, or -1 for the root.
+    size : ndarray of int
+        Number of nodes in the subtree of each node, which are those from its
+        index on, in preorder.
+    post : list of TreeNode
+        Nodes in postorder.
+    post_index : ndarray of int
+        Index of each node in `post`.
+    post_order : ndarray of int
+        Index in `nodes` of each node of `post`.
+    child, child_ptr : ndarray of int
+        The children of node `i`, in order, are
+        ``child[child_ptr[i] : child_ptr[i + 1]]``.
+    child_rank : ndarray of int
+        Index of each node in `child`, or -1 for the root.
+
+    Notes
+    -----
+    The nodes of a subtree are contiguous both in preorder and in postorder,
+    so that the traversals of any node are slices of the same two lists.
+
+    """
+
+    def __init__(self, root):
+        nodes, parent = [], []
+        stack = [(root, -1)]
+        while stack:
+            node, i = stack.pop()
+            parent.append(i)
+            i = len(nodes)
+            nodes.append(node)
+            if node.children:
+                stack.extend([(child, i) for child in reversed(node.children)])
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+
+        n = len(nodes)
+        size = [1] * n
+        for i in range(n - 1, 0, -1):
+            size[parent[i]] += size[i]
+        self.parent = parent = np.array(parent, dtype=np.intp)
+        self.size = size = np.array(size, dtype=np.intp)
+
+        # A node is preceded in postorder by its descendants, and by the nodes
+        # preceding it in preorder, except for its ancestors.
+        weights = np.ones(n, dtype=np.intp)
+        weights[0] = 0
+        depth = _ancestor_sums(parent, weights)
+        self.post_index = post_index = np.arange(n) - depth + size - 1
+        order = np.empty(n, dtype=np.intp)
+        order[post_index] = np.arange(n)
+        self.post_order = order
+        self.post = [nodes[i] for i in order.tolist()]
+
+        # the children are grouped by parent, and remain in preorder
+        self.child = np.argsort(parent[1:], kind="stable") + 1
+        self.child_ptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(np.bincount(parent[1:], minlength=n), out=self.child_ptr[1:])
+        self.child_rank = np.empty(n, dtype=np.intp)
+        self.child_rank[self.child] = np.arange(n - 1)
+        self.child_rank[0] = -1
+
+    def preorder(self, i, include_self=True):
+        """Return the nodes of a subtree in preorder."""
+        start = i if include_self else i + 1
+        return self.nodes[start : i + int(self.size[i])]
+
+    def postorder(self, i, include_self=True):
+        """Return the nodes of a subtree in postorder."""
+        end = int(self.post_index[i]) + 1
+        return self.post[end - int(self.size[i]) : end if include_self else end - 1]
+
+    def position(self, i):
+        """Return the position of a node among the children of its parent."""
+        return int(self.child_rank[i] - self.child_ptr[self.parent[i]])
+
+    def later_siblings(self, i):
+        """Return the siblings following a node."""
+        return self.child[self.child_rank[i] + 1 : self.child_ptr[self.parent[i] + 1]]
+
+    def id_order(self, i):
+        r"""Return the nodes of a subtree in the order of their IDs.
+
+        The IDs are those assigned by ``TreeNode.assign_ids``: the children of
+        each node are numbered in order, with the nodes in postorder, and the
+        root of the subtree is numbered last.
+
+        """
+        end = int(self.post_index[i]) + 1
+        parents = self.post_order[end - int(self.size[i]) : end]
+        start = self.child_ptr[parents]
+        count = self.child_ptr[parents + 1] - start
+        offset = np.repeat(start - np.cumsum(count) + count, count)
+        order = self.child[offset + np.arange(offset.size)]
+        return np.append(order, i)
@@ -9,7 +9,6 @@
 import warnings
 from operator import or_, itemgetter
 from copy import deepcopy
-from itertools import combinations
 from functools import reduce
 from collections import defaultdict
 
@@ -28,6 +27,12 @@ from ._exception import (
 )
 from skbio.util import RepresentationWarning
 from skbio.util._decorator import experimental, classonlymethod
+from skbio.util._misc import pause_gc
+from skbio.io.registry import _LazyIOMethod
+from ._lca import LCAIndex
+from ._plan import TraversalPlan
+from ._compact import CompactTree
+from ._compare import _pair_splits
 
 
 def distance_from_r(m1, m2):
@@ -78,10 +83,41 @@ class TreeNode(SkbioObject):
     children : list of TreeNode or None
         Connect this node to existing children
 
+    Notes
+    -----
+    The standard attributes of a node (`name`, `length`, `support`, `parent`,
+    `children` and `id`) are stored in ``__slots__``, and the lookup caches
+    (see `create_caches`) are only created on the root of a tree, when they
+    are needed. A node therefore takes a fraction of the memory of an object
+    with a per-instance dictionary. Other attributes can still be set on a
+    node, in which case a dictionary is created for it.
+
     """
 
     default_write_format = "newick"
-    _exclude_from_copy = set(["parent", "children", "_tip_cache", "_non_tip_cache"])
+    read = _LazyIOMethod("read")
+    write = _LazyIOMethod("write")
+    _exclude_from_copy = set(
+        [
+            "parent",
+            "children",
+            "_tip_cache",
+            "_non_tip_cache",
+            "_lca_index",
+            "_traversal_plan",
+        ]
+    )
+
+    _node_attrs = ("name", "length", "support", "parent", "children", "id")
+    __slots__ = _node_attrs + ("__dict__", "__weakref__")
+
+    # Defaults of the caches, which are only set on the root of a tree once
+    # they are created.
+    _tip_cache = {}
+    _non_tip_cache = {}
+    _registered_caches = frozenset()
+    _lca_index = None
+    _traversal_plan = None
 
     @experimental(as_of="0.4.0")
     def __init__(
@@ -91,9 +127,6 @@ class TreeNode(SkbioObject):
         self.length = length
         self.support = support
         self.parent = parent
-        self._tip_cache = {}
-        self._non_tip_cache = {}
-        self._registered_caches = set()
 
         self.children = []
         self.id = None
@@ -180,6 +213,10 @@ class TreeNode(SkbioObject):
         self.invalidate_caches()
         if node.parent is not None:
             node.parent.remove(node)
+        else:
+            # the lookups of a root no longer hold once it is part of another
+            # tree, and would be stale if it became a root again
+            node.invalidate_caches(attr=False)
         node.parent = self
         return node
 
@@ -391,27 +428,36 @@ class TreeNode(SkbioObject):
         <BLANKLINE>
 
         """
-        # build up the list of nodes to remove so the topology is not altered
-        # while traversing
-        nodes_to_remove = []
-        for node in self.traverse(include_self=False):
-            if len(node.children) == 1:
-                nodes_to_remove.append(node)
-
-        # clean up the single children nodes
-        for node in nodes_to_remove:
-            child = node.children[0]
-
-            if child.length is None or node.length is None:
-                child.length = child.length or node.length
-            else:
-                child.length += node.length
-
-            if node.parent is None:
+        # Each chain of nodes with a single child is replaced by its last node,
+        # which takes the sum of the branch lengths along the chain and moves
+        # after the other children of the parent of the chain. The children
+        # are relinked directly, in one pass, instead of through `append` and
+        # `remove`, which invalidate the caches of the whole tree every time.
+        for node in list(self.preorder()):
+            if node is not self and len(node.children) == 1:
                 continue
-
-            node.parent.append(child)
-            node.parent.remove(node)
+            if not any(len(child.children) == 1 for child in node.children):
+                continue
+            kept, moved = [], []
+            for child in node.children:
+                if len(child.children) != 1:
+                    kept.append(child)
+                    continue
+                length = child.length
+                while len(child.children) == 1:
+                    below = child.children[0]
+                    child.parent = None
+                    child.children = []
+                    child = below
+                    if child.length is None or length is None:
+                        length = child.length or length
+                    else:
+                        length = child.length + length
+                child.length = length
+                child.parent = node
+                moved.append(child)
+            node.children = kept + moved
+        self.invalidate_caches()
 
         # if a single descendent from the root, the root adopts the childs
         # properties. we can't "delete" the root as that would be deleting
@@ -419,9 +465,9 @@ class TreeNode(SkbioObject):
         if len(self.children) == 1:
             node_to_copy = self.children[0]
             efc = self._exclude_from_copy
-            for key in node_to_copy.__dict__:
+            for key, value in node_to_copy._attrs():
                 if key not in efc:
-                    self.__dict__[key] = deepcopy(node_to_copy.__dict__[key])
+                    setattr(self, key, deepcopy(value))
             self.remove(node_to_copy)
             self.extend(node_to_copy.children)
 
@@ -451,6 +497,14 @@ class TreeNode(SkbioObject):
         pop
         remove_deleted
 
+        Notes
+        -----
+        The tree is not copied as a whole. The tips to keep are found by name
+        in the tip cache of the tree if it has been created (see
+        `create_caches`), or else in a single pass over the tree, and only the
+        nodes left after pruning are copied, which takes time proportional to
+        their number once the tips are found.
+
         Examples
         --------
         >>> from skbio import TreeNode
@@ -461,27 +515,62 @@ class TreeNode(SkbioObject):
         <BLANKLINE>
 
         """
-        tcopy = self.deepcopy()
-        all_tips = {n.name for n in tcopy.tips()}
         ids = set(names)
 
+        # find the tips to keep, by name if the tips are cached
+        if self.parent is None and self._tip_cache:
+            all_tips = self._tip_cache
+            tips = [all_tips[name] for name in ids if name in all_tips]
+        else:
+            all_tips, tips = set(), []
+            stack = list(self.children)
+            while stack:
+                node = stack.pop()
+                if node.children:
+                    stack.extend(node.children)
+                else:
+                    all_tips.add(node.name)
+                    if node.name in ids:
+                        tips.append(node)
         if not ids.issubset(all_tips):
             raise ValueError("ids are not a subset of the tree.")
 
-        marked = set()
-        for tip in tcopy.tips():
-            if tip.name in ids:
-                marked.add(tip)
-                for anc in tip.ancestors():
-                    if anc in marked:
-                        break
+        # mark the ancestors of the tips, up to those already marked, counting
+        # the marked children of each node
+        kept = {id(self): 0}
+        for node in tips:
+            kept[id(node)] = 0
+            while (parent := node.parent) is not self and id(parent) not in kept:
+                kept[id(parent)] = 1
+                node = parent
+            kept[id(parent)] += 1
+
+        # Copy the marked nodes only, replacing each chain of nodes with a
+        # single marked child by its last node, as `prune` does.
+        tcopy = self._copy_node(self)
+        stack = [(self, tcopy)]
+        while stack:
+            node, parent = stack.pop()
+            children, moved = [], []
+            for child in node.children:
+                if id(child) not in kept:
+                    continue
+                length, chain = child.length, child
+                while kept[id(chain)] == 1:
+                    chain = next(x for x in chain.children if id(x) in kept)
+                    if chain.length is None or length is None:
+                        length = chain.length or length
                     else:
-                        marked.add(anc)
-
-        for node in list(tcopy.traverse()):
-            if node not in marked:
-                node.parent.remove(node)
-
+                        length = chain.length + length
+                new = self._copy_node(chain)
+                new.parent = parent
+                if chain is child:
+                    children.append(new)
+                else:
+                    new.length = length
+                    moved.append(new)
+                stack.append((chain, new))
+            parent.children = children + moved
         tcopy.prune()
 
         return tcopy
@@ -515,21 +604,7 @@ class TreeNode(SkbioObject):
         0
 
         """
-
-        def __copy_node(node_to_copy):
-            r"""Copy a node."""
-            # this is _possibly_ dangerous, we're assuming the node to copy is
-            # of the same class as self, and has the same exclusion criteria.
-            # however, it is potentially dangerous to mix TreeNode subclasses
-            # within a tree, so...
-            result = self.__class__()
-            efc = self._exclude_from_copy
-            for key in node_to_copy.__dict__:
-                if key not in efc:
-                    result.__dict__[key] = deepcopy(node_to_copy.__dict__[key])
-            return result
-
-        root = __copy_node(self)
+        root = self._copy_node(self)
         nodes_stack = [[root, self, len(self.children)]]
 
         while nodes_stack:
@@ -540,7 +615,7 @@ class TreeNode(SkbioObject):
             if unvisited_children:
                 top[2] -= 1
                 old_child = old_top_node.children[-unvisited_children]
-                new_child = __copy_node(old_child)
+                new_child = self._copy_node(old_child)
                 new_top_node.append(new_child)
                 nodes_stack.append([new_child, old_child, len(old_child.children)])
             else:  # no unvisited children
@@ -550,6 +625,25 @@ class TreeNode(SkbioObject):
     __copy__ = copy
     __deepcopy__ = deepcopy = copy
 
+    def _copy_node(self, node_to_copy):
+        r"""Copy a node, without its parent and children."""
+        # this is _possibly_ dangerous, we're assuming the node to copy is
+        # of the same class as self, and has the same exclusion criteria.
+        # however, it is potentially dangerous to mix TreeNode subclasses
+        # within a tree, so...
+        result = self.__class__()
+        efc = self._exclude_from_copy
+        for key, value in node_to_copy._attrs():
+            if key not in efc:
+                setattr(result, key, deepcopy(value))
+        return result
+
+    def _attrs(self):
+        r"""Return the names and values of the attributes of the node."""
+        attrs = [(key, getattr(self, key)) for key in self._node_attrs]
+        attrs.extend(self.__dict__.items())
+        return attrs
+
     @experimental(as_of="0.4.0")
     def unrooted_deepcopy(self, parent=None):
         r"""Walk the tree unrooted-style and returns a new copy.
@@ -1079,6 +1173,14 @@ class TreeNode(SkbioObject):
         tips
         non_tips
 
+        Notes
+        -----
+        Once the traversal plan of the tree has been created, e.g., by
+        `assign_ids`, `index_tree` or `to_array`, the nodes are read from it
+        instead of being found again. The plan is discarded when the tree is
+        modified (see `invalidate_caches`), and a traversal during which the
+        tree is modified goes on over the tree as modified.
+
         Examples
         --------
         >>> from skbio import TreeNode
@@ -1091,6 +1193,16 @@ class TreeNode(SkbioObject):
         b
 
         """
+        root = self.root()
+        plan = root._traversal_plan
+        if plan is not None:
+            for node in plan.preorder(plan.index[self], include_self):
+                yield node
+                if root._traversal_plan is not plan:
+                    yield from self._resume_preorder(plan, node)
+                    return
+            return
+
         stack = [self]
         while stack:
             curr = stack.pop()
@@ -1099,6 +1211,23 @@ class TreeNode(SkbioObject):
             if curr.children:
                 stack.extend(curr.children[::-1])
 
+    def _resume_preorder(self, plan, node):
+        r"""Resume a preorder traversal of self from a node of a stale plan."""
+        # The nodes left are the later siblings of the node and its ancestors,
+        # as they were when their parents were visited, then the descendants
+        # of the node, as they are now.
+        stack, i, top = [], plan.index[node], plan.index[self]
+        while i != top:
+            stack.append([plan.nodes[j] for j in plan.later_siblings(i)[::-1]])
+            i = plan.parent[i]
+        stack = [x for siblings in reversed(stack) for x in siblings]
+        stack.extend(node.children[::-1])
+        while stack:
+            curr = stack.pop()
+            yield curr
+            if curr.children:
+                stack.extend(curr.children[::-1])
+
     @experimental(as_of="0.4.0")
     def postorder(self, include_self=True):
         r"""Perform postorder iteration over tree.
@@ -1126,6 +1255,11 @@ class TreeNode(SkbioObject):
         tips
         non_tips
 
+        Notes
+        -----
+        As in `preorder`, the nodes are read from the traversal plan of the
+        tree if it has been created.
+
         Examples
         --------
         >>> from skbio import TreeNode
@@ -1138,10 +1272,47 @@ class TreeNode(SkbioObject):
         None
 
         """
-        child_index_stack = [0]
-        curr = self
-        curr_children = self.children
-        curr_children_len = len(curr_children)
+        root = self.root()
+        plan = root._traversal_plan
+        if plan is not None:
+            for node in plan.postorder(plan.index[self], include_self):
+                yield node
+                if root._traversal_plan is not plan:
+                    yield from self._resume_postorder(plan, node, include_self)
+                    return
+            return
+
+        yield from self._postorder(self, len(self.children), [0], include_self)
+
+    def _resume_postorder(self, plan, node, include_self):
+        r"""Resume a postorder traversal of self from a node of a stale plan."""
+        if node is self:
+            return
+        # the position of the node and its ancestors among their siblings
+        child_index_stack, i, top = [], plan.index[node], plan.index[self]
+        while i != top:
+            child_index_stack.append(plan.position(i))
+            i = plan.parent[i]
+        child_index_stack.reverse()
+        child_index_stack[-1] += 1
+        # A tip is visited from its parent, with the number of children the
+        # parent had then, whereas the traversal moves up from the current
+        # parent of an internal node.
+        i = plan.index[node]
+        if plan.child_ptr[i] == plan.child_ptr[i + 1]:
+            i = plan.parent[i]
+            curr = plan.nodes[i]
+            curr_children_len = int(plan.child_ptr[i + 1] - plan.child_ptr[i])
+        else:
+            curr = node.parent
+            curr_children_len = len(curr.children)
+        yield from self._postorder(
+            curr, curr_children_len, child_index_stack, include_self
+        )
+
+    def _postorder(self, curr, curr_children_len, child_index_stack, include_self):
+        r"""Perform postorder iteration over self from a node."""
+        curr_children = curr.children
         while 1:
             curr_index = child_index_stack[-1]
             # if there are children left, process them
@@ -1284,9 +1455,10 @@ class TreeNode(SkbioObject):
         e
 
         """
+        # the queue grows while it is read, instead of popping its first node,
+        # which takes linear time
         queue = [self]
-        while queue:
-            curr = queue.pop(0)
+        for curr in queue:
             if include_self or (curr is not self):
                 yield curr
             if curr.children:
@@ -1392,12 +1564,28 @@ class TreeNode(SkbioObject):
         cache_attr
         find
 
+        Notes
+        -----
+        The lookup caches include the nodes found by name (see
+        `create_caches`), the index of lowest common ancestors, and the
+        traversal plan of the tree, i.e., its nodes in preorder and postorder
+        and their structure as arrays, which are reused by the traversals and
+        by methods such as `index_tree`. They are invalidated by the methods
+        that modify the tree, such as `append` and `remove`. They must be
+        invalidated with this method if the `children` or `parent` of a node
+        are modified directly.
+
         """
         if not self.is_root():
             self.root().invalidate_caches()
         else:
-            self._tip_cache = {}
-            self._non_tip_cache = {}
+            if self._tip_cache or self._non_tip_cache:
+                self._tip_cache = {}
+                self._non_tip_cache = {}
+            if self._lca_index is not None:
+                self._lca_index = None
+            if self._traversal_plan is not None:
+                self._traversal_plan = None
 
             if self._registered_caches and attr:
                 for n in self.traverse():
@@ -1431,7 +1619,9 @@ class TreeNode(SkbioObject):
         if not self.is_root():
             self.root().create_caches()
         else:
-            if self._tip_cache and self._non_tip_cache:
+            # Either cache is only empty if no node of the other kind has a
+            # name, e.g., the internal nodes of many trees.
+            if self._tip_cache or self._non_tip_cache:
                 return
 
             self.invalidate_caches(attr=False)
@@ -1863,6 +2053,151 @@ class TreeNode(SkbioObject):
 
     lca = lowest_common_ancestor  # for convenience
 
+    def _get_traversal_plan(self):
+        r"""Return the traversal plan of the tree, creating it, and self's index.
+
+        The plan is kept by the root until the tree is modified, so that the
+        nodes are found once for all the traversals and the algorithms that
+        need the structure of the tree as arrays.
+
+        """
+        root = self.root()
+        if root._traversal_plan is None:
+            root._traversal_plan = TraversalPlan(root)
+        plan = root._traversal_plan
+        return plan, plan.index[self]
+
+    def _get_lca_index(self):
+        r"""Return the nodes of the tree and their LCA index, creating it."""
+        root = self.root()
+        if root._lca_index is None:
+            plan = root._get_traversal_plan()[0]
+            root.create_caches()
+            nodes, node_index = plan.nodes, plan.index
+            # nodes are looked up by name as by `find`
+            name_index = {
+                name: node_index[nodes_[0]]
+                for name, nodes_ in root._non_tip_cache.items()
+            }
+            name_index.update(
+                (name, node_index[node]) for name, node in root._tip_cache.items()
+            )
+            length = [np.nan if node.length is None else node.length for node in nodes]
+            root._lca_index = (
+                nodes,
+                node_index,
+                name_index,
+                LCAIndex(plan.parent, length),
+            )
+        return root._lca_index
+
+    def _pair_indices(self, pairs):
+        r"""Return the indices of pairs of nodes in the LCA index."""
+        nodes, node_index, name_index, index = self._get_lca_index()
+        u, v = [], []
+        for pair in pairs:
+            first, second = pair
+            for node, indices in (first, u), (second, v):
+                i = name_index.get(node) if not isinstance(node, TreeNode) else None
+                if i is None:
+                    i = node_index.get(node)
+                    if i is None:
+                        raise MissingNodeError("Node %s is not in self" % node)
+                indices.append(i)
+        return nodes, index, u, v
+
+    @experimental(as_of="0.6.0")
+    def lowest_common_ancestors(self, pairs):
+        r"""Find the lowest common ancestors of many pairs of nodes.
+
+        Parameters
+        ----------
+        pairs : iterable of pairs of TreeNode or str
+            The pairs of nodes, or of names of nodes, of interest. A name
+            refers to the same node as in `find`.
+
+        Returns
+        -------
+        list of TreeNode
+            The lowest common ancestor of each pair.
+
+        Raises
+        ------
+        MissingNodeError
+            If a node is not in the tree.
+
+        See Also
+        --------
+        lowest_common_ancestor
+        patristic_distances
+
+        Notes
+        -----
+        The first call indexes the whole tree in :math:`O(n \log n)` time,
+        after which each pair takes constant time. The index is stored on the
+        root of the tree, and is deleted by `invalidate_caches`, which is
+        called whenever nodes are added or removed. It must be called
+        explicitly if branch lengths are modified.
+
+        Examples
+        --------
+        >>> from skbio import TreeNode
+        >>> tree = TreeNode.read(["((a,b)c,(d,e)f)root;"])
+        >>> lcas = tree.lowest_common_ancestors([('a', 'b'), ('a', 'e'),
+        ...                                      ('d', 'f')])
+        >>> [node.name for node in lcas]
+        ['c', 'root', 'f']
+
+        """
+        nodes, index, u, v = self._pair_indices(pairs)
+        return [nodes[i] for i in index.lca(u, v).tolist()]
+
+    @experimental(as_of="0.6.0")
+    def patristic_distances(self, pairs):
+        r"""Return the distances between many pairs of nodes.
+
+        Parameters
+        ----------
+        pairs : iterable of pairs of TreeNode or str
+            The pairs of nodes, or of names of nodes, of interest. A name
+            refers to the same node as in `find`.
+
+        Returns
+        -------
+        ndarray of float
+            The sum of the branch lengths on the path between the nodes of
+            each pair.
+
+        Raises
+        ------
+        MissingNodeError
+            If a node is not in the tree.
+        NoLengthError
+            If a node on a path, other than the lowest common ancestor of its
+            pair, has no length.
+
+        See Also
+        --------
+        distance
+        lowest_common_ancestors
+
+        Notes
+        -----
+        The distances are computed from the distances of the nodes from the
+        root and the lowest common ancestors of the pairs, using the same
+        index as `lowest_common_ancestors`.
+
+        Examples
+        --------
+        >>> from skbio import TreeNode
+        >>> tree = TreeNode.read(["((a:1,b:2)c:3,(d:4,e:5)f:6)root;"])
+        >>> tree.patristic_distances([('a', 'b'), ('a', 'd'), ('c', 'e')])
+        array([  3.,  14.,  14.])
+
+        """
+        _, index, u, v = self._pair_indices(pairs)
+        return index.distance(u, v)
+
     @classonlymethod
     @experimental(as_of="0.4.0")
     def from_taxonomy(cls, lineage_map):
@@ -2175,8 +2510,7 @@ class TreeNode(SkbioObject):
         n = self.id + 1  # assign_ids starts at 0
         tmp = [np.zeros(n, dtype=dtype) for attr, dtype in attrs]
 
-        for node in self.traverse(include_self=True):
-            n_id = node.id
+        for n_id, node in id_index.items():
             for idx, (attr, dtype) in enumerate(attrs):
                 tmp[idx][n_id] = getattr(node, attr)
 
@@ -2379,22 +2713,29 @@ class TreeNode(SkbioObject):
         """
         maxkey = itemgetter(0)
 
-        for n in self.postorder():
-            if n.is_tip():
-                n.MaxDistTips = ((0.0, n), (0.0, n))
-            else:
-                if len(n.children) == 1:
-                    raise TreeError("No support for single descedent nodes")
+        # every node keeps the tips found, which would trigger collections
+        with pause_gc():
+            for n in self.postorder():
+                if n.is_tip():
+                    n.MaxDistTips = ((0.0, n), (0.0, n))
                 else:
-                    tip_info = [(max(c.MaxDistTips, key=maxkey), c) for c in n.children]
-
-                    dists = [i[0][0] for i in tip_info]
-                    best_idx = np.argsort(dists)[-2:]
-                    (tip_a_d, tip_a), child_a = tip_info[best_idx[0]]
-                    (tip_b_d, tip_b), child_b = tip_info[best_idx[1]]
-                    tip_a_d += child_a.length or 0.0
-                    tip_b_d += child_b.length or 0.0
-                n.MaxDistTips = ((tip_a_d, tip_a), (tip_b_d, tip_b))
+                    if len(n.children) == 1:
+                        raise TreeError("No support for single descedent nodes")
+                    else:
+                        tip_info = [
+                            (max(c.MaxDistTips, key=maxkey), c) for c in n.children
+                        ]
+
+                        dists = [i[0][0] for i in tip_info]
+                        # the two farthest children, the last ones if tied, found
+                        # without the overhead of a NumPy sort at every node
+                        best_idx = sorted(range(len(dists)), key=dists.__getitem__)
+                        best_idx = best_idx[-2:]
+                        (tip_a_d, tip_a), child_a = tip_info[best_idx[0]]
+                        (tip_b_d, tip_b), child_b = tip_info[best_idx[1]]
+                        tip_a_d += child_a.length or 0.0
+                        tip_b_d += child_b.length or 0.0
+                    n.MaxDistTips = ((tip_a_d, tip_a), (tip_b_d, tip_b))
 
     def _get_max_distance_singledesc(self):
         """Return the max distance between any pair of tips.
@@ -2460,7 +2801,7 @@ class TreeNode(SkbioObject):
         return longest, tips
 
     @experimental(as_of="0.4.0")
-    def tip_tip_distances(self, endpoints=None):
+    def tip_tip_distances(self, endpoints=None, out=None):
         """Return distance matrix between pairs of tips, and a tip order.
 
         By default, all pairwise distances are calculated in the tree. If
@@ -2471,16 +2812,28 @@ class TreeNode(SkbioObject):
         ----------
         endpoints : list of TreeNode or str, or None
             A list of TreeNode objects or names of TreeNode objects
+        out : ndarray, optional
+            A one-dimensional float array of length ``n * (n - 1) / 2``, where
+            ``n`` is the number of tips (or `endpoints`), in which to write the
+            distances in condensed form (see
+            ``scipy.spatial.distance.squareform``). This can be a
+            ``numpy.memmap`` to compute distances between more tips than fit
+            in memory. If provided, `out` is returned instead of a
+            ``DistanceMatrix``.
+
+            .. versionadded:: 0.6.0
 
         Returns
         -------
-        DistanceMatrix
-            The distance matrix
+        DistanceMatrix or ndarray
+            The distance matrix, or `out` if provided. Tips are in the order of
+            `endpoints` if specified, or in the order of `tips` otherwise.
 
         Raises
         ------
         ValueError
-            If any of the specified `endpoints` are not tips
+            If any of the specified `endpoints` are not tips, or if `out` does
+            not have the required shape
 
         See Also
         --------
@@ -2492,6 +2845,12 @@ class TreeNode(SkbioObject):
         If a node does not have an associated length, 0.0 will be used and a
         ``RepresentationWarning`` will be raised.
 
+        The distance between two tips is the sum of their distances from this
+        node minus twice the distance of their lowest common ancestor. The
+        tips descending from each node are contiguous in postorder, so the
+        distances between the tips of different children of a node are
+        computed as a block at once.
+
         Examples
         --------
         >>> from skbio import TreeNode
@@ -2507,6 +2866,12 @@ class TreeNode(SkbioObject):
          [ 14.  15.   0.   9.]
          [ 15.  16.   9.   0.]]
 
+        Write the distances between some of the tips in condensed form:
+
+        >>> import numpy as np
+        >>> tree.tip_tip_distances(['e', 'a', 'b'], out=np.empty(3))
+        array([ 15.,  16.,   3.])
+
         """
         all_tips = list(self.tips())
         if endpoints is None:
@@ -2517,58 +2882,91 @@ class TreeNode(SkbioObject):
                 if not n.is_tip():
                     raise ValueError("Node with name '%s' is not a tip." % n.name)
 
-        # linearize all tips in postorder
-        # .__start, .__stop compose the slice in tip_order.
-        for i, node in enumerate(all_tips):
-            node.__start, node.__stop = i, i + 1
-
-        # the result map provides index in the result matrix
-        result_map = {n.__start: i for i, n in enumerate(tip_order)}
-        num_all_tips = len(all_tips)  # total number of tips
-        num_tips = len(tip_order)  # total number of tips in result
-        result = np.zeros((num_tips, num_tips), float)  # tip by tip matrix
-        distances = np.zeros((num_all_tips), float)  # dist from tip to tip
-
-        def update_result():
-            # set tip_tip distance between tips of different child
-            for child1, child2 in combinations(node.children, 2):
-                for tip1 in range(child1.__start, child1.__stop):
-                    if tip1 not in result_map:
-                        continue
-                    t1idx = result_map[tip1]
-                    for tip2 in range(child2.__start, child2.__stop):
-                        if tip2 not in result_map:
-                            continue
-                        t2idx = result_map[tip2]
-                        result[t1idx, t2idx] = distances[tip1] + distances[tip2]
+        num_tips = len(tip_order)
+        if out is not None and out.shape != (num_tips * (num_tips - 1) // 2,):
+            raise ValueError(
+                "`out` must be a one-dimensional array of length %d, not of "
+                "shape %r." % (num_tips * (num_tips - 1) // 2, out.shape)
+            )
 
+        # distance of each node from self
+        dists = {self: 0.0}
+        for node in self.preorder(include_self=False):
+            length = node.length
+            if length is None:
+                warnings.warn(
+                    "`TreeNode.tip_tip_distances`: Node with name %r does "
+                    "not have an associated length, so a length of 0.0 "
+                    "will be used." % node.name,
+                    RepresentationWarning,
+                )
+                length = 0.0
+            dists[node] = dists[node.parent] + length
+
+        # Number the tips in postorder, so that the tips descending from each
+        # node are a range. For each node with more than one child, record
+        # where the ranges of its children start, followed by where the last
+        # one ends.
+        tip_index = {tip: i for i, tip in enumerate(all_tips)}
+        starts, stops = {}, {}
+        bounds, sizes, node_dists = [], [], []
         for node in self.postorder():
-            if not node.children:
+            children = node.children
+            if not children:
+                starts[node] = tip_index.get(node, 0)
+                stops[node] = starts[node] + 1
                 continue
-            # subtree with solved child wedges
-            # can possibly use np.zeros
-            starts, stops = [], []  # to calc ._start and ._stop for curr node
-            for child in node.children:
-                length = child.length
-                if length is None:
-                    warnings.warn(
-                        "`TreeNode.tip_tip_distances`: Node with name %r does "
-                        "not have an associated length, so a length of 0.0 "
-                        "will be used." % child.name,
-                        RepresentationWarning,
-                    )
-                    length = 0.0
-                distances[child.__start : child.__stop] += length
-
-                starts.append(child.__start)
-                stops.append(child.__stop)
-
-            node.__start, node.__stop = min(starts), max(stops)
-
-            if len(node.children) > 1:
-                update_result()
-
-        return DistanceMatrix(result + result.T, [n.name for n in tip_order])
+            starts[node] = starts[children[0]]
+            stops[node] = stops[children[-1]]
+            if len(children) > 1:
+                bounds.extend([starts[child] for child in children])
+                bounds.append(stops[node])
+                sizes.append(len(children) + 1)
+                node_dists.append(dists[node])
+
+        # Only the requested tips are used, sorted in postorder, and the
+        # ranges are converted to ranges of requested tips.
+        positions = np.array([tip_index[tip] for tip in tip_order], dtype=int)
+        order = np.argsort(positions, kind="stable")
+        positions = positions[order]
+        tip_dists = np.array([dists[tip] for tip in all_tips])[positions]
+        bounds = np.searchsorted(positions, np.array(bounds, dtype=int)).tolist()
+
+        if out is None:
+            result = np.zeros((num_tips, num_tips))
+        elif np.any(positions[1:] == positions[:-1]):
+            # the distances between repeated tips are not computed
+            out[:] = 0.0
+
+        offset = 0
+        for size, node_dist in zip(sizes, node_dists):
+            bound = bounds[offset : offset + size]
+            offset += size
+            end = bound[-1]
+            for i in range(len(bound) - 2):
+                # the tips of a child and those of the children after it
+                first, second = bound[i], bound[i + 1]
+                if first == second or second == end:
+                    continue
+                block = np.add.outer(
+                    tip_dists[first:second] - node_dist,
+                    tip_dists[second:end] - node_dist,
+                )
+                if out is None:
+                    result[first:second, second:end] = block
+                    result[second:end, first:second] = block.T
+                else:
+                    rows = order[first:second, None]
+                    cols = order[None, second:end]
+                    lo, hi = np.minimum(rows, cols), np.maximum(rows, cols)
+                    out[lo * num_tips - lo * (lo + 1) // 2 + hi - lo - 1] = block
+
+        if out is not None:
+            return out
+        if endpoints is not None:
+            index = np.argsort(order)
+            result = result[np.ix_(index, index)]
+        return DistanceMatrix(result, [n.name for n in tip_order])
 
     @experimental(as_of="0.4.0")
     def compare_rfd(self, other, proportion=False):
@@ -2594,7 +2992,8 @@ class TreeNode(SkbioObject):
         Raises
         ------
         ValueError
-            If the tip names between `self` and `other` are equal.
+            If neither the tip names of `self` nor those of `other` are a
+            subset of those of the other tree.
 
         See Also
         --------
@@ -2615,26 +3014,25 @@ class TreeNode(SkbioObject):
         2.0
 
         """
-        t1names = {n.name for n in self.tips()}
-        t2names = {n.name for n in other.tips()}
+        tree1 = CompactTree.from_tree_node(self)
+        tree2 = CompactTree.from_tree_node(other)
+        t1names = set(tree1.name[tree1.is_tip].tolist())
+        t2names = set(tree2.name[tree2.is_tip].tolist())
 
-        if t1names != t2names:
-            if t1names < t2names:
-                tree1 = self
-                tree2 = other.shear(t1names)
-            else:
-                tree1 = self.shear(t2names)
-                tree2 = other
-        else:
-            tree1 = self
-            tree2 = other
-
-        tree1_sets = tree1.subsets()
-        tree2_sets = tree2.subsets()
+        # The smaller tree's tips must all be in the other tree, which is
+        # compared as if it was sheared to them.
+        if not (t1names <= t2names or t2names <= t1names):
+            raise ValueError("The tips of one tree must be a subset of the other's.")
 
-        not_in_both = tree1_sets.symmetric_difference(tree2_sets)
+        tree1_sets, tree2_sets = _pair_splits(
+            tree1,
+            tree2,
+            t1names & t2names,
+            rooted=True,
+            include_all=t1names == t2names,
+        )
 
-        dist = float(len(not_in_both))
+        dist = float(len(np.setxor1d(tree1_sets, tree2_sets, assume_unique=True)))
 
         if proportion:
             total_subsets = len(tree1_sets) + len(tree2_sets)
@@ -2676,17 +3074,22 @@ class TreeNode(SkbioObject):
         0.5
 
         """
-        self_sets, other_sets = self.subsets(), other.subsets()
-
+        tree1 = CompactTree.from_tree_node(self)
+        tree2 = CompactTree.from_tree_node(other)
+        self_names = set(tree1.name[tree1.is_tip].tolist())
+        other_names = set(tree2.name[tree2.is_tip].tolist())
         if exclude_absent_taxa:
-            in_both = self.subset() & other.subset()
-            self_sets = (i & in_both for i in self_sets)
-            self_sets = frozenset({i for i in self_sets if len(i) > 1})
-            other_sets = (i & in_both for i in other_sets)
-            other_sets = frozenset({i for i in other_sets if len(i) > 1})
+            taxa = self_names & other_names
+        else:
+            taxa = self_names | other_names
+        self_sets, other_sets = _pair_splits(
+            tree1, tree2, taxa, rooted=True, include_all=True
+        )
 
         total_subsets = len(self_sets) + len(other_sets)
-        intersection_length = len(self_sets & other_sets)
+        intersection_length = len(
+            np.intersect1d(self_sets, other_sets, assume_unique=True)
+        )
 
         if not total_subsets:  # no common subsets after filtering, so max dist
             return 1
@@ -2859,27 +3262,32 @@ class TreeNode(SkbioObject):
             ID.
 
         """
-        self.assign_ids()
-
+        plan, i = self._get_traversal_plan()
+        order = plan.id_order(i)
+        nodes = plan.nodes
         id_index = {}
-        child_index = []
-
-        for n in self.postorder():
-            for c in n.children:
-                id_index[c.id] = c
-
-                if c:
-                    # c has children itself, so need to add to result
-                    child_index.append((c.id, c.children[0].id, c.children[-1].id))
-
-        # handle root, which should be t itself
-        id_index[self.id] = self
+        for id_, j in enumerate(order.tolist()):
+            node = nodes[j]
+            node.id = id_
+            id_index[id_] = node
 
         # only want to add to the child_index if self has children...
-        if self.children:
-            child_index.append((self.id, self.children[0].id, self.children[-1].id))
-        child_index = np.asarray(child_index, dtype=np.int64)
-        child_index = np.atleast_2d(child_index)
+        if not self.children:
+            return id_index, np.atleast_2d(np.asarray([], dtype=np.int64))
+
+        # the internal nodes, in the order of their IDs, with the IDs of their
+        # first and last children
+        ids = np.empty(order.size, dtype=np.int64)
+        ids[order - i] = np.arange(order.size)
+        ptr, child = plan.child_ptr, plan.child
+        internal = order[ptr[order + 1] > ptr[order]]
+        child_index = np.column_stack(
+            [
+                ids[internal - i],
+                ids[child[ptr[internal]] - i],
+                ids[child[ptr[internal + 1] - 1] - i],
+            ]
+        )
 
         return id_index, child_index
 
@@ -2890,13 +3298,10 @@ class TreeNode(SkbioObject):
         Following the call, all nodes in the tree will have their id
         attribute set.
         """
-        curr_index = 0
-        for n in self.postorder():
-            for c in n.children:
-                c.id = curr_index
-                curr_index += 1
-
-        self.id = curr_index
+        plan, i = self._get_traversal_plan()
+        nodes = plan.nodes
+        for id_, j in enumerate(plan.id_order(i).tolist()):
+            nodes[j].id = id_
 
     @experimental(as_of="0.4.0")
     def descending_branch_length(self, tip_subset=None):
@@ -3029,9 +3434,10 @@ class TreeNode(SkbioObject):
         else:
             raise TypeError("Only list, set and frozenset are supported.")
 
-        for node in self.postorder(include_self=True):
-            node._registered_caches.add(cache_attrname)
+        root = self.root()
+        root._registered_caches = root._registered_caches | {cache_attrname}
 
+        for node in self.postorder(include_self=True):
             cached = [getattr(c, cache_attrname) for c in node.children]
             cached.append(cache_type(func(node)))
             setattr(node, cache_attrname, reduce(reduce_f, cached))
@@ -3336,6 +3742,11 @@ class TreeNode(SkbioObject):
         may be provided as a dictionary. If ``names`` is omitted, taxonomy IDs
         be used as taxon names.
 
+        Nodes whose parent is not in ``nodes`` are left out, along with their
+        descendants. The full NCBI taxonomy, with millions of taxa, can be
+        loaded repeatedly in much less time if the files are read with the
+        ``cache`` parameter of the ``taxdump`` format.
+
         Raises
         ------
         ValueError
@@ -3370,58 +3781,60 @@ class TreeNode(SkbioObject):
                   \-Archaea
 
         """
+        ids = nodes.index.to_numpy()
+        parents = nodes["parent_tax_id"].to_numpy()
+
         # identify top level of hierarchy
-        tops = nodes[nodes["parent_tax_id"] == nodes.index]
+        tops = np.flatnonzero(parents == ids)
 
         # validate root uniqueness
-        n_top = tops.shape[0]
+        n_top = tops.size
         if n_top == 0:
             raise ValueError("There is no top-level node.")
         elif n_top > 1:
             raise ValueError("There are more than one top-level node.")
-
-        # get root taxid
-        root_id = tops.index[0]
-
-        # get parent-to-child(ren) map
-        to_children = {
-            p: g.index.tolist()
-            for p, g in nodes[nodes.index != root_id].groupby("parent_tax_id")
-        }
-
-        # get rank map
-        ranks = nodes["rank"].to_dict()
+        root = tops[0]
+
+        # Group nodes by the position of their parent, keeping the input order
+        # within each group. The children of the node at position i are then
+        # at positions order[bounds[i]:bounds[i + 1]]. Nodes whose parent is
+        # missing are left out.
+        positions = pd.Index(ids).get_indexer(parents)
+        positions[root] = -1
+        order = np.flatnonzero(positions >= 0)
+        order = order[np.argsort(positions[order], kind="stable")]
+        bounds = np.searchsorted(positions[order], np.arange(ids.size + 1)).tolist()
+        order = order.tolist()
+
+        ids = ids.tolist()
+        ranks = nodes["rank"].tolist()
 
         # get taxon-to-name map
         # if not provided, use tax_id as name
         if names is None:
-            names = {x: str(x) for x in nodes.index}
+            names = {x: str(x) for x in ids}
 
         # use "scientific name" as name
         elif isinstance(names, pd.DataFrame):
-            names = names[names["name_class"] == "scientific name"][
-                "name_txt"
-            ].to_dict()
+            names = names[names["name_class"] == "scientific name"]["name_txt"]
+            names = dict(zip(names.index.tolist(), names.tolist()))
 
         # initiate tree
-        tree = cls(names[root_id])
-        tree.id = root_id
-        tree.rank = ranks[root_id]
-
-        # helper for extending tree
-        def _extend_tree(node):
-            self_id = node.id
-            if self_id not in to_children:
-                return
-            children = []
-            for id_ in to_children[self_id]:
-                child = TreeNode(names[id_])
-                child.id = id_
-                child.rank = ranks[id_]
-                _extend_tree(child)
-                children.append(child)
-            node.extend(children)
-
-        # extend tree
-        _extend_tree(tree)
+        tree = cls(names[ids[root]])
+        tree.id = ids[root]
+        tree.rank = ranks[root]
+
+        # extend tree, one level at a time
+        queue = [(root, tree)]
+        with pause_gc():
+            for i, node in queue:
+                children = []
+                for j in order[bounds[i] : bounds[i + 1]]:
+                    id_ = ids[j]
+                    child = cls(names[id_], parent=node)
+                    child.id = id_
+                    child.rank = ranks[j]
+                    children.append(child)
+                    queue.append((j, child))
+                node.children = children
         return tree
@@ -0,0 +1,157 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+import numpy as np
+
+from skbio.tree._compact import _from_joins
+from skbio.util._decorator import experimental
+
+
+@experimental(as_of="0.6.0")
+def upgma(dm, weighted=False, compact=False):
+    r"""Build an ultrametric tree by average linkage clustering.
+
+    Parameters
+    ----------
+    dm : skbio.DistanceMatrix
+        Input distance matrix containing distances between OTUs.
+    weighted : bool, optional
+        If `False` (default), the distance between two clusters is the average
+        of the distances between their members (UPGMA). If `True`, the two
+        clusters joined into a new one count equally in its distances to the
+        others, whatever their sizes (WPGMA).
+    compact : bool, optional
+        If `True`, return a ``CompactTree`` instead of a ``TreeNode``.
+
+    Returns
+    -------
+    TreeNode or CompactTree
+        The rooted tree, with the tips at the same distance from the root.
+
+    Raises
+    ------
+    ValueError
+        If the distance matrix is smaller than 2x2.
+
+    See Also
+    --------
+    nj
+    bme
+    TreeNode.from_linkage_matrix
+
+    Notes
+    -----
+    UPGMA (unweighted pair group method with arithmetic mean) and WPGMA are
+    described in Sokal and Michener (1958) [1]_. Each pair of clusters joined
+    is placed at half their distance above the tips.
+
+    The clusters are joined along chains of nearest neighbors [2]_, in a single
+    copy of the distance matrix reduced in place, which takes :math:`O(n^2)`
+    time and memory overall. The tree is the same as that of the joins by
+    increasing distance found by ``scipy.cluster.hierarchy.linkage`` with the
+    ``'average'`` or ``'weighted'`` method, converted by
+    ``TreeNode.from_linkage_matrix``.
+
+    References
+    ----------
+    .. [1] Sokal RR, and Michener CD. (1958) "A statistical method for
+       evaluating systematic relationships." University of Kansas Science
+       Bulletin, 38, 1409-1438.
+    .. [2] Müllner D. (2011) "Modern hierarchical, agglomerative clustering
+       algorithms." arXiv:1109.2378.
+
+    Examples
+    --------
+    >>> from skbio import DistanceMatrix
+    >>> from skbio.tree import upgma
+    >>> dm = DistanceMatrix([[0, 2, 6, 6],
+    ...                      [2, 0, 6, 6],
+    ...                      [6, 6, 0, 4],
+    ...                      [6, 6, 4, 0]], ids=list('abcd'))
+    >>> tree = upgma(dm)
+    >>> print(tree)
+    ((a:1.0,b:1.0):2.0,(c:2.0,d:2.0):1.0);
+    <BLANKLINE>
+
+    """
+    if dm.shape[0] < 2:
+        raise ValueError(
+            "Distance matrix must be at least 2x2 to generate a UPGMA tree."
+        )
+    children, lengths = _upgma_joins(dm.data, weighted)
+    tree = _from_joins(children, lengths, dm.ids)
+    return tree if compact else tree.to_tree_node()
+
+
+def _upgma_joins(data, weighted=False):
+    """Join clusters by average linkage.
+
+    Returns the two children of each cluster, tips being 0 to n - 1 and the
+    cluster of row i being n + i, with the clusters ordered by height and the
+    smaller child first, and their branch lengths.
+
+    """
+    dm = np.array(data, dtype=float)
+    n = dm.shape[0]
+    np.fill_diagonal(dm, np.inf)
+    size = np.ones(n)
+    # the cluster in each row, which is that of the second row of each join
+    node = np.arange(n)
+    pairs = np.empty((n - 1, 2), dtype=np.intp)
+    heights = np.empty(n - 1)
+
+    first = 0
+    chain = []
+    for t in range(n - 1):
+        if not chain:
+            while size[first] == 0:
+                first += 1
+            chain.append(first)
+        # Extend the chain until its last two rows are each other's nearest
+        # ones, preferring the previous row, then the first row, if tied.
+        while True:
+            x = chain[-1]
+            row = dm[x]
+            y = int(row.argmin())
+            if len(chain) > 1:
+                prev = chain[-2]
+                if row[prev] <= row[y]:
+                    break
+            chain.append(y)
+        a, b = sorted((chain.pop(), chain.pop()))
+        pairs[t] = node[a], node[b]
+        heights[t] = dm[a, b] / 2
+
+        if weighted:
+            new = (dm[a] + dm[b]) / 2
+        else:
+            new = (size[a] * dm[a] + size[b] * dm[b]) / (size[a] + size[b])
+        dm[b] = new
+        dm[:, b] = new
+        dm[a] = np.inf
+        dm[:, a] = np.inf
+        size[b] += size[a]
+        size[a] = 0
+        node[b] = n + t
+
+    # A cluster is never placed below its children, which only happens with
+    # rounding errors, as average linkage is monotone.
+    for t, (a, b) in enumerate(pairs.tolist()):
+        for x in a, b:
+            if x >= n and heights[x - n] > heights[t]:
+                heights[t] = heights[x - n]
+
+    # renumber the clusters by increasing height
+    order = np.argsort(heights, kind="stable")
+    rank = np.empty(n - 1, dtype=np.intp)
+    rank[order] = np.arange(n - 1)
+    ids = np.concatenate([np.arange(n), n + rank])
+    children = np.sort(ids[pairs[order]], axis=1)
+    heights = np.concatenate([np.zeros(n), heights[order]])
+    lengths = heights[n:, None] - heights[children]
+    return children, lengths
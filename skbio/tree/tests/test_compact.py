@@ -0,0 +1,203 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from unittest import TestCase, main
+
+import numpy as np
+import numpy.testing as npt
+
+from skbio import TreeNode
+from skbio.tree import CompactTree, MissingNodeError
+from skbio.tree._compact import _from_joins
+
+
+class CompactTreeTests(TestCase):
+    def setUp(self):
+        self.tree = TreeNode.read(
+            ['((a:1,b:2)c:3,(d,e:0.5,f:1)g:2,h:4)i;'])
+        self.ct = CompactTree.from_tree_node(self.tree)
+
+    def test_init(self):
+        ct = CompactTree([-1, 0, 1, 1, 0], list('ecabd'),
+                         [np.nan, 3, 1, 2, 4])
+        self.assertEqual(len(ct), 5)
+        npt.assert_array_equal(ct.parent, [-1, 0, 1, 1, 0])
+        self.assertEqual(ct.name.tolist(), list('ecabd'))
+        npt.assert_array_equal(ct.length, [np.nan, 3, 1, 2, 4])
+        self.assertTrue(np.isnan(ct.support).all())
+        self.assertEqual(str(ct), '((a:1.0,b:2.0)c:3.0,d:4.0)e;\n')
+
+    def test_init_defaults(self):
+        ct = CompactTree([-1])
+        self.assertEqual(ct.name.tolist(), [None])
+        self.assertEqual(repr(ct), '<CompactTree, nodes: 1, tips: 1>')
+        npt.assert_array_equal(ct.postorder(), [0])
+        npt.assert_array_equal(ct.root_distances(), [0])
+        self.assertEqual(ct.children(0).tolist(), [])
+
+    def test_init_invalid(self):
+        for parent in ([], [0], [-1, -1], [-1, 0, 2], [-1, 2, 0], [[-1]],
+                       [-1, 0, 0, 1], [-1, 0, 1, 0, 2]):
+            with self.assertRaisesRegex(ValueError, 'preorder'):
+                CompactTree(parent)
+        with self.assertRaisesRegex(ValueError, 'one length per node'):
+            CompactTree([-1, 0], length=[1.0])
+        with self.assertRaisesRegex(ValueError, 'one name per node'):
+            CompactTree([-1, 0], name=['a', 'b', 'c'])
+
+    def test_from_tree_node(self):
+        self.assertEqual(self.ct.name.tolist(), list('icabgdefh'))
+        npt.assert_array_equal(self.ct.parent, [-1, 0, 1, 1, 0, 4, 4, 4, 0])
+        npt.assert_array_equal(
+            self.ct.length, [np.nan, 3, 1, 2, 2, np.nan, 0.5, 1, 4])
+
+    def test_from_tree_node_subtree(self):
+        ct = CompactTree.from_tree_node(self.tree.find('g'))
+        self.assertEqual(ct.name.tolist(), list('gdef'))
+        npt.assert_array_equal(ct.parent, [-1, 0, 0, 0])
+
+    def test_to_tree_node(self):
+        tree = TreeNode.read(['((a:1,b:2)0.9:3,(d,e:0.5)f)g;'])
+        tree.assign_supports()
+        obs = CompactTree.from_tree_node(tree).to_tree_node()
+        self.assertEqual(str(obs), str(tree))
+        for node, exp in zip(obs.preorder(), tree.preorder()):
+            self.assertEqual((node.name, node.length, node.support),
+                             (exp.name, exp.length, exp.support))
+            if not node.is_root():
+                self.assertIn(node, node.parent.children)
+
+    def test_to_tree_node_cls(self):
+        class MyNode(TreeNode):
+            pass
+
+        obs = self.ct.to_tree_node(MyNode)
+        self.assertTrue(all(isinstance(node, MyNode)
+                            for node in obs.traverse(include_self=True)))
+
+    def test_repr(self):
+        self.assertEqual(repr(self.ct), '<CompactTree, nodes: 9, tips: 6>')
+
+    def test_str(self):
+        self.assertEqual(str(self.ct), str(self.tree))
+
+    def test_topology(self):
+        npt.assert_array_equal(self.ct.first_child,
+                               [1, 2, -1, -1, 5, -1, -1, -1, -1])
+        npt.assert_array_equal(self.ct.next_sibling,
+                               [-1, 4, 3, -1, 8, 6, 7, -1, -1])
+        npt.assert_array_equal(
+            self.ct.is_tip,
+            [False, False, True, True, False, True, True, True, True])
+        npt.assert_array_equal(self.ct.tips(), [2, 3, 5, 6, 7, 8])
+        npt.assert_array_equal(self.ct.preorder(), np.arange(9))
+
+    def test_children(self):
+        npt.assert_array_equal(self.ct.children(0), [1, 4, 8])
+        npt.assert_array_equal(self.ct.children(4), [5, 6, 7])
+        npt.assert_array_equal(self.ct.children(2), [])
+
+    def test_subtree(self):
+        npt.assert_array_equal(self.ct.subtree(0), np.arange(9))
+        npt.assert_array_equal(self.ct.subtree(1), [1, 2, 3])
+        npt.assert_array_equal(self.ct.subtree(4), [4, 5, 6, 7])
+        npt.assert_array_equal(self.ct.subtree(8), [8])
+
+    def test_find(self):
+        self.assertEqual(self.ct.find('g'), 4)
+        self.assertEqual(self.ct.find('i'), 0)
+        for name in 'x', None, ['a']:
+            with self.assertRaises(MissingNodeError):
+                self.ct.find(name)
+
+    def test_postorder(self):
+        names = self.ct.name[self.ct.postorder()].tolist()
+        self.assertEqual(names, [node.name for node in self.tree.postorder()])
+
+    def test_depths(self):
+        npt.assert_array_equal(self.ct.depths(),
+                               [0, 1, 2, 2, 1, 2, 2, 2, 1])
+
+    def test_root_distances(self):
+        npt.assert_array_equal(self.ct.root_distances(),
+                               [0, 3, 4, 5, 2, 2, 2.5, 3, 4])
+
+    def test_to_array(self):
+        obs = self.ct.to_array()
+        npt.assert_array_equal(obs['child_index'],
+                               [[1, 5, 7], [0, 3, 4], [8, 0, 2]])
+        self.assertEqual(obs['name'].tolist(), list('cghabdefi'))
+        npt.assert_array_equal(obs['length'],
+                               [3, 2, 4, 1, 2, np.nan, 0.5, 1, np.nan])
+        npt.assert_array_equal(obs['id'], np.arange(9))
+        npt.assert_array_equal(obs['parent'], [8, 8, 8, 0, 0, 1, 1, 1, -1])
+
+    def test_to_array_same_as_tree_node(self):
+        # the nodes are numbered differently, but the children of each node
+        # are the same
+        def children(arrays):
+            names = arrays['name']
+            return {names[i]: names[j:k + 1].tolist()
+                    for i, j, k in arrays['child_index']}
+
+        for tree in self.tree, TreeNode.read(['(((a,b)c,d)e,(f,g)h)i;']):
+            obs = CompactTree.from_tree_node(tree).to_array()
+            self.assertEqual(children(obs), children(tree.to_array()))
+
+    def test_to_array_nan_length_value(self):
+        obs = self.ct.to_array(nan_length_value=0.0)
+        npt.assert_array_equal(obs['length'], [3, 2, 4, 1, 2, 0, 0.5, 1, 0])
+        self.assertTrue(np.isnan(self.ct.length[0]))
+
+    def test_deep_tree(self):
+        n = 20000
+        ct = CompactTree(np.arange(n) - 1, length=np.ones(n))
+        npt.assert_array_equal(ct.depths(), np.arange(n))
+        npt.assert_array_equal(ct.postorder(), np.arange(n)[::-1])
+        npt.assert_array_equal(ct.root_distances(), np.arange(n))
+        npt.assert_array_equal(ct.subtree(n - 3), [n - 3, n - 2, n - 1])
+        self.assertEqual(ct.to_tree_node().count(), n)
+
+    def test_random_trees(self):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            tree = TreeNode('0')
+            nodes = [tree]
+            for i in range(1, 200):
+                parent = nodes[rng.integers(len(nodes))]
+                node = TreeNode(str(i), length=float(i))
+                parent.append(node)
+                nodes.append(node)
+            ct = CompactTree.from_tree_node(tree)
+            self.assertEqual(ct.name[ct.postorder()].tolist(),
+                             [node.name for node in tree.postorder()])
+            for node in tree.preorder():
+                i = ct.find(node.name)
+                self.assertEqual(ct.name[ct.children(i)].tolist(),
+                                 [child.name for child in node.children])
+                self.assertEqual(
+                    ct.name[ct.subtree(i)].tolist(),
+                    [x.name for x in node.preorder()])
+                self.assertEqual(ct.depths()[i], len(node.ancestors()))
+                self.assertAlmostEqual(ct.root_distances()[i],
+                                       node.distance(tree))
+
+
+class FromJoinsTests(TestCase):
+    def test_from_joins(self):
+        children = [[0, 2, -1], [1, 3, -1], [5, 6, 4]]
+        lengths = [[1, 2, 0], [3, 4, 0], [5, 6, 7]]
+        obs = _from_joins(children, lengths, list('abcde'))
+        self.assertEqual(str(obs),
+                         '((a:1.0,c:2.0):5.0,(b:3.0,d:4.0):6.0,e:7.0);\n')
+        npt.assert_array_equal(obs.parent, [-1, 0, 1, 1, 0, 4, 4, 0])
+        self.assertTrue(np.isnan(obs.length[0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from itertools import combinations
+from unittest import TestCase, main
+
+import numpy as np
+import numpy.testing as npt
+
+from skbio import TreeNode
+from skbio.tree import CompactTree, rf_dists, wrf_dists
+from skbio.tree._compare import _TaxonBits
+
+
+def _random_tree(names, rng):
+    nodes = [TreeNode(x, length=float(rng.integers(1, 5))) for x in names]
+    while len(nodes) > 2:
+        picked = sorted(rng.choice(len(nodes), 2, replace=False), reverse=True)
+        children = [nodes.pop(i) for i in picked]
+        nodes.append(TreeNode(length=float(rng.integers(1, 5)),
+                              children=children))
+    return TreeNode(children=nodes)
+
+
+def _splits(tree, taxa, rooted=False):
+    # splits of a tree computed from sets of names
+    taxa = frozenset(taxa)
+    first = min(taxa)
+    splits = {}
+    for node in tree.postorder(include_self=False):
+        split = frozenset(x.name for x in node.tips(include_self=True)) & taxa
+        if not rooted and first in split:
+            split = taxa - split
+        size = len(split) if rooted else min(len(split),
+                                             len(taxa) - len(split))
+        if 1 < size < len(taxa):
+            splits[split] = splits.get(split, 0) + node.length
+    return splits
+
+
+class TaxonBitsTests(TestCase):
+    def test_clades(self):
+        tree = TreeNode.read(['((a,b)c,(d,(e,x)f)g)h;'])
+        bits = _TaxonBits('abdex')
+        obs = bits.clades(CompactTree.from_tree_node(tree))
+        npt.assert_array_equal(obs[:, 0], [31, 3, 1, 2, 28, 4, 24, 8, 16])
+        npt.assert_array_equal(bits.bitset('ae'), [9])
+
+    def test_clades_multiple_words(self):
+        names = [str(i) for i in range(150)]
+        tree = TreeNode.read(['((%s),%s);' % (','.join(names[:100]),
+                                              ','.join(names[100:]))])
+        bits = _TaxonBits(names)
+        self.assertEqual(bits.n_words, 3)
+        obs = bits.clades(CompactTree.from_tree_node(tree))
+        npt.assert_array_equal(obs[0], [2 ** 64 - 1, 2 ** 64 - 1,
+                                        2 ** 22 - 1])
+        npt.assert_array_equal(obs[1], [2 ** 64 - 1, 2 ** 36 - 1, 0])
+        npt.assert_array_equal(obs[-1], [0, 0, 2 ** 21])
+
+
+class RFDistsTests(TestCase):
+    def setUp(self):
+        self.trees = [TreeNode.read(['((a,b),c,(d,e));']),
+                      TreeNode.read(['((a,c),b,(d,e));']),
+                      TreeNode.read(['((a,b),(c,d),e);'])]
+
+    def test_rf_dists(self):
+        obs = rf_dists(self.trees, ids=['t1', 't2', 't3'])
+        self.assertEqual(obs.ids, ('t1', 't2', 't3'))
+        npt.assert_array_equal(obs.data, [[0, 2, 2], [2, 0, 4], [2, 4, 0]])
+
+    def test_rf_dists_default_ids(self):
+        self.assertEqual(rf_dists(self.trees).ids, ('0', '1', '2'))
+
+    def test_rf_dists_proportion(self):
+        obs = rf_dists(self.trees, proportion=True)
+        npt.assert_array_equal(obs.data,
+                               [[0, .5, .5], [.5, 0, 1], [.5, 1, 0]])
+
+    def test_rf_dists_unrooted(self):
+        # the same unrooted tree with different roots
+        trees = [TreeNode.read(['(((a,b),c),(d,e));']),
+                 TreeNode.read(['((a,b),(c,(d,e)));']),
+                 TreeNode.read(['(a,(b,(c,(d,e))));'])]
+        npt.assert_array_equal(rf_dists(trees).data, np.zeros((3, 3)))
+        npt.assert_array_equal(rf_dists(trees, rooted=True).data,
+                               [[0, 2, 4], [2, 0, 2], [4, 2, 0]])
+
+    def test_rf_dists_compact_trees(self):
+        trees = [CompactTree.from_tree_node(x) for x in self.trees]
+        npt.assert_array_equal(rf_dists(trees).data,
+                               rf_dists(self.trees).data)
+
+    def test_rf_dists_shared_by_all(self):
+        trees = [TreeNode.read(['((a,b),(c,d),(e,f));']),
+                 TreeNode.read(['((a,c),(b,d),e);']),
+                 TreeNode.read(['((a,b),(c,d),e,f);'])]
+        npt.assert_array_equal(rf_dists(trees).data,
+                               [[0, 4, 0], [4, 0, 4], [0, 4, 0]])
+        npt.assert_array_equal(rf_dists(trees, shared_by_all=False).data,
+                               [[0, 4, 1], [4, 0, 4], [1, 4, 0]])
+
+    def test_rf_dists_compare_rfd(self):
+        rng = np.random.default_rng(0)
+        names = [str(i) for i in range(80)]
+        trees = [_random_tree(names, rng) for _ in range(5)]
+        trees.append(_random_tree(names[:60], rng))
+        dm = rf_dists(trees, rooted=True, shared_by_all=False)
+        for i, j in combinations(range(len(trees)), 2):
+            self.assertEqual(dm[i, j], trees[i].compare_rfd(trees[j]))
+
+    def test_rf_dists_random_trees(self):
+        rng = np.random.default_rng(0)
+        names = [str(i) for i in range(70)]
+        trees = [_random_tree(names, rng) for _ in range(6)]
+        for rooted in True, False:
+            dm = rf_dists(trees, rooted=rooted)
+            for i, j in combinations(range(len(trees)), 2):
+                splits1 = _splits(trees[i], names, rooted)
+                splits2 = _splits(trees[j], names, rooted)
+                self.assertEqual(dm[i, j],
+                                 len(splits1.keys() ^ splits2.keys()))
+
+    def test_rf_dists_threads(self):
+        rng = np.random.default_rng(0)
+        names = [str(i) for i in range(20)]
+        trees = [_random_tree(names, rng) for _ in range(10)]
+        npt.assert_array_equal(rf_dists(trees, threads=3).data,
+                               rf_dists(trees).data)
+
+
+class WRFDistsTests(TestCase):
+    def setUp(self):
+        self.trees = [
+            TreeNode.read(['((a:1,b:2):1,c:4,(d:4,e:5):2);']),
+            TreeNode.read(['((a:1,c:3):2,b:2,(d:3,e:4):3);']),
+            TreeNode.read(['((a:1,b:1):1,(c:2,d:3):3,e:4);'])]
+
+    def test_wrf_dists(self):
+        obs = wrf_dists(self.trees, ids=['t1', 't2', 't3'])
+        npt.assert_array_equal(obs.data,
+                               [[0, 7, 10], [7, 0, 11], [10, 11, 0]])
+
+    def test_wrf_dists_no_tips(self):
+        obs = wrf_dists(self.trees, include_tips=False)
+        npt.assert_array_equal(obs.data, [[0, 4, 5], [4, 0, 9], [5, 9, 0]])
+
+    def test_wrf_dists_euclidean(self):
+        obs = wrf_dists(self.trees, include_tips=False, metric='euclidean')
+        npt.assert_allclose(
+            obs.data, np.sqrt([[0, 6, 13], [6, 0, 23], [13, 23, 0]]))
+
+    def test_wrf_dists_missing_lengths(self):
+        trees = [TreeNode.read(['((a,b):1,c,(d,e));']),
+                 TreeNode.read(['((a,b):3,c,(d,e):2);'])]
+        npt.assert_array_equal(wrf_dists(trees).data, [[0, 4], [4, 0]])
+
+    def test_wrf_dists_random_trees(self):
+        rng = np.random.default_rng(0)
+        names = [str(i) for i in range(70)]
+        trees = [_random_tree(names, rng) for _ in range(5)]
+        trees.append(_random_tree(names[:50], rng))
+        for rooted in True, False:
+            for shared_by_all in True, False:
+                dm = wrf_dists(trees, rooted=rooted, include_tips=False,
+                               shared_by_all=shared_by_all, threads=2)
+                for i, j in combinations(range(len(trees)), 2):
+                    taxa = names[:50] if shared_by_all or j == 5 else names
+                    splits1 = _splits(trees[i], taxa, rooted)
+                    splits2 = _splits(trees[j], taxa, rooted)
+                    exp = sum(abs(splits1.get(x, 0) - splits2.get(x, 0))
+                              for x in splits1.keys() | splits2.keys())
+                    self.assertAlmostEqual(dm[i, j], exp)
+
+    def test_wrf_dists_invalid_metric(self):
+        with self.assertRaisesRegex(ValueError, 'metric'):
+            wrf_dists(self.trees, metric='hamming')
+
+
+if __name__ == '__main__':
+    main()
@@ -12,9 +12,22 @@ from unittest import TestCase, main
 import numpy as np
 
 from skbio import TreeNode
-from skbio.tree import majority_rule
+from skbio.tree import CompactTree, majority_rule
 from skbio.tree._majority_rule import (_walk_clades, _filter_clades,
                                        _build_trees)
+from skbio.tree._compare import _TaxonBits
+
+
+def _rows(names, clade_counts):
+    bits = _TaxonBits(names)
+    rows = np.array([bits.bitset(clade) for clade, _ in clade_counts])
+    return rows, np.array([count for _, count in clade_counts], dtype=float)
+
+
+def _clades(names, rows):
+    return [frozenset(x for i, x in enumerate(names)
+                      if row[i // 64] >> np.uint64(i % 64) & np.uint64(1))
+            for row in rows]
 
 
 class MajorityRuleTests(TestCase):
@@ -107,6 +120,60 @@ class MajorityRuleTests(TestCase):
         obs = set([frozenset([n.name for n in t.traverse()]) for t in trees])
         self.assertEqual(obs, exp)
 
+    def test_majority_rule_generator(self):
+        lines = ['((a:1,b:2):3,(c:4,d:5):6);', '((a:3,b:2):1,c:4,d:5);',
+                 '(a:1,(b:2,(c:4,d:1):2):1);']
+        obs = majority_rule(TreeNode.read([x]) for x in lines)
+        self.assertEqual(len(obs), 1)
+        self.assertEqual(obs[0].compare_subsets(
+            TreeNode.read(['((a,b),(c,d));'])), 0.0)
+        self.assertEqual(obs[0].find('a').length, 5 / 3)
+        self.assertEqual(obs[0].lca(['c', 'd']).length, 8 / 3)
+
+        with self.assertRaisesRegex(ValueError, 'weights'):
+            majority_rule((TreeNode.read([x]) for x in lines),
+                          weights=[1, 2])
+        with self.assertRaisesRegex(ValueError, 'weights'):
+            majority_rule((TreeNode.read([x]) for x in lines),
+                          weights=[1, 2, 3, 4])
+
+    def test_majority_rule_compact_trees_threads(self):
+        rng = np.random.default_rng(0)
+        names = [str(i) for i in range(150)]
+        trees = []
+        for _ in range(200):
+            tree = TreeNode.read(['((%s),(%s));' % (','.join(names[:70]),
+                                                   ','.join(names[70:]))])
+            # a random clade in each half
+            for half in tree.children:
+                picked = rng.choice(len(half.children), 2, replace=False)
+                children = [half.children[i] for i in picked]
+                half.remove(children[0])
+                half.remove(children[1])
+                half.append(TreeNode(children=children))
+            trees.append(tree)
+        exp = majority_rule(trees, cutoff=0.005)
+        self.assertEqual(sum(x.count(tips=True) for x in exp), 150)
+        for obs in (
+                majority_rule(trees, cutoff=0.005, threads=3),
+                majority_rule([CompactTree.from_tree_node(x) for x in trees],
+                              cutoff=0.005)):
+            self.assertEqual(len(obs), len(exp))
+            for tree1, tree2 in zip(obs, exp):
+                self.assertEqual(tree1.compare_subsets(tree2), 0.0)
+                self.assertEqual(
+                    sorted(x.support for x in tree1.traverse()),
+                    sorted(x.support for x in tree2.traverse()))
+
+    def test_majority_rule_conflicting_clades(self):
+        trees = [TreeNode.read(['((a,b),c,d);']),
+                 TreeNode.read(['((a,b),c,d);']),
+                 TreeNode.read(['((b,c),a,d);'])]
+        obs = majority_rule(trees, cutoff=0.25)
+        self.assertEqual(len(obs), 1)
+        self.assertEqual(obs[0].compare_subsets(
+            TreeNode.read(['((a,b),c,d);'])), 0.0)
+
     def test_walk_clades(self):
         trees = [TreeNode.read(io.StringIO("((A,B),(D,E));")),
                  TreeNode.read(io.StringIO("((A,B),(D,(E,X)));"))]
@@ -149,29 +216,37 @@ class MajorityRuleTests(TestCase):
             frozenset(['D', 'E', 'X']): 1.0,
             frozenset(['A', 'B', 'D', 'E', 'X']): 1.0}
 
-        obs_clades, obs_lengths = _walk_clades(trees, np.ones(len(trees)))
-        self.assertEqual(set(obs_clades), set(exp_clades))
-        self.assertEqual(obs_lengths, exp_lengths_nolength)
+        names, rows, counts, lengths, total = _walk_clades(trees, None)
+        self.assertEqual(names, ['A', 'B', 'D', 'E', 'X'])
+        self.assertEqual(total, 2.0)
+        clades = _clades(names, rows)
+        self.assertEqual(set(zip(clades, counts)), set(exp_clades))
+        self.assertEqual(set(clades), set(exp_lengths_nolength))
+        self.assertTrue(np.isnan(lengths).all())
 
         for t in trees:
             for n in t.traverse(include_self=True):
                 n.length = 2.0
 
-        obs_clades, obs_lengths = _walk_clades(trees, np.ones(len(trees)))
-
-        self.assertEqual(set(obs_clades), set(exp_clades))
-        self.assertEqual(obs_lengths, exp_lengths)
+        names, rows, counts, lengths, total = _walk_clades(
+            trees, np.ones(len(trees)))
+        clades = _clades(names, rows)
+        self.assertEqual(set(zip(clades, counts)), set(exp_clades))
+        self.assertEqual(dict(zip(clades, lengths)), exp_lengths)
 
     def test_filter_clades(self):
+        names = ['A', 'B', 'C', 'D']
         clade_counts = [(frozenset(['A', 'B']), 8),
                         (frozenset(['A', 'C']), 7),
                         (frozenset(['A']), 6),
                         (frozenset(['B']), 5)]
-        obs = _filter_clades(clade_counts, 2)
+        rows, counts = _rows(names, clade_counts)
+        obs = _filter_clades(rows, counts, 2)
         exp = {frozenset(['A', 'B']): 8,
                frozenset(['A']): 6,
                frozenset(['B']): 5}
-        self.assertEqual(obs, exp)
+        self.assertEqual(dict(zip(_clades(names, rows[obs]), counts[obs])),
+                         exp)
 
         clade_counts = [(frozenset(['A']), 8),
                         (frozenset(['B']), 7),
@@ -179,28 +254,44 @@ class MajorityRuleTests(TestCase):
                         (frozenset(['A', 'B']), 6),
                         (frozenset(['A', 'B', 'C']), 5),
                         (frozenset(['D']), 2)]
-        obs = _filter_clades(clade_counts, 4)
+        rows, counts = _rows(names, clade_counts)
         exp = {frozenset(['A']): 8,
                frozenset(['B']): 7,
                frozenset(['C']): 7,
                frozenset(['A', 'B']): 6,
                frozenset(['A', 'B', 'C']): 5}
-        self.assertEqual(obs, exp)
+        for check in True, False:
+            obs = _filter_clades(rows, counts, 4, check=check)
+            self.assertEqual(
+                dict(zip(_clades(names, rows[obs]), counts[obs])), exp)
 
     def test_build_trees(self):
-        clade_counts = {frozenset(['A', 'B']): 6,
-                        frozenset(['A']): 7,
-                        frozenset(['B']): 8}
-        edge_lengths = {frozenset(['A', 'B']): 1,
-                        frozenset(['A']): 2,
-                        frozenset(['B']): 3}
-        tree = _build_trees(clade_counts, edge_lengths, 'foo', TreeNode)[0]
+        names = ['A', 'B']
+        rows, counts = _rows(names, [(frozenset(['A', 'B']), 6),
+                                     (frozenset(['A']), 7),
+                                     (frozenset(['B']), 8)])
+        lengths = np.array([1, 2, 3])
+        tree = _build_trees(names, rows, counts, lengths, 'foo',
+                            TreeNode)[0]
         self.assertEqual(tree.foo, 6)
         tree_foos = set([c.foo for c in tree.children])
         tree_lens = set([c.length for c in tree.children])
         self.assertEqual(tree_foos, set([7, 8]))
         self.assertEqual(tree_lens, set([2, 3]))
 
+    def test_build_trees_nested(self):
+        names = list('abcdef')
+        rows, counts = _rows(names, [(frozenset(x), 1) for x in [
+            'abcdef', 'f', 'e', 'bc', 'd', 'c', 'b', 'a', 'abcd', 'abc']])
+        lengths = np.arange(10.0)
+        lengths[0] = np.nan
+        tree = _build_trees(names, rows, counts, lengths, 'foo',
+                            TreeNode)[0]
+        self.assertEqual(str(tree),
+                         '(((a:7.0,(b:6.0,c:5.0):3.0):9.0,d:4.0):8.0,e:2.0,'
+                         'f:1.0);\n')
+        self.assertIsNone(tree.length)
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,168 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from itertools import combinations
+from unittest import TestCase, main
+
+import numpy as np
+import numpy.testing as npt
+
+from skbio import DistanceMatrix, TreeNode
+from skbio.tree import CompactTree, bme, rf_dists
+from skbio.tree._me import _BalancedME
+
+
+def _random_tree(n, rng):
+    nodes = [TreeNode(str(i), length=float(rng.integers(1, 5)))
+             for i in range(n)]
+    while len(nodes) > 1:
+        picked = sorted(rng.choice(len(nodes), 2, replace=False), reverse=True)
+        children = [nodes.pop(i) for i in picked]
+        nodes.append(TreeNode(length=float(rng.integers(1, 5)),
+                              children=children))
+    return nodes[0]
+
+
+def _noisy_data(n, rng):
+    x = rng.random((n, 4))
+    return np.abs(x[:, None] - x[None]).sum(axis=-1)
+
+
+def _tree_length(me):
+    # the tree length by Pauplin's formula: each distance weighted by 2 to
+    # the power of 1 minus the number of branches between the OTUs
+    lineages = {}
+    for i in range(me.size):
+        if me.otu[i] >= 0:
+            lineage, node = {i}, i
+            while node > 0:
+                node = me.parent[node]
+                lineage.add(node)
+            lineages[me.otu[i]] = lineage
+    length = 0.0
+    for i, j in combinations(lineages, 2):
+        steps = len(lineages[i] ^ lineages[j])
+        length += 2.0 ** (1 - steps) * me.data[i, j]
+    return length
+
+
+class BmeTests(TestCase):
+    def setUp(self):
+        self.dm = DistanceMatrix([[0, 3, 7, 6],
+                                  [3, 0, 8, 7],
+                                  [7, 8, 0, 5],
+                                  [6, 7, 5, 0]], list('abcd'))
+
+    def test_bme(self):
+        obs = bme(self.dm)
+        self.assertIsInstance(obs, TreeNode)
+        self.assertEqual(str(obs), '(a:1.0,b:2.0,(c:3.0,d:2.0):3.0);\n')
+
+    def test_bme_compact(self):
+        obs = bme(self.dm, compact=True)
+        self.assertIsInstance(obs, CompactTree)
+        self.assertEqual(str(obs), str(bme(self.dm)))
+
+    def test_bme_three_ids(self):
+        dm = DistanceMatrix([[0, 3, 4], [3, 0, 5], [4, 5, 0]], list('abc'))
+        self.assertEqual(str(bme(dm)), '(a:1.0,b:2.0,c:3.0);\n')
+
+    def test_bme_too_small(self):
+        dm = DistanceMatrix([[0, 1], [1, 0]], list('ab'))
+        with self.assertRaisesRegex(ValueError, '3x3'):
+            bme(dm)
+
+    def test_bme_additive(self):
+        # the tree is found, with its branch lengths, from its distances
+        rng = np.random.default_rng(0)
+        for _ in range(5):
+            tree = _random_tree(50, rng)
+            ids = [str(i) for i in range(50)]
+            dm = tree.tip_tip_distances(ids)
+            for nni in False, True:
+                obs = bme(dm, nni=nni)
+                self.assertEqual(rf_dists([obs, tree])[0, 1], 0)
+                npt.assert_allclose(obs.tip_tip_distances(ids).data, dm.data)
+
+    def test_bme_nni(self):
+        rng = np.random.default_rng(0)
+        ids = [str(i) for i in range(40)]
+        for _ in range(5):
+            dm = DistanceMatrix(_noisy_data(40, rng), ids)
+            lengths = [sum(x.length for x in bme(dm, nni=nni).traverse()
+                           if x.length is not None) for nni in (False, True)]
+            self.assertLessEqual(lengths[1], lengths[0] + 1e-12)
+
+
+class BalancedMETests(TestCase):
+    def test_insert(self):
+        # the averages updated by each insertion are those of the new tree
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            data = _noisy_data(int(rng.integers(4, 20)), rng)
+            me = _BalancedME(data)
+            for k in range(3, len(data)):
+                me.insert(k)
+                m = me.size
+                obs = me.avg[:m, :m].copy()
+                me.update()
+                exp = me.avg[:m, :m]
+                # only the averages of ancestors against their descendants
+                # are updated, and not the other way around
+                for b in range(1, m):
+                    a = me.parent[b]
+                    while a > 0:
+                        obs[b, a] = exp[b, a]
+                        a = me.parent[a]
+                npt.assert_allclose(obs[1:, 1:], exp[1:, 1:])
+            npt.assert_allclose(me._branches().sum(), _tree_length(me))
+
+    def test_insert_shortest(self):
+        # each OTU is inserted where it lengthens the tree the least
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            data = _noisy_data(int(rng.integers(5, 12)), rng)
+            me = _BalancedME(data)
+            for k in range(3, len(data) - 1):
+                me.insert(k)
+            lengths = []
+            for z in range(1, me.size):
+                tree = _BalancedME(data)
+                for key in 'parent', 'children', 'sibling', 'otu':
+                    setattr(tree, key, getattr(me, key).copy())
+                tree.size = me.size + 2
+                w, x = me.size + 1, me.size
+                row = tree.children[me.parent[z]]
+                row[row == z] = w
+                tree.parent[[w, x, z]] = me.parent[z], w, w
+                tree.children[w] = z, x
+                tree.sibling[[w, x, z]] = me.sibling[z], z, x
+                if me.sibling[z] >= 0:
+                    tree.sibling[me.sibling[z]] = w
+                tree.otu[x] = len(data) - 1
+                lengths.append(_tree_length(tree))
+            me.insert(len(data) - 1)
+            self.assertAlmostEqual(_tree_length(me), min(lengths))
+
+    def test_nni(self):
+        # no NNI shortens the tree after refinement
+        rng = np.random.default_rng(0)
+        for _ in range(5):
+            data = _noisy_data(30, rng)
+            me = _BalancedME(data)
+            for k in range(3, len(data)):
+                me.insert(k)
+            before = _tree_length(me)
+            me.nni()
+            self.assertLessEqual(_tree_length(me), before + 1e-12)
+            npt.assert_allclose(me._branches().sum(), _tree_length(me))
+            self.assertEqual(me._improving_swaps(), [])
+
+
+if __name__ == '__main__':
+    main()
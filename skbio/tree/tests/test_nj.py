@@ -9,10 +9,11 @@
 import io
 from unittest import TestCase, main
 
+import numpy as np
+import numpy.testing as npt
+
 from skbio import DistanceMatrix, TreeNode, nj
-from skbio.tree._nj import (
-    _compute_q, _compute_collapsed_dm, _lowest_index,
-    _pair_members_to_new_node)
+from skbio.tree._nj import _clip_lengths, _nj_joins, _tie_break
 
 
 class NjTests(TestCase):
@@ -124,72 +125,91 @@ class NjTests(TestCase):
         dm = DistanceMatrix(data, list('ab'))
         self.assertRaises(ValueError, nj, dm)
 
-    def test_compute_q(self):
-        expected_data = [[0, -50, -38, -34, -34],
-                         [-50,   0, -38, -34, -34],
-                         [-38, -38,   0, -40, -40],
-                         [-34, -34, -40,   0, -48],
-                         [-34, -34, -40, -48,   0]]
-        expected_ids = list('abcde')
-        expected = DistanceMatrix(expected_data, expected_ids)
-        self.assertEqual(_compute_q(self.dm1), expected)
-
-        data = [[0, 3, 2],
-                [3, 0, 3],
-                [2, 3, 0]]
-        dm = DistanceMatrix(data, list('abc'))
-        # computed this manually
-        expected_data = [[0, -8, -8],
-                         [-8,  0, -8],
-                         [-8, -8,  0]]
-        expected = DistanceMatrix(expected_data, list('abc'))
-        self.assertEqual(_compute_q(dm), expected)
-
-    def test_compute_collapsed_dm(self):
-        expected_data = [[0,  7,  7,  6],
-                         [7,  0,  8,  7],
-                         [7,  8,  0,  3],
-                         [6,  7,  3,  0]]
-        expected_ids = ['x', 'c', 'd', 'e']
-        expected1 = DistanceMatrix(expected_data, expected_ids)
-        self.assertEqual(_compute_collapsed_dm(self.dm1, 'a', 'b', True, 'x'),
-                         expected1)
-
-        # computed manually
-        expected_data = [[0, 4, 3],
-                         [4, 0, 3],
-                         [3, 3, 0]]
-        expected_ids = ['yy', 'd', 'e']
-        expected2 = DistanceMatrix(expected_data, expected_ids)
-        self.assertEqual(
-            _compute_collapsed_dm(expected1, 'x', 'c', True, 'yy'), expected2)
-
-    def test_lowest_index(self):
-        self.assertEqual(_lowest_index(self.dm1), (4, 3))
-        self.assertEqual(_lowest_index(_compute_q(self.dm1)), (1, 0))
-
-    def test_pair_members_to_new_node(self):
-        self.assertEqual(_pair_members_to_new_node(self.dm1, 'a', 'b', True),
-                         (2, 3))
-        self.assertEqual(_pair_members_to_new_node(self.dm1, 'a', 'c', True),
-                         (4, 5))
-        self.assertEqual(_pair_members_to_new_node(self.dm1, 'd', 'e', True),
-                         (2, 1))
-
-    def test_pair_members_to_new_node_zero_branch_length(self):
-        # the values in this example don't really make sense
-        # (I'm not sure how you end up with these distances between
-        # three sequences), but that doesn't really matter for the sake
-        # of this test
-        data = [[0, 4, 2],
-                [4, 0, 38],
-                [2, 38, 0]]
-        ids = ['a', 'b', 'c']
-        dm = DistanceMatrix(data, ids)
-        self.assertEqual(_pair_members_to_new_node(dm, 'a', 'b', True), (0, 4))
+    def test_nj_invalid_method(self):
+        with self.assertRaisesRegex(ValueError, 'method'):
+            nj(self.dm1, method='upgma')
+
+    def test_nj_rapid(self):
+        for dm in self.dm1, self.dm2, self.dm3, self.dm4:
+            for clip in True, False:
+                self.assertEqual(
+                    nj(dm, clip, result_constructor=str, rapid=True),
+                    nj(dm, clip, result_constructor=str))
+
+    def test_nj_rapid_ties(self):
+        # small integer distances have many pairs with the same Q value
+        rng = np.random.default_rng(0)
+        for n in range(3, 40):
+            data = rng.integers(0, 4, (n, n))
+            data = data + data.T
+            np.fill_diagonal(data, 0)
+            dm = DistanceMatrix(data, [str(i) for i in range(n)])
+            for method in 'nj', 'bionj':
+                self.assertEqual(
+                    nj(dm, result_constructor=str, method=method,
+                       rapid=True),
+                    nj(dm, result_constructor=str, method=method))
+
+    def test_nj_additive(self):
+        # the distances between the tips of a tree are recovered
+        rng = np.random.default_rng(0)
+        nodes = [TreeNode(str(i), length=rng.uniform(1, 2))
+                 for i in range(300)]
+        while len(nodes) > 3:
+            i, j = sorted(rng.choice(len(nodes), 2, replace=False))
+            children = [nodes.pop(j), nodes.pop(i)]
+            nodes.append(TreeNode(length=rng.uniform(1, 2),
+                                  children=children))
+        tree = TreeNode(children=nodes)
+        dm = tree.tip_tip_distances()
+        for kwargs in {}, {'rapid': True}, {'method': 'bionj'}:
+            obs = nj(dm, result_constructor=lambda x: x, **kwargs)
+            obs = TreeNode.read([obs]).tip_tip_distances(dm.ids)
+            npt.assert_allclose(obs.data, dm.data, atol=1e-5)
+
+    def test_nj_bionj(self):
+        data = [[0, 3, 4, 7],
+                [3, 0, 5, 5],
+                [4, 5, 0, 4],
+                [7, 5, 4, 0]]
+        dm = DistanceMatrix(data, list('abcd'))
+        self.assertEqual(nj(dm, result_constructor=str),
+                         "(c:1.250000, (b:1.250000, a:1.750000):1.750000,"
+                         " d:2.750000);")
+        # b and a are joined with lambda = 7/12, and the distances of the new
+        # node to c and d are 3.125 and 4.375
+        self.assertEqual(nj(dm, result_constructor=str, method='bionj'),
+                         "(c:1.375000, (b:1.250000, a:1.750000):1.750000,"
+                         " d:2.625000);")
+        # on an additive matrix, the tree is the same as that of NJ
+        self.assertEqual(nj(self.dm1, result_constructor=str,
+                            method='bionj'), self.expected1_str)
+
+    def test_nj_joins(self):
+        children, lengths = _nj_joins(self.dm1.data)
+        npt.assert_array_equal(children, [[1, 0, -1], [2, 5, -1],
+                                          [3, 6, 4]])
+        npt.assert_array_equal(lengths, [[3, 2, 0], [4, 3, 0], [2, 2, 1]])
+        # the input is not modified
+        self.assertEqual(self.dm1.data[0, 1], 5)
+
+    def test_tie_break(self):
+        # pairs of rows with the lowest Q value of dm1, in any order
+        rank = np.arange(5)
+        self.assertEqual(_tie_break(np.array([[1, 0], [3, 4]]), rank),
+                         (1, 0))
+        self.assertEqual(_tie_break(np.array([[4, 3]]), rank), (4, 3))
+        # rows listed in a different order
+        rank = np.array([4, 3, 0, 1, 2])
+        self.assertEqual(_tie_break(np.array([[1, 0], [3, 4]]), rank),
+                         (4, 3))
+
+    def test_clip_lengths(self):
+        self.assertEqual(_clip_lengths(2, 5, True), (2, 3))
+        self.assertEqual(_clip_lengths(-16, 4, True), (0, 4))
         # this makes it clear why negative branch lengths don't make sense...
-        self.assertEqual(
-            _pair_members_to_new_node(dm, 'a', 'b', False), (-16, 20))
+        self.assertEqual(_clip_lengths(-16, 4, False), (-16, 20))
+        self.assertEqual(_clip_lengths(6, 4, True), (6, 0))
 
 
 if __name__ == "__main__":
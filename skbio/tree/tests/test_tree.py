@@ -7,8 +7,11 @@
 # ----------------------------------------------------------------------------
 
 import io
+import os
+import tempfile
 from unittest import TestCase, main
 from collections import defaultdict
+from itertools import combinations
 
 import numpy as np
 import numpy.testing as npt
@@ -181,6 +184,24 @@ class TreeTests(TestCase):
             self.assertEqual(a.name, b.name)
             self.assertEqual(a.length, b.length)
 
+    def test_copy_other_attributes(self):
+        self.simple_t.children[0].support = 0.9
+        self.simple_t.children[0].extra = ['x']
+        cp = self.simple_t.copy()
+        self.assertEqual(cp.children[0].support, 0.9)
+        self.assertEqual(cp.children[0].extra, ['x'])
+        self.assertIsNot(cp.children[0].extra, self.simple_t.children[0].extra)
+        self.assertFalse(hasattr(cp.children[1], 'extra'))
+
+    def test_slots(self):
+        node = TreeNode('a', 1.0)
+        self.assertFalse(hasattr(node, '__dict__') and node.__dict__)
+        node.extra = 42
+        self.assertEqual(node.extra, 42)
+        subclass_node = TreeNodeSubclass()
+        subclass_node.extra = 42
+        self.assertEqual(subclass_node.extra, 42)
+
     def test_append(self):
         """Append a node to a tree"""
         second_tree = TreeNode.read(io.StringIO("(x,y)z;"))
@@ -336,6 +357,16 @@ class TreeTests(TestCase):
         t.prune()
         self.assertEqual(str(t), exp)
 
+    def test_prune_root_single_desc_attributes(self):
+        t = TreeNode.read(["((a,b)c:1.5)extra;"])
+        t.children[0].support = 0.9
+        t.children[0].extra = 'x'
+        t.prune()
+        self.assertEqual((t.name, t.length, t.support, t.extra),
+                         ('c', 1.5, 0.9, 'x'))
+        self.assertIsNone(t.parent)
+        self.assertEqual([c.parent for c in t.children], [t, t])
+
     def test_prune(self):
         """Collapse single descendent nodes"""
         # check the identity case
@@ -429,6 +460,32 @@ class TreeTests(TestCase):
         self.assertEqual(root._tip_cache, {})
         self.assertEqual(root._non_tip_cache, {})
 
+    def test_caches_only_on_root(self):
+        root = self.simple_t
+        root.create_caches()
+        for node in root.traverse(include_self=False):
+            self.assertNotIn('_tip_cache', vars(node))
+            self.assertNotIn('_non_tip_cache', vars(node))
+        self.assertIn('_tip_cache', vars(root))
+
+    def test_create_caches_unnamed_internal_nodes(self):
+        t = TreeNode.read(io.StringIO("((a,b),(c,d));"))
+        t.create_caches()
+        tip_cache = t._tip_cache
+        t.find('a')
+        self.assertIs(t._tip_cache, tip_cache)
+
+    def test_cache_attr_registered_on_root(self):
+        tree = TreeNode.read(io.StringIO("((a,b,(c,d)e)f,(g,h)i)root;"))
+        f = tree.find('f')
+        f.cache_attr(lambda n: [n.name] if n.is_tip() else [], 'tip_names')
+        self.assertEqual(f.tip_names, ['a', 'b', 'c', 'd'])
+        self.assertEqual(tree._registered_caches, {'tip_names'})
+        self.assertNotIn('_registered_caches', vars(f))
+        tree.invalidate_caches()
+        for n in tree.traverse(include_self=True):
+            self.assertFalse(hasattr(n, 'tip_names'))
+
     def test_invalidate_attr_caches(self):
         tree = TreeNode.read(io.StringIO("((a,b,(c,d)e)f,(g,h)i)root;"))
 
@@ -647,6 +704,67 @@ class TreeTests(TestCase):
         with self.assertRaises(NoLengthError):
             tips[2].distance(tips[3])
 
+    def test_lowest_common_ancestors(self):
+        t = TreeNode.read(io.StringIO("((a,(b,c)d)e,f,(g,h)i)j;"))
+        pairs = [('a', 'b'), ('b', 'c'), ('a', 'h'), ('c', 'e'), ('e', 'c'),
+                 ('f', 'f'), ('j', 'g'), (t.find('g'), 'h')]
+        obs = t.lowest_common_ancestors(pairs)
+        self.assertEqual([node.name for node in obs],
+                         ['e', 'd', 'j', 'e', 'e', 'f', 'j', 'i'])
+        self.assertEqual(t.find('b').lowest_common_ancestors([('b', 'c')]),
+                         [t.find('d')])
+        self.assertEqual(t.lowest_common_ancestors([]), [])
+
+    def test_lowest_common_ancestors_random_trees(self):
+        rng = np.random.default_rng(0)
+        for size in 1, 2, 3, 100:
+            t = TreeNode('0')
+            nodes = [t]
+            for i in range(1, size):
+                node = TreeNode(str(i), length=rng.random())
+                nodes[rng.integers(len(nodes))].append(node)
+                nodes.append(node)
+            pairs = [(nodes[i], nodes[j])
+                     for i, j in rng.integers(len(nodes), size=(200, 2))]
+            obs = t.lowest_common_ancestors(pairs)
+            for lca, (a, b) in zip(obs, pairs):
+                ancestors = set([a] + a.ancestors())
+                exp = next(x for x in [b] + b.ancestors() if x in ancestors)
+                self.assertIs(lca, exp)
+            npt.assert_almost_equal(t.patristic_distances(pairs),
+                                    [a.distance(b) for a, b in pairs])
+
+    def test_lowest_common_ancestors_missing_node(self):
+        t = TreeNode.read(io.StringIO("((a,b)c,d)e;"))
+        for pair in ('a', 'x'), ('a', TreeNode('a')):
+            with self.assertRaises(MissingNodeError):
+                t.lowest_common_ancestors([pair])
+
+    def test_lowest_common_ancestors_invalidated(self):
+        t = TreeNode.read(io.StringIO("((a,b)c,d)e;"))
+        self.assertEqual(t.lowest_common_ancestors([('a', 'd')]), [t])
+        self.assertIsNotNone(t._lca_index)
+        t.find('c').append(t.find('d'))
+        self.assertIsNone(t._lca_index)
+        self.assertEqual(t.lowest_common_ancestors([('a', 'd')]),
+                         [t.find('c')])
+        self.assertIsNone(t.copy()._lca_index)
+
+    def test_patristic_distances(self):
+        t = TreeNode.read(io.StringIO("((a:1,b:2)c:3,(d:4,e:5)f:6)root:7;"))
+        obs = t.patristic_distances([('a', 'b'), ('a', 'e'), ('c', 'a'),
+                                     ('root', 'f'), ('d', 'd')])
+        npt.assert_almost_equal(obs, [3, 15, 1, 6, 0])
+        self.assertEqual(obs.dtype, float)
+        self.assertEqual(t.patristic_distances([]).shape, (0,))
+
+    def test_patristic_distances_no_length(self):
+        t = TreeNode.read(io.StringIO("((a:1,b:2)c,(d:4,e:5):6)root;"))
+        npt.assert_almost_equal(t.patristic_distances([('a', 'b')]), [3])
+        npt.assert_almost_equal(t.patristic_distances([('d', 'root')]), [10])
+        with self.assertRaises(NoLengthError):
+            t.patristic_distances([('a', 'b'), ('a', 'd')])
+
     def test_lowest_common_ancestor(self):
         """TreeNode lowestCommonAncestor should return LCA for set of tips"""
         t1 = TreeNode.read(io.StringIO("((a,(b,c)d)e,f,(g,h)i)j;"))
@@ -740,6 +858,35 @@ class TreeTests(TestCase):
         exp = '(G:3.0,M:3.7);\n'
         self.assertEqual(obs, exp)
 
+    def test_shear_chains(self):
+        # chains are collapsed as by prune, their last nodes placed after the
+        # other children, and the tree sheared is left unchanged
+        s = '(((a:1,b:1)c:1,(d:1,e)f:2)g:1,((h,i:2)j)k:3,l:1)m;'
+        t = TreeNode.read([s])
+        t.find('a').extra = 'x'
+        obs = t.shear(['a', 'b', 'd', 'h', 'l'])
+        self.assertEqual(str(obs),
+                         '(((a:1.0,b:1.0)c:1.0,d:3.0)g:1.0,l:1.0,h:3.0)m;\n')
+        self.assertEqual(obs.find('a').extra, 'x')
+        self.assertIsNot(obs.find('a'), t.find('a'))
+        for node in obs.traverse():
+            for child in node.children:
+                self.assertIs(child.parent, node)
+        self.assertEqual(str(t), str(TreeNode.read([s])))
+
+    def test_shear_cached(self):
+        t = TreeNode.read(['((H:1,G:1):2,(R:0.5,M:0.7):3);'])
+        t.create_caches()
+        self.assertEqual(str(t.shear(['G', 'M'])), '(G:3.0,M:3.7);\n')
+        self.assertEqual(str(t.shear(['H', 'G'])), '(H:1.0,G:1.0):2.0;\n')
+        with self.assertRaisesRegex(ValueError, 'subset'):
+            t.shear(['G', 'X'])
+
+    def test_shear_not_subset(self):
+        t = TreeNode.read(['((H:1,G:1):2,(R:0.5,M:0.7):3);'])
+        with self.assertRaisesRegex(ValueError, 'subset'):
+            t.shear(['G', 'X'])
+
     def test_compare_tip_distances(self):
         t = TreeNode.read(io.StringIO('((H:1,G:1):2,(R:0.5,M:0.7):3);'))
         t2 = TreeNode.read(io.StringIO('(((H:1,G:1,O:1):2,R:3):1,X:4);'))
@@ -796,6 +943,70 @@ class TreeTests(TestCase):
         obs = t.tip_tip_distances(endpoints=nodes)
         self.assertEqual(obs, exp)
 
+    def test_tip_tip_distances_endpoints_order(self):
+        t = TreeNode.read(io.StringIO('((H:1,G:1):2,(R:0.5,M:0.7):3,X:4);'))
+        obs = t.tip_tip_distances(endpoints=['X', 'M', 'H'])
+        exp = DistanceMatrix([[0, 7.7, 7],
+                              [7.7, 0, 6.7],
+                              [7, 6.7, 0]], ['X', 'M', 'H'])
+        self.assertEqual(obs, exp)
+
+    def test_tip_tip_distances_out(self):
+        t = TreeNode.read(io.StringIO('((H:1,G:1):2,(R:0.5,M:0.7):3,X:4);'))
+        for endpoints in None, ['X', 'M', 'H'], ['R']:
+            exp = t.tip_tip_distances(endpoints).condensed_form()
+            out = np.full(exp.shape, np.nan)
+            obs = t.tip_tip_distances(endpoints, out=out)
+            self.assertIs(obs, out)
+            npt.assert_almost_equal(obs, exp)
+
+    def test_tip_tip_distances_out_memmap(self):
+        t = TreeNode.read(io.StringIO('((H:1,G:1):2,(R:0.5,M:0.7):3,X:4);'))
+        exp = t.tip_tip_distances().condensed_form()
+        with tempfile.TemporaryDirectory() as tmp:
+            out = np.memmap(os.path.join(tmp, 'dm'), dtype=float, mode='w+',
+                            shape=exp.shape)
+            t.tip_tip_distances(out=out)
+            out.flush()
+            npt.assert_almost_equal(out, exp)
+            del out
+
+    def test_tip_tip_distances_out_invalid(self):
+        t = TreeNode.read(io.StringIO('((H:1,G:1):2,(R:0.5,M:0.7):3);'))
+        with self.assertRaisesRegex(ValueError, 'length 6'):
+            t.tip_tip_distances(out=np.zeros(16))
+        with self.assertRaisesRegex(ValueError, 'length 1'):
+            t.tip_tip_distances(['H', 'G'], out=np.zeros((1, 1)))
+
+    def test_tip_tip_distances_repeated_endpoints(self):
+        t = TreeNode.read(io.StringIO('((H:1,G:1):2,(R:0.5,M:0.7):3);'))
+        out = np.full(3, np.nan)
+        t.tip_tip_distances(['H', 'M', 'H'], out=out)
+        npt.assert_almost_equal(out, [6.7, 0, 6.7])
+
+    def test_tip_tip_distances_random_trees(self):
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            t = TreeNode('0')
+            nodes = [t]
+            for i in range(1, 60):
+                node = TreeNode(str(i), length=rng.random())
+                nodes[rng.integers(len(nodes))].append(node)
+                nodes.append(node)
+            tips = list(t.tips())
+            endpoints = [tips[i].name
+                         for i in rng.permutation(len(tips))[:10]]
+            for names in None, endpoints:
+                obs = t.tip_tip_distances(names)
+                for a, b in combinations(obs.ids, 2):
+                    self.assertAlmostEqual(obs[a, b],
+                                           t.find(a).distance(t.find(b)))
+
+    def test_tip_tip_distances_subtree(self):
+        t = TreeNode.read(io.StringIO('((H:1,G:1)a:2,(R:0.5,M:0.7)b:3);'))
+        obs = t.find('b').tip_tip_distances()
+        self.assertEqual(obs, DistanceMatrix([[0, 1.2], [1.2, 0]], ['R', 'M']))
+
     def test_tip_tip_distances_non_tip_endpoints(self):
         t = TreeNode.read(io.StringIO('((H:1,G:1)foo:2,(R:0.5,M:0.7):3);'))
         with self.assertRaises(ValueError):
@@ -893,6 +1104,73 @@ class TreeTests(TestCase):
         obs = [n.name for n in self.simple_t.levelorder()]
         self.assertEqual(obs, exp)
 
+    def test_traversal_plan(self):
+        t = TreeNode.read(['((a,b)c,(d,(e,f)g)h,i)j;'])
+        exp = {}
+        for node in t.traverse(include_self=True):
+            for method in 'preorder', 'postorder', 'tips', 'non_tips':
+                for include_self in True, False:
+                    key = node.name, method, include_self
+                    exp[key] = [x.name for x in getattr(node, method)(
+                        include_self=include_self)]
+        self.assertIsNone(t._traversal_plan)
+        plan, i = t.find('h')._get_traversal_plan()
+        self.assertIs(t._traversal_plan, plan)
+        self.assertEqual(i, 4)
+        self.assertEqual([x.name for x in plan.nodes], list('jcabhdgefi'))
+        self.assertEqual([x.name for x in plan.post], list('abcdefghij'))
+        npt.assert_array_equal(plan.parent, [-1, 0, 1, 1, 0, 4, 4, 6, 6, 0])
+        npt.assert_array_equal(plan.size, [10, 3, 1, 1, 5, 1, 3, 1, 1, 1])
+        npt.assert_array_equal(plan.child[plan.child_ptr[0]:
+                                          plan.child_ptr[1]], [1, 4, 9])
+        for (name, method, include_self), names in exp.items():
+            obs = getattr(t.find(name), method)(include_self=include_self)
+            self.assertEqual([x.name for x in obs], names)
+
+    def test_traversal_plan_invalidated(self):
+        t = TreeNode.read(['((a,b)c,(d,e)f)g;'])
+        t.assign_ids()
+        self.assertIsNotNone(t._traversal_plan)
+        self.assertIsNone(t.copy()._traversal_plan)
+        t.find('c').append(t.find('d'))
+        self.assertIsNone(t._traversal_plan)
+        self.assertEqual([x.name for x in t.postorder()], list('abdcefg'))
+
+        # a root adopted by another tree loses its plan
+        t.assign_ids()
+        TreeNode(children=[t]).remove(t)
+        self.assertIsNone(t._traversal_plan)
+
+    def test_traversal_plan_modified_while_traversing(self):
+        # traversals continue on the tree as modified, as without a plan
+        for plan in False, True:
+            t = TreeNode.read(['((a,b,c,d)e,(f,g)h)i;'])
+            if plan:
+                t.assign_ids()
+            t.bifurcate()
+            self.assertEqual(str(t), '((d,(c,(a,b)))e,(f,g)h)i;\n')
+
+            t = TreeNode.read(['((a,b)c,(d,e)f,(g,h)k)i;'])
+            if plan:
+                t.assign_ids()
+            obs = []
+            for node in t.postorder():
+                obs.append(node.name)
+                if node.name == 'b':
+                    t.find('f').append(TreeNode('x'))
+                    t.remove(t.find('k'))
+            self.assertEqual(obs, list('abcdexfi'))
+
+            t = TreeNode.read(['((a,b)c,(d,e)f)i;'])
+            if plan:
+                t.assign_ids()
+            obs = []
+            for node in t.preorder():
+                obs.append(node.name)
+                if node.name == 'c':
+                    node.append(TreeNode('x'))
+            self.assertEqual(obs, list('icabxfde'))
+
     def test_bifurcate(self):
         t1 = TreeNode.read(io.StringIO('(((a,b),c),(d,e));'))
         t2 = TreeNode.read(io.StringIO('((a,b,c));'))
@@ -1042,6 +1320,12 @@ class TreeTests(TestCase):
         exp = 0.5
         self.assertEqual(obs, exp)
 
+        # the larger tree is compared on the tips of the smaller one
+        t3 = TreeNode.read(io.StringIO('((H,G),R);'))
+        self.assertEqual(t2.compare_rfd(t3), 0.0)
+        self.assertEqual(t3.compare_rfd(t), 0.0)
+        self.assertEqual(t.compare_rfd(t3, proportion=True), 0.0)
+
         with self.assertRaises(ValueError):
             t.compare_rfd(t4)
 
@@ -0,0 +1,83 @@
+# ----------------------------------------------------------------------------
+# Copyright (c) 2013--, scikit-bio development team.
+#
+# Distributed under the terms of the Modified BSD License.
+#
+# The full license is in the file LICENSE.txt, distributed with this software.
+# ----------------------------------------------------------------------------
+
+from unittest import TestCase, main
+
+import numpy as np
+import numpy.testing as npt
+from scipy.cluster.hierarchy import linkage
+from scipy.spatial.distance import squareform
+
+from skbio import DistanceMatrix, TreeNode
+from skbio.tree import CompactTree, upgma
+
+
+class UpgmaTests(TestCase):
+    def setUp(self):
+        self.dm = DistanceMatrix([[0, 2, 6, 6, 9],
+                                  [2, 0, 6, 6, 9],
+                                  [6, 6, 0, 4, 9],
+                                  [6, 6, 4, 0, 9],
+                                  [9, 9, 9, 9, 0]], list('abcde'))
+
+    def test_upgma(self):
+        obs = upgma(self.dm)
+        self.assertIsInstance(obs, TreeNode)
+        self.assertEqual(
+            str(obs), '(e:4.5,((a:1.0,b:1.0):2.0,(c:2.0,d:2.0):1.0):1.5);\n')
+        for tip in obs.tips():
+            self.assertAlmostEqual(tip.distance(obs), 4.5)
+
+    def test_upgma_weighted(self):
+        dm = DistanceMatrix([[0, 2, 4, 10],
+                             [2, 0, 4, 10],
+                             [4, 4, 0, 4],
+                             [10, 10, 4, 0]], list('abcd'))
+        # d is at 8 from a, b and c on average
+        self.assertEqual(str(upgma(dm)),
+                         '(d:4.0,(c:2.0,(a:1.0,b:1.0):1.0):2.0);\n')
+        # c and the pair (a, b) count equally: (4 + 10) / 2
+        self.assertEqual(str(upgma(dm, weighted=True)),
+                         '(d:3.5,(c:2.0,(a:1.0,b:1.0):1.0):1.5);\n')
+
+    def test_upgma_compact(self):
+        obs = upgma(self.dm, compact=True)
+        self.assertIsInstance(obs, CompactTree)
+        self.assertEqual(str(obs), str(upgma(self.dm)))
+
+    def test_upgma_two_ids(self):
+        dm = DistanceMatrix([[0, 3], [3, 0]], ['a', 'b'])
+        self.assertEqual(str(upgma(dm)), '(a:1.5,b:1.5);\n')
+
+    def test_upgma_too_small(self):
+        dm = DistanceMatrix([[0]], ['a'])
+        with self.assertRaisesRegex(ValueError, '2x2'):
+            upgma(dm)
+
+    def test_upgma_same_as_scipy(self):
+        rng = np.random.default_rng(0)
+        for i in range(20):
+            n = int(rng.integers(3, 40))
+            # integer distances, with many ties
+            x = rng.integers(0, 5 if i % 2 else 1000, size=(n, 3))
+            data = np.abs(x[:, None] - x[None]).sum(axis=-1)
+            ids = [str(j) for j in range(n)]
+            dm = DistanceMatrix(data, ids)
+            for weighted, method in (False, 'average'), (True, 'weighted'):
+                obs = upgma(dm, weighted=weighted)
+                exp = TreeNode.from_linkage_matrix(
+                    linkage(squareform(data), method), ids)
+                self.assertEqual([x.name for x in obs.postorder()],
+                                 [x.name for x in exp.postorder()])
+                npt.assert_allclose(
+                    [x.length for x in obs.postorder(include_self=False)],
+                    [x.length for x in exp.postorder(include_self=False)])
+
+
+if __name__ == '__main__':
+    main()
@@ -52,16 +52,21 @@ Warnings
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+from importlib import import_module
+
 from ._warning import EfficiencyWarning, RepresentationWarning, SkbioWarning
 from ._misc import cardinal_to_ordinal, find_duplicates, safe_md5, get_rng
-from ._testing import (
-    get_data_path,
-    assert_ordination_results_equal,
-    assert_data_frame_almost_equal,
-    pytestrunner,
-)
 from ._decorator import classproperty
 
+# The testing functionality imports pandas and scipy, so it is imported on
+# first access, see `__getattr__`.
+_lazy_imports = {
+    "get_data_path": "skbio.util._testing",
+    "assert_ordination_results_equal": "skbio.util._testing",
+    "assert_data_frame_almost_equal": "skbio.util._testing",
+    "pytestrunner": "skbio.util._testing",
+}
+
 __all__ = [
     "SkbioWarning",
     "EfficiencyWarning",
@@ -76,3 +81,16 @@ __all__ = [
     "classproperty",
     "pytestrunner",
 ]
+
+
+def __getattr__(name):
+    if name in _lazy_imports:
+        value = getattr(import_module(_lazy_imports[name]), name)
+    else:
+        raise AttributeError("module 'skbio.util' has no attribute %r" % name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
@@ -6,8 +6,10 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import gc
 import hashlib
 import inspect
+from contextlib import contextmanager
 from types import FunctionType
 
 import numpy as np
@@ -100,6 +102,24 @@ def chunk_str(s, n, char):
     return char.join((s[i : i + n] for i in range(0, len(s), n)))
 
 
+@contextmanager
+def pause_gc():
+    """Disable the cyclic garbage collector within a context.
+
+    Creating many container objects that are kept alive, such as the nodes of
+    a large tree, triggers collections that repeatedly scan all of them. They
+    are pointless in that case and can take most of the time.
+
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 @experimental(as_of="0.4.0")
 def cardinal_to_ordinal(n):
     """Return ordinal string version of cardinal int `n`.
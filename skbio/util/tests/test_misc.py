@@ -6,13 +6,14 @@
 # The full license is in the file LICENSE.txt, distributed with this software.
 # ----------------------------------------------------------------------------
 
+import gc
 import io
 import unittest
 
 import numpy as np
 
 from skbio.util import cardinal_to_ordinal, safe_md5, find_duplicates, get_rng
-from skbio.util._misc import MiniRegistry, chunk_str, resolve_key
+from skbio.util._misc import MiniRegistry, chunk_str, resolve_key, pause_gc
 
 
 class TestMiniRegistry(unittest.TestCase):
@@ -175,6 +176,29 @@ class ChunkStrTests(unittest.TestCase):
             chunk_str('abcdef', -42, ' ')
 
 
+class PauseGCTests(unittest.TestCase):
+    def test_pause_gc(self):
+        self.assertTrue(gc.isenabled())
+        with pause_gc():
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+
+    def test_already_disabled(self):
+        gc.disable()
+        try:
+            with pause_gc():
+                pass
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+
+    def test_exception(self):
+        with self.assertRaises(ZeroDivisionError):
+            with pause_gc():
+                1 / 0
+        self.assertTrue(gc.isenabled())
+
+
 class SafeMD5Tests(unittest.TestCase):
     def test_safe_md5(self):
         exp = 'ab07acbb1e496801937adfa772424bf7'